@@ -0,0 +1,229 @@
+"""
+Benchmark: context tree section content, nested containment scans vs. sweeps.
+
+Builds a synthetic document (5,000 paragraphs, 200 tables, 50 images spread
+over 20 sections by default) from plain Python objects that count property
+reads, then builds the content of every section with
+
+* ``baseline``: the original algorithm, which walked every document table,
+  image and paragraph once per section and checked containment with nested
+  loops,
+* ``lazy``: the lazily built tree's section loader before the sweep, which
+  walked only the section's own tables, images and paragraphs but still
+  checked containment against every table and image seen, and
+* ``sweep``: ``read_section_content``, which reads only the offsets of the
+  section's objects, assigns them with a sorted merge and then reads text,
+  style and size of the objects it keeps.
+
+Both lazy loaders run after the tree build, which has already read every
+section's offsets (and, for the sweep, anchored them in the edit journal);
+that step is done once up front and not timed.
+
+Property reads stand in for COM round trips; against a real Word instance
+each one costs tens of microseconds, so they dominate the wall time.
+
+Usage:
+    python benchmarks/bench_section_sweep.py [--paragraphs N] [--tables N]
+        [--sections N] [--images N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from word_docx_tools.com_backend.edit_journal import get_edit_journal
+from word_docx_tools.com_backend.section_sweep import read_section_content
+
+
+class Counter:
+    reads = 0
+
+
+class Fake:
+    """Object whose attribute reads are counted like COM property gets."""
+
+    def __init__(self, **values):
+        self.__dict__["_values"] = values
+
+    def __getattr__(self, name):
+        try:
+            value = self.__dict__["_values"][name]
+        except KeyError:
+            raise AttributeError(name)
+        Counter.reads += 1
+        return value
+
+
+class FakeCollection(list):
+    """Enumerable collection that also supports 1-based calls and Count."""
+
+    @property
+    def Count(self):
+        Counter.reads += 1
+        return len(self)
+
+    def __call__(self, index):
+        Counter.reads += 1
+        return self[index - 1]
+
+
+def _range(start, end, text=""):
+    return Fake(Start=start, End=end, Text=text)
+
+
+def build_document(paragraphs, tables, sections, images):
+    """Lay out sections of equal size; each table spans three paragraphs."""
+    paragraph_objects = FakeCollection()
+    table_objects = FakeCollection()
+    image_objects = FakeCollection()
+    section_objects = FakeCollection()
+
+    section_objects_in = (FakeCollection(), FakeCollection(), FakeCollection())
+
+    per_section = max(paragraphs // sections, 1)
+    table_every = max(paragraphs // max(tables, 1), 4)
+    image_every = max(paragraphs // max(images, 1), 1)
+    offset = 0
+    section_start = 0
+    table_open = None
+    for i in range(paragraphs):
+        text = f"Paragraph {i} with some text\r"
+        start, end = offset, offset + len(text)
+        paragraph_objects.append(Fake(Range=_range(start, end, text), Style=Fake(NameLocal="Normal")))
+        section_objects_in[2].append(paragraph_objects[-1])
+        if tables and i % table_every == 1 and len(table_objects) < tables:
+            table_open = (start, i + 3)
+        if table_open and i == table_open[1] - 1:
+            table_objects.append(Fake(Range=_range(table_open[0], end),
+                                      Rows=FakeCollection([None] * 3), Columns=FakeCollection([None] * 2)))
+            section_objects_in[0].append(table_objects[-1])
+            table_open = None
+        if images and i % image_every == 0 and len(image_objects) < images:
+            image_objects.append(Fake(Range=_range(start, start + 1), Width=100, Height=80, Type=3))
+            section_objects_in[1].append(image_objects[-1])
+        offset = end
+        if (i + 1) % per_section == 0 or i == paragraphs - 1:
+            if len(section_objects) < sections - 1 or i == paragraphs - 1:
+                tables_in, images_in, paragraphs_in = section_objects_in
+                section_objects.append(Fake(Range=Fake(Start=section_start, End=offset, Tables=tables_in,
+                                                       InlineShapes=images_in, Paragraphs=paragraphs_in)))
+                section_objects_in = (FakeCollection(), FakeCollection(), FakeCollection())
+                section_start = offset
+
+    return Fake(Sections=section_objects, Tables=table_objects, InlineShapes=image_objects,
+                Paragraphs=paragraph_objects, Content=Fake(End=offset), FullName="bench.docx")
+
+
+def build_baseline(document):
+    """The original per-section algorithm, reduced to its COM access pattern."""
+    built = 0
+    for section in document.Sections:
+        range_start = section.Range.Start
+        range_end = section.Range.End
+        child_ranges = []
+        for table in document.Tables:
+            if range_start <= table.Range.Start and table.Range.End <= range_end:
+                table.Rows.Count
+                table.Columns.Count
+                child_ranges.append(table.Range)
+        for i in range(1, document.InlineShapes.Count + 1):
+            shape = document.InlineShapes(i)
+            if range_start <= shape.Range.Start and shape.Range.End <= range_end:
+                if not any(shape.Range.Start >= r.Start and shape.Range.End <= r.End for r in child_ranges):
+                    shape.Width
+                    shape.Height
+                    child_ranges.append(shape.Range)
+        processed = [(r.Start, r.End) for r in child_ranges]
+        for i in range(1, document.Paragraphs.Count + 1):
+            paragraph = document.Paragraphs(i)
+            if range_start <= paragraph.Range.Start and paragraph.Range.End <= range_end:
+                if not any(paragraph.Range.Start >= s and paragraph.Range.End <= e for s, e in processed):
+                    if paragraph.Range.Text.strip():
+                        paragraph.Range.Text
+                        paragraph.Style.NameLocal
+                        built += 1
+        built += len(child_ranges)
+    return built
+
+
+def build_lazy(document):
+    """The lazy section loader before the sweep, reduced to its COM access pattern."""
+    built = 0
+    for section in document.Sections:
+        section_range = section.Range
+        processed = []
+        for table in section_range.Tables:
+            table_range = table.Range
+            table.Rows.Count
+            table.Columns.Count
+            processed.append((table_range.Start, table_range.End))
+            built += 1
+        for shape in section_range.InlineShapes:
+            shape_range = shape.Range
+            start, end = shape_range.Start, shape_range.End
+            if any(start >= s and end <= e for s, e in processed):
+                continue
+            shape.Width
+            shape.Height
+            shape.Type
+            processed.append((start, end))
+            built += 1
+        for paragraph in section_range.Paragraphs:
+            paragraph_range = paragraph.Range
+            start, end = paragraph_range.Start, paragraph_range.End
+            if any(start >= s and end <= e for s, e in processed):
+                continue
+            if paragraph_range.Text.strip():
+                paragraph.Style.NameLocal
+                built += 1
+    return built
+
+
+def anchor_sections(document):
+    """What the tree build does before any section is expanded."""
+    bounds = [(section.Range.Start, section.Range.End) for section in document.Sections]
+    offsets = get_edit_journal(document).anchor(
+        (offset for pair in bounds for offset in pair), content_end=document.Content.End
+    )
+    return [(offsets, pair) for pair in bounds]
+
+
+def build_sweep(document, anchors):
+    built = 0
+    for index, section in enumerate(document.Sections):
+        offsets, bounds = anchors[index]
+        content = read_section_content(document, index, section.Range, offsets, bounds)
+        built += len(content.tables) + len(content.images) + len(content.paragraphs)
+    return built
+
+
+def run(label, builder, document, repeat):
+    best = None
+    for _ in range(repeat):
+        Counter.reads = 0
+        started = time.perf_counter()
+        built = builder(document)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<8} {best * 1000:10.1f} ms  {Counter.reads:>12,} property reads  {built:>6} contexts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--sections", type=int, default=20)
+    parser.add_argument("--images", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    document = build_document(args.paragraphs, args.tables, args.sections, args.images)
+    print(f"{len(document.Paragraphs)} paragraphs, {len(document.Tables)} tables, "
+          f"{len(document.InlineShapes)} images, {len(document.Sections)} sections")
+    run("baseline", build_baseline, document, args.repeat)
+    run("lazy", build_lazy, document, args.repeat)
+    anchors = anchor_sections(document)
+    run("sweep", lambda doc: build_sweep(doc, anchors), document, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -340,6 +340,24 @@ def setup_venv():
         print("Please install uv (https://docs.astral.sh/uv/) and try again.")
         sys.exit(1)
 
+    # Pre-build the Word type library wrapper so the server can use early binding
+    if is_windows:
+        print("\nBuilding Word type library cache (gen_py)...")
+        result = subprocess.run(
+            [
+                python_path,
+                "-c",
+                "from word_docx_tools.com_backend.com_dispatch import ensure_word_typelib; "
+                "raise SystemExit(0 if ensure_word_typelib() else 1)",
+            ],
+            cwd=base_path,
+        )
+        if result.returncode == 0:
+            print("Word type library cache built successfully!")
+        else:
+            print("Warning: Could not build the Word type library cache; "
+                  "the server will fall back to late binding.")
+
     return python_path
 
 
@@ -40,4 +40,238 @@ def mock_app_context():
         instance.get_active_document.return_value = MagicMock()
         instance.set_active_document.return_value = None
         instance.set_word_app.return_value = None
-        yield instance
\ No newline at end of file
+        yield instance
+
+class FakeComDocument:
+    """
+    In-memory stand-in for a Word document COM object.
+
+    Positions map one-to-one onto characters of the document text. Every
+    property read or method call made on the document or on objects it hands
+    out increments ``com_calls``, so tests can compare the COM cost of
+    different code paths.
+    """
+
+    def __init__(self, paragraphs):
+        # paragraphs: list of (text_without_mark, style_name)
+        self.com_calls = 0
+        self._paragraphs = [(text + "\r", style) for text, style in paragraphs]
+        self._starts = []
+        position = 0
+        for text, _ in self._paragraphs:
+            self._starts.append(position)
+            position += len(text)
+        self._text = "".join(text for text, _ in self._paragraphs)
+
+    def _tick(self, count=1):
+        self.com_calls += count
+
+    def _paragraph_at(self, position):
+        index = 0
+        for i, start in enumerate(self._starts):
+            if start <= position:
+                index = i
+        return index
+
+    def _paragraph_span(self, index):
+        start = self._starts[index]
+        return start, start + len(self._paragraphs[index][0])
+
+    @property
+    def Content(self):
+        self._tick()
+        return FakeComRange(self, 0, len(self._text))
+
+    @property
+    def Paragraphs(self):
+        self._tick()
+        return FakeComParagraphs(self, 0, len(self._paragraphs))
+
+    def Range(self, start=None, end=None):
+        self._tick()
+        if start is None:
+            return FakeComRange(self, 0, len(self._text))
+        return FakeComRange(self, start, end)
+
+
+class FakeComRange:
+    def __init__(self, document, start, end):
+        self._document = document
+        self._start = start
+        self._end = end
+        self._find = None
+
+    @property
+    def Start(self):
+        self._document._tick()
+        return self._start
+
+    @property
+    def End(self):
+        self._document._tick()
+        return self._end
+
+    @property
+    def Text(self):
+        self._document._tick()
+        return self._document._text[self._start:self._end]
+
+    @property
+    def Document(self):
+        self._document._tick()
+        return self._document
+
+    @property
+    def Paragraphs(self):
+        self._document._tick()
+        first = self._document._paragraph_at(self._start)
+        last = self._document._paragraph_at(max(self._start, self._end - 1))
+        return FakeComParagraphs(self._document, first, last + 1)
+
+    @property
+    def Find(self):
+        self._document._tick()
+        if self._find is None:
+            self._find = FakeComFind(self)
+        return self._find
+
+    def Collapse(self, direction=1):
+        self._document._tick()
+        if direction == 0:
+            self._start = self._end
+        else:
+            self._end = self._start
+
+
+class FakeComParagraphs:
+    def __init__(self, document, first, stop):
+        self._document = document
+        self._first = first
+        self._stop = stop
+
+    @property
+    def Count(self):
+        self._document._tick()
+        return self._stop - self._first
+
+    def __call__(self, index):
+        self._document._tick()
+        return FakeComParagraph(self._document, self._first + index - 1)
+
+
+class FakeComParagraph:
+    def __init__(self, document, index):
+        self._document = document
+        self._index = index
+
+    @property
+    def Range(self):
+        self._document._tick()
+        start, end = self._document._paragraph_span(self._index)
+        return FakeComRange(self._document, start, end)
+
+    @property
+    def Style(self):
+        self._document._tick()
+        return FakeComStyle(self._document, self._document._paragraphs[self._index][1])
+
+    @Style.setter
+    def Style(self, style):
+        self._document._tick()
+        name = style if isinstance(style, str) else style.NameLocal
+        text, _ = self._document._paragraphs[self._index]
+        self._document._paragraphs[self._index] = (text, name)
+
+    @property
+    def OutlineLevel(self):
+        self._document._tick()
+        return _outline_level(self._document._paragraphs[self._index][1])
+
+
+def _outline_level(style_name):
+    """Outline level of a built-in heading style, 10 (body text) otherwise."""
+    if style_name.startswith("Heading "):
+        return int(style_name.split()[1])
+    return 10
+
+
+class FakeComStyle:
+    def __init__(self, document, name):
+        self._document = document
+        self._name = name
+
+    @property
+    def NameLocal(self):
+        self._document._tick()
+        return self._name
+
+
+class FakeComFind:
+    """
+    Supports paragraph-style and outline-level searches with wdFindStop
+    semantics.
+    """
+
+    def __init__(self, search_range):
+        self._range = search_range
+        self.Text = ""
+        self.Style = None
+        self.Format = False
+        self.Forward = True
+        self.Wrap = 0
+        self._paragraph_format = FakeFindParagraphFormat(search_range._document)
+
+    @property
+    def ParagraphFormat(self):
+        self._range._document._tick()
+        return self._paragraph_format
+
+    def _matches(self, style_name):
+        level = self._paragraph_format.OutlineLevel
+        if level is not None:
+            return _outline_level(style_name) == level
+        return style_name == self.Style
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._range._document._tick()
+        object.__setattr__(self, name, value)
+
+    def ClearFormatting(self):
+        self._range._document._tick()
+
+    def Execute(self):
+        document = self._range._document
+        document._tick()
+        paragraphs = document._paragraphs
+        index = 0
+        while index < len(paragraphs) and document._starts[index] < self._range._start:
+            index += 1
+        while index < len(paragraphs) and not self._matches(paragraphs[index][1]):
+            index += 1
+        if index >= len(paragraphs):
+            return False
+        run_start = document._starts[index]
+        while index < len(paragraphs) and self._matches(paragraphs[index][1]):
+            index += 1
+        run_end = document._paragraph_span(index - 1)[1]
+        self._range._start = run_start
+        self._range._end = run_end
+        return True
+
+
+class FakeFindParagraphFormat:
+    def __init__(self, document):
+        self._document = document
+        self.OutlineLevel = None
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            self._document._tick()
+        object.__setattr__(self, name, value)
+
+
+@pytest.fixture
+def make_fake_document():
+    """Factory for FakeComDocument instances built from (text, style) pairs."""
+    return FakeComDocument
@@ -2,9 +2,12 @@
 Tests for the AppContext class.
 """
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 
+from word_docx_tools.com_backend.word_pool import WordInstancePool
 from word_docx_tools.mcp_service.app_context import AppContext
+from word_docx_tools.mcp_service.errors import WordDocumentError
 
 
 def test_app_context_singleton():
@@ -67,4 +70,325 @@ def test_get_word_app_creates_instance(mock_dispatch):
     
     result = context.get_word_app(create_if_needed=True)
     assert result == mock_word_app
-    mock_dispatch.assert_called_once_with("Word.Application")
\ No newline at end of file
+    mock_dispatch.assert_called_once_with("Word.Application")
+
+class FakeWordApp:
+    """Word application stand-in for the instance pool."""
+
+    def __init__(self, number):
+        self.number = number
+        self.quit_called = False
+
+    def Quit(self):
+        self.quit_called = True
+
+
+def _fake_factory():
+    apps = []
+
+    def factory():
+        apps.append(FakeWordApp(len(apps) + 1))
+        return apps[-1]
+
+    return factory, apps
+
+
+def test_word_pool_routes_new_documents_to_least_loaded_instance():
+    """New documents start instances up to the pool size, then share the least loaded."""
+    factory, apps = _fake_factory()
+    pool = WordInstancePool(2, factory)
+
+    first = pool.acquire_for_new_document()
+    pool.pin("a.docx", first)
+    second = pool.acquire_for_new_document()
+    pool.pin("b.docx", second)
+    pool.pin("c.docx", second)
+
+    assert first is not second
+    assert pool.acquire_for_new_document() is first
+    assert len(apps) == 2
+    assert pool.instance_for("c.docx") is second
+
+    pool.unpin("a.docx")
+    pool.record_operation(second, 5)
+    assert pool.acquire_for_new_document() is first
+    assert pool.get_stats()["pinned_documents"] == 2
+
+
+def test_word_pool_recycles_idle_instances_over_threshold():
+    """Only instances without documents are recycled once they pass a threshold."""
+    factory, apps = _fake_factory()
+    pool = WordInstancePool(
+        2, factory, max_operations=3, max_memory_bytes=1000,
+        memory_probe=lambda app: 2000 if app.number == 2 else 10,
+    )
+    busy = pool.acquire_for_new_document()
+    pool.pin("a.docx", busy)
+    pool.record_operation(busy, 10)
+    heavy = pool.acquire_for_new_document()
+    pool.pin("b.docx", heavy)
+
+    assert pool.recycle_idle() == 0
+
+    pool.unpin("b.docx")
+    assert heavy.memory_bytes == 2000
+    assert pool.recycle_idle() == 1
+    assert apps[1].quit_called and not apps[0].quit_called
+
+    pool.unpin("a.docx")
+    assert pool.recycle_idle() == 1
+    assert len(pool) == 0
+    assert pool.acquire_for_new_document().app is not apps[0]
+
+
+def test_app_context_pins_documents_to_pool_instances():
+    """AppContext routes opened documents through the pool and unpins them on close."""
+    context = AppContext()
+    factory, apps = _fake_factory()
+    pool = context.configure_word_pool(size=2, max_operations=1, app_factory=factory)
+    try:
+        app = context.get_word_app_for_new_document()
+        doc = MagicMock()
+        doc.FullName = "C:\\temp\\pooled.docx"
+        context.set_active_document(doc)
+
+        assert app is apps[0]
+        assert pool.instance_for("C:\\temp\\pooled.docx").app is app
+        assert context.get_word_app() is app
+
+        context.get_active_document()
+        context.close_document()
+
+        assert pool.instance_for("C:\\temp\\pooled.docx") is None
+        assert apps[0].quit_called
+    finally:
+        context.configure_word_pool(size=1)
+
+
+def _build_fake_tree(self):
+    self._document_context_tree = MagicMock()
+    return self._document_context_tree
+
+
+def _workspace_document(full_name):
+    doc = MagicMock()
+    doc.FullName = full_name
+    doc.Name = full_name.rsplit("\\", 1)[-1]
+    doc.Path = full_name.rsplit("\\", 1)[0]
+    return doc
+
+
+def test_workspace_switches_documents_without_rebuilding_context_tree():
+    """Documents keep their handle and context tree while other documents are active."""
+    context = AppContext()
+    context.close_all_documents()
+    first = _workspace_document("C:\\temp\\first.docx")
+    second = _workspace_document("C:\\temp\\second.docx")
+
+    with patch.object(AppContext, "create_document_context_tree",
+                      autospec=True, side_effect=_build_fake_tree) as build:
+        context.set_active_document(first)
+        first_handle = context.get_active_document_handle()
+        first_tree = context._document_context_tree
+        context.set_active_document(second)
+        assert build.call_count == 2
+
+        assert context.activate_document(first_handle) is first
+        assert build.call_count == 2
+        assert context._document_context_tree is first_tree
+        assert context.find_open_document("C:\\temp\\second.docx") is not None
+        assert [d["active"] for d in context.list_documents()] == [True, False]
+
+    with pytest.raises(WordDocumentError):
+        context.activate_document("missing")
+    context.close_all_documents()
+
+
+def test_workspace_evicts_least_recently_used_documents():
+    """Documents above the limit are saved and closed, least recently used first."""
+    context = AppContext()
+    context.close_all_documents()
+    context._workspace.max_documents = 2
+    docs = [_workspace_document(f"C:\\temp\\doc{i}.docx") for i in range(3)]
+    try:
+        with patch.object(AppContext, "create_document_context_tree",
+                          autospec=True, side_effect=_build_fake_tree):
+            context.set_active_document(docs[0])
+            context.set_active_document(docs[1])
+            context.set_active_document(docs[0])
+            context.set_active_document(docs[2])
+
+        docs[1].Save.assert_called_once()
+        docs[1].Close.assert_called_once_with(SaveChanges=0)
+        docs[0].Close.assert_not_called()
+        assert context.find_open_document("C:\\temp\\doc1.docx") is None
+        assert len(context.list_documents()) == 2
+    finally:
+        context._workspace.max_documents = 10
+        context.close_all_documents()
+
+
+def test_workspace_keeps_documents_that_cannot_be_saved():
+    """A document whose save fails stays open and in the workspace."""
+    context = AppContext()
+    context.close_all_documents()
+    context._workspace.max_documents = 1
+    locked = _workspace_document("C:\\temp\\locked.docx")
+    locked.Save.side_effect = Exception("The file is locked for editing")
+    other = _workspace_document("C:\\temp\\other.docx")
+    try:
+        with patch.object(AppContext, "create_document_context_tree",
+                          autospec=True, side_effect=_build_fake_tree):
+            context.set_active_document(locked)
+            context.set_active_document(other)
+
+        locked.Close.assert_not_called()
+        assert context.find_open_document("C:\\temp\\locked.docx") is not None
+        assert len(context.list_documents()) == 2
+    finally:
+        context._workspace.max_documents = 10
+        context.close_all_documents()
+
+
+def _lazy_document(full_name, sections):
+    """Document whose sections hold the given paragraph texts."""
+    doc = _workspace_document(full_name)
+    doc.Sections, doc.Paragraphs = [], []
+    offset = 0
+    for texts in sections:
+        section_start = offset
+        paragraphs = []
+        for text in texts:
+            paragraphs.append(SimpleNamespace(
+                Range=SimpleNamespace(Start=offset, End=offset + len(text), Text=text),
+                Style=SimpleNamespace(NameLocal="Normal"),
+            ))
+            offset += len(text)
+        doc.Paragraphs.extend(paragraphs)
+        doc.Sections.append(SimpleNamespace(
+            Range=SimpleNamespace(Start=section_start, End=offset, Tables=[],
+                                  InlineShapes=[], Paragraphs=paragraphs),
+            PageSetup=MagicMock(),
+        ))
+    doc.Tables, doc.InlineShapes = [], []
+    doc.Content.End = offset
+    return doc
+
+
+def _shift_ranges(doc, position, delta):
+    """Move the fake document's ranges after position, as Word does on an edit."""
+    ranges = [p.Range for p in doc.Paragraphs] + [s.Range for s in doc.Sections]
+    for range_obj in ranges:
+        if range_obj.Start > position:
+            range_obj.Start += delta
+        if range_obj.End > position:
+            range_obj.End += delta
+    doc.Content.End += delta
+
+
+def test_context_tree_builds_sections_lazily():
+    """Only sections are built on open; a section's content is built when first touched."""
+    context = AppContext()
+    context.close_all_documents()
+    doc = _lazy_document("C:\\temp\\lazy.docx", [["Intro\r", "Body\r"], ["Appendix\r"]])
+    try:
+        context.set_active_document(doc)
+        root = context.get_document_context_tree()
+        sections = root.loaded_child_contexts
+
+        assert len(sections) == 2
+        assert not any(section.is_expanded for section in sections)
+        assert context.get_context_build_stats()["expanded_subtrees"] == 0
+
+        first = sections[0].child_contexts
+        assert [c.metadata["text_preview"] for c in first] == ["Intro\r", "Body\r"]
+        stats = context.get_context_build_stats()
+        assert stats["expanded_subtrees"] == 1
+        assert stats["subtrees"][0]["built_child_count"] == 2
+        assert stats["subtrees"][0]["build_time"] >= 0
+        assert not sections[1].is_expanded
+
+        found = context.search_contexts_by_type("paragraph")
+        assert len(found) == 3
+        assert sections[1].is_expanded
+    finally:
+        context.close_all_documents()
+
+
+def test_context_offsets_follow_edits_without_rebuilding():
+    """Edits recorded by the operations layer shift later contexts lazily."""
+    from word_docx_tools.com_backend.paragraph_index import record_range_replaced
+
+    context = AppContext()
+    context.close_all_documents()
+    doc = _lazy_document("C:\\temp\\journal.docx", [["Intro\r", "Body\r"], ["Appendix\r"]])
+    try:
+        context.set_active_document(doc)
+        root = context.get_document_context_tree()
+        first, second = root.loaded_child_contexts
+        intro, body = first.child_contexts
+
+        # "Intro\r" becomes "Introduction\r"; the second section is not built yet
+        record_range_replaced(doc, 0, 5, "Introduction")
+        _shift_ranges(doc, 5, 7)
+
+        assert root is context.get_document_context_tree()
+        assert intro.get_offsets() == (0, 13)
+        assert body.get_offsets() == (13, 18)
+        assert second.get_offsets() == (18, 27)
+        # The second section is read after the edit, at its new offsets
+        appendix, = second.child_contexts
+        assert appendix.get_offsets() == (18, 27)
+        assert appendix.metadata["range_start"] == 18
+        assert context.get_context_build_stats()["edit_journal"]["version"] == 1
+    finally:
+        context.close_all_documents()
+
+
+def test_range_queries_use_the_interval_index():
+    """Range lookups find contexts from their offsets and expand only the sections they touch."""
+    context = AppContext()
+    context.close_all_documents()
+    doc = _lazy_document("C:\\temp\\ranges.docx", [["Intro\r", "Body\r"], ["Appendix\r"]])
+    try:
+        context.set_active_document(doc)
+        first, second = context.get_document_context_tree().loaded_child_contexts
+
+        found = context.find_contexts_by_range(6, 8, "paragraph")
+        assert [c.metadata["text_preview"] for c in found] == ["Body\r"]
+        assert first.is_expanded and not second.is_expanded
+
+        assert context._find_section_context(SimpleNamespace(Start=12, End=14)) is second
+        assert context.find_context_by_range(doc, 11, 20, "paragraph").metadata["text_preview"] == "Appendix\r"
+        assert context.find_nearest_context(100, "paragraph").metadata["text_preview"] == "Appendix\r"
+    finally:
+        context.close_all_documents()
+
+
+def test_context_locator_after_replace_all_does_not_use_stale_offsets():
+    """A replace-all is not journaled, so context locators fall back to Word's Range."""
+    from word_docx_tools.com_backend.selector_utils import get_selection_range
+    from word_docx_tools.operations.document_ops import find_and_replace_text
+
+    context = AppContext()
+    context.close_all_documents()
+    doc = _lazy_document("C:\\temp\\replace.docx", [["Intro\r", "Body\r"], ["Appendix\r"]])
+    doc.Content.Text = "Intro\rBody\rAppendix\r"
+
+    def replace_all(**kwargs):
+        # Word grows "Intro" to "Introduction" and moves every later object
+        doc.Content.Text = "Introduction\rBody\rAppendix\r"
+        doc.Content.End += 7
+        return True
+
+    doc.Content.Find.Execute.side_effect = replace_all
+    try:
+        context.set_active_document(doc)
+        body = context.get_document_context_tree().loaded_child_contexts[0].child_contexts[1]
+
+        assert find_and_replace_text(doc, "Intro", "Introduction") == 1
+        locator = {"type": "context", "id": body.context_id}
+        assert get_selection_range(doc, locator) is body.range
+        doc.Range.assert_not_called()
+    finally:
+        context.close_all_documents()
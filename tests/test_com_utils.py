@@ -0,0 +1,373 @@
+"""
+Tests for COM utility functions.
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from word_docx_tools.com_backend.com_dispatch import (binding_mode,
+                                                      get_com_property,
+                                                      get_dispatch_stats,
+                                                      reset_dispatch_stats,
+                                                      set_com_property)
+from word_docx_tools.com_backend.com_executor import ComExecutor
+from word_docx_tools.com_backend.com_utils import (count_com_calls,
+                                                   get_com_call_stats,
+                                                   iter_com_collection,
+                                                   record_com_call,
+                                                   reset_com_call_stats)
+from word_docx_tools.com_backend.render_suspension import (
+    get_render_suspension_stats, reset_render_suspension_stats,
+    suspend_rendering)
+from word_docx_tools.com_backend.style_catalog import (
+    get_font_catalog, get_style_catalog, invalidate_font_catalog,
+    invalidate_style_catalog)
+from word_docx_tools.models.range_snapshot import RangeSnapshot
+
+
+class EnumerableCollection:
+    """Collection exposing a native enumerator, counting items handed out."""
+
+    def __init__(self, items):
+        self._items = items
+        self.pulled = 0
+
+    def __iter__(self):
+        for item in self._items:
+            self.pulled += 1
+            yield item
+
+
+class IndexedCollection:
+    """Collection without an enumerator, only Count and 1-based Item()."""
+
+    def __init__(self, items):
+        self._items = items
+
+    @property
+    def Count(self):
+        return len(self._items)
+
+    def __call__(self, index):
+        return self._items[index - 1]
+
+
+def _cells(count):
+    return [
+        SimpleNamespace(Range=SimpleNamespace(Start=i * 10, End=i * 10 + 5, Text=f"cell {i}"))
+        for i in range(count)
+    ]
+
+
+def test_iteration_is_lazy():
+    """Breaking out of the loop stops pulling elements."""
+    collection = EnumerableCollection(_cells(1000))
+
+    for i, _ in enumerate(iter_com_collection(collection)):
+        if i == 4:
+            break
+
+    assert collection.pulled == 5
+
+
+@pytest.mark.parametrize("factory", [EnumerableCollection, IndexedCollection])
+def test_slicing(factory):
+    """start/stop/step behave like Python slicing on both access paths."""
+    items = _cells(20)
+
+    result = list(iter_com_collection(factory(items), start=3, stop=15, step=4))
+
+    assert result == items[3:15:4]
+
+
+def test_fields_projection_reads_shared_prefix_once():
+    """Projected fields share intermediate objects and skip other properties."""
+    with count_com_calls() as counter:
+        rows = list(iter_com_collection(
+            EnumerableCollection(_cells(3)), fields=("Range.Start", "Range.End")
+        ))
+
+    assert rows == [
+        {"Range.Start": 0, "Range.End": 5},
+        {"Range.Start": 10, "Range.End": 15},
+        {"Range.Start": 20, "Range.End": 25},
+    ]
+    assert counter.calls["Range"] == 3
+    assert "Text" not in counter.calls
+
+
+def test_missing_field_yields_none():
+    """A property that cannot be read is reported as None."""
+    rows = list(iter_com_collection(IndexedCollection(_cells(1)), fields=("Range.Missing",)))
+
+    assert rows == [{"Range.Missing": None}]
+
+
+def _word_application():
+    options = SimpleNamespace(
+        Pagination=True, CheckSpellingAsYouType=True, CheckGrammarAsYouType=False
+    )
+    application = SimpleNamespace(ScreenUpdating=True, Options=options)
+    application.Application = application
+    return application
+
+
+def test_render_suspension_is_reentrant_and_restores_on_error():
+    application = _word_application()
+    document = SimpleNamespace(Application=application)
+    reset_render_suspension_stats()
+
+    with pytest.raises(RuntimeError):
+        with suspend_rendering(document, "outer") as outer:
+            with suspend_rendering(application, "inner") as inner:
+                assert inner.nested is True
+            # The inner scope must not restore anything
+            assert application.ScreenUpdating is False
+            assert application.Options.Pagination is False
+            raise RuntimeError("edit failed")
+
+    assert outer.nested is False
+    assert application.ScreenUpdating is True
+    assert application.Options.Pagination is True
+    assert application.Options.CheckSpellingAsYouType is True
+    assert application.Options.CheckGrammarAsYouType is False
+
+    stats = get_render_suspension_stats()
+    assert stats["outer"]["count"] == 1
+    assert stats["outer"]["total_time"] == outer.elapsed
+    assert "inner" not in stats
+
+
+class _ApplicationWrapper:
+    """A fresh pywin32-style wrapper, equal to others around the same object."""
+
+    def __init__(self, oleobj):
+        self.__dict__["_oleobj_"] = oleobj
+
+    def __getattr__(self, name):
+        return getattr(self._oleobj_, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._oleobj_, name, value)
+
+    def __eq__(self, other):
+        return self._oleobj_ is getattr(other, "_oleobj_", None)
+
+    __hash__ = None
+
+
+def test_render_suspension_matches_fresh_application_wrappers():
+    oleobj = _word_application()
+
+    class Document:
+        @property
+        def Application(self):
+            return _ApplicationWrapper(oleobj)
+
+    document = Document()
+    reset_render_suspension_stats()
+
+    with suspend_rendering(document, "outer") as outer:
+        with suspend_rendering(document, "inner") as inner:
+            assert inner.nested is True
+            assert inner.restored == []
+        assert oleobj.ScreenUpdating is False
+
+    assert outer.nested is False
+    assert oleobj.ScreenUpdating is True
+    assert oleobj.Options.Pagination is True
+    assert get_render_suspension_stats() == {
+        "outer": {"count": 1, "total_time": outer.elapsed, "max_time": outer.elapsed}
+    }
+
+
+def test_render_suspension_without_application_is_a_no_op():
+    with suspend_rendering(None) as scope:
+        assert scope.nested is True
+    assert scope.restored == []
+
+
+class CountingRange:
+    """Range stand-in counting how often each property is read."""
+
+    def __init__(self, text, style="Normal"):
+        self._text = text
+        self._style = style
+        self.reads = {}
+
+    def _read(self, name, value):
+        self.reads[name] = self.reads.get(name, 0) + 1
+        return value
+
+    Start = property(lambda self: self._read("Start", 10))
+    End = property(lambda self: self._read("End", 10 + len(self._text)))
+    Text = property(lambda self: self._read("Text", self._text))
+    Style = property(lambda self: self._read("Style", SimpleNamespace(NameLocal=self._style)))
+
+
+def test_range_snapshot_reads_each_property_once():
+    range_obj = CountingRange("x" * 300)
+
+    snapshot = RangeSnapshot.capture(range_obj)
+
+    assert range_obj.reads == {"Start": 1, "End": 1, "Text": 1, "Style": 1}
+    assert snapshot.text_length == 300
+    assert snapshot.text_preview(50) == "x" * 50 + "..."
+    assert snapshot.to_dict()["style"] == "Normal"
+    assert not hasattr(snapshot, "__dict__")
+
+
+def test_com_call_stats_are_accumulated_per_label():
+    reset_com_call_stats()
+
+    for calls in (3, 5):
+        with count_com_calls("tool"):
+            record_com_call("Range.Text", calls)
+
+    stats = get_com_call_stats()["tool"]
+    assert stats["invocations"] == 2
+    assert stats["total_calls"] == 8
+    assert stats["max_calls"] == 5
+    assert stats["avg_calls"] == 4
+
+
+def test_font_catalog_is_read_once_and_searched_locally():
+    invalidate_font_catalog()
+    fonts = EnumerableCollection(["Arial", "Calibri", "Cambria", "Consolas", "Times New Roman"])
+    application = SimpleNamespace(FontNames=fonts)
+
+    page, total = get_font_catalog(application).query(prefix="c", offset=1, limit=1)
+    get_font_catalog(application).query()
+
+    assert page == [{"font_name": "Cambria"}]
+    assert total == 3
+    assert fonts.pulled == 5
+
+
+def test_style_catalog_follows_styles_count():
+    styles = [
+        SimpleNamespace(NameLocal="Normal", Type=1, BuiltIn=True),
+        SimpleNamespace(NameLocal="Heading 1", Type=1, BuiltIn=True),
+        SimpleNamespace(NameLocal="Heading Char", Type=2, BuiltIn=False),
+        SimpleNamespace(NameLocal="List Bullet", Type=4, BuiltIn=True),
+    ]
+    collection = EnumerableCollection(styles)
+    collection.Count = len(styles)
+    document = SimpleNamespace(FullName="C:\\temp\\styles.docx", Styles=collection)
+    invalidate_style_catalog(document)
+
+    catalog = get_style_catalog(document)
+    headings, total = catalog.query(style_type="paragraph", prefix="head")
+    assert [style["name"] for style in headings] == ["Heading 1"]
+    assert total == 1
+    assert catalog.find("heading 1", ignore_case=True)["type_name"] == "paragraph"
+    assert catalog.find("Heading Char", style_type=1) is None
+    assert get_style_catalog(document) is catalog
+
+    styles.append(SimpleNamespace(NameLocal="Quote", Type=1, BuiltIn=True))
+    collection.Count = len(styles)
+    assert get_style_catalog(document).find("Quote") is not None
+
+
+class FakeOleObject:
+    """IDispatch stand-in counting name lookups and invocations."""
+
+    DISPIDS = {"Start": 3, "End": 4, "Text": 0, "Bold": 130}
+
+    def __init__(self, values):
+        self.values = values
+        self.name_lookups = 0
+
+    def GetIDsOfNames(self, name):
+        self.name_lookups += 1
+        return self.DISPIDS[name]
+
+    def Invoke(self, dispid, lcid, flags, result_wanted, *args):
+        name = next(key for key, value in self.DISPIDS.items() if value == dispid)
+        if args:
+            self.values[name] = args[0]
+            return None
+        return self.values[name]
+
+
+class CDispatch:
+    """Late-bound wrapper stand-in, named like win32com's dynamic CDispatch."""
+
+    def __init__(self, values, clsid="{IID-Range}"):
+        self._oleobj_ = FakeOleObject(values)
+        self._olerepr_ = SimpleNamespace(clsid=clsid)
+
+
+def test_dispids_are_memoized_per_interface():
+    reset_dispatch_stats(clear_dispids=True)
+    ranges = [CDispatch({"Start": i, "End": i + 5, "Text": "x"}) for i in range(50)]
+
+    starts = [get_com_property(range_obj, "Start") for range_obj in ranges]
+    set_com_property(ranges[0], "Text", "changed")
+    # Not a hot member: plain attribute access
+    assert get_com_property(SimpleNamespace(Bold=True), "Bold") is True
+
+    assert starts == list(range(50))
+    assert ranges[0]._oleobj_.values["Text"] == "changed"
+    assert sum(range_obj._oleobj_.name_lookups for range_obj in ranges) == 2
+    stats = get_dispatch_stats()
+    assert stats["dispid_lookups"] == 2
+    assert stats["dispid_hits"] == 49
+    assert stats["fallback_accesses"] == 1
+    assert binding_mode(ranges[0]) == "late"
+
+
+def test_early_bound_objects_use_generated_wrappers():
+    class EarlyBoundRange:
+        """gen_py wrappers carry their property maps as class attributes."""
+
+        _prop_map_get_ = {"Start": (3, 2, (3, 0), (), "Start", None)}
+        Start = 7
+
+    reset_dispatch_stats()
+
+    assert get_com_property(EarlyBoundRange(), "Start") == 7
+    assert binding_mode(EarlyBoundRange()) == "early"
+    assert get_dispatch_stats()["early_bound_accesses"] == 1
+    assert get_dispatch_stats()["dispid_lookups"] == 0
+
+
+def test_com_executor_keeps_event_loop_responsive():
+    executor = ComExecutor(name="test-com-worker")
+    threads = []
+
+    def slow_job(delay):
+        threads.append(threading.current_thread())
+        # Nested calls from the worker run inline instead of deadlocking
+        executor.run(threads.append, threading.current_thread())
+        time.sleep(delay)
+        return delay
+
+    async def scenario():
+        job = asyncio.ensure_future(executor.run_async(slow_job, 0.2, label="get_table_info"))
+        queued = asyncio.ensure_future(executor.run_async(slow_job, 0, label="ping"))
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        loop_latency = time.perf_counter() - started
+        return await job, await queued, loop_latency
+
+    try:
+        slow, fast, loop_latency = asyncio.run(scenario())
+        with pytest.raises(ZeroDivisionError):
+            executor.run(lambda: 1 / 0, label="failing")
+    finally:
+        executor.shutdown()
+
+    assert (slow, fast) == (0.2, 0)
+    assert loop_latency < 0.15
+    assert len(set(threads)) == 1 and threads[0] is executor.worker_thread
+
+    stats = executor.get_stats()
+    assert stats["labels"]["get_table_info"]["max_exec_time"] >= 0.2
+    # The ping waited behind the slow job
+    assert stats["labels"]["ping"]["max_wait_time"] >= 0.15
+    assert stats["labels"]["failing"]["errors"] == 1
+    assert stats["max_queue_depth"] >= 1
@@ -0,0 +1,104 @@
+"""
+Tests for comment operations.
+"""
+from datetime import datetime
+from types import SimpleNamespace
+
+from word_docx_tools.com_backend.comment_inventory import \
+    invalidate_comment_inventory
+from word_docx_tools.operations import comment_ops
+
+
+class FakeComments:
+    """Comments collection with an enumerator, counting enumeration passes."""
+
+    def __init__(self, comments):
+        self._comments = comments
+        self.passes = 0
+
+    @property
+    def Count(self):
+        return len(self._comments)
+
+    def __iter__(self):
+        self.passes += 1
+        return iter(self._comments)
+
+    def __call__(self, index):
+        return self._comments[index - 1]
+
+
+def _comment(position, author, day, scope_start, ancestor=None):
+    comment = SimpleNamespace(
+        Index=position,
+        Range=SimpleNamespace(Text=f"Comment {position}"),
+        Author=author,
+        Initial=author[:2].upper(),
+        Date=datetime(2024, 5, day, 9, 30),
+        Scope=SimpleNamespace(Start=scope_start, End=scope_start + 10, Text=f" clause {position} "),
+        Replies=SimpleNamespace(Count=0),
+        Ancestor=ancestor,
+    )
+    comment.Delete = lambda: None
+    return comment
+
+
+def _document():
+    comments = [
+        _comment(1, "Alice", 1, 0),
+        _comment(2, "Bob", 2, 100),
+        _comment(3, "alice", 3, 200),
+        _comment(4, "Carol", 4, 300),
+    ]
+    # Word 2013+ lists replies in Document.Comments and links them via Ancestor
+    comments[0].Replies.Count = 1
+    comments.append(_comment(5, "Bob", 5, 0, ancestor=comments[0]))
+    document = SimpleNamespace(
+        FullName="C:\\temp\\review.docx",
+        Comments=FakeComments(comments),
+        Content=SimpleNamespace(End=1000),
+    )
+    # Every test starts from a fresh document with the same name
+    invalidate_comment_inventory(document)
+    return document
+
+
+def test_get_comments_filters_and_pages_from_one_pass():
+    document = _document()
+
+    page = comment_ops.get_comments_page(document, author="ALICE")
+    assert [c["index"] for c in page["comments"]] == [0, 2]
+    assert page["total"] == 2
+
+    in_may = comment_ops.get_comments(document, date_from="2024-05-02", date_to="2024-05-04")
+    assert [c["index"] for c in in_may] == [1, 2]
+
+    in_scope = comment_ops.get_comments(document, scope_start=150, scope_end=305)
+    assert [c["index"] for c in in_scope] == [2, 3]
+
+    page = comment_ops.get_comments_page(document, offset=1, limit=2)
+    assert [c["index"] for c in page["comments"]] == [1, 2]
+    assert page["has_more"] is True
+    assert page["comments"][0]["scope"] == {"start": 100, "end": 110, "text": "clause 2"}
+
+    assert document.Comments.passes == 1
+
+
+def test_get_comment_thread_uses_ancestor_index():
+    document = _document()
+
+    thread = comment_ops.get_comment_thread(document, 0)
+
+    assert [entry["index"] for entry in thread] == [0, "0-reply-0"]
+    assert thread[1]["author"] == "Bob"
+    assert thread[0]["scope_text"] == "clause 1"
+
+
+def test_comment_edits_invalidate_inventory():
+    document = _document()
+    comment_ops.get_comments(document)
+
+    comment_ops.delete_comment(document, 3)
+    comment_ops.get_comments(document)
+
+    assert document.Comments.passes == 2
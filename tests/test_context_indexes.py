@@ -0,0 +1,301 @@
+"""
+Tests for the context tree's offset and lookup indexes.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from word_docx_tools.com_backend.context_intervals import ContextIntervalIndex
+from word_docx_tools.com_backend.edit_journal import (EditJournal, OffsetTree, get_edit_journal,
+                                                      invalidate_edit_journal)
+from word_docx_tools.com_backend.metadata_index import IndexedContextMap
+from word_docx_tools.com_backend.section_sweep import locate, read_section_content
+from word_docx_tools.com_backend.text_index import ContextTextIndex
+
+
+class _SweepRange:
+    """Range stand-in that records which paragraph texts were read."""
+
+    def __init__(self, start, end, text, text_reads):
+        self.Start = start
+        self.End = end
+        self._text = text
+        self._text_reads = text_reads
+
+    @property
+    def Text(self):
+        self._text_reads.append(self.Start)
+        return self._text
+
+
+def _sweep_objects(text_reads, *spans, text="text\r"):
+    return [
+        SimpleNamespace(
+            Range=_SweepRange(start, end, text, text_reads),
+            Style=SimpleNamespace(NameLocal="Normal"),
+            Rows=SimpleNamespace(Count=2), Columns=SimpleNamespace(Count=3),
+            Width=10, Height=20, Type=3,
+        )
+        for start, end in spans
+    ]
+
+
+def test_section_sweep_reads_text_only_outside_tables():
+    text_reads = []
+    document = MagicMock()
+    document.FullName = "C:\\temp\\sweep.docx"
+    document.Content.End = 300
+    paragraphs = _sweep_objects(text_reads, (90, 110), (110, 120), (120, 130), (130, 140),
+                                (140, 150), (150, 165), (190, 205))
+    paragraphs += _sweep_objects(text_reads, (180, 190), text="\r")
+    section_range = SimpleNamespace(
+        Start=100, End=200,
+        Tables=_sweep_objects(text_reads, (150, 180), (120, 140)),
+        InlineShapes=_sweep_objects(text_reads, (125, 126), (145, 146), (160, 161)),
+        Paragraphs=paragraphs,
+    )
+    try:
+        content = read_section_content(document, 1, section_range)
+
+        assert [t["Range.Start"] for t in content.tables] == [120, 150]
+        assert content.tables[0]["Columns.Count"] == 3
+        # Images and paragraphs inside tables belong to the table
+        assert [i["Range.Start"] for i in content.images] == [145]
+        # Paragraphs crossing the section bounds and blank paragraphs are dropped
+        assert [p["Range.Start"] for p in content.paragraphs] == [110, 140]
+        # Text is read only for paragraphs outside tables
+        assert sorted(text_reads) == [110, 140, 180]
+        assert content.offsets.current(140) == 140
+
+        # With the section's anchored offsets, its bounds are not read again
+        del section_range.Start, section_range.End
+        again = read_section_content(document, 1, section_range, content.offsets, (100, 200))
+        assert [p["Range.Start"] for p in again.paragraphs] == [110, 140]
+        assert get_edit_journal(document).is_current(again.offsets, 300)
+    finally:
+        invalidate_edit_journal(document)
+
+
+def test_locate_matches_binary_search():
+    from bisect import bisect_right
+
+    starts = [0, 5, 5, 9, 30]
+    positions = [0, 4, 5, 6, 29, 30, 31]
+    assert locate(starts, positions) == [bisect_right(starts, p) - 1 for p in positions]
+    assert locate([3], [1, 3]) == [-1, 0]
+
+
+def _shift(offset, start, removed, inserted):
+    """Reference position of an offset after one replacement."""
+    if offset <= start:
+        return offset
+    if offset < start + removed:
+        return start
+    return offset + inserted - removed
+
+
+def test_offset_tree_matches_replaying_every_edit():
+    import random
+
+    rng = random.Random(19)
+    offsets = sorted(rng.sample(range(0, 5000), 300))
+    tree = OffsetTree(offsets)
+    expected = {offset: offset for offset in offsets}
+    length = 5000
+    for _ in range(500):
+        start = rng.randrange(0, length + 1)
+        removed = rng.choice([0, 0, rng.randrange(0, 40), rng.randrange(0, 400)])
+        removed = min(removed, length - start)
+        inserted = rng.choice([0, rng.randrange(1, 60)])
+        tree.apply(start, removed, inserted)
+        for offset, position in expected.items():
+            expected[offset] = _shift(position, start, removed, inserted)
+        length += inserted - removed
+
+    assert {offset: tree.current(offset) for offset in offsets} == expected
+    assert tree.current(offsets[0] + 0.5) is None
+
+
+def test_edit_journal_shifts_trees_anchored_before_an_edit():
+    journal = EditJournal("doc")
+    early = journal.anchor([0, 10, 20])
+    journal.record(5, 5, "abc")
+    late = journal.anchor([0, 13, 23])
+    # Replacing "ab" at 13 with one character
+    journal.record(13, 15, "x")
+
+    assert [early.current(o) for o in (0, 10, 20)] == [0, 13, 22]
+    assert [late.current(o) for o in (0, 13, 23)] == [0, 13, 22]
+    stats = journal.get_stats()
+    assert stats["version"] == 2
+    assert stats["net_delta"] == 2
+
+
+def test_edit_journal_detects_edits_it_did_not_record():
+    journal = EditJournal("doc")
+    tree = journal.anchor([0, 10], content_end=100)
+    journal.record(5, 5, "abc")
+    assert journal.is_current(tree, 103)
+    # A length change the journal never saw, e.g. a replace-all
+    assert not journal.is_current(tree, 110)
+
+    journal.detach()
+    assert tree.stale and not journal.is_current(tree, 103)
+
+
+def test_insertion_without_text_is_journaled_by_content_end():
+    """Pictures, tables and fields are recorded with the length Content.End grew by."""
+    from word_docx_tools.com_backend.paragraph_index import record_range_insertion
+
+    document = MagicMock()
+    document.FullName = "C:\\temp\\insertion.docx"
+    com_range = MagicMock(StoryType=1, Document=document)
+    journal = get_edit_journal(document)
+    tree = journal.anchor([10, 50], content_end=100)
+    try:
+        # A 2x2 table (6 characters) replacing [20, 22)
+        document.Content.End = 104
+        record_range_insertion(com_range, 20, 22, 100)
+        assert [tree.current(offset) for offset in (10, 50)] == [10, 54]
+        assert journal.is_current(tree, 104)
+
+        # More was removed than the span held: not a replacement of it
+        document.Content.End = 90
+        record_range_insertion(com_range, 20, 20, 104)
+        assert tree.stale
+    finally:
+        invalidate_edit_journal(document)
+
+
+class _SpanContext:
+    """Context stand-in whose offsets come from an OffsetTree, like anchored contexts."""
+
+    def __init__(self, tree, start, end, context_type):
+        self._offsets = (tree, start, end)
+        self.metadata = {"type": context_type}
+
+    def get_offsets(self):
+        tree, start, end = self._offsets
+        return tree.current(start), tree.current(end)
+
+
+def test_context_interval_index_matches_linear_scan_across_edits():
+    import random
+
+    rng = random.Random(20)
+    spans = []
+    for _ in range(400):
+        start = rng.randrange(0, 10000)
+        spans.append((start, start + rng.randrange(0, 300)))
+    tree = OffsetTree([offset for span in spans for offset in span])
+    contexts = {
+        str(i): _SpanContext(tree, start, end, rng.choice(["paragraph", "table"]))
+        for i, (start, end) in enumerate(spans)
+    }
+    index = ContextIntervalIndex(lambda: contexts)
+
+    def check():
+        current = {c: c.get_offsets() for c in contexts.values()}
+        for _ in range(50):
+            start = rng.randrange(-10, 10500)
+            end = start + rng.randrange(0, 400)
+            expected = {c for c, (s, e) in current.items() if s < max(end, start + 1) and e > start}
+            assert set(index.overlapping(start, end)) == expected
+            expected = {c for c, (s, e) in current.items() if s <= start and e >= end}
+            assert set(index.containing(start, end)) == expected
+            expected = {c for c, (s, e) in current.items() if start <= s and e <= end}
+            assert set(index.contained_in(start, end)) == expected
+            typed = {c for c in expected if c.metadata["type"] == "table"}
+            assert set(index.contained_in(start, end, "table")) == typed
+
+            nearest = index.nearest(start)
+            distance = min(max(s - start, start - e + 1, 0) for s, e in current.values())
+            s, e = current[nearest]
+            assert max(s - start, start - e + 1, 0) == distance
+
+    check()
+    # Edits shift the contexts in place; the index is not rebuilt
+    for _ in range(30):
+        start = rng.randrange(0, 10000)
+        tree.apply(start, rng.choice([0, rng.randrange(0, 200)]), rng.randrange(0, 100))
+    check()
+    assert index.rebuilds == 1
+
+
+def test_indexed_context_map_follows_metadata_changes():
+    from word_docx_tools.models.context import DocumentContext
+
+    section = DocumentContext("Section 1", metadata={"type": "section"})
+    heading = DocumentContext("Heading", metadata={"type": "paragraph", "style_name": "Heading 1"})
+    body = DocumentContext("Body", metadata={"type": "paragraph", "style_name": "Normal", "tags": ["x"]})
+    context_map = IndexedContextMap()
+    for context in (section, heading, body):
+        context_map[context.context_id] = context
+
+    assert context_map.index.lookup("type", "paragraph") == [heading, body]
+    # Metadata changed through the context's own methods is reindexed
+    section.batch_add_child_contexts([heading, body])
+    body._update_metadata("style_name", "Heading 1")
+    assert context_map.index.find({"parent_id": section.context_id, "style_name": "Heading 1"}) == [heading, body]
+    # Keys that are not indexed, or unhashable values, fall back to a scan
+    assert context_map.index.find({"tags": ["x"]}) is None
+    # ...but combined with an indexed key they are compared directly
+    assert context_map.index.find({"type": "paragraph", "tags": ["x"]}) == [body]
+    section._update_metadata("page_setup", {"orientation": "0"})
+    assert context_map.index.find({"type": "section", "page_setup": {"orientation": "0"}}) == [section]
+
+    del context_map[heading.context_id]
+    assert context_map.index.lookup("type", "paragraph") == [body]
+    heading._update_metadata("type", "table")
+    assert context_map.index.lookup("type", "table") == []
+    context_map.clear()
+    assert context_map.index.lookup("type", "section") == []
+    assert not section._index_listeners
+
+
+def test_text_index_matches_substring_scan():
+    from word_docx_tools.models.context import DocumentContext
+
+    contexts = [
+        DocumentContext("Introduction", metadata={"type": "paragraph", "text": "Scope of the report"}),
+        DocumentContext("Results table", metadata={"type": "table", "caption": "Quarterly report"}),
+        DocumentContext("第一章 概述", metadata={"type": "paragraph", "text": "报告范围"}),
+        DocumentContext("Appendix", metadata={"type": "section", "pages": 3}),
+    ]
+    index = ContextTextIndex()
+    for context in contexts:
+        index.add(context)
+
+    def scan(term, fields=("title", "metadata")):
+        term = term.lower()
+        return [
+            c for c in contexts
+            if ("title" in fields and term in c.title.lower())
+            or ("metadata" in fields and any(isinstance(v, str) and term in v.lower()
+                                              for v in c.metadata.values()))
+        ]
+
+    for term in ("report", "REP", "re", "x", "概述", "章", "ort of", "", "missing"):
+        found = [c for c, _ in index.search(term)]
+        assert sorted(found, key=id) == sorted(scan(term), key=id), term
+    assert [c for c, _ in index.search("report", fields=["title"])] == []
+
+    # Title matches rank above metadata matches; AND/OR combine terms
+    assert [c for c, _ in index.search("re")][:2] == [contexts[1], contexts[0]]
+    assert [c for c, _ in index.search("table quarterly", operator="and")] == [contexts[1]]
+    assert index.search("intro appendix", operator="and") == []
+    assert [c for c, _ in index.search("intro appendix", operator="or")] == [contexts[0], contexts[3]]
+
+    # Metadata changes are followed through the context's listeners
+    contexts[3]._update_metadata("text", "Glossary")
+    assert [c for c, _ in index.search("gloss")] == [contexts[3]]
+    index.discard(contexts[3].context_id)
+    assert index.search("gloss") == []
+    assert not contexts[3]._index_listeners
+
+    # Contexts beyond the posting cap are scanned instead of indexed
+    capped = ContextTextIndex(max_postings=10)
+    for context in contexts[:3]:
+        capped.add(context)
+    assert capped.get_stats()["postings"] <= 10
+    assert capped.get_stats()["unindexed_contexts"] > 0
+    assert [c for c, _ in capped.search("report")] == [contexts[0], contexts[1]]
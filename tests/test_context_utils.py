@@ -0,0 +1,101 @@
+"""
+Tests for the context cache and performance utilities.
+"""
+import math
+import random
+
+from word_docx_tools.com_backend.latency_stats import (LatencyHistogram,
+                                                      OperationStats)
+from word_docx_tools.contexts.context_utils import (ContextCache,
+                                                    PerformanceMonitor)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_context_cache_evicts_least_recently_used_and_expired():
+    clock = FakeClock()
+    cache = ContextCache(ttl=10, max_size=3, max_bytes=None, clock=clock)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == "A"
+    cache.set("d", "D")
+    assert cache.get("b") is None
+    assert [cache.get(k) for k in ("a", "c", "d")] == ["A", "C", "D"]
+
+    clock.now = 5
+    cache.set("e", "E", ttl=1)  # evicts "a"
+    clock.now = 6.5
+    assert cache.size() == 2  # "e" expired through the expiry heap
+    clock.now = 11
+    assert cache.size() == 0
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (4, 1, 2, 3)
+
+
+def test_context_cache_byte_budget_and_namespaces():
+    cache = ContextCache(ttl=60, max_size=100, max_bytes=100, sizer=len)
+    cache.configure_namespace("snapshots", max_bytes=1000)
+    for i in range(5):
+        cache.set(f"t{i}", "x" * 30, namespace="trees")
+    trees = cache.get_stats()["namespaces"]["trees"]
+    assert trees["size"] == 3 and trees["bytes"] <= 100 and trees["evictions"] == 2
+
+    # A large snapshot fits its own partition without evicting tree entries
+    cache.set("doc", "y" * 500, namespace="snapshots")
+    assert cache.get("t4", namespace="trees") == "x" * 30
+    assert cache.get("doc", namespace="snapshots") == "y" * 500
+    # Entries larger than the partition budget are not stored
+    cache.set("big", "z" * 200, namespace="trees")
+    assert cache.get("big", namespace="trees") is None
+    assert cache.get_stats()["rejected"] == 1
+
+    cache.clear("trees")
+    assert cache.size("trees") == 0 and cache.size() == 1
+
+
+def test_latency_histogram_percentiles_stay_within_bucket_error():
+    rng = random.Random(7)
+    durations = [rng.lognormvariate(-6, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for duration in durations:
+        histogram.record(duration)
+    ordered = sorted(durations)
+    for percentile in (50, 90, 99, 99.9):
+        exact = ordered[max(0, math.ceil(len(ordered) * percentile / 100) - 1)]
+        # One microsecond resolution plus 1/64 relative bucket width
+        assert abs(histogram.percentile(percentile) - exact) <= exact / 64 + 1e-6
+    assert histogram.min == min(durations) and histogram.max == max(durations)
+    assert len(histogram.counts) < 2000
+
+
+def test_performance_monitor_splits_outcomes_and_exports_prometheus(tmp_path):
+    clock = FakeClock()
+    monitor = PerformanceMonitor()
+    monitor.performance_records["save"] = OperationStats(window_seconds=10, clock=clock)
+    for i in range(100):
+        clock.now = i / 10
+        monitor.end("save", monitor.start("save") - 0.001 * (i + 1), success=i % 10 != 0)
+
+    stats = monitor.get_stats("save")
+    assert (stats["count"], stats["success_count"], stats["failure_count"]) == (100, 90, 10)
+    assert abs(stats["p50_duration"] - 0.050) < 0.002
+    assert stats["p99_duration"] <= stats["max_duration"]
+    assert stats["failure"]["count"] == 10
+    assert stats["rates"]["rate"] == 10.0 and stats["rates"]["error_ratio"] == 0.1
+    assert monitor.get_stats("missing")["count"] == 0
+
+    path = monitor.export_prometheus(str(tmp_path / "metrics" / "word.prom"))
+    text = open(path, encoding="utf-8").read()
+    assert 'word_operation_duration_seconds{operation="save",quantile="0.99"}' in text
+    assert 'word_operation_duration_seconds_count{operation="save"} 100' in text
+    assert 'word_operation_duration_seconds_calls_total{operation="save",outcome="failure"} 10' in text
+    assert [p.name for p in (tmp_path / "metrics").iterdir()] == ["word.prom"]
@@ -0,0 +1,61 @@
+"""
+Tests for the diagnostics tool.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+from word_docx_tools.com_backend.metric_store import MetricBudget, MetricStore
+from word_docx_tools.tools.diagnostics_tools import diagnostics_tools
+
+
+def test_diagnostics_tools_snapshot_and_reset():
+    """Operation metrics are reported by snapshot and cleared by reset."""
+    app_context = MagicMock()
+    store = MetricStore()
+    store.record("batch_add_objects", 0.25, operations_count=40)
+    app_context.get_performance_metrics.side_effect = store.snapshot
+    app_context.reset_performance_metrics.side_effect = store.reset
+    ctx = MagicMock()
+    ctx.request_context.lifespan_context = app_context
+
+    snapshot = json.loads(diagnostics_tools(ctx=ctx, operation_type="snapshot"))
+    metrics = snapshot["operation_metrics"]["app_context"]["batch_add_objects"]
+    assert metrics["count"] == 1
+    assert metrics["metrics"]["operations_count"]["max"] == 40
+    assert "used_bytes" in snapshot["metric_budget"]
+
+    with patch("word_docx_tools.tools.diagnostics_tools.reset_com_executor_stats") as reset_executor:
+        assert json.loads(diagnostics_tools(ctx=ctx, operation_type="reset"))["success"] is True
+    reset_executor.assert_called_once_with()
+    snapshot = json.loads(diagnostics_tools(ctx=ctx, operation_type="snapshot"))
+    assert snapshot["operation_metrics"]["app_context"] == {}
+
+
+def test_metric_store_keeps_exact_aggregates_within_its_budget():
+    budget = MetricBudget(max_bytes=8192)
+    store = MetricStore(budget=budget, reservoir_size=64, seed=1)
+    for i in range(10000):
+        store.record("search_contexts", i / 1000, success=i % 4 != 0, result_count=i, mode="and")
+
+    stats = store.snapshot()["search_contexts"]
+    assert (stats["count"], stats["success_count"], stats["fail_count"]) == (10000, 7500, 2500)
+    assert stats["total_time"] == sum(i / 1000 for i in range(10000))
+    result_count = stats["metrics"]["result_count"]
+    assert (result_count["min"], result_count["max"], result_count["last"]) == (0, 9999, 9999)
+    assert result_count["avg"] == 4999.5
+    assert stats["metrics"]["mode"] == {"count": 10000}
+    # Samples are bounded by the reservoir and the shared budget
+    assert result_count["samples"] <= 64
+    assert budget.used_bytes <= budget.max_bytes
+    assert store.get_stats()["estimated_bytes"] == budget.used_bytes
+
+    # New series beyond the budget are dropped, not allocated
+    other = MetricStore(budget=budget)
+    for i in range(100):
+        other.record(f"operation_{i}", 0.001)
+    assert budget.used_bytes <= budget.max_bytes
+    assert other.get_stats()["dropped_series"] > 0
+
+    store.reset()
+    other.reset()
+    assert budget.used_bytes == 0 and store.snapshot() == {}
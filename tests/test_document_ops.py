@@ -61,4 +61,156 @@ def test_close_document():
     
     result = document_ops.close_document(mock_doc)
     assert result is True
-    mock_doc.Close.assert_called_once_with(SaveChanges=0)
\ No newline at end of file
+    mock_doc.Close.assert_called_once_with(SaveChanges=0)
+
+def test_scan_replacements_matches_word_options():
+    """The local scan counts matches the way Word's Find does."""
+    text = "Party A and party a; PartyA.\r"
+
+    assert document_ops._scan_replacements(text, "party a", False, False) == 2
+    assert document_ops._scan_replacements(text, "Party", True, True) == 1
+    assert document_ops._scan_replacements(text, "^p", False, False) == 1
+    # ^# (any digit) cannot be counted locally
+    assert document_ops._scan_replacements(text, "^#", False, False) is None
+
+
+def test_find_and_replace_rules_uses_one_replace_all_per_rule():
+    """Each rule issues a single wdReplaceAll and scans the text Word produced."""
+    mock_doc = MagicMock()
+    mock_doc.Content.Text = "Lessor shall pay Lessee. lessor agrees.\r"
+    find = mock_doc.Content.Find
+    # Text after each replace-all, as Word produces it (Word keeps the case of "lessor")
+    word_results = iter([
+        (True, "Landlord shall pay Lessee. landlord agrees.\r"),
+        (True, "Landlord must pay Lessee. landlord agrees.\r"),
+        (False, None),
+    ])
+
+    def replace_all(**kwargs):
+        replaced, text = next(word_results)
+        if text is not None:
+            mock_doc.Content.Text = text
+        return replaced
+
+    find.Execute.side_effect = replace_all
+
+    result = document_ops.find_and_replace_rules(mock_doc, [
+        ("Lessor", "Landlord", {"match_case": False}),
+        {"find": "Landlord shall", "replace": "Landlord must"},
+        ("Nonexistent", "X"),
+    ])
+
+    assert [rule["count"] for rule in result["rules"]] == [2, 1, 0]
+    assert result["total_replacements"] == 3
+    # Word is asked even when the local scan finds nothing
+    assert find.Execute.call_count == 3
+    find.Execute.assert_called_with(Replace=2)
+    mock_doc.Application.UndoRecord.StartCustomRecord.assert_called_once()
+    mock_doc.Application.UndoRecord.EndCustomRecord.assert_called_once()
+
+
+def test_find_and_replace_leaves_matching_to_word():
+    """Matches the local scan misses (e.g. smart quotes) are still replaced by Word."""
+    mock_doc = MagicMock()
+    mock_doc.Content.Text = "the \u201cTenant\u201d agrees\r"
+    mock_doc.Content.Find.Execute.return_value = True
+
+    assert document_ops.find_and_replace_text(mock_doc, '"Tenant"', '"Lessee"') == 1
+    mock_doc.Content.Find.Execute.assert_called_once_with(Replace=2)
+
+
+def _outline_document_paragraphs():
+    paragraphs = []
+    for chapter in range(1, 6):
+        paragraphs.append((f"Chapter {chapter}", "Heading 1"))
+        for section in range(1, 4):
+            paragraphs.append((f"Section {chapter}.{section}", "Heading 2"))
+            paragraphs.extend((f"Body {chapter}.{section}.{i}", "Normal") for i in range(30))
+    return paragraphs
+
+
+def test_outline_uses_find_loops_and_revision_cache(make_fake_document):
+    """Headings come from outline-level Find runs and are cached per revision."""
+    from word_docx_tools.com_backend.document_outline import (
+        _scan_paragraph_headings, invalidate_document_outline,
+        read_document_outline)
+    from word_docx_tools.com_backend.document_revision import \
+        bump_document_revision
+
+    paragraphs = _outline_document_paragraphs()
+    document = make_fake_document(paragraphs)
+    expected, paragraph_count = _scan_paragraph_headings(make_fake_document(paragraphs))
+    invalidate_document_outline(document)
+
+    document.com_calls = 0
+    outline = read_document_outline(document)
+    build_calls = document.com_calls
+
+    assert outline.headings == expected
+    assert outline.paragraph_count == paragraph_count == len(paragraphs)
+    assert [h["outline_level"] for h in outline.headings[:3]] == [1, 2, 2]
+    # The per-paragraph scan reads OutlineLevel of every paragraph
+    assert build_calls < len(paragraphs)
+
+    document.com_calls = 0
+    assert read_document_outline(document) is outline
+    assert document.com_calls <= 2
+
+    bump_document_revision(document)
+    assert read_document_outline(document) is not outline
+
+
+def test_paragraph_style_change_refreshes_outline(make_fake_document):
+    """Setting a heading style makes the next outline read pick it up."""
+    from word_docx_tools.com_backend.document_outline import read_document_outline
+    from word_docx_tools.operations import styles_ops
+
+    document = make_fake_document([("Title", "Heading 1"), ("Intro", "Normal")])
+    document.Styles = lambda name: name
+    assert [h["text"] for h in read_document_outline(document).headings] == ["Title"]
+
+    intro = document.Paragraphs(2).Range
+    with patch.object(styles_ops, "get_selection_range", return_value=intro), \
+            patch.object(styles_ops, "get_style_catalog"):
+        styles_ops.set_paragraph_style(document, "Heading 1", {"type": "paragraph", "index": 2})
+
+    assert [h["text"] for h in read_document_outline(document).headings] == ["Title", "Intro"]
+
+
+class _PagedDocument:
+    """Document stand-in with fixed page starts, counting repaginations."""
+
+    def __init__(self, page_starts, content_end):
+        self.page_starts = page_starts
+        self.repaginations = 0
+        self.goto_calls = 0
+        self.Content = MagicMock(End=content_end)
+        self.Content.Information.side_effect = self._information
+
+    def _information(self, what):
+        self.repaginations += 1
+        return len(self.page_starts)
+
+    def GoTo(self, what, which, count):
+        self.goto_calls += 1
+        return MagicMock(Start=self.page_starts[count - 1])
+
+
+def test_page_map_lookups_are_local_until_revision_changes():
+    from word_docx_tools.com_backend.document_revision import \
+        bump_document_revision
+    from word_docx_tools.com_backend.page_map import read_page_map
+
+    document = _PagedDocument([0, 120, 260, 400], content_end=500)
+
+    page_map = read_page_map(document)
+    assert [page_map.page_at(offset) for offset in (0, 119, 120, 399, 499)] == [1, 1, 2, 3, 4]
+    assert page_map.page_span(2) == (120, 260)
+    assert page_map.page_span(4) == (400, None)
+    assert document_ops.count_objects_by_type(document, "pages") == 4
+    assert document.repaginations == 1
+    assert document.goto_calls == 3
+
+    bump_document_revision(document)
+    assert read_page_map(document) is not page_map
+    assert document.repaginations == 2
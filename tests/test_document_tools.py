@@ -1,6 +1,8 @@
 """
 Tests for document tools.
 """
+import asyncio
+
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -24,15 +26,15 @@ def test_document_tools_create(mock_save, mock_create, mock_context):
     mock_create.return_value = mock_doc
     mock_save.return_value = True
     
-    mock_context.request_context.lifespan_context.get_word_app.return_value = MagicMock()
+    mock_context.request_context.lifespan_context.get_word_app_for_new_document.return_value = MagicMock()
     mock_context.request_context.lifespan_context.get_active_document.return_value = None
     
     # Test create operation
-    result = document_tools(
+    result = asyncio.run(document_tools(
         ctx=mock_context,
         operation_type="create",
         file_path="test.docx"
-    )
+    ))
     
     # Verify the calls were made
     mock_create.assert_called_once()
@@ -48,15 +50,16 @@ def test_document_tools_open(mock_open, mock_context):
     mock_doc.Saved = True
     mock_open.return_value = mock_doc
     
-    mock_context.request_context.lifespan_context.get_word_app.return_value = MagicMock()
+    mock_context.request_context.lifespan_context.find_open_document.return_value = None
+    mock_context.request_context.lifespan_context.get_word_app_for_new_document.return_value = MagicMock()
     mock_context.request_context.lifespan_context.get_active_document.return_value = None
     
     # Test open operation
-    result = document_tools(
+    result = asyncio.run(document_tools(
         ctx=mock_context,
         operation_type="open",
         file_path="test.docx"
-    )
+    ))
     
     # Verify the calls were made
     mock_open.assert_called_once()
@@ -71,10 +74,10 @@ def test_document_tools_save(mock_context):
         mock_save.return_value = True
         
         # Test save operation
-        result = document_tools(
+        result = asyncio.run(document_tools(
             ctx=mock_context,
             operation_type="save"
-        )
+        ))
         
         # Verify the calls were made
         mock_save.assert_called_once_with(mock_doc)
@@ -89,10 +92,10 @@ def test_document_tools_close(mock_context):
         mock_close.return_value = True
         
         # Test close operation
-        result = document_tools(
+        result = asyncio.run(document_tools(
             ctx=mock_context,
             operation_type="close"
-        )
+        ))
         
         # Verify the calls were made
         mock_close.assert_called_once_with(mock_doc)
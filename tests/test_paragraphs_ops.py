@@ -0,0 +1,107 @@
+"""
+Tests for paragraph operations.
+"""
+import pytest
+
+from word_docx_tools.com_backend.com_utils import count_com_calls
+from word_docx_tools.com_backend.document_snapshot import split_paragraphs
+from word_docx_tools.com_backend.paragraph_index import (
+    ParagraphIndex, get_paragraph_index, invalidate_paragraph_index)
+from word_docx_tools.operations import paragraphs_ops
+
+
+def _contract(paragraph_count):
+    """Build a document with a heading every 20 body paragraphs."""
+    paragraphs = []
+    for i in range(paragraph_count):
+        if i % 20 == 0:
+            paragraphs.append((f"Article {i // 20 + 1}", "Heading 1"))
+        elif i % 7 == 0:
+            paragraphs.append(("", "Normal"))
+        else:
+            paragraphs.append((f"Clause {i} " + "lorem ipsum " * (i % 5), "Normal"))
+    return paragraphs
+
+
+def test_split_paragraphs_offsets():
+    """Paragraph marks and end-of-cell marks both advance one position."""
+    spans = split_paragraphs("Title\rcell\r\x07\r\x07Body\r", base=0)
+    assert spans == [
+        (0, 6, "Title\r"),
+        (6, 11, "cell\r\x07"),
+        (11, 12, "\r\x07"),
+        (12, 17, "Body\r"),
+    ]
+
+
+def test_snapshot_matches_per_paragraph_reads(make_fake_document):
+    """Snapshot mode returns the same paragraph dicts as the legacy path."""
+    document = make_fake_document(_contract(120))
+
+    expected = paragraphs_ops.get_paragraphs(document, snapshot=False)
+    result = paragraphs_ops.get_paragraphs(document, snapshot=True)
+
+    assert result == expected
+
+
+def test_snapshot_com_calls_do_not_scale_with_paragraphs(make_fake_document):
+    """The snapshot costs calls per style run, not per paragraph."""
+    document = make_fake_document(_contract(2000))
+
+    document.com_calls = 0
+    with count_com_calls() as legacy_counter:
+        paragraphs_ops.get_paragraphs(document, snapshot=False)
+    legacy_calls = document.com_calls
+
+    document.com_calls = 0
+    with count_com_calls() as snapshot_counter:
+        paragraphs_ops.get_paragraphs(document, snapshot=True)
+    snapshot_calls = document.com_calls
+
+    assert snapshot_calls * 10 < legacy_calls
+    assert snapshot_counter.total * 10 < legacy_counter.total
+
+
+def test_snapshot_falls_back_when_paragraph_count_differs(make_fake_document):
+    """A snapshot that does not line up with Word is discarded."""
+    document = make_fake_document(_contract(10))
+    # Simulate a field code whose result text hides a paragraph mark
+    document._text = document._text.replace("\r", " ", 1)
+
+    result = paragraphs_ops.get_paragraphs(document, snapshot=True)
+
+    assert len(result) == 10
+
+
+def test_paragraph_index_resolves_ordinals(make_fake_document):
+    """Paragraph ordinals resolve through the cached offset index."""
+    document = make_fake_document(_contract(50))
+    invalidate_paragraph_index(document)
+
+    index = get_paragraph_index(document)
+    assert len(index) == 50
+    assert index.to_range(document, 1).Text == "Article 1\r"
+    assert index.to_range(document, -30).Text == "Article 2\r"
+
+    document.com_calls = 0
+    assert get_paragraph_index(document) is index
+    assert document.com_calls <= 2
+
+    with pytest.raises(IndexError):
+        index.span(51)
+
+
+def test_paragraph_index_applies_edits():
+    """Edits shift later paragraphs without re-reading the document."""
+    # "ab\r" "cd\r" "ef\r"
+    index = ParagraphIndex([0, 3, 6], 9)
+
+    index.apply_insert(4, "x\ry")
+    assert index.starts == [0, 3, 6, 9]
+    assert index.content_end == 12
+
+    index.apply_delete(3, 6)
+    assert index.starts == [0, 3, 6]
+    assert index.content_end == 9
+    assert index.span(2) == (3, 6)
+    assert index.ordinal_at(7) == 3
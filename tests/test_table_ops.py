@@ -0,0 +1,160 @@
+"""
+Tests for table operations.
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from word_docx_tools.com_backend.com_utils import count_com_calls
+from word_docx_tools.com_backend.table_snapshot import (read_table_cells,
+                                                        split_table_text)
+from word_docx_tools.mcp_service.errors import WordDocumentError
+from word_docx_tools.operations import table_ops
+
+CELL = "\r\x07"
+
+
+class FakeCells(list):
+    @property
+    def Count(self):
+        return len(self)
+
+
+def _fake_table(grid):
+    """Build a table COM stand-in whose rows may have different cell counts."""
+    rows = []
+    for row in grid:
+        cells = FakeCells(
+            SimpleNamespace(Range=SimpleNamespace(Text=text + CELL)) for text in row
+        )
+        row_text = "".join(text + CELL for text in row) + CELL
+        rows.append(SimpleNamespace(Range=SimpleNamespace(Text=row_text), Cells=cells))
+
+    table_rows = FakeCells(rows)
+    return SimpleNamespace(
+        Rows=table_rows,
+        Columns=SimpleNamespace(Count=max(len(row) for row in grid)),
+        Tables=SimpleNamespace(Count=0),
+        Uniform=len({len(row) for row in grid}) == 1,
+        Range=SimpleNamespace(Text="".join(row.Range.Text for row in rows)),
+    )
+
+
+def test_split_table_text_handles_empty_cells():
+    """Empty cells are not confused with end-of-row marks."""
+    text = "a" + CELL + CELL + CELL + CELL + "d" + CELL + CELL
+
+    assert split_table_text(text, [2, 2]) == [["a", ""], ["", "d"]]
+    assert split_table_text(text, [2, 3]) is None
+    assert split_table_text("a" + CELL + "b" + CELL + CELL, [1, 0]) is None
+
+
+def test_uniform_table_is_read_with_constant_com_calls():
+    """A regular table is parsed from a single Range.Text read."""
+    grid = [[f"r{r}c{c}" for c in range(12)] for r in range(400)]
+    table = _fake_table(grid)
+
+    with count_com_calls() as counter:
+        cells = read_table_cells(table)
+
+    assert cells == grid
+    assert counter.total < 20
+
+
+def test_window_limits_rows_and_columns():
+    grid = [[f"r{r}c{c}" for c in range(5)] for r in range(10)]
+
+    cells = read_table_cells(_fake_table(grid), row_start=3, row_end=4, col_start=2, col_end=3)
+
+    assert cells == [["r2c1", "r2c2"], ["r3c1", "r3c2"]]
+
+
+def test_irregular_table_falls_back_per_row():
+    """Rows with merged cells are split one row at a time."""
+    grid = [["title"], ["a", "b", "c"], ["d", "e", "f"]]
+
+    assert read_table_cells(_fake_table(grid)) == grid
+    assert read_table_cells(_fake_table(grid), row_start=2, col_end=2) == [["a", "b"], ["d", "e"]]
+
+
+def test_irregular_table_is_not_split_as_a_grid():
+    """An empty cell where a row end would be does not fool the fast path."""
+    grid = [["a", "b"], ["", "d", "e", "f"]]
+    table = _fake_table(grid)
+    table.Columns.Count = 3
+
+    assert read_table_cells(table) == grid
+
+
+class FakeWritableTable:
+    """Table stand-in recording every cell written through Cell().Range.Text."""
+
+    def __init__(self, row_count, column_count):
+        self.Rows = SimpleNamespace(Count=row_count)
+        self.Columns = SimpleNamespace(Count=column_count)
+        self.Range = SimpleNamespace(Start=0, End=0)
+        self.written = {}
+
+    def Cell(self, Row, Column):
+        table = self
+
+        class _Range:
+            def __setattr__(self, name, value):
+                if name == "Text":
+                    table.written[(Row, Column)] = value
+                object.__setattr__(self, name, value)
+
+        return SimpleNamespace(Range=_Range())
+
+
+def _document_with(table):
+    tables = lambda index: table  # noqa: E731
+    tables.Count = 1
+    return SimpleNamespace(Tables=tables, FullName="set_cells.docx")
+
+
+def test_set_cells_writes_array_in_one_pass():
+    table = FakeWritableTable(200, 10)
+    grid = [[f"{r}-{c}" for c in range(10)] for r in range(200)]
+
+    result = json.loads(table_ops.set_cells(_document_with(table), 1, grid))
+
+    assert result["success"] is True
+    assert result["cells_written"] == 2000
+    assert table.written[(200, 10)] == "199-9"
+    # One validation for the whole batch, then three calls per cell
+    assert result["com_calls"]["total"] == 2000 * 3 + 8
+
+
+def test_set_cells_accepts_sparse_map_and_rejects_out_of_range():
+    table = FakeWritableTable(3, 3)
+    document = _document_with(table)
+
+    table_ops.set_cells(document, 1, {"2,3": "x", (1, 1): "y"})
+    assert table.written == {(1, 1): "y", (2, 3): "x"}
+
+    with pytest.raises(WordDocumentError):
+        table_ops.set_cells(document, 1, [["a", "b"]], start_row=3, start_col=3)
+
+
+def test_insert_row_marks_anchored_offsets_stale():
+    """Row inserts add cells the journal cannot record as one replacement."""
+    from unittest.mock import MagicMock
+
+    from word_docx_tools.com_backend.edit_journal import (get_edit_journal,
+                                                          invalidate_edit_journal)
+
+    document = MagicMock()
+    document.FullName = "C:\\temp\\rows.docx"
+    document.Tables.Count = 1
+    table = document.Tables.return_value
+    table.Rows.Count = 2
+    tree = get_edit_journal(document).anchor([0, 10])
+    try:
+        table_ops.insert_row(document, 1, "after")
+
+        table.Rows.Add.assert_called_once()
+        assert tree.stale
+    finally:
+        invalidate_edit_journal(document)
@@ -0,0 +1,306 @@
+"""
+Dispatch layer for Word Document MCP Server.
+
+Late-bound ``win32com.client.Dispatch`` objects resolve every member name
+with ``IDispatch::GetIDsOfNames`` before invoking it, and every Range, Font
+or Paragraph object handed out by Word starts with an empty name cache. This
+module reduces that overhead in two ways:
+
+* ``create_word_application`` prefers early binding through the gen_py
+  wrapper of the Word type library (built once with ``ensure_word_typelib``
+  at install time or server start). Early-bound wrappers carry the DISPIDs in
+  generated code, so they never call ``GetIDsOfNames``.
+* For objects that are still late bound, ``get_com_property`` and
+  ``set_com_property`` memoize the DISPIDs of hot members (``Range``,
+  ``Text``, ``Start``, ``End``, ``Font``, ``Paragraphs``) per interface, so
+  each name is resolved once per process instead of once per object.
+
+``get_dispatch_stats`` reports the binding mode of the application and how
+many lookups were made and saved.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Microsoft Word 8.7 Object Library (Word 2010 and later register this version)
+WORD_TYPELIB = ("{00020905-0000-0000-C000-000000000046}", 0, 8, 7)
+
+# Members read on almost every operation
+HOT_MEMBERS = frozenset(("Range", "Text", "Start", "End", "Font", "Paragraphs"))
+
+# IDispatch::Invoke flags
+_DISPATCH_METHOD = 1
+_DISPATCH_PROPERTYGET = 2
+_DISPATCH_PROPERTYPUT = 4
+
+BINDING_EARLY = "early"
+BINDING_LATE = "late"
+BINDING_UNKNOWN = "unknown"
+
+_lock = threading.Lock()
+_dispids: Dict[Tuple[Any, str], int] = {}
+_stats: Dict[str, Any] = {
+    "binding_mode": BINDING_UNKNOWN,
+    "typelib_ready": False,
+    "dispid_lookups": 0,
+    "dispid_hits": 0,
+    "early_bound_accesses": 0,
+    "fallback_accesses": 0,
+}
+
+
+def ensure_word_typelib() -> bool:
+    """
+    Make sure the gen_py wrapper of the Word type library exists.
+
+    Generating the wrapper takes several seconds, so this is meant to run at
+    install time or server start rather than on the first request.
+
+    Returns:
+        True if the wrapper module is available.
+    """
+    try:
+        from win32com.client import gencache
+
+        gencache.EnsureModule(*WORD_TYPELIB)
+        ready = True
+    except Exception as e:
+        logger.warning(f"Word type library wrapper not available: {e}")
+        ready = False
+    with _lock:
+        _stats["typelib_ready"] = ready
+    return ready
+
+
+def rebuild_word_typelib() -> bool:
+    """
+    Regenerate only the Word type library wrapper.
+
+    Used when a stale gen_py module breaks dispatch. Unlike deleting the
+    whole gen_py directory, wrappers of other type libraries are kept.
+
+    Returns:
+        True if the wrapper was regenerated.
+    """
+    try:
+        from win32com.client import gencache
+
+        clsid, lcid, major, minor = WORD_TYPELIB
+        module_name = f"{clsid[1:-1]}x{lcid}x{major}x{minor}"
+        gen_path = gencache.GetGeneratePath()
+        for name in (module_name, module_name + ".py"):
+            path = os.path.join(gen_path, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        # Drop the stale entries from gen_py's index before regenerating
+        gencache.Rebuild(verbose=0)
+    except Exception as e:
+        logger.warning(f"Failed to remove stale Word type library wrapper: {e}")
+        return False
+    return ensure_word_typelib()
+
+
+def create_word_application(
+    prefer_early_binding: bool = True, separate_process: bool = False
+) -> Any:
+    """
+    Create a Word application object, early bound when possible.
+
+    Args:
+        prefer_early_binding: Whether to try the gen_py wrapper first.
+        separate_process: Whether to start a new Word process (DispatchEx)
+            instead of attaching to a running one. Always late bound.
+
+    Returns:
+        The Word application COM object.
+
+    Raises:
+        Exception: The COM error of the last method tried.
+    """
+    import win32com.client
+
+    if separate_process:
+        word_app = win32com.client.DispatchEx("Word.Application")
+        _set_binding_mode(BINDING_LATE)
+        return word_app
+
+    if prefer_early_binding:
+        try:
+            from win32com.client import gencache
+
+            word_app = gencache.EnsureDispatch("Word.Application")
+            _set_binding_mode(binding_mode(word_app))
+            return word_app
+        except Exception as e:
+            logger.warning(f"Early binding unavailable, falling back to late binding: {e}")
+
+    word_app = win32com.client.Dispatch("Word.Application")
+    _set_binding_mode(binding_mode(word_app))
+    return word_app
+
+
+def binding_mode(com_object: Any) -> str:
+    """Return whether a COM object is early bound, late bound or unknown."""
+    if com_object is None:
+        return BINDING_UNKNOWN
+    if _is_early_bound(com_object):
+        return BINDING_EARLY
+    if _is_late_bound(com_object):
+        return BINDING_LATE
+    return BINDING_UNKNOWN
+
+
+def get_com_property(com_object: Any, name: str) -> Any:
+    """
+    Read a property, reusing the memoized DISPID for hot members.
+
+    Early-bound objects, anything that is not a late-bound dispatch wrapper
+    and members outside ``HOT_MEMBERS`` are read with a plain attribute
+    access.
+
+    Args:
+        com_object: A Word COM object.
+        name: The property name.
+
+    Returns:
+        The property value; IDispatch results are wrapped for attribute access.
+    """
+    oleobj = _memo_target(com_object, name)
+    if oleobj is None:
+        return getattr(com_object, name)
+
+    dispid = _resolve_dispid(com_object, oleobj, name)
+    result = oleobj.Invoke(dispid, 0, _DISPATCH_METHOD | _DISPATCH_PROPERTYGET, True)
+    return _wrap_result(result, name)
+
+
+def set_com_property(com_object: Any, name: str, value: Any) -> None:
+    """
+    Assign a property, reusing the memoized DISPID for hot members.
+
+    Args:
+        com_object: A Word COM object.
+        name: The property name.
+        value: The value to assign.
+    """
+    oleobj = _memo_target(com_object, name)
+    if oleobj is None:
+        setattr(com_object, name, value)
+        return
+
+    dispid = _resolve_dispid(com_object, oleobj, name)
+    oleobj.Invoke(dispid, 0, _DISPATCH_PROPERTYPUT, False, _unwrap_value(value))
+
+
+def get_dispatch_stats() -> Dict[str, Any]:
+    """
+    Return binding mode and name-lookup counters.
+
+    Returns:
+        A dict with ``binding_mode``, ``typelib_ready``, ``dispid_lookups``
+        (GetIDsOfNames calls made), ``dispid_hits`` (calls saved),
+        ``early_bound_accesses``, ``fallback_accesses`` and
+        ``memoized_members``.
+    """
+    with _lock:
+        stats = dict(_stats)
+        stats["memoized_members"] = len(_dispids)
+    return stats
+
+
+def reset_dispatch_stats(clear_dispids: bool = False) -> None:
+    """
+    Reset the lookup counters, and optionally forget the memoized DISPIDs.
+
+    The binding mode and type library state are kept.
+    """
+    with _lock:
+        for key in ("dispid_lookups", "dispid_hits", "early_bound_accesses", "fallback_accesses"):
+            _stats[key] = 0
+        if clear_dispids:
+            _dispids.clear()
+
+
+def _set_binding_mode(mode: str) -> None:
+    with _lock:
+        _stats["binding_mode"] = mode
+    logger.info(f"Word application created with {mode} binding")
+
+
+def _is_early_bound(com_object: Any) -> bool:
+    # gen_py wrapper classes carry generated property maps
+    return hasattr(type(com_object), "_prop_map_get_")
+
+
+def _is_late_bound(com_object: Any) -> bool:
+    # win32com.client.dynamic.CDispatch, matched by name so that this module
+    # does not import win32com
+    return (
+        type(com_object).__name__ == "CDispatch"
+        and getattr(com_object, "_oleobj_", None) is not None
+    )
+
+
+def _memo_target(com_object: Any, name: str) -> Any:
+    """Return the IDispatch to invoke directly, or None for a plain access."""
+    if _is_early_bound(com_object):
+        with _lock:
+            _stats["early_bound_accesses"] += 1
+        return None
+    if (
+        name not in HOT_MEMBERS
+        or not _is_late_bound(com_object)
+        or _interface_key(com_object) is None
+    ):
+        with _lock:
+            _stats["fallback_accesses"] += 1
+        return None
+    return com_object._oleobj_
+
+
+def _interface_key(com_object: Any) -> Any:
+    """
+    Return a value identifying the object's interface.
+
+    Dynamic dispatch objects keep the interface IID of their type info in
+    ``_olerepr_.clsid``; DISPIDs are only shared between objects with the
+    same interface.
+    """
+    olerepr = getattr(com_object, "_olerepr_", None)
+    return getattr(olerepr, "clsid", None)
+
+
+def _resolve_dispid(com_object: Any, oleobj: Any, name: str) -> int:
+    key = (_interface_key(com_object), name)
+    with _lock:
+        dispid = _dispids.get(key)
+        if dispid is not None:
+            _stats["dispid_hits"] += 1
+            return dispid
+
+    dispid = oleobj.GetIDsOfNames(name)
+    with _lock:
+        _dispids[key] = dispid
+        _stats["dispid_lookups"] += 1
+    return dispid
+
+
+def _wrap_result(result: Any, name: str) -> Any:
+    """Wrap a raw IDispatch result the way attribute access would."""
+    if type(result).__name__ != "PyIDispatch":
+        return result
+    import win32com.client
+
+    return win32com.client.Dispatch(result, name)
+
+
+def _unwrap_value(value: Any) -> Any:
+    oleobj = getattr(value, "_oleobj_", None)
+    return oleobj if oleobj is not None else value
@@ -0,0 +1,269 @@
+"""
+COM executor for Word Document MCP Server.
+
+Word objects live in a single-threaded apartment and every call on them
+blocks until Word answers. Running tools directly on the server's thread
+means one slow operation (a large ``get_table_info``, a repagination) stalls
+every other request, pings included. The ComExecutor owns one dedicated STA
+worker thread; operations are queued onto it and awaited from the asyncio
+event loop, which stays free to serve other traffic.
+
+All COM objects must be created and used on the worker thread, so every tool
+entry point goes through the executor (see ``run_on_com_thread`` in
+``mcp_service.core_utils``). Calls made from the worker thread itself run
+inline, so operations can call each other without deadlocking.
+
+Each job records the queue depth it found, how long it waited and how long
+it ran; ``get_com_executor_stats`` aggregates them per label.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between message pumps while the worker waits for jobs
+_PUMP_INTERVAL = 0.05
+# Number of finished jobs kept for get_com_executor_stats
+_RECENT_JOBS = 50
+
+_STOP = object()
+
+
+class ComJob:
+    """
+    One operation queued on the COM worker.
+
+    Attributes:
+        label: Name used in the statistics, usually the tool name.
+        queue_depth: Jobs already waiting when this one was queued.
+        wait_time: Seconds between queuing and starting, set when it starts.
+        exec_time: Seconds the job ran, set when it finishes.
+        success: Whether the job returned without raising.
+    """
+
+    __slots__ = ("label", "func", "args", "kwargs", "future", "queue_depth",
+                 "queued_at", "wait_time", "exec_time", "success")
+
+    def __init__(self, label: str, func: Callable[..., Any], args: tuple,
+                 kwargs: Dict[str, Any], queue_depth: int):
+        self.label = label
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future: Future = Future()
+        self.queue_depth = queue_depth
+        self.queued_at = time.perf_counter()
+        self.wait_time = 0.0
+        self.exec_time = 0.0
+        self.success = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "queue_depth": self.queue_depth,
+            "wait_time": self.wait_time,
+            "exec_time": self.exec_time,
+            "success": self.success,
+        }
+
+
+class ComExecutor:
+    """
+    Single STA worker thread with a job queue.
+
+    Example:
+        executor = get_com_executor()
+        result = await executor.run_async(get_table_info, document, 1)
+    """
+
+    def __init__(self, name: str = "word-com-worker"):
+        self._name = name
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._label_stats: Dict[str, Dict[str, float]] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=_RECENT_JOBS)
+        self._max_queue_depth = 0
+
+    @property
+    def worker_thread(self) -> Optional[threading.Thread]:
+        return self._thread
+
+    def in_worker_thread(self) -> bool:
+        """Return whether the caller is the COM worker thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running."""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._work, name=self._name, daemon=True)
+            self._thread.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker after the queued jobs have run."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        if wait and threading.current_thread() is not thread:
+            thread.join()
+
+    def submit(self, func: Callable[..., Any], *args: Any,
+               label: Optional[str] = None, **kwargs: Any) -> Future:
+        """
+        Queue a call on the worker thread.
+
+        Returns:
+            A Future resolved with the call's result or exception.
+        """
+        self.start()
+        job = ComJob(label or getattr(func, "__name__", "job"), func, args, kwargs,
+                     self._queue.qsize())
+        with self._stats_lock:
+            self._max_queue_depth = max(self._max_queue_depth, job.queue_depth + 1)
+        self._queue.put(job)
+        return job.future
+
+    def run(self, func: Callable[..., Any], *args: Any,
+            label: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Call ``func`` on the worker thread and wait for the result.
+
+        Runs inline when already on the worker thread.
+        """
+        if self.in_worker_thread():
+            return func(*args, **kwargs)
+        return self.submit(func, *args, label=label, **kwargs).result()
+
+    async def run_async(self, func: Callable[..., Any], *args: Any,
+                        label: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Call ``func`` on the worker thread without blocking the event loop.
+
+        Runs inline when already on the worker thread.
+        """
+        if self.in_worker_thread():
+            return func(*args, **kwargs)
+        return await asyncio.wrap_future(self.submit(func, *args, label=label, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return queue and per-label job statistics.
+
+        Returns:
+            A dict with the current and maximum queue depth, whether the
+            worker is running, per-label counts with total/max wait and
+            execution times, and the most recent jobs.
+        """
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "worker_alive": self._thread is not None and self._thread.is_alive(),
+                "labels": {label: dict(entry) for label, entry in self._label_stats.items()},
+                "recent_jobs": list(self._recent),
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._label_stats.clear()
+            self._recent.clear()
+            self._max_queue_depth = 0
+
+    def _work(self) -> None:
+        pythoncom = _initialize_apartment()
+        try:
+            while True:
+                try:
+                    job = self._queue.get(timeout=_PUMP_INTERVAL)
+                except queue.Empty:
+                    # STA threads must pump messages while idle
+                    if pythoncom is not None:
+                        pythoncom.PumpWaitingMessages()
+                    continue
+                if job is _STOP:
+                    break
+                self._run_job(job)
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def _run_job(self, job: ComJob) -> None:
+        if not job.future.set_running_or_notify_cancel():
+            return
+        started = time.perf_counter()
+        job.wait_time = started - job.queued_at
+        try:
+            result = job.func(*job.args, **job.kwargs)
+        except BaseException as e:
+            job.exec_time = time.perf_counter() - started
+            self._record(job)
+            job.future.set_exception(e)
+        else:
+            job.exec_time = time.perf_counter() - started
+            job.success = True
+            self._record(job)
+            job.future.set_result(result)
+
+    def _record(self, job: ComJob) -> None:
+        with self._stats_lock:
+            entry = self._label_stats.setdefault(job.label, {
+                "count": 0, "errors": 0,
+                "total_wait_time": 0.0, "max_wait_time": 0.0,
+                "total_exec_time": 0.0, "max_exec_time": 0.0,
+            })
+            entry["count"] += 1
+            entry["errors"] += 0 if job.success else 1
+            entry["total_wait_time"] += job.wait_time
+            entry["max_wait_time"] = max(entry["max_wait_time"], job.wait_time)
+            entry["total_exec_time"] += job.exec_time
+            entry["max_exec_time"] = max(entry["max_exec_time"], job.exec_time)
+            self._recent.append(job.to_dict())
+
+
+def _initialize_apartment() -> Any:
+    """Enter a single-threaded apartment, returning pythoncom if available."""
+    try:
+        import pythoncom
+
+        pythoncom.CoInitializeEx(pythoncom.COINIT_APARTMENTTHREADED)
+        return pythoncom
+    except Exception as e:
+        logger.warning(f"COM worker running without an STA: {e}")
+        return None
+
+
+_executor: Optional[ComExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_com_executor() -> ComExecutor:
+    """Return the process-wide COM executor."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ComExecutor()
+        return _executor
+
+
+def get_com_executor_stats() -> Dict[str, Any]:
+    """Return the statistics of the process-wide COM executor."""
+    return get_com_executor().get_stats()
+
+
+def reset_com_executor_stats() -> None:
+    """Clear the statistics of the process-wide COM executor, if it exists."""
+    with _executor_lock:
+        executor = _executor
+    if executor is not None:
+        executor.reset_stats()
@@ -6,11 +6,16 @@ including error handling and common operations.
 """
 
 import functools
-from typing import Any, Callable, List, TypeVar
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import (Any, Callable, Dict, Iterator, List, Optional, Sequence,
+                    TypeVar)
 
 import win32com.client
 
 from ..mcp_service.errors import ErrorCode, WordDocumentError
+from .com_dispatch import get_com_property
 
 T = TypeVar("T")
 
@@ -73,30 +78,235 @@ def safe_com_call(error_code: ErrorCode, operation_name: str):
     return SafeComCall()
 
 
-def iter_com_collection(collection: Any) -> List[Any]:
+def iter_com_collection(
+    collection: Any,
+    start: int = 0,
+    stop: Optional[int] = None,
+    step: int = 1,
+    fields: Optional[Sequence[str]] = None,
+) -> Iterator[Any]:
     """
-    Iterate through a COM collection and return a list of elements.
+    Lazily iterate through a COM collection.
+
+    Elements are pulled one at a time from the collection's native
+    ``_NewEnum`` enumerator, so nothing is materialized up front and breaking
+    out of the loop stops all further COM traffic. Collections without an
+    enumerator are walked by index instead.
 
     Args:
         collection: The COM collection object to iterate through.
+        start: 0-based position of the first element to yield.
+        stop: 0-based position to stop before, or None for the whole collection.
+        step: Distance between yielded elements.
+        fields: Optional dotted property paths (e.g. ``"Range.Start"``). When
+            given, a dict mapping each path to its value is yielded instead of
+            the element, and only those properties are read. Shared prefixes
+            such as ``Range`` are read once per element.
+
+    Yields:
+        The elements of the collection, or one dict per element when
+        ``fields`` is given.
 
-    Returns:
-        A list containing all elements from the COM collection.
-        
     Example:
-        paragraphs = iter_com_collection(document.Paragraphs)
+        for info in iter_com_collection(document.Tables, stop=10,
+                                        fields=("Rows.Count", "Range.Start")):
+            ...
     """
-    result = []
+    if start < 0 or (stop is not None and stop < 0) or step < 1:
+        raise ValueError("start, stop and step must be non-negative, step at least 1")
+
+    limit = None if stop is None else max(stop - start, 0)
+    elements = itertools.islice(
+        _enumerate_com_collection(collection, start), 0, limit, step
+    )
+    for element in elements:
+        if fields is None:
+            yield element
+        else:
+            yield _read_com_fields(element, fields)
+
+
+def _enumerate_com_collection(collection: Any, start: int) -> Iterator[Any]:
+    """Yield elements from position start, preferring the native enumerator."""
+    try:
+        enumerator = iter(collection)
+        record_com_call("Collection._NewEnum")
+    except TypeError:
+        enumerator = None
+
+    if enumerator is not None:
+        # 枚举器无法随机定位，跳过的元素只消耗一次Next调用，不读取任何属性
+        for element in itertools.islice(enumerator, start, None):
+            record_com_call("Enum.Next")
+            yield element
+        return
+
     try:
         count = collection.Count
-        for i in range(1, count + 1):
-            try:
-                element = collection(i)
-                result.append(element)
-            except Exception:
-                # Skip elements that can't be accessed
-                continue
+        record_com_call("Collection.Count")
     except Exception:
-        # If collection doesn't support Count property, return empty list
-        pass
-    return result
+        # If collection doesn't support Count property, yield nothing
+        return
+    for i in range(start + 1, count + 1):
+        try:
+            element = collection(i)
+            record_com_call("Collection.Item")
+        except Exception:
+            # Skip elements that can't be accessed
+            continue
+        yield element
+
+
+def _read_com_fields(element: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Read dotted property paths from a COM object, reusing shared prefixes."""
+    resolved: Dict[str, Any] = {}
+    values: Dict[str, Any] = {}
+    for field in fields:
+        target = element
+        path = ""
+        try:
+            for name in field.split("."):
+                path = f"{path}.{name}" if path else name
+                if path not in resolved:
+                    resolved[path] = get_com_property(target, name)
+                    record_com_call(name)
+                target = resolved[path]
+            values[field] = target
+        except Exception:
+            values[field] = None
+    return values
+
+
+def document_key(document: Any) -> str:
+    """
+    Return a key identifying a document for per-document caches.
+
+    Args:
+        document: The Word document COM object.
+
+    Returns:
+        The document's full name, or its object identity when the name is
+        not available.
+    """
+    try:
+        return str(document.FullName)
+    except Exception:
+        return f"document_{id(document)}"
+
+
+class ComCallCounter:
+    """
+    Counter for cross-process COM round trips made by an operation.
+
+    Every property read, method call or indexed collection access on a Word
+    COM object is a separate round trip to the Word process. Code paths that
+    care about their cost report each access with ``record_com_call`` while a
+    counter is active, which makes the cost of an operation measurable both
+    against the real Word application and against fake documents in tests.
+    """
+
+    def __init__(self, label: str = "operation"):
+        self.label = label
+        self.calls: Dict[str, int] = {}
+
+    def add(self, member: str, count: int = 1) -> None:
+        """Record ``count`` round trips made through ``member``."""
+        self.calls[member] = self.calls.get(member, 0) + count
+
+    @property
+    def total(self) -> int:
+        """Total number of recorded round trips."""
+        return sum(self.calls.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the counter as a JSON-serializable dictionary."""
+        return {"label": self.label, "total": self.total, "calls": dict(self.calls)}
+
+
+_counter_state = threading.local()
+
+
+def _active_counters() -> List[ComCallCounter]:
+    stack = getattr(_counter_state, "stack", None)
+    if stack is None:
+        stack = []
+        _counter_state.stack = stack
+    return stack
+
+
+@contextmanager
+def count_com_calls(label: str = "operation") -> Iterator[ComCallCounter]:
+    """
+    Context manager that counts the COM round trips recorded inside it.
+
+    Scopes nest: a call recorded inside an inner scope is also counted by all
+    enclosing scopes on the same thread.
+
+    Usage:
+        with count_com_calls("get paragraphs") as counter:
+            paragraphs = get_paragraphs(document)
+        print(counter.total)
+    """
+    counter = ComCallCounter(label)
+    stack = _active_counters()
+    stack.append(counter)
+    try:
+        yield counter
+    finally:
+        stack.remove(counter)
+        _accumulate_com_calls(counter)
+
+
+_totals_lock = threading.Lock()
+_com_call_totals: Dict[str, Dict[str, int]] = {}
+
+
+def _accumulate_com_calls(counter: ComCallCounter) -> None:
+    """Add a finished counter scope to the process-wide totals of its label."""
+    total = counter.total
+    with _totals_lock:
+        entry = _com_call_totals.setdefault(
+            counter.label,
+            {"invocations": 0, "total_calls": 0, "max_calls": 0, "last_calls": 0},
+        )
+        entry["invocations"] += 1
+        entry["total_calls"] += total
+        entry["max_calls"] = max(entry["max_calls"], total)
+        entry["last_calls"] = total
+
+
+def get_com_call_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Return the COM round trips recorded per counter label.
+
+    Every MCP tool call runs inside a counter labelled with the tool name, so
+    this shows the COM cost of each tool across calls.
+
+    Returns:
+        A dict mapping each label to its number of invocations, total and
+        maximum calls per invocation, calls in the last invocation, and the
+        average calls per invocation.
+    """
+    with _totals_lock:
+        stats = {label: dict(entry) for label, entry in _com_call_totals.items()}
+    for entry in stats.values():
+        entry["avg_calls"] = entry["total_calls"] / entry["invocations"]
+    return stats
+
+
+def reset_com_call_stats() -> None:
+    """Clear the per-label COM call totals."""
+    with _totals_lock:
+        _com_call_totals.clear()
+
+
+def record_com_call(member: str, count: int = 1) -> None:
+    """
+    Record COM round trips against every active counter on this thread.
+
+    Args:
+        member: Name of the COM member that was accessed (e.g. "Range.Text").
+        count: Number of round trips made.
+    """
+    for counter in _active_counters():
+        counter.add(member, count)
@@ -0,0 +1,303 @@
+"""
+Comment inventory for Word Document MCP Server.
+
+Listing comments used to read ``Text``, ``Author``, ``Initial``, ``Date``,
+``Scope`` and ``Replies`` of each comment separately, with several fallbacks
+and a logged warning per failure. The inventory reads all of them in one
+enumeration of ``Document.Comments`` (shared prefixes such as ``Scope`` are
+resolved once per comment), keeps the result per document revision, and
+answers filtered, paged queries and thread lookups from memory.
+
+From Word 2013 on, replies are themselves members of ``Document.Comments``;
+their ``Ancestor.Index`` links them to the comment they answer, so threads
+are built without touching ``Replies``. Older versions only expose replies
+through ``Comment.Replies``; those are read on the first thread lookup and
+memoized.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .com_utils import document_key, iter_com_collection, record_com_call
+from .document_revision import document_fingerprint
+
+# Properties read for every comment in the enumeration pass
+COMMENT_FIELDS = (
+    "Range.Text",
+    "Author",
+    "Initial",
+    "Date",
+    "Scope.Start",
+    "Scope.End",
+    "Scope.Text",
+    "Replies.Count",
+    "Ancestor.Index",
+)
+
+# Properties read for every reply when Word does not list replies as comments
+REPLY_FIELDS = ("Range.Text", "Author", "Initial", "Date")
+
+DateBound = Union[str, datetime, None]
+
+
+class CommentInventory:
+    """
+    All comments of one document at one revision.
+
+    Attributes:
+        entries: Comment dicts in collection order, as returned by
+            ``get_comments``.
+        fingerprint: The (document fingerprint, comment count) the inventory
+            was built at.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], dates: List[Optional[datetime]],
+                 fingerprint: Tuple[Any, int]):
+        self.entries = entries
+        self.fingerprint = fingerprint
+        self._dates = dates
+        self._children: Dict[int, List[int]] = {}
+        self._author_index: Dict[str, List[int]] = {}
+        self._legacy_replies: Dict[int, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            parent = entry["parent_index"]
+            if parent is not None:
+                self._children.setdefault(parent, []).append(entry["index"])
+            self._author_index.setdefault(entry["author"].casefold(), []).append(entry["index"])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def query(
+        self,
+        author: Optional[str] = None,
+        date_from: DateBound = None,
+        date_to: DateBound = None,
+        scope_start: Optional[int] = None,
+        scope_end: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return one page of the comments matching all given filters.
+
+        Args:
+            author: Author name, compared case-insensitively.
+            date_from: Earliest comment date (inclusive), datetime or ISO string.
+            date_to: Latest comment date (inclusive), datetime or ISO string.
+            scope_start: Keep comments whose scope ends after this offset.
+            scope_end: Keep comments whose scope starts before this offset.
+            offset: Number of matching comments to skip.
+            limit: Maximum number of comments to return, None for all.
+
+        Returns:
+            A tuple (copies of the matching comments on this page, total
+            number of matching comments).
+
+        Raises:
+            ValueError: If a date bound or the paging values are invalid.
+        """
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must not be negative")
+        lower = _parse_date_bound(date_from)
+        upper = _parse_date_bound(date_to)
+
+        if author is not None:
+            candidates = self._author_index.get(author.casefold(), [])
+        else:
+            candidates = range(len(self.entries))
+
+        matches = []
+        for index in candidates:
+            entry = self.entries[index]
+            if lower is not None or upper is not None:
+                date = self._dates[index]
+                if date is None:
+                    continue
+                if (lower is not None and date < lower) or (upper is not None and date > upper):
+                    continue
+            if scope_start is not None or scope_end is not None:
+                scope = entry.get("scope")
+                if scope is None:
+                    continue
+                if scope_start is not None and scope["end"] <= scope_start:
+                    continue
+                if scope_end is not None and scope["start"] >= scope_end:
+                    continue
+            matches.append(index)
+
+        stop = None if limit is None else offset + limit
+        page = [_copy_entry(self.entries[index]) for index in matches[offset:stop]]
+        return page, len(matches)
+
+    def thread(self, document: Any, index: int) -> List[Dict[str, Any]]:
+        """
+        Return a comment followed by its replies.
+
+        Args:
+            document: The Word document COM object, used only when replies
+                are not listed in ``Document.Comments``.
+            index: The 0-based index of the comment.
+
+        Returns:
+            A list of thread entry dicts, the comment first.
+
+        Raises:
+            IndexError: If there is no comment at the index.
+        """
+        if not 0 <= index < len(self.entries):
+            raise IndexError(
+                f"Comment index {index} out of range (0-{len(self.entries) - 1})"
+            )
+
+        entry = self.entries[index]
+        scope = entry.get("scope") or {}
+        thread = [{
+            "index": index,
+            "text": entry["text"],
+            "author": entry["author"],
+            "initials": entry["initials"],
+            "date": entry["date"],
+            "scope_start": scope.get("start"),
+            "scope_end": scope.get("end"),
+            "scope_text": scope.get("text"),
+        }]
+
+        children = self._children.get(index)
+        if children:
+            replies = [self.entries[child] for child in children]
+        elif entry["replies_count"]:
+            replies = self._read_legacy_replies(document, index)
+        else:
+            replies = []
+
+        for position, reply in enumerate(replies):
+            thread.append({
+                "index": f"{index}-reply-{position}",
+                "text": reply["text"],
+                "author": reply["author"],
+                "initials": reply["initials"],
+                "date": reply["date"],
+            })
+        return thread
+
+    def _read_legacy_replies(self, document: Any, index: int) -> List[Dict[str, Any]]:
+        """Read the replies of a comment through Comment.Replies, once."""
+        if index not in self._legacy_replies:
+            comment = document.Comments(index + 1)
+            record_com_call("Collection.Item")
+            self._legacy_replies[index] = [
+                _entry_from_fields(position, values)[0]
+                for position, values in enumerate(
+                    iter_com_collection(comment.Replies, fields=REPLY_FIELDS)
+                )
+            ]
+        return self._legacy_replies[index]
+
+
+_inventories: Dict[str, CommentInventory] = {}
+_inventories_lock = threading.RLock()
+
+
+def read_comment_inventory(document: Any, use_cache: bool = True) -> CommentInventory:
+    """
+    Return the comment inventory of a document, reusing the cached one if unchanged.
+
+    The cache is keyed by the document fingerprint plus ``Comments.Count``,
+    so comments added or removed outside this server are noticed as well.
+
+    Args:
+        document: The Word document COM object.
+        use_cache: Whether a cached inventory may be returned.
+
+    Returns:
+        The CommentInventory of the document.
+    """
+    key = document_key(document)
+    comments = document.Comments
+    fingerprint = (document_fingerprint(document), comments.Count)
+    record_com_call("Document.Comments")
+    record_com_call("Collection.Count")
+    with _inventories_lock:
+        inventory = _inventories.get(key)
+        if use_cache and inventory is not None and inventory.fingerprint == fingerprint:
+            return inventory
+
+        entries = []
+        dates = []
+        for index, values in enumerate(iter_com_collection(comments, fields=COMMENT_FIELDS)):
+            entry, date = _entry_from_fields(index, values)
+            entries.append(entry)
+            dates.append(date)
+        inventory = CommentInventory(entries, dates, fingerprint)
+        _inventories[key] = inventory
+        return inventory
+
+
+def invalidate_comment_inventory(document: Optional[Any] = None) -> None:
+    """
+    Drop the cached comment inventory of a document, or of all documents.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _inventories_lock:
+        if document is None:
+            _inventories.clear()
+        else:
+            _inventories.pop(document_key(document), None)
+
+
+def _entry_from_fields(index: int, values: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[datetime]]:
+    """Build a comment dict and its comparable date from prefetched fields."""
+    text = values.get("Range.Text")
+    author = values.get("Author")
+    initials = values.get("Initial")
+    date = values.get("Date")
+    entry: Dict[str, Any] = {
+        "index": index,
+        "text": str(text) if text is not None else "[Unable to retrieve text]",
+        "author": str(author) if author is not None else "[Unknown]",
+        "initials": str(initials) if initials is not None else "",
+        "date": str(date) if date is not None else "[Unknown date]",
+        "replies_count": values.get("Replies.Count") or 0,
+    }
+
+    start = values.get("Scope.Start")
+    end = values.get("Scope.End")
+    if start is not None and end is not None:
+        scope_text = values.get("Scope.Text")
+        entry["scope"] = {
+            "start": start,
+            "end": end,
+            "text": scope_text.strip() if scope_text is not None else "",
+        }
+
+    # Comment.Index is 1-based; replies point at their parent via Ancestor
+    ancestor = values.get("Ancestor.Index")
+    entry["parent_index"] = ancestor - 1 if isinstance(ancestor, int) else None
+    return entry, _naive_datetime(date)
+
+
+def _copy_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    copy = dict(entry)
+    if "scope" in copy:
+        copy["scope"] = dict(copy["scope"])
+    return copy
+
+
+def _naive_datetime(value: Any) -> Optional[datetime]:
+    """Return a COM date as a naive datetime, or None if it is not a date."""
+    if not isinstance(value, datetime):
+        return None
+    return value.replace(tzinfo=None) if value.tzinfo is not None else value
+
+
+def _parse_date_bound(value: DateBound) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return _naive_datetime(value)
+    try:
+        return _naive_datetime(datetime.fromisoformat(str(value)))
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}', expected ISO format (YYYY-MM-DD[THH:MM:SS])")
@@ -0,0 +1,281 @@
+"""
+Context interval index for Word Document MCP Server.
+
+Range queries on the context tree (which contexts overlap a span, which
+section contains a range, which paragraph sits at an offset) used to walk
+every context and read ``Range.Start``/``Range.End`` over COM for each one.
+ContextIntervalIndex answers them from the offsets the contexts already
+carry (``DocumentContext.get_offsets``), without touching Word.
+
+Contexts are sorted by start offset once; a segment tree over that order
+keeps, per node, the context with the largest and the smallest end. Overlap
+and containment queries binary-search the start bound and descend the tree,
+pruning subtrees that cannot match: O(log n + k) offset reads for k results.
+
+Anchored offsets are shifted lazily by the edit journal, and every edit maps
+positions monotonically, so the sort order and the per-node extremes stay
+valid across edits; offsets are read when queried. Contexts whose offsets
+are fixed (read once from their Range) do not shift, so the index is rebuilt
+when the edit version changes and such contexts are present.
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+Span = Tuple[int, int]
+
+
+class _IntervalSet:
+    """Contexts of one type sorted by start offset, with max/min end trees."""
+
+    def __init__(self, entries: List[Tuple[Any, Optional[Span], Span]]):
+        entries.sort(key=lambda entry: (entry[2][0], -entry[2][1]))
+        self._contexts = [entry[0] for entry in entries]
+        self._fixed = [entry[1] for entry in entries]
+        size = 1
+        while size < len(entries):
+            size *= 2
+        self._size = size
+        self._max_end = [-1] * (2 * size)
+        self._min_end = [-1] * (2 * size)
+        ends = [entry[2][1] for entry in entries]
+        for position in range(len(entries)):
+            self._max_end[size + position] = position
+            self._min_end[size + position] = position
+        for node in range(size - 1, 0, -1):
+            left, right = self._max_end[2 * node], self._max_end[2 * node + 1]
+            self._max_end[node] = left if right < 0 or (left >= 0 and ends[left] >= ends[right]) else right
+            left, right = self._min_end[2 * node], self._min_end[2 * node + 1]
+            self._min_end[node] = left if right < 0 or (left >= 0 and ends[left] <= ends[right]) else right
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def span(self, position: int) -> Span:
+        fixed = self._fixed[position]
+        if fixed is not None:
+            return fixed
+        return self._contexts[position].get_offsets() or (0, 0)
+
+    def context(self, position: int) -> Any:
+        return self._contexts[position]
+
+    def first_start_after(self, offset: int) -> int:
+        """Return the first position whose start is greater than offset."""
+        low, high = 0, len(self._contexts)
+        while low < high:
+            middle = (low + high) // 2
+            if self.span(middle)[0] <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def first_start_at_least(self, offset: int) -> int:
+        """Return the first position whose start is at least offset."""
+        return self.first_start_after(offset - 1)
+
+    def ends_above(self, high: int, offset: int) -> List[int]:
+        """Positions in [0, high) whose end is greater than offset."""
+        return self._collect(0, high, lambda end: end > offset, self._max_end)
+
+    def ends_at_most(self, low: int, high: int, offset: int) -> List[int]:
+        """Positions in [low, high) whose end is at most offset."""
+        return self._collect(low, high, lambda end: end <= offset, self._min_end)
+
+    def max_end_before(self, high: int) -> int:
+        """Position of the largest end in [0, high), or -1."""
+        best = -1
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, node_low, node_high = stack.pop()
+            if node_low >= high or self._max_end[node] < 0:
+                continue
+            if node_high <= high:
+                candidate = self._max_end[node]
+                if best < 0 or self.span(candidate)[1] >= self.span(best)[1]:
+                    best = candidate
+                continue
+            middle = (node_low + node_high) // 2
+            stack.append((2 * node, node_low, middle))
+            stack.append((2 * node + 1, middle, node_high))
+        return best
+
+    def _collect(self, low: int, high: int, accept: Callable[[int], bool],
+                 extremes: List[int]) -> List[int]:
+        found = []
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, node_low, node_high = stack.pop()
+            if node_high <= low or node_low >= high:
+                continue
+            extreme = extremes[node]
+            # 子树中最有希望的端点也不满足条件时整棵子树剪掉
+            if extreme < 0 or not accept(self.span(extreme)[1]):
+                continue
+            if node >= self._size:
+                found.append(node - self._size)
+                continue
+            middle = (node_low + node_high) // 2
+            stack.append((2 * node + 1, middle, node_high))
+            stack.append((2 * node, node_low, middle))
+        return found
+
+
+class ContextIntervalIndex:
+    """
+    Overlap, containment and nearest-neighbour queries on context offsets.
+
+    The index reads its contexts from a mapping (context ID to context) and
+    rebuilds itself on the next query after ``invalidate``, after the
+    mapping was replaced or changed size, or after an edit when contexts
+    with fixed offsets are present.
+
+    Example:
+        index = ContextIntervalIndex(lambda: context_map)
+        index.overlapping(100, 200, context_type="paragraph")
+    """
+
+    def __init__(self, source: Callable[[], Mapping[str, Any]],
+                 version_source: Optional[Callable[[], int]] = None):
+        self._source = source
+        self._version_source = version_source
+        self._sets: Dict[Optional[str], _IntervalSet] = {}
+        self._built_from: Optional[Mapping[str, Any]] = None
+        self._built_size = -1
+        self._built_version: Optional[int] = None
+        self._has_fixed = False
+        self._dirty = True
+        self.rebuilds = 0
+
+    def invalidate(self) -> None:
+        """Rebuild the index on the next query."""
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._ensure(None) or ())
+
+    def overlapping(self, start: int, end: int, context_type: Optional[str] = None) -> List[Any]:
+        """
+        Return contexts whose span overlaps ``[start, end)``, in document order.
+
+        An empty query span matches the contexts containing that offset.
+        """
+        intervals = self._ensure(context_type)
+        if intervals is None:
+            return []
+        high = intervals.first_start_at_least(max(end, start + 1))
+        positions = sorted(intervals.ends_above(high, start))
+        return [intervals.context(p) for p in positions]
+
+    def containing(self, start: int, end: int, context_type: Optional[str] = None) -> List[Any]:
+        """Return contexts whose span contains ``[start, end]``, innermost first."""
+        intervals = self._ensure(context_type)
+        if intervals is None:
+            return []
+        high = intervals.first_start_after(start)
+        positions = intervals.ends_above(high, end - 1)
+        spans = {p: intervals.span(p) for p in positions}
+        positions.sort(key=lambda p: (spans[p][1] - spans[p][0], -spans[p][0]))
+        return [intervals.context(p) for p in positions]
+
+    def contained_in(self, start: int, end: int, context_type: Optional[str] = None) -> List[Any]:
+        """Return contexts whose span lies inside ``[start, end]``, in document order."""
+        intervals = self._ensure(context_type)
+        if intervals is None:
+            return []
+        low = intervals.first_start_at_least(start)
+        high = intervals.first_start_after(end)
+        positions = sorted(intervals.ends_at_most(low, high, end))
+        return [intervals.context(p) for p in positions]
+
+    def find_exact(self, start: int, end: int, context_type: Optional[str] = None) -> Optional[Any]:
+        """Return a context spanning exactly ``[start, end)``, or None."""
+        intervals = self._ensure(context_type)
+        if intervals is None:
+            return None
+        position = intervals.first_start_at_least(start)
+        while position < len(intervals):
+            span = intervals.span(position)
+            if span[0] != start:
+                break
+            if span[1] == end:
+                return intervals.context(position)
+            position += 1
+        return None
+
+    def nearest(self, offset: int, context_type: Optional[str] = None) -> Optional[Any]:
+        """
+        Return the innermost context containing offset, or else the one
+        whose span is closest to it (the preceding one on a tie).
+        """
+        inside = self.containing(offset, offset + 1, context_type)
+        if inside:
+            return inside[0]
+        intervals = self._ensure(context_type)
+        if intervals is None:
+            return None
+        following = intervals.first_start_after(offset)
+        preceding = intervals.max_end_before(following)
+        candidates = []
+        if preceding >= 0:
+            # 区间为半开区间，前一个上下文的最后一个字符位于end - 1
+            candidates.append((offset - intervals.span(preceding)[1] + 1, 0, preceding))
+        if following < len(intervals):
+            candidates.append((intervals.span(following)[0] - offset, 1, following))
+        if not candidates:
+            return None
+        return intervals.context(min(candidates)[2])
+
+    def _ensure(self, context_type: Optional[str]) -> Optional[_IntervalSet]:
+        contexts = self._source()
+        if contexts is None:
+            return None
+        version = self._version_source() if self._version_source else None
+        if (
+            self._dirty
+            or contexts is not self._built_from
+            or len(contexts) != self._built_size
+            or (self._has_fixed and version != self._built_version)
+        ):
+            self._build(contexts, version)
+        return self._sets.get(context_type)
+
+    def _build(self, contexts: Mapping[str, Any], version: Optional[int]) -> None:
+        grouped: Dict[Optional[str], List[Tuple[Any, Optional[Span], Span]]] = {None: []}
+        has_fixed = False
+        for context in list(contexts.values()):
+            fixed = None
+            span = context.get_offsets() if hasattr(context, "get_offsets") else None
+            if span is None or not _is_anchored(context):
+                fixed = span or _range_span(context)
+                if fixed is None:
+                    continue
+                span = fixed
+                has_fixed = True
+            entry = (context, fixed, span)
+            grouped[None].append(entry)
+            context_type = context.metadata.get("type") if hasattr(context, "metadata") else None
+            if context_type:
+                grouped.setdefault(context_type, []).append(entry)
+        self._sets = {key: _IntervalSet(entries) for key, entries in grouped.items()}
+        self._built_from = contexts
+        self._built_size = len(contexts)
+        self._built_version = version
+        self._has_fixed = has_fixed
+        self._dirty = False
+        self.rebuilds += 1
+
+
+def _is_anchored(context: Any) -> bool:
+    return getattr(context, "_offsets", None) is not None
+
+
+def _range_span(context: Any) -> Optional[Span]:
+    """Read a context's offsets from its Range once, at build time."""
+    range_obj = getattr(context, "range", None)
+    if range_obj is None:
+        return None
+    try:
+        return int(range_obj.Start), int(range_obj.End)
+    except Exception:
+        return None
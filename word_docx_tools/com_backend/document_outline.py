@@ -0,0 +1,234 @@
+"""
+Document outline engine for Word Document MCP Server.
+
+Finding headings by reading ``OutlineLevel``, ``Style`` and ``Range.Text`` of
+every paragraph costs several COM calls per paragraph. This module instead
+runs one Find loop per outline level (1-9) with ``ParagraphFormat.OutlineLevel``
+as the search criterion, and takes heading text and offsets from the
+single-read paragraph snapshot. Only the headings themselves are touched
+individually, to read their style name.
+
+COM cost of ``read_document_outline``:
+
+    7                            snapshot (Content, Text, Start, End,
+                                 Paragraphs.Count) + fingerprint
+    + 9 * 11                     Find setup per outline level
+    + 4 per heading run          Execute, Start, End, Collapse
+    + 5 per heading              style name
+
+Page numbers force Word to paginate, so they are only computed on request,
+from the document's page map (see ``page_map``). The outline is cached per
+document until ``document_fingerprint`` changes.
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from .com_utils import document_key, iter_com_collection, record_com_call
+from .document_revision import document_fingerprint
+from .document_snapshot import read_paragraph_snapshot, read_paragraph_style
+from .page_map import read_page_map
+
+# wdOutlineLevel1 .. wdOutlineLevel9; wdOutlineLevelBodyText is 10
+_HEADING_LEVELS = range(1, 10)
+# wdFindStop
+_WD_FIND_STOP = 0
+# wdCollapseEnd
+_WD_COLLAPSE_END = 0
+
+
+class DocumentOutline:
+    """
+    Headings of one document at one revision.
+
+    Attributes:
+        headings: Heading dicts in document order, each with ``index``
+            (1-based paragraph index), ``text``, ``outline_level``,
+            ``style_name``, ``start`` and ``end``.
+        paragraph_count: Number of paragraphs in the document.
+        fingerprint: The document fingerprint the outline was built at.
+    """
+
+    def __init__(
+        self,
+        headings: List[Dict[str, Any]],
+        paragraph_count: int,
+        fingerprint: Tuple[int, int],
+    ):
+        self.headings = headings
+        self.paragraph_count = paragraph_count
+        self.fingerprint = fingerprint
+
+    def heading_list(
+        self, document: Any = None, include_page_numbers: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Return copies of the headings, optionally with page numbers.
+
+        Args:
+            document: The Word document COM object, needed for page numbers.
+            include_page_numbers: Whether to add a ``page_number`` field.
+
+        Returns:
+            A list of heading dicts that callers may modify.
+        """
+        page_map = read_page_map(document) if include_page_numbers else None
+        headings = []
+        for heading in self.headings:
+            item = dict(heading)
+            if page_map is not None:
+                item["page_number"] = page_map.page_at(heading["start"])
+            headings.append(item)
+        return headings
+
+
+_outlines: Dict[str, DocumentOutline] = {}
+_outlines_lock = threading.RLock()
+
+
+def read_document_outline(document: Any, use_cache: bool = True) -> DocumentOutline:
+    """
+    Return the outline of a document, reusing the cached one if unchanged.
+
+    Args:
+        document: The Word document COM object.
+        use_cache: Whether a cached outline may be returned.
+
+    Returns:
+        The DocumentOutline of the document.
+    """
+    key = document_key(document)
+    fingerprint = document_fingerprint(document)
+    with _outlines_lock:
+        outline = _outlines.get(key)
+        if use_cache and outline is not None and outline.fingerprint == fingerprint:
+            return outline
+
+        outline = _build_outline(document, fingerprint)
+        _outlines[key] = outline
+        return outline
+
+
+def invalidate_document_outline(document: Optional[Any] = None) -> None:
+    """
+    Drop the cached outline of a document, or of all documents.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _outlines_lock:
+        if document is None:
+            _outlines.clear()
+        else:
+            _outlines.pop(document_key(document), None)
+
+
+def _build_outline(document: Any, fingerprint: Tuple[int, int]) -> DocumentOutline:
+    """Build the outline with outline-level Find loops, or by scanning."""
+    snapshot = read_paragraph_snapshot(document, include_styles=False)
+    if snapshot is not None:
+        try:
+            runs = _find_outline_level_runs(document)
+        except Exception:
+            # Find with paragraph formatting is not usable on this document
+            runs = None
+        if runs is not None:
+            headings = _headings_from_runs(document, snapshot.spans, runs)
+            return DocumentOutline(headings, len(snapshot), fingerprint)
+
+    headings, paragraph_count = _scan_paragraph_headings(document)
+    return DocumentOutline(headings, paragraph_count, fingerprint)
+
+
+def _find_outline_level_runs(document: Any) -> List[Tuple[int, int, int]]:
+    """Return (level, start, end) for every run of paragraphs at levels 1-9."""
+    runs: List[Tuple[int, int, int]] = []
+    for level in _HEADING_LEVELS:
+        search_range = document.Content
+        find = search_range.Find
+        find.ClearFormatting()
+        find.Text = ""
+        find.Format = True
+        find.Forward = True
+        find.Wrap = _WD_FIND_STOP
+        find.ParagraphFormat.OutlineLevel = level
+        record_com_call("Document.Content")
+        record_com_call("Range.Find")
+        record_com_call("Find.Setup", 7)
+        record_com_call("Find.ParagraphFormat", 2)
+
+        last_end = -1
+        while True:
+            found = find.Execute()
+            record_com_call("Find.Execute")
+            if not found:
+                break
+            run_start = search_range.Start
+            run_end = search_range.End
+            record_com_call("Range.Start")
+            record_com_call("Range.End")
+            if run_end <= last_end:
+                # Find made no progress, stop instead of looping forever
+                break
+            last_end = run_end
+            runs.append((level, run_start, run_end))
+            search_range.Collapse(_WD_COLLAPSE_END)
+            record_com_call("Range.Collapse")
+    return runs
+
+
+def _headings_from_runs(
+    document: Any,
+    spans: List[Tuple[int, int, str]],
+    runs: List[Tuple[int, int, int]],
+) -> List[Dict[str, Any]]:
+    """Split Find runs into heading paragraphs using the snapshot offsets."""
+    starts = [start for start, _, _ in spans]
+    levels: Dict[int, int] = {}
+    for level, run_start, run_end in runs:
+        index = max(bisect_right(starts, run_start) - 1, 0)
+        while index < len(starts) and starts[index] < run_end:
+            levels.setdefault(index, level)
+            index += 1
+
+    headings = []
+    for index in sorted(levels):
+        start, end, text = spans[index]
+        headings.append({
+            "index": index + 1,
+            "text": text.strip(),
+            "outline_level": levels[index],
+            "style_name": read_paragraph_style(document, start, end),
+            "start": start,
+            "end": end,
+        })
+    return headings
+
+
+def _scan_paragraph_headings(document: Any) -> Tuple[List[Dict[str, Any]], int]:
+    """Find headings by reading OutlineLevel of every paragraph."""
+    headings = []
+    paragraph_count = 0
+    for index, paragraph in enumerate(iter_com_collection(document.Paragraphs), 1):
+        paragraph_count = index
+        outline_level = paragraph.OutlineLevel
+        record_com_call("Paragraph.OutlineLevel")
+        if not 1 <= outline_level <= 9:
+            continue
+
+        paragraph_range = paragraph.Range
+        headings.append({
+            "index": index,
+            "text": paragraph_range.Text.strip(),
+            "outline_level": outline_level,
+            "style_name": paragraph.Style.NameLocal,
+            "start": paragraph_range.Start,
+            "end": paragraph_range.End,
+        })
+        record_com_call("Paragraph.Range")
+        record_com_call("Range.Text")
+        record_com_call("Paragraph.Style", 2)
+        record_com_call("Range.Start")
+        record_com_call("Range.End")
+    return headings, paragraph_count
@@ -0,0 +1,59 @@
+"""
+Document revisions for Word Document MCP Server.
+
+Caches derived from a document (outline, page map, comment inventory, ...)
+have to be dropped when the document changes. Word has no cheap change
+counter, so this module keeps one per document: every edit made through the
+operations layer bumps it. Edits made outside this server are caught by also
+comparing ``Content.End``, which changes with almost every text edit.
+"""
+
+import threading
+from typing import Any, Dict, Tuple
+
+from .com_utils import document_key, record_com_call
+
+_revisions: Dict[str, int] = {}
+_revisions_lock = threading.Lock()
+
+
+def bump_document_revision(document: Any) -> int:
+    """
+    Record that a document was changed by this server.
+
+    Args:
+        document: The Word document COM object.
+
+    Returns:
+        The new revision number.
+    """
+    key = document_key(document)
+    with _revisions_lock:
+        revision = _revisions.get(key, 0) + 1
+        _revisions[key] = revision
+        return revision
+
+
+def get_document_revision(document: Any) -> int:
+    """Return the number of changes recorded for a document."""
+    with _revisions_lock:
+        return _revisions.get(document_key(document), 0)
+
+
+def document_fingerprint(document: Any) -> Tuple[int, int]:
+    """
+    Return a value that changes whenever the document is known to change.
+
+    Combines the recorded revision with ``Content.End`` (two COM calls).
+    Formatting-only edits made outside this server are not detected.
+
+    Args:
+        document: The Word document COM object.
+
+    Returns:
+        A ``(revision, content_end)`` tuple.
+    """
+    content_end = document.Content.End
+    record_com_call("Document.Content")
+    record_com_call("Range.End")
+    return get_document_revision(document), content_end
@@ -0,0 +1,250 @@
+"""
+Document text snapshots for Word Document MCP Server.
+
+This module reads the text of the main document story with a single COM call
+and derives paragraph offsets from it locally, instead of walking the
+``Paragraphs`` collection one item at a time. Paragraph styles are resolved
+in bulk with one Find loop per distinct paragraph style.
+
+COM cost of ``read_paragraph_snapshot`` for one document:
+
+    5                           Content, Text, Start, End, Paragraphs.Count
+    + 5 per distinct style      Range, Paragraphs(1), Style, NameLocal lookup
+    + 8 per distinct style      Find setup (Content, Find, ClearFormatting,
+                                Text, Style, Format, Forward, Wrap)
+    + 4 per style run           Execute, Start, End, Collapse
+
+A style run is a block of consecutive paragraphs sharing a style, so the cost
+depends on how often the style changes rather than on the paragraph count.
+"""
+
+from bisect import bisect_right
+from typing import Any, List, Optional, Tuple
+
+from .com_utils import record_com_call
+
+# Paragraph mark as reported by Range.Text
+PARAGRAPH_MARK = "\r"
+# End-of-cell / end-of-row mark as reported by Range.Text. It occupies a
+# single character position in the document even though it is two
+# characters long in the text.
+END_OF_CELL_MARK = "\r\x07"
+
+# wdFindStop
+_WD_FIND_STOP = 0
+# wdCollapseEnd
+_WD_COLLAPSE_END = 0
+
+
+def split_paragraphs(text: str, base: int = 0) -> List[Tuple[int, int, str]]:
+    """
+    Split story text into paragraphs with their character offsets.
+
+    Args:
+        text: The story text, as returned by ``document.Content.Text``.
+        base: Character position of the first character of ``text``.
+
+    Returns:
+        A list of ``(start, end, text)`` tuples. ``text`` keeps its trailing
+        paragraph mark, matching ``Paragraph.Range.Text``.
+    """
+    spans: List[Tuple[int, int, str]] = []
+    position = base
+    index = 0
+    length = len(text)
+
+    while index < length:
+        mark = text.find(PARAGRAPH_MARK, index)
+        if mark == -1:
+            # Trailing text without a paragraph mark
+            body = text[index:]
+            spans.append((position, position + len(body), body))
+            break
+
+        mark_length = 2 if text.startswith(END_OF_CELL_MARK, mark) else 1
+        paragraph_text = text[index:mark + mark_length]
+        end = position + (mark - index) + 1
+        spans.append((position, end, paragraph_text))
+
+        position = end
+        index = mark + mark_length
+
+    return spans
+
+
+class ParagraphSnapshot:
+    """
+    Offsets, text and styles of every paragraph in a document.
+
+    Attributes:
+        spans: ``(start, end, text)`` tuple for each paragraph.
+        styles: Local style name for each paragraph, or None when styles were
+            not requested.
+        content_start: Start position of the main story.
+        content_end: End position of the main story.
+    """
+
+    def __init__(
+        self,
+        spans: List[Tuple[int, int, str]],
+        styles: List[Optional[str]],
+        content_start: int,
+        content_end: int,
+    ):
+        self.spans = spans
+        self.styles = styles
+        self.content_start = content_start
+        self.content_end = content_end
+
+    @property
+    def starts(self) -> List[int]:
+        """Start positions of all paragraphs, in document order."""
+        return [start for start, _, _ in self.spans]
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+
+def read_paragraph_snapshot(
+    document: Any, include_styles: bool = True
+) -> Optional[ParagraphSnapshot]:
+    """
+    Read all paragraphs of a document with a bounded number of COM calls.
+
+    The offsets derived from the text are only trusted when they agree with
+    Word: the number of paragraphs must match ``Paragraphs.Count`` and the
+    last paragraph must end at ``Content.End``. Content whose text length
+    differs from its character positions (field codes, hidden text, content
+    controls) fails this check.
+
+    Args:
+        document: The Word document COM object.
+        include_styles: Whether to resolve paragraph style names.
+
+    Returns:
+        A ParagraphSnapshot, or None if the snapshot does not match the
+        document and the caller has to fall back to per-paragraph reads.
+    """
+    content = document.Content
+    text = content.Text
+    content_start = content.Start
+    content_end = content.End
+    paragraph_count = document.Paragraphs.Count
+    record_com_call("Document.Content")
+    record_com_call("Range.Text")
+    record_com_call("Range.Start")
+    record_com_call("Range.End")
+    record_com_call("Paragraphs.Count", 2)
+
+    spans = split_paragraphs(text or "", content_start)
+    if len(spans) != paragraph_count:
+        return None
+    if spans and spans[-1][1] != content_end:
+        return None
+
+    if include_styles:
+        styles = collect_paragraph_styles(document, spans)
+    else:
+        styles = [None] * len(spans)
+
+    return ParagraphSnapshot(spans, styles, content_start, content_end)
+
+
+def collect_paragraph_styles(
+    document: Any, spans: List[Tuple[int, int, str]]
+) -> List[Optional[str]]:
+    """
+    Resolve the paragraph style of every span with one Find loop per style.
+
+    The style of the first unresolved paragraph is read directly, then a
+    forward Find for that style marks every run of paragraphs using it. This
+    repeats until every paragraph has a style.
+
+    Args:
+        document: The Word document COM object.
+        spans: Paragraph spans as returned by ``split_paragraphs``.
+
+    Returns:
+        The local style name of each paragraph.
+    """
+    starts = [start for start, _, _ in spans]
+    styles: List[Optional[str]] = [None] * len(spans)
+    find_available = True
+    next_index = 0
+
+    while True:
+        while next_index < len(styles) and styles[next_index] is not None:
+            next_index += 1
+        if next_index >= len(styles):
+            break
+
+        start, end, _ = spans[next_index]
+        style_name = read_paragraph_style(document, start, end)
+
+        if find_available:
+            try:
+                _mark_style_runs(document, style_name, starts, styles)
+            except Exception:
+                # Find is not usable on this document; resolve one by one
+                find_available = False
+
+        # Find did not cover the paragraph that started this pass
+        if styles[next_index] is None:
+            styles[next_index] = style_name
+
+    return styles
+
+
+def read_paragraph_style(document: Any, start: int, end: int) -> str:
+    """Read the local style name of the paragraph between start and end."""
+    name = document.Range(start, end).Paragraphs(1).Style.NameLocal
+    record_com_call("Document.Range")
+    record_com_call("Range.Paragraphs", 2)
+    record_com_call("Paragraph.Style")
+    record_com_call("Style.NameLocal")
+    return name
+
+
+def _mark_style_runs(
+    document: Any,
+    style_name: str,
+    starts: List[int],
+    styles: List[Optional[str]],
+) -> None:
+    """Assign style_name to every unresolved paragraph found by a style Find."""
+    search_range = document.Content
+    find = search_range.Find
+    find.ClearFormatting()
+    find.Text = ""
+    find.Style = style_name
+    find.Format = True
+    find.Forward = True
+    find.Wrap = _WD_FIND_STOP
+    record_com_call("Document.Content")
+    record_com_call("Range.Find")
+    record_com_call("Find.Setup", 6)
+
+    last_end = -1
+    while True:
+        found = find.Execute()
+        record_com_call("Find.Execute")
+        if not found:
+            break
+
+        run_start = search_range.Start
+        run_end = search_range.End
+        record_com_call("Range.Start")
+        record_com_call("Range.End")
+        if run_end <= last_end:
+            # Find made no progress, stop instead of looping forever
+            break
+        last_end = run_end
+
+        index = max(bisect_right(starts, run_start) - 1, 0)
+        while index < len(starts) and starts[index] < run_end:
+            if styles[index] is None:
+                styles[index] = style_name
+            index += 1
+
+        search_range.Collapse(_WD_COLLAPSE_END)
+        record_com_call("Range.Collapse")
@@ -0,0 +1,355 @@
+"""
+Edit journal for Word Document MCP Server.
+
+Context tree nodes remember the offsets their objects had when the tree was
+built. An edit moves every later object, so the stored offsets went stale
+after the first insertion and the only remedy was rebuilding the tree.
+
+The journal records every mutation the operations layer performs as a
+replacement of ``[start, end)`` with new text (see ``record_range_replaced``
+in ``paragraph_index``). Offsets read from Word are anchored in an
+OffsetTree: a Fenwick tree over the sorted anchored offsets whose weights are
+the gaps between neighbours. An edit changes the gaps around it, O(log n) for
+an edit that does not swallow anchored offsets, and a node's current offset
+is a prefix sum, also O(log n). Nodes are never touched by an edit; they are
+shifted when they are read.
+
+For a replacement of ``[start, end)`` by ``n`` characters, an offset
+
+* at or before ``start`` stays where it is (text inserted at an offset goes
+  into the object starting there),
+* inside ``(start, end)`` collapses to ``start``,
+* at or after ``end`` moves by ``n - (end - start)``.
+
+Edits that cannot be described as one replacement (a replace-all, a bulk
+cell write) drop the journal with ``invalidate_edit_journal``, which marks
+every tree anchored in it stale. Edits made outside this server are not
+recorded at all; to catch them, a tree remembers ``Content.End`` and the
+journal's net length change at anchor time, and ``anchored_offsets_current``
+compares them with the document's ``Content.End`` before offsets are used.
+Callers rebuild their offsets when the check fails.
+"""
+
+import threading
+import weakref
+from bisect import bisect_left
+from collections import deque
+from operator import sub
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from .com_utils import document_key, record_com_call
+
+# Number of recent edits kept per journal for get_edit_journal_stats
+_RECENT_EDITS = 50
+
+
+class OffsetTree:
+    """
+    Fenwick tree mapping anchored offsets to their current positions.
+
+    Example:
+        tree = OffsetTree([0, 10, 25])
+        tree.apply(5, 5, 3)      # 3 characters inserted at 5
+        tree.current(10)         # 13
+    """
+
+    def __init__(self, offsets: Iterable[int], version: int = 0,
+                 content_end: Optional[int] = None, net_delta: int = 0):
+        self._offsets: List[int] = sorted(set(offsets))
+        self.version = version
+        # Content.End and the journal's net delta when the offsets were read
+        self.content_end = content_end
+        self.net_delta = net_delta
+        # Set when the journal stops receiving this tree's edits
+        self.stale = False
+        # The EditJournal the tree is anchored in, set by EditJournal.anchor
+        self.journal: Optional["EditJournal"] = None
+        size = len(self._offsets)
+        # Slot i holds the gap between offset i and offset i-1 (1-based)
+        self._weights = [0, *map(sub, self._offsets, [0, *self._offsets])]
+        # Linear-time Fenwick construction
+        self._tree = self._weights.copy()
+        for slot in range(1, size + 1):
+            parent = slot + (slot & -slot)
+            if parent <= size:
+                self._tree[parent] += self._tree[slot]
+        self._mask = 1 << size.bit_length() if size else 0
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, offset: int) -> bool:
+        slot = bisect_left(self._offsets, offset)
+        return slot < len(self._offsets) and self._offsets[slot] == offset
+
+    def current(self, offset: int) -> Optional[int]:
+        """
+        Return the current position of an anchored offset.
+
+        Returns:
+            The shifted offset, or None if the offset was not anchored.
+        """
+        slot = bisect_left(self._offsets, offset)
+        if slot == len(self._offsets) or self._offsets[slot] != offset:
+            return None
+        return self._prefix(slot + 1)
+
+    def apply(self, start: int, removed: int, inserted: int) -> None:
+        """
+        Apply a replacement of ``removed`` characters at ``start`` by
+        ``inserted`` characters, given in current positions.
+        """
+        size = len(self._offsets)
+        if removed <= 0:
+            # 插入：start之后的第一个偏移量及其后的偏移量整体后移
+            target = self._last_at_most(start) + 1
+            if target <= size and inserted:
+                self._add(target, inserted)
+            return
+
+        end = start + removed
+        # 偏移量落在end及其后的第一个槽位，替换后位于start + inserted
+        target = self._last_at_most(end - 1) + 1
+        slot = self._last_at_most(start) + 1
+        low = self._prefix(slot - 1)
+        while slot <= size and low < end:
+            high = low + self._weights[slot]
+            cut = min(high, end) - max(low, start)
+            if cut > 0:
+                self._add(slot, -cut)
+            low = high
+            slot += 1
+        if target <= size and inserted:
+            self._add(target, inserted)
+
+    def _add(self, slot: int, delta: int) -> None:
+        self._weights[slot] += delta
+        size = len(self._offsets)
+        while slot <= size:
+            self._tree[slot] += delta
+            slot += slot & -slot
+
+    def _prefix(self, slot: int) -> int:
+        total = 0
+        while slot > 0:
+            total += self._tree[slot]
+            slot -= slot & -slot
+        return total
+
+    def _last_at_most(self, position: int) -> int:
+        """Return the last slot whose current offset is <= position, or 0."""
+        slot = 0
+        remaining = position
+        step = self._mask
+        size = len(self._offsets)
+        while step:
+            candidate = slot + step
+            if candidate <= size and self._tree[candidate] <= remaining:
+                slot = candidate
+                remaining -= self._tree[candidate]
+            step >>= 1
+        return slot
+
+
+class EditJournal:
+    """
+    Edits made to one document since its offsets were anchored.
+
+    Every OffsetTree created with ``anchor`` receives the edits recorded
+    after it; trees that are no longer referenced drop out automatically.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.version = 0
+        self._lock = threading.RLock()
+        self._trees: "weakref.WeakSet[OffsetTree]" = weakref.WeakSet()
+        self._recent: Deque[Dict[str, int]] = deque(maxlen=_RECENT_EDITS)
+        self._net_delta = 0
+
+    def anchor(self, offsets: Iterable[int], content_end: Optional[int] = None) -> OffsetTree:
+        """
+        Anchor offsets read from Word now, so later edits shift them.
+
+        Args:
+            offsets: Offsets in the document's current coordinates.
+            content_end: The document's ``Content.End`` when the offsets were
+                read, used by ``is_current`` to detect unrecorded edits.
+
+        Returns:
+            The OffsetTree resolving the offsets to current positions.
+        """
+        with self._lock:
+            tree = OffsetTree(offsets, self.version, content_end, self._net_delta)
+            tree.journal = self
+            self._trees.add(tree)
+            return tree
+
+    def is_current(self, tree: OffsetTree, content_end: int) -> bool:
+        """
+        Return whether a tree's offsets still match the document.
+
+        The tree must be anchored in this journal and not stale, and the
+        ``Content.End`` it was anchored at, shifted by the edits recorded
+        since, must equal the document's current ``Content.End``.
+        """
+        with self._lock:
+            if tree.stale or tree not in self._trees:
+                return False
+            if tree.content_end is None:
+                return True
+            return tree.content_end + self._net_delta - tree.net_delta == content_end
+
+    def expected_content_end(self, tree: OffsetTree) -> Optional[int]:
+        """
+        Return the ``Content.End`` the document has if a tree is current.
+
+        Offsets read later can be anchored with this value instead of
+        reading ``Content.End`` again: if the document was changed without
+        the journal knowing, the new tree fails ``is_current`` like the old
+        one does.
+
+        Returns:
+            The shifted ``Content.End``, or None if the tree is stale, not
+            anchored in this journal or anchored without ``Content.End``.
+        """
+        with self._lock:
+            if tree.stale or tree not in self._trees or tree.content_end is None:
+                return None
+            return tree.content_end + self._net_delta - tree.net_delta
+
+    def detach(self) -> None:
+        """Mark every anchored tree stale and stop shifting them."""
+        with self._lock:
+            for tree in list(self._trees):
+                tree.stale = True
+            self._trees = weakref.WeakSet()
+
+    def record(self, start: int, end: int, text: str = "", length: Optional[int] = None) -> int:
+        """
+        Record the replacement of ``[start, end)`` by text.
+
+        Args:
+            start: Start offset of the replaced span before the edit.
+            end: End offset of the replaced span before the edit.
+            text: The text that replaced the span.
+            length: Number of characters inserted, when the inserted content
+                is not known as text (pictures, tables, fields).
+
+        Returns:
+            The journal version after the edit.
+        """
+        removed = max(end - start, 0)
+        inserted = len(text or "") if length is None else length
+        with self._lock:
+            self.version += 1
+            for tree in list(self._trees):
+                tree.apply(start, removed, inserted)
+            self._net_delta += inserted - removed
+            self._recent.append({
+                "version": self.version,
+                "position": start,
+                "removed": removed,
+                "inserted": inserted,
+            })
+            return self.version
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "document": self.key,
+                "version": self.version,
+                "net_delta": self._net_delta,
+                "anchored_trees": len(self._trees),
+                "anchored_offsets": sum(len(tree) for tree in self._trees),
+                "recent_edits": list(self._recent),
+            }
+
+
+_journals: Dict[str, EditJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_edit_journal(document: Any) -> EditJournal:
+    """Return the edit journal of a document, creating it if needed."""
+    key = document_key(document)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = EditJournal(key)
+            _journals[key] = journal
+        return journal
+
+
+def record_edit(document: Any, start: int, end: int, text: str = "",
+                length: Optional[int] = None) -> None:
+    """
+    Record an edit in a document's journal (see ``EditJournal.record``).
+
+    Documents without a journal have nothing anchored, so the edit is
+    dropped without creating one.
+    """
+    with _journals_lock:
+        journal = _journals.get(document_key(document))
+    if journal is not None:
+        journal.record(start, end, text, length)
+
+
+def invalidate_edit_journal(document: Optional[Any] = None) -> None:
+    """
+    Drop the journal of a document, or of all documents.
+
+    Trees anchored before keep their current positions but receive no
+    further edits and are marked stale. Call this when the document is
+    closed, and after edits that cannot be recorded as a replacement.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _journals_lock:
+        if document is None:
+            dropped = list(_journals.values())
+            _journals.clear()
+        else:
+            journal = _journals.pop(document_key(document), None)
+            dropped = [journal] if journal is not None else []
+    for journal in dropped:
+        journal.detach()
+
+
+def anchored_offsets_current(document: Any, tree: Optional[OffsetTree]) -> bool:
+    """
+    Check a tree's anchored offsets against the document (one COM read).
+
+    Args:
+        document: The Word document COM object the offsets were read from.
+        tree: The OffsetTree returned by ``EditJournal.anchor``.
+
+    Returns:
+        False if the tree is stale or the document's length changed in a way
+        the journal did not record; the offsets must then be read again.
+    """
+    if tree is None or tree.stale:
+        return False
+    content_end = document.Content.End
+    record_com_call("Document.Content")
+    record_com_call("Range.End")
+    with _journals_lock:
+        journal = _journals.get(document_key(document))
+    return journal is not None and journal.is_current(tree, content_end)
+
+
+def get_edit_journal_stats(document: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Return journal statistics of a document, or of all documents.
+
+    Returns:
+        The journal's version, net length change, anchored trees and recent
+        edits, or a dict of them keyed by document.
+    """
+    with _journals_lock:
+        if document is not None:
+            journal = _journals.get(document_key(document))
+            return journal.get_stats() if journal is not None else {}
+        journals = list(_journals.values())
+    return {journal.key: journal.get_stats() for journal in journals}
@@ -0,0 +1,250 @@
+"""
+Context metadata index for Word Document MCP Server.
+
+Type and metadata queries on the context tree (``search_contexts_by_type``,
+``find_contexts_by_metadata``, child lookups) used to scan every context and
+compare its metadata. MetadataIndex keeps one hash index per configured
+metadata key, ``value -> contexts``, so an equality query costs O(k) for k
+matches.
+
+IndexedContextMap is the context ID -> context dict used by AppContext and
+ContextManager. It indexes contexts as they are inserted and drops them as
+they are removed, and registers itself with each context so that metadata
+changed through the context's own methods (``_update_metadata``,
+``add_child_context``, ...) is reindexed right away. Lookups re-check the
+current metadata, so a value written into ``metadata`` directly can cause a
+miss until the context is reindexed, never a wrong match.
+"""
+
+from collections.abc import Hashable
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Metadata keys indexed by default (WORD_CONTEXT_INDEX_KEYS overrides them)
+DEFAULT_INDEXED_KEYS: Tuple[str, ...] = ("type", "style_name", "is_heading", "parent_id")
+
+_MISSING = object()
+
+
+class MetadataIndex:
+    """
+    Hash indexes on a set of metadata keys.
+
+    Example:
+        index = MetadataIndex(("type", "style_name"))
+        index.add(context)
+        index.lookup("type", "paragraph")
+    """
+
+    def __init__(self, keys: Iterable[str] = DEFAULT_INDEXED_KEYS):
+        self.keys: Tuple[str, ...] = tuple(dict.fromkeys(keys))
+        # key -> value -> context_id -> context（字典保持插入顺序）
+        self._buckets: Dict[str, Dict[Any, Dict[str, Any]]] = {key: {} for key in self.keys}
+        # context_id -> key -> 建立索引时的值
+        self._indexed: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexed)
+
+    def is_indexed(self, key: str) -> bool:
+        return key in self._buckets
+
+    def add(self, context: Any) -> None:
+        """Index a context under its current metadata values."""
+        context_id = context.context_id
+        if context_id in self._indexed:
+            self.reindex(context)
+            return
+        values = {}
+        for key in self.keys:
+            value = _metadata_value(context, key)
+            if value is not _MISSING:
+                self._buckets[key].setdefault(value, {})[context_id] = context
+                values[key] = value
+        self._indexed[context_id] = values
+
+    def discard(self, context_id: str) -> None:
+        """Remove a context from every index."""
+        values = self._indexed.pop(context_id, None)
+        if not values:
+            return
+        for key, value in values.items():
+            self._unlink(key, value, context_id)
+
+    def reindex(self, context: Any) -> None:
+        """Move a context to the buckets of its current metadata values."""
+        context_id = context.context_id
+        values = self._indexed.get(context_id)
+        if values is None:
+            return
+        for key in self.keys:
+            old = values.get(key, _MISSING)
+            new = _metadata_value(context, key)
+            if old is new or (old is not _MISSING and new is not _MISSING
+                              and type(old) is type(new) and old == new):
+                continue
+            if old is not _MISSING:
+                self._unlink(key, old, context_id)
+                del values[key]
+            if new is not _MISSING:
+                self._buckets[key].setdefault(new, {})[context_id] = context
+                values[key] = new
+
+    def clear(self) -> None:
+        for buckets in self._buckets.values():
+            buckets.clear()
+        self._indexed.clear()
+
+    def lookup(self, key: str, value: Any) -> Optional[List[Any]]:
+        """
+        Return the contexts whose metadata ``key`` equals value.
+
+        Returns:
+            The matching contexts in insertion order, or None if the key is
+            not indexed or the value is not hashable (scan instead).
+        """
+        if key not in self._buckets or not _hashable(value):
+            return None
+        bucket = self._buckets[key].get(value)
+        if not bucket:
+            return []
+        return [c for c in bucket.values() if _metadata_value(c, key) == value]
+
+    def find(self, filters: Mapping[str, Any]) -> Optional[List[Any]]:
+        """
+        Return the contexts matching every key/value pair of filters.
+
+        Starts from the smallest bucket among the indexed filter keys and
+        checks every filter against each candidate's current metadata, so
+        filters on keys that are not indexed or have unhashable values (a
+        ``page_setup`` dict, a list) match the way a full scan does.
+
+        Returns:
+            The matching contexts, or None if no filter key can use an index.
+        """
+        best: Optional[Dict[str, Any]] = None
+        for key, value in filters.items():
+            if key not in self._buckets or not _hashable(value):
+                continue
+            bucket = self._buckets[key].get(value, {})
+            if best is None or len(bucket) < len(best):
+                best = bucket
+        if best is None:
+            return None
+        return [
+            context for context in best.values()
+            if all(_metadata_matches(context, key, value) for key, value in filters.items())
+        ]
+
+    def count(self, key: str, value: Any) -> Optional[int]:
+        """Return the number of indexed contexts with a metadata value."""
+        if key not in self._buckets or not _hashable(value):
+            return None
+        return len(self._buckets[key].get(value, ()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "indexed_contexts": len(self._indexed),
+            "keys": {key: len(buckets) for key, buckets in self._buckets.items()},
+        }
+
+    def _unlink(self, key: str, value: Any, context_id: str) -> None:
+        bucket = self._buckets[key].get(value)
+        if bucket is not None:
+            bucket.pop(context_id, None)
+            if not bucket:
+                del self._buckets[key][value]
+
+
+class IndexedContextMap(dict):
+    """
+    Context ID -> context dict that maintains a MetadataIndex.
+
+    Example:
+        context_map = IndexedContextMap(keys=("type", "parent_id"))
+        context_map[context.context_id] = context
+        context_map.index.lookup("type", "table")
+    """
+
+    def __init__(self, *args: Any, keys: Iterable[str] = DEFAULT_INDEXED_KEYS, **kwargs: Any):
+        super().__init__()
+        self.index = MetadataIndex(keys)
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, context_id: str, context: Any) -> None:
+        previous = dict.get(self, context_id)
+        if previous is not None and previous is not context:
+            self._detach(context_id, previous)
+        super().__setitem__(context_id, context)
+        self.index.add(context)
+        listeners = getattr(context, "_index_listeners", None)
+        if listeners is not None and self.index.reindex not in listeners:
+            listeners.append(self.index.reindex)
+
+    def __delitem__(self, context_id: str) -> None:
+        context = self[context_id]
+        super().__delitem__(context_id)
+        self._detach(context_id, context)
+
+    def pop(self, context_id: str, *default: Any) -> Any:
+        if context_id not in self:
+            return super().pop(context_id, *default)
+        context = self[context_id]
+        del self[context_id]
+        return context
+
+    def popitem(self) -> Tuple[str, Any]:
+        context_id, context = super().popitem()
+        self._detach(context_id, context)
+        return context_id, context
+
+    def setdefault(self, context_id: str, default: Any = None) -> Any:
+        if context_id not in self:
+            self[context_id] = default
+        return self[context_id]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for context_id, context in dict(*args, **kwargs).items():
+            self[context_id] = context
+
+    def clear(self) -> None:
+        for context_id, context in list(self.items()):
+            self._detach(context_id, context)
+        super().clear()
+        self.index.clear()
+
+    def _detach(self, context_id: str, context: Any) -> None:
+        self.index.discard(context_id)
+        listeners = getattr(context, "_index_listeners", None)
+        if listeners is not None and self.index.reindex in listeners:
+            listeners.remove(self.index.reindex)
+
+
+def _metadata_value(context: Any, key: str) -> Any:
+    metadata = getattr(context, "metadata", None)
+    if not metadata or key not in metadata:
+        return _MISSING
+    value = metadata[key]
+    return value if _hashable(value) else _MISSING
+
+
+def _metadata_matches(context: Any, key: str, value: Any) -> bool:
+    metadata = getattr(context, "metadata", None)
+    return bool(metadata) and key in metadata and metadata[key] == value
+
+
+def _hashable(value: Any) -> bool:
+    if not isinstance(value, Hashable):
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def parse_indexed_keys(value: Optional[str]) -> Tuple[str, ...]:
+    """Parse a comma separated key list, falling back to the default keys."""
+    if not value:
+        return DEFAULT_INDEXED_KEYS
+    keys = tuple(key.strip() for key in value.split(",") if key.strip())
+    return keys or DEFAULT_INDEXED_KEYS
@@ -0,0 +1,252 @@
+"""
+Bounded operation metrics for Word Document MCP Server.
+
+``AppContext`` and ``ContextManager`` record the duration of every operation
+together with extra values such as ``result_count`` or ``operations_count``.
+They used to append every value to a list, so memory grew for as long as the
+server ran. MetricStore keeps running aggregates (count, sum, min, max, last)
+for each operation and value, plus a reservoir sample (Algorithm R) from
+which percentiles are estimated.
+
+All stores share a MetricBudget, a hard ceiling on the estimated memory of
+their series and samples (WORD_METRICS_MAX_BYTES, 4 MB by default). Once it
+is spent, reservoirs stop growing and keep replacing their existing samples,
+and new series are dropped and counted; the aggregates of existing series
+stay exact.
+"""
+
+import os
+import random
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_MAX_METRIC_BYTES = 4 * 1024 * 1024
+
+DEFAULT_RESERVOIR_SIZE = 256
+
+# Estimated cost of one sample (list slot + float) and of one series
+_SAMPLE_BYTES = 8 + sys.getsizeof(0.0)
+_SERIES_BYTES = 512
+
+
+class MetricBudget:
+    """Memory ceiling shared by metric stores."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_METRIC_BYTES):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.used_bytes + size > self.max_bytes:
+                self.denied += 1
+                return False
+            self.used_bytes += size
+            return True
+
+    def release(self, size: int) -> None:
+        with self._lock:
+            self.used_bytes = max(self.used_bytes - size, 0)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "used_bytes": self.used_bytes,
+                "denied_reservations": self.denied,
+            }
+
+
+class _Series:
+    """Running aggregates and a reservoir sample of one value stream."""
+
+    __slots__ = ("count", "total", "min", "max", "last", "samples", "capacity")
+
+    def __init__(self, capacity: int):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.last: Optional[float] = None
+        self.samples: List[float] = []
+        self.capacity = capacity
+
+    def add(self, value: float, budget: MetricBudget, rng: random.Random) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.last = value
+        if len(self.samples) < self.capacity:
+            if budget.reserve(_SAMPLE_BYTES):
+                self.samples.append(value)
+                return
+            # 预算用完：蓄水池停止增长，之后只替换已有样本
+            self.capacity = len(self.samples)
+        slot = rng.randrange(self.count)
+        if slot < len(self.samples):
+            self.samples[slot] = value
+
+    def snapshot(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+
+        def quantile(q: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "last": self.last,
+            "p50": quantile(0.5),
+            "p90": quantile(0.9),
+            "p99": quantile(0.99),
+            "samples": len(ordered),
+        }
+
+    @property
+    def size(self) -> int:
+        return _SERIES_BYTES + len(self.samples) * _SAMPLE_BYTES
+
+
+class _OperationMetrics:
+    __slots__ = ("success_count", "fail_count", "duration", "metrics", "flags")
+
+    def __init__(self, capacity: int):
+        self.success_count = 0
+        self.fail_count = 0
+        self.duration = _Series(capacity)
+        self.metrics: Dict[str, _Series] = {}
+        self.flags: Dict[str, int] = {}
+
+    @property
+    def size(self) -> int:
+        # 操作本身预留的开销计入duration序列
+        return (_SERIES_BYTES * len(self.flags) + self.duration.size
+                + sum(series.size for series in self.metrics.values()))
+
+
+class MetricStore:
+    """
+    Per-operation metrics with bounded memory.
+
+    Example:
+        store = MetricStore()
+        store.record("search_contexts", 0.004, result_count=12)
+        store.snapshot()["search_contexts"]["metrics"]["result_count"]["avg"]
+    """
+
+    def __init__(self, budget: Optional[MetricBudget] = None,
+                 reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+                 seed: Optional[int] = None):
+        self.budget = budget if budget is not None else get_metric_budget()
+        self.reservoir_size = reservoir_size
+        self.dropped_series = 0
+        self._operations: Dict[str, _OperationMetrics] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def record(self, operation_type: str, duration: float, success: bool = True, **metrics: Any) -> None:
+        """
+        Record one operation.
+
+        Numeric values (including bools) feed a series per key; other values
+        only count how often the key was reported.
+        """
+        with self._lock:
+            operation = self._operations.get(operation_type)
+            if operation is None:
+                if not self.budget.reserve(_SERIES_BYTES):
+                    self.dropped_series += 1
+                    return
+                operation = _OperationMetrics(self.reservoir_size)
+                self._operations[operation_type] = operation
+            if success:
+                operation.success_count += 1
+            else:
+                operation.fail_count += 1
+            operation.duration.add(duration, self.budget, self._rng)
+
+            for key, value in metrics.items():
+                if isinstance(value, (int, float)):
+                    series = operation.metrics.get(key)
+                    if series is None:
+                        if not self.budget.reserve(_SERIES_BYTES):
+                            self.dropped_series += 1
+                            continue
+                        series = _Series(self.reservoir_size)
+                        operation.metrics[key] = series
+                    series.add(value, self.budget, self._rng)
+                elif key in operation.flags:
+                    operation.flags[key] += 1
+                elif self.budget.reserve(_SERIES_BYTES):
+                    operation.flags[key] = 1
+                else:
+                    self.dropped_series += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the metrics of every operation.
+
+        Returns:
+            Operation type -> count, total_time, success_count, fail_count,
+            duration aggregates and percentiles, and per-key metrics.
+        """
+        with self._lock:
+            result = {}
+            for name, operation in self._operations.items():
+                duration = operation.duration.snapshot()
+                metrics = {key: series.snapshot() for key, series in operation.metrics.items()}
+                metrics.update({key: {"count": count} for key, count in operation.flags.items()})
+                result[name] = {
+                    "count": duration["count"],
+                    "total_time": duration["sum"],
+                    "success_count": operation.success_count,
+                    "fail_count": operation.fail_count,
+                    "duration": duration,
+                    "metrics": metrics,
+                }
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the memory used by this store and the shared budget."""
+        with self._lock:
+            used = sum(operation.size for operation in self._operations.values())
+            return {
+                "operations": len(self._operations),
+                "estimated_bytes": used,
+                "dropped_series": self.dropped_series,
+                "budget": self.budget.get_stats(),
+            }
+
+    def reset(self) -> None:
+        """Drop all metrics and return their memory to the budget."""
+        with self._lock:
+            for operation in self._operations.values():
+                self.budget.release(operation.size)
+            self._operations.clear()
+            self.dropped_series = 0
+
+
+_budget: Optional[MetricBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_metric_budget() -> MetricBudget:
+    """Return the budget shared by all metric stores (WORD_METRICS_MAX_BYTES)."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            try:
+                max_bytes = int(os.environ.get("WORD_METRICS_MAX_BYTES") or 0)
+            except ValueError:
+                max_bytes = 0
+            _budget = MetricBudget(max_bytes if max_bytes > 0 else DEFAULT_MAX_METRIC_BYTES)
+        return _budget
@@ -0,0 +1,131 @@
+"""
+Page map index for Word Document MCP Server.
+
+``Range.Information(wdActiveEndPageNumber)`` and
+``Information(wdNumberOfPagesInDocument)`` make Word repaginate before they
+answer, and asking once per range multiplies that cost. A PageMap records the
+start offset of every page once per document revision (one page count plus
+one ``GoTo`` per page); afterwards, mapping an offset to its page is a binary
+search in Python.
+
+The map is cached per document until ``document_fingerprint`` changes, the
+same way the outline is.
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from .com_utils import document_key, record_com_call
+from .document_revision import document_fingerprint
+
+# wdNumberOfPagesInDocument
+_WD_NUMBER_OF_PAGES_IN_DOCUMENT = 4
+# wdGoToPage
+_WD_GO_TO_PAGE = 1
+# wdGoToAbsolute
+_WD_GO_TO_ABSOLUTE = 1
+
+
+class PageMap:
+    """
+    Start offsets of the pages of one document at one revision.
+
+    Attributes:
+        page_starts: Start offset of each page in the main text story,
+            ascending; ``page_starts[0]`` belongs to page 1.
+        fingerprint: The document fingerprint the map was built at.
+    """
+
+    __slots__ = ("page_starts", "fingerprint")
+
+    def __init__(self, page_starts: List[int], fingerprint: Tuple[int, int]):
+        self.page_starts = page_starts
+        self.fingerprint = fingerprint
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document."""
+        return len(self.page_starts)
+
+    def page_at(self, offset: int) -> int:
+        """
+        Return the 1-based page number containing a character offset.
+
+        Offsets before the first page map to page 1 and offsets past the end
+        map to the last page.
+        """
+        return max(bisect_right(self.page_starts, offset), 1)
+
+    def page_span(self, page: int) -> Tuple[int, Optional[int]]:
+        """
+        Return the (start, end) offsets of a page; end is None for the last page.
+
+        Raises:
+            IndexError: If the page number is out of range.
+        """
+        if not 1 <= page <= len(self.page_starts):
+            raise IndexError(f"Page {page} out of range (1-{len(self.page_starts)})")
+        end = self.page_starts[page] if page < len(self.page_starts) else None
+        return self.page_starts[page - 1], end
+
+    def __repr__(self) -> str:
+        return f"PageMap(page_count={self.page_count}, fingerprint={self.fingerprint})"
+
+
+_page_maps: Dict[str, PageMap] = {}
+_page_maps_lock = threading.RLock()
+
+
+def read_page_map(document: Any, use_cache: bool = True) -> PageMap:
+    """
+    Return the page map of a document, reusing the cached one if unchanged.
+
+    Args:
+        document: The Word document COM object.
+        use_cache: Whether a cached map may be returned.
+
+    Returns:
+        The PageMap of the document.
+    """
+    key = document_key(document)
+    fingerprint = document_fingerprint(document)
+    with _page_maps_lock:
+        page_map = _page_maps.get(key)
+        if use_cache and page_map is not None and page_map.fingerprint == fingerprint:
+            return page_map
+
+        page_map = PageMap(_read_page_starts(document), fingerprint)
+        _page_maps[key] = page_map
+        return page_map
+
+
+def invalidate_page_map(document: Optional[Any] = None) -> None:
+    """
+    Drop the cached page map of a document, or of all documents.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _page_maps_lock:
+        if document is None:
+            _page_maps.clear()
+        else:
+            _page_maps.pop(document_key(document), None)
+
+
+def _read_page_starts(document: Any) -> List[int]:
+    """Read the start offset of every page, paginating the document once."""
+    page_count = document.Content.Information(_WD_NUMBER_OF_PAGES_IN_DOCUMENT)
+    record_com_call("Document.Content")
+    record_com_call("Range.Information")
+
+    page_starts = [0]
+    for page in range(2, page_count + 1):
+        page_range = document.GoTo(_WD_GO_TO_PAGE, _WD_GO_TO_ABSOLUTE, page)
+        start = page_range.Start
+        record_com_call("Document.GoTo")
+        record_com_call("Range.Start")
+        # GoTo never goes backwards; keep the list sorted if Word disagrees
+        page_starts.append(max(start, page_starts[-1]))
+    return page_starts
@@ -0,0 +1,269 @@
+"""
+Paragraph offset index for Word Document MCP Server.
+
+``document.Paragraphs(i)`` walks the paragraph collection from the start on
+every call, so resolving paragraph locators deep in a large document is slow
+and repeats the walk each time. This module keeps, per document, a sorted
+list of paragraph start offsets so that a paragraph ordinal maps directly to
+``document.Range(start, end)`` and an offset maps back to its ordinal with a
+binary search.
+
+Edits made by the operations layer are applied to the index incrementally via
+``record_range_replaced``; inserted pictures, tables and fields, whose
+paragraphs cannot be placed from text, are recorded with
+``record_range_insertion`` and drop the index. Edits made outside this server (for example by a
+user typing in Word) change ``Content.End`` and cause a rebuild on next use.
+"""
+
+import threading
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from .com_utils import document_key, iter_com_collection, record_com_call
+from .document_revision import bump_document_revision
+from .document_snapshot import read_paragraph_snapshot
+from .edit_journal import invalidate_edit_journal, record_edit
+
+# wdMainTextStory
+_WD_MAIN_TEXT_STORY = 1
+
+
+def _paragraph_mark_offsets(text: str) -> List[int]:
+    """Offsets just past each paragraph mark in text inserted through COM."""
+    offsets = []
+    index = 0
+    length = len(text)
+    while index < length:
+        char = text[index]
+        if char == "\r":
+            if text.startswith("\r\n", index):
+                index += 1
+            offsets.append(index + 1)
+        elif char == "\n":
+            offsets.append(index + 1)
+        index += 1
+    return offsets
+
+
+class ParagraphIndex:
+    """
+    Sorted paragraph start offsets of one document's main story.
+
+    Ordinals are 1-based like the Word ``Paragraphs`` collection; negative
+    ordinals count from the end.
+    """
+
+    def __init__(self, starts: List[int], content_end: int):
+        self.starts = starts
+        self.content_end = content_end
+
+    @classmethod
+    def build(cls, document: Any) -> "ParagraphIndex":
+        """
+        Build the index for a document.
+
+        Uses the single-read text snapshot and falls back to one pass over
+        the paragraph collection when the snapshot does not match.
+        """
+        snapshot = read_paragraph_snapshot(document, include_styles=False)
+        if snapshot is not None:
+            return cls(snapshot.starts, snapshot.content_end)
+
+        starts = [
+            info["Range.Start"]
+            for info in iter_com_collection(
+                document.Paragraphs, fields=("Range.Start",)
+            )
+        ]
+        content_end = document.Content.End
+        record_com_call("Range.End", 2)
+        return cls(starts, content_end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def normalize_ordinal(self, ordinal: int) -> int:
+        """
+        Convert a possibly negative ordinal to a 1-based ordinal.
+
+        Raises:
+            IndexError: If the ordinal is out of range.
+        """
+        count = len(self.starts)
+        if ordinal < 0:
+            ordinal = count + ordinal + 1
+        if ordinal < 1 or ordinal > count:
+            raise IndexError(f"Paragraph index {ordinal} out of range (1-{count})")
+        return ordinal
+
+    def span(self, ordinal: int) -> Tuple[int, int]:
+        """Return the (start, end) offsets of a paragraph."""
+        ordinal = self.normalize_ordinal(ordinal)
+        start = self.starts[ordinal - 1]
+        end = self.starts[ordinal] if ordinal < len(self.starts) else self.content_end
+        return start, end
+
+    def ordinal_at(self, position: int) -> Optional[int]:
+        """Return the 1-based ordinal of the paragraph containing position."""
+        if not self.starts or position < self.starts[0] or position > self.content_end:
+            return None
+        return bisect_right(self.starts, position)
+
+    def to_range(self, document: Any, ordinal: int) -> Any:
+        """Return ``document.Range`` covering the given paragraph."""
+        start, end = self.span(ordinal)
+        record_com_call("Document.Range")
+        return document.Range(start, end)
+
+    def apply_replace(self, start: int, end: int, text: str) -> None:
+        """
+        Update the index for text in [start, end) being replaced by text.
+
+        Paragraph starts inside the removed span disappear, later starts are
+        shifted, and every paragraph mark in the new text adds a start.
+        """
+        removed = end - start
+        inserted = len(text)
+        delta = inserted - removed
+
+        # Starts in (start, end] merge into the paragraph at start
+        lo = bisect_right(self.starts, start)
+        hi = bisect_right(self.starts, end)
+        tail = [offset + delta for offset in self.starts[hi:]]
+        new_starts = [start + offset for offset in _paragraph_mark_offsets(text)]
+        self.starts[lo:] = new_starts + tail
+        self.content_end += delta
+
+    def apply_insert(self, position: int, text: str) -> None:
+        """Update the index for text inserted at position."""
+        self.apply_replace(position, position, text)
+
+    def apply_delete(self, start: int, end: int) -> None:
+        """Update the index for the span [start, end) being deleted."""
+        self.apply_replace(start, end, "")
+
+
+_indexes: Dict[str, ParagraphIndex] = {}
+_indexes_lock = threading.RLock()
+
+
+def get_paragraph_index(document: Any) -> ParagraphIndex:
+    """
+    Return the paragraph index of a document, building it if needed.
+
+    A cached index is reused as long as ``Content.End`` still matches it,
+    which costs two COM calls.
+
+    Args:
+        document: The Word document COM object.
+
+    Returns:
+        The ParagraphIndex of the document.
+    """
+    key = document_key(document)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            content_end = document.Content.End
+            record_com_call("Range.End", 2)
+            if content_end == index.content_end:
+                return index
+
+        index = ParagraphIndex.build(document)
+        _indexes[key] = index
+        return index
+
+
+def invalidate_paragraph_index(document: Optional[Any] = None) -> None:
+    """
+    Drop the cached index of a document, or of all documents.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _indexes_lock:
+        if document is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(document_key(document), None)
+            bump_document_revision(document)
+
+
+def record_range_replaced(document: Any, start: int, end: int, text: str) -> None:
+    """
+    Apply an edit made by the operations layer to the cached index.
+
+    Call with the offsets the edited range had before the edit. An insertion
+    is a replacement of an empty span, a deletion a replacement with "".
+    The edit is also recorded in the document's edit journal, which shifts
+    the offsets anchored by the context tree.
+
+    Args:
+        document: The Word document COM object.
+        start: Start offset of the replaced span.
+        end: End offset of the replaced span.
+        text: The text that replaced the span.
+    """
+    bump_document_revision(document)
+    record_edit(document, start, end, text)
+    key = document_key(document)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            index.apply_replace(start, end, text)
+
+
+def record_range_edit(com_range: Any, start: int, end: int, text: str) -> None:
+    """
+    Apply an edit made through a Range object to its document's index.
+
+    Edits outside the main text story (headers, footnotes, comments) do not
+    move main story paragraphs and are ignored.
+
+    Args:
+        com_range: The Range object the edit was made through.
+        start: Start offset of the replaced span before the edit.
+        end: End offset of the replaced span before the edit.
+        text: The text that replaced the span.
+    """
+    try:
+        if com_range.StoryType != _WD_MAIN_TEXT_STORY:
+            return
+        document = com_range.Document
+    except Exception:
+        return
+    record_range_replaced(document, start, end, text)
+
+
+def record_range_insertion(com_range: Any, start: int, end: int, content_end: int) -> None:
+    """
+    Apply an edit whose inserted content is not known as text.
+
+    Pictures, tables and fields take up character positions that
+    ``Range.Text`` does not report one for one, so the inserted length is
+    taken from the change of ``Content.End``. The edit journal only needs
+    that length; the paragraph index cannot place the paragraphs of the
+    inserted content and is dropped.
+
+    Args:
+        com_range: The Range object the edit was made through.
+        start: Start offset of the replaced span before the edit.
+        end: End offset of the replaced span before the edit.
+        content_end: The document's ``Content.End`` read before the edit.
+    """
+    try:
+        if com_range.StoryType != _WD_MAIN_TEXT_STORY:
+            return
+        document = com_range.Document
+        new_content_end = document.Content.End
+    except Exception:
+        return
+    record_com_call("Document.Content")
+    record_com_call("Range.End")
+    invalidate_paragraph_index(document)
+    inserted = end - start + new_content_end - content_end
+    if inserted < 0:
+        # 删除的内容超出了被替换的范围，无法表示为一次替换
+        invalidate_edit_journal(document)
+    else:
+        record_edit(document, start, end, length=inserted)
@@ -0,0 +1,179 @@
+"""
+Render suspension for Word Document MCP Server.
+
+Word re-lays out the document after every edit while screen updating,
+background repagination and background spelling/grammar checking are on.
+``suspend_rendering`` turns them off for the duration of a batch of edits and
+restores the previous settings afterwards.
+
+Scopes are reentrant per Word application and thread: nested scopes are free,
+and only the outermost scope changes and restores the settings. Every
+``Application`` access returns a fresh pywin32 wrapper, so applications are
+matched with ``==``, which compares the underlying COM objects.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# (owner attribute on Application, property name, value while suspended)
+_SUSPENDED_SETTINGS: Tuple[Tuple[Optional[str], str, bool], ...] = (
+    (None, "ScreenUpdating", False),
+    ("Options", "Pagination", False),
+    ("Options", "CheckSpellingAsYouType", False),
+    ("Options", "CheckGrammarAsYouType", False),
+)
+
+
+class RenderSuspension:
+    """
+    State of one suspension scope.
+
+    Attributes:
+        label: Name of the operation that entered the scope.
+        nested: Whether an outer scope had already suspended rendering, in
+            which case this scope changed nothing.
+        restored: Settings changed by this scope, as (owner, name, old value).
+        elapsed: Seconds rendering was suspended, set when the scope exits.
+    """
+
+    def __init__(self, label: str, nested: bool):
+        self.label = label
+        self.nested = nested
+        self.restored: List[Tuple[Any, str, Any]] = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+
+_state = threading.local()
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _active_scopes() -> List[List[Any]]:
+    """Return this thread's suspended applications, as [application, depth]."""
+    scopes = getattr(_state, "scopes", None)
+    if scopes is None:
+        scopes = []
+        _state.scopes = scopes
+    return scopes
+
+
+def _find_scope(scopes: List[List[Any]], application: Any) -> Optional[List[Any]]:
+    for entry in scopes:
+        try:
+            if entry[0] == application:
+                return entry
+        except Exception:
+            continue
+    return None
+
+
+@contextmanager
+def suspend_rendering(
+    com_object: Any, label: str = "operation"
+) -> Iterator[RenderSuspension]:
+    """
+    Suspend screen updating and background layout work while editing.
+
+    Args:
+        com_object: The Word application, or any COM object exposing it
+            through ``Application`` (document, range, ...). None gives a
+            no-op scope.
+        label: Operation name used in the suspension statistics.
+
+    Yields:
+        The RenderSuspension of this scope. Its ``elapsed`` attribute is set
+        on exit.
+
+    Example:
+        with suspend_rendering(document, "batch_apply_formatting"):
+            for range_obj in ranges:
+                range_obj.Font.Bold = True
+    """
+    application = _resolve_application(com_object)
+    scopes = _active_scopes()
+    entry = None if application is None else _find_scope(scopes, application)
+    nested = application is None or entry is not None
+
+    scope = RenderSuspension(label, nested)
+    if not nested:
+        scope.restored = _apply_settings(application)
+        entry = [application, 0]
+        scopes.append(entry)
+    if entry is not None:
+        entry[1] += 1
+    try:
+        yield scope
+    finally:
+        if entry is not None:
+            entry[1] -= 1
+            if not entry[1]:
+                scopes[:] = [other for other in scopes if other is not entry]
+        if not nested:
+            # Restore in reverse order so ScreenUpdating comes back last
+            for owner, name, value in reversed(scope.restored):
+                try:
+                    setattr(owner, name, value)
+                except Exception:
+                    pass
+            scope.elapsed = time.perf_counter() - scope.started
+            _record_suspension(label, scope.elapsed)
+
+
+def _resolve_application(com_object: Any) -> Any:
+    """Return the Word application of a COM object, or None."""
+    if com_object is None:
+        return None
+    try:
+        return com_object.Application
+    except Exception:
+        return None
+
+
+def _apply_settings(application: Any) -> List[Tuple[Any, str, Any]]:
+    """Apply the suspended settings, returning the ones that were changed."""
+    changed: List[Tuple[Any, str, Any]] = []
+    owners: Dict[Optional[str], Any] = {None: application}
+    for owner_name, name, value in _SUSPENDED_SETTINGS:
+        try:
+            if owner_name not in owners:
+                owners[owner_name] = getattr(application, owner_name)
+            owner = owners[owner_name]
+            previous = getattr(owner, name)
+            if previous != value:
+                setattr(owner, name, value)
+                changed.append((owner, name, previous))
+        except Exception:
+            # Setting not available (e.g. no Options in this Word build)
+            continue
+    return changed
+
+
+def _record_suspension(label: str, elapsed: float) -> None:
+    with _stats_lock:
+        entry = _stats.setdefault(
+            label, {"count": 0, "total_time": 0.0, "max_time": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_time"] += elapsed
+        entry["max_time"] = max(entry["max_time"], elapsed)
+
+
+def get_render_suspension_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Return how long rendering was suspended, per operation label.
+
+    Returns:
+        A dict mapping each label to its scope count, total and maximum
+        suspension time in seconds.
+    """
+    with _stats_lock:
+        return {label: dict(entry) for label, entry in _stats.items()}
+
+
+def reset_render_suspension_stats() -> None:
+    """Clear the suspension statistics."""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,243 @@
+"""
+Section sweep for Word Document MCP Server.
+
+Building a section of the context tree used to walk the section's tables,
+inline shapes and paragraphs and test every image and paragraph against
+every table and image already seen, which is O(objects x tables) per
+section. The sweep reads only the start and end offsets of each of the
+section's objects, sorts them and drops the objects inside tables by merging
+the sorted offset lists. For large sections the merge uses
+``numpy.searchsorted`` when NumPy is installed; otherwise it is a plain
+two-pointer walk. Text, style and size are then read only for the objects
+the merge kept, so nothing is read for paragraphs inside tables.
+
+Sections are swept one at a time (``read_section_content``), so expanding a
+section of the lazily built context tree reads only that section's objects
+and its build cost is that section's own.
+
+The offsets read by the sweep are anchored in the document's edit journal,
+so contexts built from a sweep taken before an edit still resolve to their
+current positions.
+
+Only top-level tables are assigned (``Range.Tables`` does not list nested
+tables); images and paragraphs inside a table belong to the table.
+"""
+
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .com_utils import record_com_call
+from .edit_journal import OffsetTree, get_edit_journal
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Below this many positions the merge walk beats building NumPy arrays
+NUMPY_THRESHOLD = 2048
+
+
+class SectionContent:
+    """
+    Objects that lie inside one section.
+
+    Attributes:
+        index: 0-based section index.
+        start: Section start offset.
+        end: Section end offset.
+        tables: Table field dicts (``Range``, ``Range.Start``, ``Range.End``,
+            ``Rows.Count``, ``Columns.Count``), in document order.
+        images: Inline shape field dicts outside tables, in document order.
+        paragraphs: Non-blank paragraph field dicts outside tables, in
+            document order.
+        offsets: OffsetTree anchoring the offsets of the sweep, if any.
+    """
+
+    __slots__ = ("index", "start", "end", "range", "tables", "images", "paragraphs", "offsets")
+
+    def __init__(self, index: int, start: int, end: int, range_obj: Any = None):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.range = range_obj
+        self.tables: List[Dict[str, Any]] = []
+        self.images: List[Dict[str, Any]] = []
+        self.paragraphs: List[Dict[str, Any]] = []
+        self.offsets: Optional[OffsetTree] = None
+
+
+def locate(starts: Sequence[int], positions: Sequence[int]) -> List[int]:
+    """
+    Return, for each position, the index of the last start <= position.
+
+    Args:
+        starts: Ascending start offsets.
+        positions: Ascending positions to locate.
+
+    Returns:
+        One index per position, -1 for positions before the first start.
+    """
+    if np is not None and len(positions) >= NUMPY_THRESHOLD:
+        indexes = np.searchsorted(
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(positions, dtype=np.int64),
+            side="right",
+        ) - 1
+        return indexes.tolist()
+
+    result = []
+    current = -1
+    count = len(starts)
+    for position in positions:
+        while current + 1 < count and starts[current + 1] <= position:
+            current += 1
+        result.append(current)
+    return result
+
+
+# (start, end, COM object, Range) of one object of a section
+Span = Tuple[int, int, Any, Any]
+
+
+def _read_spans(collection: Any) -> List[Span]:
+    """Read the Range offsets of every accessible element, sorted by start."""
+    spans = []
+    # 直接使用集合的原生枚举器；调用次数在遍历结束后一次性记录
+    for element in collection:
+        try:
+            element_range = element.Range
+            spans.append((element_range.Start, element_range.End, element, element_range))
+        except Exception:
+            # 忽略无法访问的对象
+            continue
+    record_com_call("Collection._NewEnum")
+    for name in ("Enum.Next", "Range", "Start", "End"):
+        record_com_call(name, len(spans))
+    spans.sort(key=itemgetter(0))
+    return spans
+
+
+def _keep_outside_tables(spans: List[Span], start: int, end: int, tables: List[Span]) -> List[Span]:
+    """Keep the spans that lie inside [start, end] and not inside a table."""
+    table_ends = [table[1] for table in tables]
+    containers = locate([table[0] for table in tables], [span[0] for span in spans])
+    return [
+        span for span, table in zip(spans, containers)
+        if start <= span[0] and span[1] <= end
+        and (table < 0 or span[1] > table_ends[table])
+    ]
+
+
+def _read_path(element: Any, path: str) -> Any:
+    """Read a dotted property path, None if any step fails."""
+    try:
+        for name in path.split("."):
+            element = getattr(element, name)
+        return element
+    except Exception:
+        return None
+
+
+def read_section_content(
+    document: Any,
+    index: int,
+    section_range: Any,
+    section_offsets: Optional[OffsetTree] = None,
+    bounds: Optional[Tuple[int, int]] = None,
+) -> SectionContent:
+    """
+    Read one section's tables, inline shapes and paragraphs and sweep them.
+
+    Only offsets are read before the sweep; sizes, text and styles are read
+    afterwards for the objects that are kept. Objects not entirely inside
+    the section are dropped.
+
+    Args:
+        document: The Word document COM object.
+        index: 0-based section index.
+        section_range: The section's Range object.
+        section_offsets: The OffsetTree the section's own offsets are
+            anchored in, if any. While it is usable, the section's current
+            ``bounds`` are trusted and ``Content.End`` is not read again.
+        bounds: The section's current (start, end) offsets.
+
+    Returns:
+        The SectionContent of the section, with its offsets anchored.
+    """
+    journal = section_offsets.journal if section_offsets is not None else None
+    content_end = None
+    if journal is not None and bounds is not None:
+        content_end = journal.expected_content_end(section_offsets)
+    if content_end is None:
+        journal = get_edit_journal(document)
+        bounds = section_range.Start, section_range.End
+        record_com_call("Range.Start")
+        record_com_call("Range.End")
+    start, end = bounds
+
+    record_com_call("Range.Tables")
+    tables = _keep_outside_tables(_read_spans(section_range.Tables), start, end, [])
+    record_com_call("Range.InlineShapes")
+    images = _keep_outside_tables(_read_spans(section_range.InlineShapes), start, end, tables)
+    record_com_call("Range.Paragraphs")
+    paragraphs = _keep_outside_tables(_read_spans(section_range.Paragraphs), start, end, tables)
+
+    content = SectionContent(index, start, end, section_range)
+    for table_start, table_end, table, table_range in tables:
+        content.tables.append({
+            "Range": table_range,
+            "Range.Start": table_start,
+            "Range.End": table_end,
+            "Rows.Count": _read_path(table, "Rows.Count"),
+            "Columns.Count": _read_path(table, "Columns.Count"),
+        })
+    record_com_call("Table.Rows", len(tables))
+    record_com_call("Table.Columns", len(tables))
+    record_com_call("Collection.Count", 2 * len(tables))
+
+    for shape_start, shape_end, shape, shape_range in images:
+        content.images.append({
+            "Range": shape_range,
+            "Range.Start": shape_start,
+            "Range.End": shape_end,
+            "Width": _read_path(shape, "Width"),
+            "Height": _read_path(shape, "Height"),
+            "Type": _read_path(shape, "Type"),
+        })
+    record_com_call("InlineShape.Size", 3 * len(images))
+
+    # 只为表格外的段落读取文本，只为非空段落读取样式
+    for paragraph_start, paragraph_end, paragraph, paragraph_range in paragraphs:
+        try:
+            text = paragraph_range.Text
+        except Exception:
+            continue
+        if not text or not text.strip():
+            continue
+        try:
+            style_name = paragraph.Style.NameLocal
+        except Exception:
+            style_name = None
+        content.paragraphs.append({
+            "Range": paragraph_range,
+            "Range.Start": paragraph_start,
+            "Range.End": paragraph_end,
+            "Range.Text": text,
+            "Style.NameLocal": style_name,
+        })
+    record_com_call("Range.Text", len(paragraphs))
+    record_com_call("Paragraph.Style", len(content.paragraphs))
+    record_com_call("Style.NameLocal", len(content.paragraphs))
+
+    if content_end is None:
+        content_end = document.Content.End
+        record_com_call("Document.Content")
+        record_com_call("Range.End")
+    offsets = [start, end]
+    for spans in (tables, images, paragraphs):
+        for span in spans:
+            offsets.append(span[0])
+            offsets.append(span[1])
+    content.offsets = journal.anchor(offsets, content_end=content_end)
+    return content
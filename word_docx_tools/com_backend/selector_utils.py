@@ -9,6 +9,8 @@ in Word documents across different operation modules.
 from typing import Any, Dict, List, Optional, Union
 
 from ..mcp_service.errors import ErrorCode, WordDocumentError
+from .edit_journal import anchored_offsets_current
+from .paragraph_index import get_paragraph_index
 
 
 def get_selection_range(
@@ -84,6 +86,10 @@ def get_selection_range(
             else:
                 return document.Content
         
+        # 处理上下文定位：按上下文ID或偏移量，通过上下文区间索引解析
+        elif locator_type == 'context':
+            return _resolve_context_locator(document, locator)
+        
         # 处理段落定位
         elif locator_type == 'paragraph' or 'paragraph' in locator:
             # 尝试从locator中获取段落索引
@@ -105,8 +111,9 @@ def get_selection_range(
                 # 转换为整数索引
                 index = int(index)
                 
-                # 处理索引范围检查
-                paragraph_count = document.Paragraphs.Count
+                # 处理索引范围检查（通过段落偏移索引，避免逐个遍历Paragraphs集合）
+                paragraph_index = get_paragraph_index(document)
+                paragraph_count = len(paragraph_index)
                 
                 # 支持负索引（从末尾开始计数）
                 if index < 0:
@@ -129,7 +136,7 @@ def get_selection_range(
                         raise IndexError(f"Paragraph index {index} out of range (1-{paragraph_count})")
                 
                 # 返回指定段落的范围
-                return document.Paragraphs(index).Range
+                return paragraph_index.to_range(document, index)
                 
             except (ValueError, TypeError) as e:
                 raise WordDocumentError(
@@ -162,6 +169,53 @@ def get_selection_range(
         )
 
 
+def _resolve_context_locator(document: Any, locator: Dict[str, Any]) -> Any:
+    """
+    解析上下文定位器为Range
+    
+    ``{"type": "context", "id": ...}`` 定位上下文树中的节点；
+    ``{"type": "context", "position": offset, "context_type": ...}`` 定位包含
+    该偏移量的最内层上下文，没有时取距离最近的上下文。偏移量来自上下文
+    记录的偏移量（已按编辑日志平移），只在最后创建一次Range。锚定的偏移量
+    先与文档的Content.End核对；日志之外的编辑使其失效时改用上下文的Range，
+    Word会随编辑更新该Range。
+    
+    Raises:
+        WordDocumentError: 如果找不到对应的上下文
+    """
+    from ..mcp_service.app_context import AppContext
+
+    app_context = AppContext.get_instance()
+    if locator.get('id') is not None:
+        context = app_context.get_context_by_id(str(locator['id']))
+    else:
+        position = locator.get('position', locator.get('value'))
+        if position is None:
+            raise ValueError("Context locator must contain 'id' or 'position'")
+        context = app_context.find_nearest_context(int(position), locator.get('context_type'))
+
+    if context is None:
+        raise WordDocumentError(ErrorCode.OBJECT_NOT_FOUND, f"No context found for locator {locator}")
+    offsets = context.get_offsets()
+    offset_tree = context.offset_tree
+    if offsets is not None and (
+        offset_tree is None or not anchored_offsets_current(document, offset_tree)
+    ):
+        # 未锚定或已过期的偏移量不能用于定位，有Range时优先使用Range
+        if context.range is not None:
+            return context.range
+        if offset_tree is not None:
+            raise WordDocumentError(
+                ErrorCode.OBJECT_NOT_FOUND,
+                f"Context '{context.title}' is out of date and has no range"
+            )
+    if offsets is None:
+        if context.range is None:
+            raise WordDocumentError(ErrorCode.OBJECT_NOT_FOUND, f"Context '{context.title}' has no range")
+        return context.range
+    return document.Range(*offsets)
+
+
 def validate_locator(locator: Any, expected_types: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     验证定位器对象的有效性
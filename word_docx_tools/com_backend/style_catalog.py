@@ -0,0 +1,239 @@
+"""
+Font and style catalogs for Word Document MCP Server.
+
+``Application.FontNames`` lists the installed fonts, which do not change
+while the server runs, so the font catalog is read once per process. Listing
+or looking up styles used to walk ``Document.Styles`` and read ``Type`` and
+``NameLocal`` of every style each time. The style catalog reads
+``NameLocal``, ``Type`` and ``BuiltIn`` of every style in one projected
+enumeration and keeps the table per document. It is rebuilt when
+``invalidate_style_catalog`` is called or when ``Styles.Count`` changes.
+
+Both catalogs answer name-prefix searches and pages from memory.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .com_utils import document_key, iter_com_collection, record_com_call
+
+# Word中样式类型常量
+STYLE_TYPES = {
+    "paragraph": 1,  # wdStyleTypeParagraph
+    "character": 2,  # wdStyleTypeCharacter
+    "table": 3,  # wdStyleTypeTable
+    "list": 4,  # wdStyleTypeList
+}
+STYLE_TYPE_NAMES = {value: key for key, value in STYLE_TYPES.items()}
+
+_STYLE_FIELDS = ("NameLocal", "Type", "BuiltIn")
+
+
+class _NameCatalog:
+    """Items with a case-insensitive sorted name index for prefix search."""
+
+    def __init__(self, items: List[Dict[str, Any]], name_key: str):
+        self.items = items
+        self._name_key = name_key
+        self._sorted = sorted(
+            (str(item[name_key]).casefold(), position)
+            for position, item in enumerate(items)
+        )
+        self._keys = [key for key, _ in self._sorted]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _prefix_positions(self, prefix: Optional[str]) -> Iterable[int]:
+        if not prefix:
+            return range(len(self.items))
+        folded = prefix.casefold()
+        positions = []
+        for i in range(bisect_left(self._keys, folded), len(self._keys)):
+            if not self._keys[i].startswith(folded):
+                break
+            positions.append(self._sorted[i][1])
+        # Keep the catalog order rather than the sort order
+        return sorted(positions)
+
+    def _page(
+        self, positions: Iterable[int], offset: int, limit: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("offset and limit must not be negative")
+        matches = list(positions)
+        stop = None if limit is None else offset + limit
+        return [dict(self.items[i]) for i in matches[offset:stop]], len(matches)
+
+
+class FontCatalog(_NameCatalog):
+    """Installed font names."""
+
+    def __init__(self, names: List[str]):
+        super().__init__([{"font_name": name} for name in names], "font_name")
+
+    def query(
+        self, prefix: Optional[str] = None, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return one page of fonts whose name starts with ``prefix``.
+
+        Returns:
+            A tuple (font dicts on this page, total number of matches).
+        """
+        return self._page(self._prefix_positions(prefix), offset, limit)
+
+
+class StyleCatalog(_NameCatalog):
+    """
+    Styles of one document.
+
+    Attributes:
+        items: Style dicts in ``Document.Styles`` order, each with ``name``,
+            ``type``, ``built_in`` and ``type_name``.
+        style_count: ``Styles.Count`` when the catalog was read.
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], style_count: int):
+        super().__init__(items, "name")
+        self.style_count = style_count
+        self._by_name = {item["name"]: item for item in items}
+
+    def query(
+        self,
+        style_type: Optional[str] = None,
+        prefix: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return one page of styles, optionally of one type and name prefix.
+
+        Args:
+            style_type: 'paragraph', 'character', 'table' or 'list'; other
+                values are ignored.
+            prefix: Case-insensitive name prefix.
+            offset: Number of matching styles to skip.
+            limit: Maximum number of styles to return, None for all.
+
+        Returns:
+            A tuple (style dicts on this page, total number of matches).
+        """
+        positions = self._prefix_positions(prefix)
+        type_value = STYLE_TYPES.get(style_type.lower()) if style_type else None
+        if type_value is not None:
+            positions = [i for i in positions if self.items[i]["type"] == type_value]
+        return self._page(positions, offset, limit)
+
+    def find(
+        self, name: str, style_type: Optional[int] = None, ignore_case: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the style with the given local name, or None.
+
+        Args:
+            name: The style's local name.
+            style_type: Optional Word style type constant the style must have.
+            ignore_case: Whether to compare names case-insensitively.
+        """
+        item = self._by_name.get(name)
+        if item is None and ignore_case:
+            folded = name.casefold()
+            position = bisect_left(self._keys, folded)
+            if position < len(self._keys) and self._keys[position] == folded:
+                item = self.items[self._sorted[position][1]]
+        if item is None or (style_type is not None and item["type"] != style_type):
+            return None
+        return item
+
+    def names(self, style_type: Optional[int] = None) -> List[str]:
+        """Return the style names in catalog order, optionally of one type."""
+        return [
+            item["name"]
+            for item in self.items
+            if style_type is None or item["type"] == style_type
+        ]
+
+
+_font_catalog: Optional[FontCatalog] = None
+_style_catalogs: Dict[str, StyleCatalog] = {}
+_catalog_lock = threading.RLock()
+
+
+def get_font_catalog(application: Any) -> FontCatalog:
+    """
+    Return the installed fonts, reading ``Application.FontNames`` only once.
+
+    Args:
+        application: The Word application COM object.
+
+    Returns:
+        The process-wide FontCatalog.
+    """
+    global _font_catalog
+    with _catalog_lock:
+        if _font_catalog is None:
+            names = list(iter_com_collection(application.FontNames))
+            record_com_call("Application.FontNames")
+            _font_catalog = FontCatalog(names)
+        return _font_catalog
+
+
+def invalidate_font_catalog() -> None:
+    """Forget the font list, e.g. after fonts were installed."""
+    global _font_catalog
+    with _catalog_lock:
+        _font_catalog = None
+
+
+def get_style_catalog(document: Any) -> StyleCatalog:
+    """
+    Return the style catalog of a document, reading it on first use.
+
+    Args:
+        document: The Word document COM object.
+
+    Returns:
+        The StyleCatalog of the document.
+    """
+    key = document_key(document)
+    styles = document.Styles
+    style_count = styles.Count
+    record_com_call("Document.Styles")
+    record_com_call("Collection.Count")
+    with _catalog_lock:
+        catalog = _style_catalogs.get(key)
+        if catalog is not None and catalog.style_count == style_count:
+            return catalog
+
+        items = []
+        for values in iter_com_collection(styles, fields=_STYLE_FIELDS):
+            if values["NameLocal"] is None:
+                continue
+            style_type = values["Type"]
+            items.append({
+                "name": values["NameLocal"],
+                "type": style_type,
+                "built_in": values["BuiltIn"],
+                "type_name": STYLE_TYPE_NAMES.get(style_type, "unknown"),
+            })
+        catalog = StyleCatalog(items, style_count)
+        _style_catalogs[key] = catalog
+        return catalog
+
+
+def invalidate_style_catalog(document: Optional[Any] = None) -> None:
+    """
+    Drop the cached style catalog of a document, or of all documents.
+
+    Call this after adding, deleting, renaming or retyping a style.
+
+    Args:
+        document: The Word document COM object, or None for all documents.
+    """
+    with _catalog_lock:
+        if document is None:
+            _style_catalogs.clear()
+        else:
+            _style_catalogs.pop(document_key(document), None)
@@ -0,0 +1,164 @@
+"""
+Table text snapshots for Word Document MCP Server.
+
+This module reads the cell texts of a table in bulk. ``Table.Range.Text``
+returns every cell followed by an end-of-cell mark, and every row followed by
+an extra end-of-row mark, so a single read of the table text is enough to
+rebuild the whole grid:
+
+    a\r\x07 b\r\x07 \r\x07   c\r\x07 d\r\x07 \r\x07
+    ------- ------- -----   ------- ------- -----
+    cell    cell    row end cell    cell    row end
+
+COM cost of ``read_table_cells`` for one table:
+
+    6                    Rows.Count, Columns.Count, Tables.Count, Uniform,
+                         Range, Text
+    + 3 per row          only for non-uniform tables (merged or split
+                         cells): Range, Text, Cells.Count
+    + 2 per cell         only for rows that cannot be split (nested tables)
+"""
+
+from typing import Any, List, Optional
+
+from .com_utils import iter_com_collection, record_com_call
+from .document_snapshot import END_OF_CELL_MARK
+
+
+def split_table_text(text: str, cells_per_row: List[int]) -> Optional[List[List[str]]]:
+    """
+    Split table text into rows of cell texts.
+
+    Args:
+        text: The table text, as returned by ``Table.Range.Text``.
+        cells_per_row: Number of cells in each row.
+
+    Returns:
+        A list of rows, each a list of cell texts without end-of-cell marks,
+        or None if the text does not have the expected layout.
+    """
+    tokens = text.split(END_OF_CELL_MARK)
+    # Every row is followed by an empty end-of-row token, and the text ends
+    # with a mark, which leaves one empty token at the end
+    if len(tokens) != sum(cells_per_row) + len(cells_per_row) + 1 or tokens[-1]:
+        return None
+
+    rows: List[List[str]] = []
+    position = 0
+    for cell_count in cells_per_row:
+        if tokens[position + cell_count]:
+            return None
+        rows.append(tokens[position:position + cell_count])
+        position += cell_count + 1
+    return rows
+
+
+def read_table_cells(
+    table: Any,
+    row_start: int = 1,
+    row_end: Optional[int] = None,
+    col_start: int = 1,
+    col_end: Optional[int] = None,
+) -> List[List[str]]:
+    """
+    Read the cell texts of a table, optionally limited to a window.
+
+    The whole table is parsed from one ``Range.Text`` read when Word reports
+    it as uniform (every row has the same number of cells). The text of an
+    irregular table can happen to split into a regular grid when an empty
+    cell sits where a row end is expected, so other tables are read one row
+    at a time, and only rows inside the window are read. Rows containing
+    nested tables are read cell by cell.
+
+    Args:
+        table: The Word table COM object.
+        row_start: First row to return (1-based).
+        row_end: Last row to return (inclusive), or None for the last row.
+        col_start: First column to return (1-based).
+        col_end: Last column to return (inclusive), or None for the last column.
+
+    Returns:
+        A list of rows, each a list of cell texts. Rows with merged cells can
+        be shorter than others.
+    """
+    if row_start < 1 or col_start < 1:
+        raise ValueError("Row and column windows are 1-based")
+
+    row_count = table.Rows.Count
+    column_count = table.Columns.Count
+    nested_count = table.Tables.Count
+    record_com_call("Rows.Count", 2)
+    record_com_call("Columns.Count", 2)
+    record_com_call("Table.Tables", 2)
+
+    last_row = row_count if row_end is None else min(row_end, row_count)
+    if last_row < row_start:
+        return []
+    col_stop = None if col_end is None else max(col_end, col_start - 1)
+
+    rows = None
+    uniform = False
+    if nested_count == 0:
+        uniform = bool(table.Uniform)
+        record_com_call("Table.Uniform")
+    if uniform:
+        text = table.Range.Text
+        record_com_call("Table.Range")
+        record_com_call("Range.Text")
+        rows = split_table_text(text or "", [column_count] * row_count)
+        if rows is not None:
+            rows = rows[row_start - 1:last_row]
+
+    if rows is None:
+        rows = _read_rows(table, row_start, last_row)
+
+    return [row[col_start - 1:col_stop] for row in rows]
+
+
+def _read_rows(table: Any, row_start: int, row_end: int) -> List[List[str]]:
+    """Read rows one at a time, splitting each row's text locally."""
+    rows: List[List[str]] = []
+    try:
+        row_infos = list(iter_com_collection(
+            table.Rows,
+            start=row_start - 1,
+            stop=row_end,
+            fields=("Range.Text", "Cells.Count", "Cells"),
+        ))
+    except Exception:
+        # Rows of tables with vertically merged cells cannot be accessed
+        return _read_cells(table, row_start, row_end)
+
+    for info in row_infos:
+        cell_count = info["Cells.Count"]
+        split = None
+        if info["Range.Text"] is not None and cell_count is not None:
+            split = split_table_text(info["Range.Text"], [cell_count])
+        if split is not None:
+            rows.append(split[0])
+        else:
+            rows.append([
+                _strip_cell_mark(cell["Range.Text"] or "")
+                for cell in iter_com_collection(info["Cells"], fields=("Range.Text",))
+            ])
+    return rows
+
+
+def _read_cells(table: Any, row_start: int, row_end: int) -> List[List[str]]:
+    """Read the cells of the window one by one, grouped by row index."""
+    rows: List[List[str]] = [[] for _ in range(row_end - row_start + 1)]
+    for cell in iter_com_collection(
+        table.Range.Cells, fields=("RowIndex", "Range.Text")
+    ):
+        row_index = cell["RowIndex"]
+        if row_index is None or not row_start <= row_index <= row_end:
+            continue
+        rows[row_index - row_start].append(_strip_cell_mark(cell["Range.Text"] or ""))
+    return rows
+
+
+def _strip_cell_mark(text: str) -> str:
+    """Remove the end-of-cell mark from a cell text."""
+    if text.endswith(END_OF_CELL_MARK):
+        return text[:-len(END_OF_CELL_MARK)]
+    return text
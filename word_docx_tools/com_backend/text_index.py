@@ -0,0 +1,240 @@
+"""
+Context keyword index for Word Document MCP Server.
+
+``search_contexts`` lower-cased the title and every string metadata value of
+every context on each query. ContextTextIndex keeps an inverted index from
+character trigrams to context IDs, maintained as contexts are added,
+updated and removed, so a query only looks at the contexts that contain all
+trigrams of each search term.
+
+Search terms are matched as case-insensitive substrings, like before, which
+also works for CJK text that has no word boundaries. Terms of one or two
+characters are looked up through the trigrams that contain them. Candidates
+are always checked against the context's current title and metadata, so the
+index can only narrow the search, never change its result.
+
+Memory is bounded by ``max_postings`` (trigram/context pairs). Contexts that
+would exceed it are kept out of the trigram index and checked on every
+query instead.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Default cap on trigram/context pairs (WORD_CONTEXT_TEXT_INDEX_MAX_POSTINGS)
+DEFAULT_MAX_POSTINGS = 2_000_000
+
+SEARCH_FIELDS = ("title", "metadata")
+
+# Score of a term found in the title and in metadata values
+_FIELD_WEIGHTS = {"title": 2, "metadata": 1}
+
+
+class ContextTextIndex:
+    """
+    Trigram index over context titles and string metadata values.
+
+    Example:
+        index = ContextTextIndex()
+        index.add(context)
+        index.search("heading intro", operator="and")
+    """
+
+    def __init__(self, max_postings: int = DEFAULT_MAX_POSTINGS):
+        self.max_postings = max_postings
+        self._contexts: Dict[str, Any] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        self._grams: Dict[str, Set[str]] = {}
+        self._context_grams: Dict[str, Set[str]] = {}
+        self._unindexed: Set[str] = set()
+        self._postings = 0
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def add(self, context: Any) -> None:
+        """Index a context and follow its later metadata changes."""
+        context_id = context.context_id
+        if context_id not in self._contexts:
+            self._order[context_id] = self._next_order
+            self._next_order += 1
+            listeners = getattr(context, "_index_listeners", None)
+            if listeners is not None and self.reindex not in listeners:
+                listeners.append(self.reindex)
+        self._contexts[context_id] = context
+        self._index(context_id, _context_grams(context))
+
+    def reindex(self, context: Any) -> None:
+        """Update the trigrams of a context after its text changed."""
+        if context.context_id in self._contexts:
+            self._index(context.context_id, _context_grams(context))
+
+    def discard(self, context_id: str) -> None:
+        """Remove a context from the index."""
+        context = self._contexts.pop(context_id, None)
+        if context is None:
+            return
+        self._order.pop(context_id, None)
+        self._index(context_id, set())
+        self._context_grams.pop(context_id, None)
+        self._unindexed.discard(context_id)
+        listeners = getattr(context, "_index_listeners", None)
+        if listeners is not None and self.reindex in listeners:
+            listeners.remove(self.reindex)
+
+    def clear(self) -> None:
+        for context_id in list(self._contexts):
+            self.discard(context_id)
+        self._grams.clear()
+        self._postings = 0
+
+    def search(
+        self,
+        query: str,
+        fields: Optional[Sequence[str]] = None,
+        operator: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[Any, int]]:
+        """
+        Find contexts whose title or string metadata contain the query.
+
+        Args:
+            query: Text to find, case-insensitive.
+            fields: Fields to search, "title" and/or "metadata" (default both).
+            operator: None to match the query as one phrase, "and" to require
+                every whitespace separated term, "or" to require any of them.
+            limit: Maximum number of results.
+
+        Returns:
+            (context, score) pairs, best first. A term scores 2 when found in
+            the title and 1 when found in metadata; ties keep insertion order.
+        """
+        fields = tuple(f for f in (fields or SEARCH_FIELDS) if f in _FIELD_WEIGHTS)
+        if operator is None:
+            terms = [query.lower()]
+        else:
+            terms = list(dict.fromkeys(term.lower() for term in query.split()))
+        if not terms or not fields:
+            return []
+        require_all = operator is None or operator.lower() == "and"
+
+        candidates: Optional[Set[str]] = None
+        for term in terms:
+            found = self._candidates(term)
+            if candidates is None:
+                candidates = found
+            elif require_all:
+                candidates &= found
+            else:
+                candidates |= found
+        candidates = (candidates or set()) | self._unindexed
+
+        scored = []
+        for context_id in candidates:
+            context = self._contexts.get(context_id)
+            if context is None:
+                continue
+            texts = _field_texts(context, fields)
+            scores = [_term_score(term, texts) for term in terms]
+            if (all if require_all else any)(scores):
+                scored.append((context_id, context, sum(scores)))
+        scored.sort(key=lambda item: (-item[2], self._order.get(item[0], 0)))
+        if limit is not None:
+            scored = scored[:limit]
+        return [(context, score) for _, context, score in scored]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "contexts": len(self._contexts),
+            "grams": len(self._grams),
+            "postings": self._postings,
+            "max_postings": self.max_postings,
+            "unindexed_contexts": len(self._unindexed),
+        }
+
+    def _candidates(self, term: str) -> Set[str]:
+        if not term:
+            return set(self._contexts)
+        if len(term) >= 3:
+            postings = sorted(
+                (self._grams.get(gram, set()) for gram in _grams(term)), key=len
+            )
+            if not postings or not postings[0]:
+                return set()
+            result = set(postings[0])
+            for posting in postings[1:]:
+                result &= posting
+                if not result:
+                    break
+            return result
+        # 一两个字符的词：合并包含它的所有三元组的倒排表
+        result: Set[str] = set()
+        for gram, posting in self._grams.items():
+            if term in gram:
+                result |= posting
+        return result
+
+    def _index(self, context_id: str, grams: Set[str]) -> None:
+        old = self._context_grams.get(context_id, set())
+        if context_id in self._unindexed:
+            old = set()
+            self._unindexed.discard(context_id)
+        added = grams - old
+        if self._postings - len(old - grams) + len(added) > self.max_postings:
+            # 超出内存上限：不建倒排表，查询时逐个检查
+            grams, added = set(), set()
+            self._unindexed.add(context_id)
+        for gram in old - grams:
+            posting = self._grams.get(gram)
+            if posting is not None:
+                posting.discard(context_id)
+                self._postings -= 1
+                if not posting:
+                    del self._grams[gram]
+        for gram in added:
+            self._grams.setdefault(gram, set()).add(context_id)
+            self._postings += 1
+        self._context_grams[context_id] = grams
+
+
+def _grams(text: str) -> Set[str]:
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _field_texts(context: Any, fields: Iterable[str]) -> Dict[str, List[str]]:
+    texts: Dict[str, List[str]] = {}
+    for field in fields:
+        if field == "title":
+            title = getattr(context, "title", None)
+            texts["title"] = [title.lower()] if isinstance(title, str) else []
+        elif field == "metadata":
+            metadata = getattr(context, "metadata", None) or {}
+            texts["metadata"] = [v.lower() for v in metadata.values() if isinstance(v, str)]
+    return texts
+
+
+def _context_grams(context: Any) -> Set[str]:
+    grams: Set[str] = set()
+    for values in _field_texts(context, SEARCH_FIELDS).values():
+        for value in values:
+            grams |= _grams(value)
+    return grams
+
+
+def _term_score(term: str, texts: Dict[str, List[str]]) -> int:
+    return sum(
+        _FIELD_WEIGHTS[field]
+        for field, values in texts.items()
+        if any(term in value for value in values)
+    )
+
+
+def parse_max_postings(value: Optional[str]) -> int:
+    """Parse a posting cap setting, falling back to the default cap."""
+    try:
+        number = int(value) if value else 0
+    except ValueError:
+        number = 0
+    return number if number > 0 else DEFAULT_MAX_POSTINGS
@@ -0,0 +1,287 @@
+"""
+Word instance pool for Word Document MCP Server.
+
+One ``Word.Application`` serializes every document behind a single process:
+a repagination in one document stalls work on all others, and a long-lived
+Word process keeps growing. The pool owns up to ``size`` Word instances,
+each started in its own process by the application factory (normally
+``DispatchEx`` through ``AppContext._create_word_app_with_dispatchex``).
+
+* Every open document is pinned to the instance that opened it; its COM
+  objects are only valid there.
+* New documents go to the least-loaded instance: fewest pinned documents,
+  then fewest recorded operations. Instances are started lazily until the
+  pool is full.
+* An instance without documents is recycled (``Quit``) once it has served
+  ``max_operations`` operations or its last observed memory use reached
+  ``max_memory_bytes``. The next request starts a fresh process.
+
+The pool holds no Word-specific logic beyond ``Quit``, so it can be driven
+by a fake factory in tests.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+AppFactory = Callable[[], Any]
+MemoryProbe = Callable[[Any], Optional[int]]
+
+
+class WordInstance:
+    """
+    One Word application in the pool.
+
+    Attributes:
+        instance_id: Sequence number, unique within the pool.
+        app: The Word application COM object.
+        documents: Keys of the documents pinned to this instance.
+        operations: Operations recorded since the instance was started.
+        memory_bytes: Working set observed last, None if never measured.
+    """
+
+    def __init__(self, instance_id: int, app: Any):
+        self.instance_id = instance_id
+        self.app = app
+        self.documents: set = set()
+        self.operations = 0
+        self.memory_bytes: Optional[int] = None
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    @property
+    def load(self) -> tuple:
+        """Sort key for routing: pinned documents first, then operations."""
+        return (len(self.documents), self.operations)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "instance_id": self.instance_id,
+            "documents": len(self.documents),
+            "operations": self.operations,
+            "memory_bytes": self.memory_bytes,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+        }
+
+
+class WordInstancePool:
+    """
+    Pool of Word application instances with document affinity.
+
+    Example:
+        pool = WordInstancePool(3, app_factory)
+        instance = pool.acquire_for_new_document()
+        doc = instance.app.Documents.Open(path)
+        pool.pin(document_key(doc), instance)
+    """
+
+    def __init__(
+        self,
+        size: int,
+        app_factory: AppFactory,
+        max_operations: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None,
+        memory_probe: Optional[MemoryProbe] = None,
+    ):
+        if size < 1:
+            raise ValueError("Word pool size must be at least 1")
+        self.size = size
+        self.max_operations = max_operations
+        self.max_memory_bytes = max_memory_bytes
+        self._app_factory = app_factory
+        self._memory_probe = memory_probe or process_memory
+        self._lock = threading.RLock()
+        self._instances: List[WordInstance] = []
+        self._by_document: Dict[str, WordInstance] = {}
+        self._next_id = 1
+        self._created = 0
+        self._recycled = 0
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    @property
+    def instances(self) -> List[WordInstance]:
+        with self._lock:
+            return list(self._instances)
+
+    def acquire_for_new_document(self) -> WordInstance:
+        """
+        Return the instance a new document should be opened in.
+
+        Starts a new instance while the pool is not full and every running
+        instance already has documents; otherwise picks the least-loaded one.
+
+        Raises:
+            RuntimeError: If no instance runs and the factory fails.
+        """
+        with self._lock:
+            idle = [i for i in self._instances if not i.documents]
+            if not idle and len(self._instances) < self.size:
+                instance = self._start_instance()
+                if instance is not None:
+                    return instance
+            if not self._instances:
+                raise RuntimeError("Failed to start a Word application instance")
+            return min(self._instances, key=lambda i: i.load)
+
+    def pin(self, document_key: str, instance: WordInstance) -> None:
+        """Pin an open document to the instance it was opened in."""
+        with self._lock:
+            previous = self._by_document.get(document_key)
+            if previous is not None and previous is not instance:
+                previous.documents.discard(document_key)
+            instance.documents.add(document_key)
+            instance.last_used = time.time()
+            self._by_document[document_key] = instance
+
+    def unpin(self, document_key: str) -> Optional[WordInstance]:
+        """
+        Release a document, sampling its instance's memory first.
+
+        Call this before closing the document: Word's window (and so its
+        process) is only reachable while a document is open.
+
+        Returns:
+            The instance the document was pinned to, or None.
+        """
+        with self._lock:
+            instance = self._by_document.pop(document_key, None)
+            if instance is None:
+                return None
+            instance.memory_bytes = self._probe_memory(instance)
+            instance.documents.discard(document_key)
+            instance.last_used = time.time()
+            return instance
+
+    def instance_for(self, document_key: str) -> Optional[WordInstance]:
+        """Return the instance a document is pinned to, or None."""
+        with self._lock:
+            return self._by_document.get(document_key)
+
+    def record_operation(self, instance: Optional[WordInstance], count: int = 1) -> None:
+        """Count operations served by an instance."""
+        if instance is None:
+            return
+        with self._lock:
+            instance.operations += count
+            instance.last_used = time.time()
+
+    def needs_recycling(self, instance: WordInstance) -> bool:
+        """Return whether an instance passed its operation or memory threshold."""
+        if self.max_operations is not None and instance.operations >= self.max_operations:
+            return True
+        return (
+            self.max_memory_bytes is not None
+            and instance.memory_bytes is not None
+            and instance.memory_bytes >= self.max_memory_bytes
+        )
+
+    def recycle_idle(self) -> int:
+        """
+        Quit idle instances that passed a threshold.
+
+        Returns:
+            The number of instances recycled.
+        """
+        with self._lock:
+            stale = [i for i in self._instances if not i.documents and self.needs_recycling(i)]
+            for instance in stale:
+                logger.info(
+                    f"Recycling Word instance {instance.instance_id} after "
+                    f"{instance.operations} operations ({instance.memory_bytes} bytes)"
+                )
+                self._remove(instance)
+            self._recycled += len(stale)
+            return len(stale)
+
+    def discard(self, instance: WordInstance) -> None:
+        """Drop an instance that no longer responds, unpinning its documents."""
+        with self._lock:
+            for key in list(instance.documents):
+                self._by_document.pop(key, None)
+            instance.documents.clear()
+            self._remove(instance)
+
+    def shutdown(self) -> None:
+        """Quit every instance."""
+        with self._lock:
+            for instance in list(self._instances):
+                self.discard(instance)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return pool statistics.
+
+        Returns:
+            A dict with the configured size and thresholds, the number of
+            instances started and recycled, pinned documents and per-instance
+            load.
+        """
+        with self._lock:
+            return {
+                "size": self.size,
+                "max_operations": self.max_operations,
+                "max_memory_bytes": self.max_memory_bytes,
+                "instances_created": self._created,
+                "instances_recycled": self._recycled,
+                "pinned_documents": len(self._by_document),
+                "instances": [i.to_dict() for i in self._instances],
+            }
+
+    def _start_instance(self) -> Optional[WordInstance]:
+        try:
+            app = self._app_factory()
+        except Exception as e:
+            logger.warning(f"Failed to start Word instance for pool: {e}")
+            app = None
+        if app is None:
+            return None
+        instance = WordInstance(self._next_id, app)
+        self._next_id += 1
+        self._created += 1
+        self._instances.append(instance)
+        logger.info(f"Started Word instance {instance.instance_id} ({len(self._instances)}/{self.size})")
+        return instance
+
+    def _remove(self, instance: WordInstance) -> None:
+        if instance in self._instances:
+            self._instances.remove(instance)
+        try:
+            instance.app.Quit()
+        except Exception as e:
+            logger.warning(f"Error quitting Word instance {instance.instance_id}: {e}")
+
+    def _probe_memory(self, instance: WordInstance) -> Optional[int]:
+        try:
+            memory = self._memory_probe(instance.app)
+        except Exception as e:
+            logger.debug(f"Memory probe failed for Word instance {instance.instance_id}: {e}")
+            return instance.memory_bytes
+        return memory if memory is not None else instance.memory_bytes
+
+
+def process_memory(app: Any) -> Optional[int]:
+    """
+    Return the working set of a Word process, or None if it cannot be read.
+
+    The process is found through the window of the active document, so this
+    only works while the instance has a document open.
+    """
+    try:
+        import win32api
+        import win32process
+
+        _, pid = win32process.GetWindowThreadProcessId(app.ActiveWindow.Hwnd)
+        # PROCESS_QUERY_INFORMATION | PROCESS_VM_READ
+        handle = win32api.OpenProcess(0x0400 | 0x0010, False, pid)
+        try:
+            return int(win32process.GetProcessMemoryInfo(handle)["WorkingSetSize"])
+        finally:
+            win32api.CloseHandle(handle)
+    except Exception:
+        return None
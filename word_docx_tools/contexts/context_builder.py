@@ -20,6 +20,7 @@ from .metadata_processing import (
 )
 
 # 导入文档大纲相关的函数
+from ..com_backend.document_outline import read_document_outline
 from ..operations.document_ops import get_document_outline, build_hierarchical_outline_by_level
 
 # 获取日志记录器
@@ -63,28 +64,12 @@ def create_document_context_tree(document: CDispatch, word_app: Optional[CDispat
         # 1. 首先获取并处理文档大纲（优先）
         outline_headings = []
         try:
-            # 收集所有标题段落
-            for i in range(1, document.Paragraphs.Count + 1):
-                paragraph = document.Paragraphs(i)
-                
-                # 获取段落大纲级别
-                outline_level = 0
-                if hasattr(paragraph, 'OutlineLevel'):
-                    outline_level = paragraph.OutlineLevel
-                
-                # 1~9为标题样式，10为正文
-                if 1 <= outline_level <= 9:
-                    # 获取段落样式信息
-                    style_name = paragraph.Style.NameLocal if hasattr(paragraph.Style, 'NameLocal') else ""
-                    
-                    outline_headings.append({
-                        "index": i,
-                        "text": paragraph.Range.Text.strip(),
-                        "outline_level": outline_level,
-                        "style_name": style_name,
-                        "paragraph_obj": paragraph,
-                        "range_obj": paragraph.Range
-                    })
+            # 通过大纲引擎批量获取标题，不再逐个读取段落
+            for heading in read_document_outline(document).heading_list():
+                range_obj = document.Range(heading["start"], heading["end"])
+                heading["range_obj"] = range_obj
+                heading["paragraph_obj"] = range_obj.Paragraphs(1)
+                outline_headings.append(heading)
             
             if outline_headings:
                 logger.info(f"Found {len(outline_headings)} outline headings")
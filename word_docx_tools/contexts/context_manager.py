@@ -1,25 +1,38 @@
+import os
 import time
-from typing import Dict, List, Optional, Any, Set
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
 from win32com.client import CDispatch
 import logging
 from ..common.exceptions import DocumentContextError, ErrorCode
 from ..com_backend.com_utils import handle_com_error
+from ..com_backend.context_intervals import ContextIntervalIndex
+from ..com_backend.metadata_index import DEFAULT_INDEXED_KEYS, IndexedContextMap
+from ..com_backend.metric_store import MetricStore
+from ..com_backend.text_index import DEFAULT_MAX_POSTINGS, ContextTextIndex, parse_max_postings
 from ..models.context import DocumentContext
 
+logger = logging.getLogger(__name__)
+
 
 class ContextManager:
     """上下文管理器，负责管理文档上下文对象的创建、更新、删除和查询"""
-    def __init__(self):
-        # 上下文对象映射表，用于快速查找
-        self._context_map: Dict[str, DocumentContext] = {}
+    def __init__(self, indexed_keys: Iterable[str] = DEFAULT_INDEXED_KEYS,
+                 max_text_postings: int = DEFAULT_MAX_POSTINGS):
+        # 上下文对象映射表，用于快速查找；按indexed_keys中的元数据键维护哈希索引
+        self._context_map: Dict[str, DocumentContext] = IndexedContextMap(keys=indexed_keys)
         # 上下文层次结构，维护上下文树关系
         self._context_tree: Dict[str, str] = {}
+        # 上下文偏移量的区间索引，用于范围查询
+        self._context_intervals = ContextIntervalIndex(lambda: self._context_map)
+        # 标题和元数据文本的三元组倒排索引，用于关键词搜索
+        self._text_index = ContextTextIndex(max_text_postings)
         # 事务相关状态
         self._in_transaction = False
         self._transaction_operations: List[Dict[str, Any]] = []
         self._transaction_context_backups: Dict[str, Dict[str, Any]] = {}
         # 性能监控相关
-        self._operation_times: Dict[str, Dict[str, Any]] = {}
+        # 操作耗时和附加指标：运行聚合值加蓄水池采样，受全局内存上限约束
+        self._operation_times = MetricStore()
         self._last_document_operation_time = 0
         self._document_operations_count = 0
 
@@ -47,6 +60,8 @@ class ContextManager:
 
             # 添加到映射表
             self._context_map[context_id] = context
+            self._context_intervals.invalidate()
+            self._text_index.add(context)
 
             # 如果有父上下文，建立父子关系
             if parent_context:
@@ -106,8 +121,11 @@ class ContextManager:
                 else:
                     logger.warning(f"Cannot update unknown field {key} for context {context_id}")
 
-            # 使缓存失效
+            # 使缓存失效（更新可能替换了Range），并按新的元数据重建索引
             context._invalidate_cache()
+            self._context_intervals.invalidate()
+            self._context_map.index.reindex(context)
+            self._text_index.reindex(context)
 
             # 记录事务操作
             if self._in_transaction:
@@ -170,6 +188,8 @@ class ContextManager:
 
             # 从映射表中移除
             del self._context_map[context_id]
+            self._context_intervals.invalidate()
+            self._text_index.discard(context_id)
 
             success = True
             logger.info(f"Context {context_id} removed successfully")
@@ -203,7 +223,96 @@ class ContextManager:
         Returns:
             子上下文ID列表
         """
-        return [context_id for context_id, p_id in self._context_tree.items() if p_id == parent_id]
+        children = self._context_map.index.lookup('parent_id', parent_id)
+        if children is None:
+            return [context_id for context_id, p_id in self._context_tree.items() if p_id == parent_id]
+        return [c.context_id for c in children if self._context_tree.get(c.context_id) == parent_id]
+
+    def find_contexts_by_type(self, context_type: str) -> List[DocumentContext]:
+        """
+        按类型查找上下文
+        
+        Args:
+            context_type: 上下文类型（如'paragraph', 'table', 'image', 'section'等）
+        
+        Returns:
+            上下文对象列表
+        """
+        return self.find_contexts_by_metadata({'type': context_type})
+
+    def find_contexts_by_metadata(self, metadata_filters: Dict[str, Any]) -> List[DocumentContext]:
+        """
+        按元数据等值条件查找上下文，条件中有已建索引的键时开销与结果数量成正比
+        
+        Args:
+            metadata_filters: 元数据键值条件，全部满足才匹配
+        
+        Returns:
+            上下文对象列表
+        """
+        matches = self._context_map.index.find(metadata_filters)
+        if matches is not None:
+            return matches
+        return [
+            context for context in self._context_map.values()
+            if all(k in context.metadata and context.metadata[k] == v for k, v in metadata_filters.items())
+        ]
+
+    def find_contexts_by_range(self, start: int, end: int,
+                               context_type: Optional[str] = None) -> List[DocumentContext]:
+        """
+        查找与指定范围重叠的上下文，按文档顺序返回
+        
+        Args:
+            start: 起始位置
+            end: 结束位置
+            context_type: 只返回该类型的上下文，None表示所有类型
+        
+        Returns:
+            上下文对象列表
+        """
+        return self._context_intervals.overlapping(start, end, context_type)
+
+    def find_contexts_containing(self, start: int, end: int,
+                                 context_type: Optional[str] = None) -> List[DocumentContext]:
+        """
+        查找包含指定范围的上下文，由内到外返回
+        
+        Args:
+            start: 起始位置
+            end: 结束位置
+            context_type: 只返回该类型的上下文，None表示所有类型
+        
+        Returns:
+            上下文对象列表
+        """
+        return self._context_intervals.containing(start, end, context_type)
+
+    def search_contexts(self, keyword: str, search_fields: Optional[List[str]] = None,
+                        operator: Optional[str] = None,
+                        limit: Optional[int] = None) -> List[Tuple[DocumentContext, int]]:
+        """
+        在标题和字符串元数据中搜索关键词（不区分大小写的子串匹配），使用倒排索引
+        
+        Args:
+            keyword: 搜索关键词
+            search_fields: 要搜索的字段列表，默认为['title', 'metadata']
+            operator: None表示整体匹配关键词，'and'/'or'表示按空白拆分后全部/任一匹配
+            limit: 最多返回的结果数量
+        
+        Returns:
+            (上下文对象, 得分)列表，得分高的在前
+        """
+        return self._text_index.search(keyword, search_fields, operator, limit)
+
+    def get_text_index_stats(self) -> Dict[str, Any]:
+        """
+        获取关键词索引的统计信息
+        
+        Returns:
+            索引的上下文数、三元组数和倒排表条目数
+        """
+        return self._text_index.get_stats()
 
     def get_all_contexts(self) -> List[DocumentContext]:
         """
@@ -266,37 +375,7 @@ class ContextManager:
             **kwargs: 其他要记录的指标（如结果数量、操作计数等）
         """
         try:
-            if operation_type not in self._operation_times:
-                self._operation_times[operation_type] = {
-                    'count': 0,
-                    'total_time': 0,
-                    'success_count': 0,
-                    'fail_count': 0,
-                    'metrics': {}
-                }
-            
-            # 更新基本统计信息
-            self._operation_times[operation_type]['count'] += 1
-            self._operation_times[operation_type]['total_time'] += duration
-            
-            if success:
-                self._operation_times[operation_type]['success_count'] += 1
-            else:
-                self._operation_times[operation_type]['fail_count'] += 1
-            
-            # 更新额外指标
-            for key, value in kwargs.items():
-                if key not in self._operation_times[operation_type]['metrics']:
-                    self._operation_times[operation_type]['metrics'][key] = []
-                
-                # 对于数值类型，记录具体值；对于其他类型，记录计数或状态
-                if isinstance(value, (int, float)):
-                    self._operation_times[operation_type]['metrics'][key].append(value)
-                else:
-                    # 对于非数值类型，记录存在性
-                    if key not in self._operation_times[operation_type]['metrics']:
-                        self._operation_times[operation_type]['metrics'][key] = 0
-                    self._operation_times[operation_type]['metrics'][key] += 1
+            self._operation_times.record(operation_type, duration, success, **kwargs)
             
             # 记录操作频率
             current_time = time.time()
@@ -318,7 +397,11 @@ class ContextManager:
         Returns:
             包含性能指标的字典
         """
-        return self._operation_times.copy()
+        return self._operation_times.snapshot()
+
+    def reset_performance_metrics(self) -> None:
+        """清空性能指标，释放其占用的内存预算"""
+        self._operation_times.reset()
 
     def clear_all_contexts(self) -> bool:
         """
@@ -344,6 +427,7 @@ class ContextManager:
             # 清空映射表和树结构
             self._context_map.clear()
             self._context_tree.clear()
+            self._text_index.clear()
             
             # 提交事务
             self.commit_transaction()
@@ -362,7 +446,9 @@ class ContextManager:
 
 
 # 创建全局上下文管理器实例
-global_context_manager = ContextManager()
+global_context_manager = ContextManager(
+    max_text_postings=parse_max_postings(os.environ.get("WORD_CONTEXT_TEXT_INDEX_MAX_POSTINGS"))
+)
 
 
 def get_context_manager() -> ContextManager:
@@ -7,6 +7,7 @@
 import logging
 from typing import Optional, Dict, Any, Union
 from win32com.client import CDispatch
+from ..com_backend.page_map import read_page_map
 from ..utils.com_error_handler import handle_com_error
 from ..utils.logger import get_logger
 from ..models.context import DocumentContext
@@ -336,12 +337,11 @@ def get_context_information(word_app: CDispatch) -> Dict[str, Any]:
                     'tables': getattr(active_doc, 'Tables', 0).Count
                 }
                 
-                # 添加页数信息（如果可用）
-                if hasattr(active_doc, 'ComputeStatistics'):
-                    try:
-                        context_info['document']['pages'] = active_doc.ComputeStatistics(2)  # wdStatisticPages
-                    except Exception:
-                        context_info['document']['pages'] = 0
+                # 添加页数信息（如果可用），取自按文档版本缓存的页面索引
+                try:
+                    context_info['document']['pages'] = read_page_map(active_doc).page_count
+                except Exception:
+                    context_info['document']['pages'] = 0
             except Exception as e:
                 logger.error(f"Error retrieving document information: {e}")
                 context_info['document'] = {'error': str(e)}
@@ -1,118 +1,301 @@
 from typing import Dict, Any, Optional, List, Union, Callable, Tuple
 import time
 import hashlib
+import heapq
+import sys
 import threading
+from collections import OrderedDict
 from functools import wraps
 import json
 
-from ..utils.exceptions import WordDocumentError, ErrorCode
-from ..utils.logger import log_info, log_error, log_debug
+from ..com_backend.com_utils import handle_com_error
+from ..com_backend.latency_stats import (DEFAULT_RATE_WINDOW, PERCENTILES,
+                                         OperationStats, render_prometheus,
+                                         write_prometheus_textfile)
+from ..mcp_service.core_utils import log_debug, log_error, log_info
+from ..mcp_service.errors import ErrorCode, WordDocumentError
 from .context_control import DocumentContext
 
 # 缓存配置
 DEFAULT_CACHE_TTL = 60  # 默认缓存过期时间(秒)
 DEFAULT_CACHE_SIZE = 100  # 默认缓存大小
+DEFAULT_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 每个分区默认的字节预算
+DEFAULT_NAMESPACE = "default"
+
+
+def estimate_cache_size(value: Any) -> int:
+    """估算缓存值占用的字节数（JSON数据按序列化长度计算）"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError, OverflowError):
+        return sys.getsizeof(value)
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at", "size", "seq")
+
+    def __init__(self, value: Any, expires_at: float, size: int, seq: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.seq = seq
+
+
+class _CachePartition:
+    """一个命名空间的缓存分区：LRU有序字典 + 过期时间堆"""
+
+    def __init__(self, ttl: float, max_size: int, max_bytes: Optional[int]):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        # 最近使用的项在末尾
+        self.entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        # (过期时间, 序号, 键)，被覆盖或删除的项在弹出时跳过
+        self.expiry: List[Tuple[float, int, str]] = []
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    def get(self, key: str, now: float) -> Tuple[bool, Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        if now > entry.expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def set(self, key: str, value: Any, ttl: Optional[float], now: float, seq: int, size: int) -> bool:
+        self.purge(now)
+        self._remove(key)
+        if (self.max_bytes is not None and size > self.max_bytes) or self.max_size <= 0:
+            self.rejected += 1
+            return False
+        expires_at = now + (ttl if ttl is not None else self.ttl)
+        self.entries[key] = _CacheEntry(value, expires_at, size, seq)
+        self.bytes += size
+        heapq.heappush(self.expiry, (expires_at, seq, key))
+        # 按LRU顺序淘汰，直到数量和字节数都回到预算内
+        while len(self.entries) > self.max_size or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            oldest, _ = next(iter(self.entries.items()))
+            self._remove(oldest)
+            self.evictions += 1
+        self._compact()
+        return True
+
+    def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    def purge(self, now: float) -> None:
+        """删除所有已过期的项，每项O(log n)"""
+        while self.expiry and self.expiry[0][0] < now:
+            _, seq, key = heapq.heappop(self.expiry)
+            entry = self.entries.get(key)
+            if entry is not None and entry.seq == seq:
+                self._remove(key)
+                self.expirations += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.expiry.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+        }
+
+    def _remove(self, key: str) -> bool:
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.bytes -= entry.size
+        return True
+
+    def _compact(self) -> None:
+        # 覆盖写入会在堆中留下失效项，超过有效项两倍时重建
+        if len(self.expiry) > 2 * len(self.entries) + 16:
+            self.expiry = [
+                (entry.expires_at, entry.seq, key) for key, entry in self.entries.items()
+            ]
+            heapq.heapify(self.expiry)
+
 
 class ContextCache:
-    """上下文缓存管理类"""
-    
-    def __init__(self, ttl: int = DEFAULT_CACHE_TTL, max_size: int = DEFAULT_CACHE_SIZE):
+    """上下文缓存管理类
+
+    每个命名空间是独立的分区，各自按LRU淘汰、按TTL过期并受条目数和字节预算限制，
+    因此上下文树、定位结果和文本快照等不同用途的数据不会相互挤出。读写都是O(1)，
+    过期项通过过期时间堆清理（每项O(log n)）。
+    """
+
+    def __init__(self, ttl: int = DEFAULT_CACHE_TTL, max_size: int = DEFAULT_CACHE_SIZE,
+                 max_bytes: Optional[int] = DEFAULT_CACHE_MAX_BYTES,
+                 sizer: Callable[[Any], int] = estimate_cache_size,
+                 clock: Callable[[], float] = time.monotonic):
         self.ttl = ttl
         self.max_size = max_size
-        self.cache = {}
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.clock = clock
+        self.partitions: Dict[str, _CachePartition] = {}
         self.lock = threading.RLock()
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._seq = 0
+
+    def configure_namespace(self, namespace: str, ttl: Optional[int] = None,
+                            max_size: Optional[int] = None,
+                            max_bytes: Optional[int] = None) -> None:
+        """设置命名空间分区的过期时间、条目数上限和字节预算
+
+        Args:
+            namespace: 命名空间
+            ttl: 默认过期时间(秒)，None表示使用缓存的默认值
+            max_size: 最大条目数，None表示使用缓存的默认值
+            max_bytes: 字节预算，None表示使用缓存的默认值
+        """
+        with self.lock:
+            partition = self._partition(namespace)
+            partition.ttl = ttl if ttl is not None else self.ttl
+            partition.max_size = max_size if max_size is not None else self.max_size
+            partition.max_bytes = max_bytes if max_bytes is not None else self.max_bytes
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None,
+            namespace: str = DEFAULT_NAMESPACE) -> None:
         """设置缓存项
         
         Args:
             key: 缓存键
             value: 缓存值
             ttl: 缓存过期时间(秒)，None表示使用默认值
+            namespace: 缓存分区
         """
+        size = self.sizer(value) + len(key)
         with self.lock:
-            # 如果缓存已满，移除最早的项
-            if len(self.cache) >= self.max_size:
-                # 获取最早添加的键
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['added_at'])
-                del self.cache[oldest_key]
-                
-            # 存储缓存项
-            self.cache[key] = {
-                'value': value,
-                'added_at': time.time(),
-                'ttl': ttl if ttl is not None else self.ttl
-            }
+            self._seq += 1
+            self._partition(namespace).set(key, value, ttl, self.clock(), self._seq, size)
     
-    def get(self, key: str) -> Any:
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Any:
         """获取缓存项
         
         Args:
             key: 缓存键
+            namespace: 缓存分区
             
         Returns:
             缓存值，如果不存在或已过期则返回None
         """
         with self.lock:
-            if key not in self.cache:
-                return None
-            
-            item = self.cache[key]
-            current_time = time.time()
-            
-            # 检查是否过期
-            if current_time - item['added_at'] > item['ttl']:
-                # 删除过期项
-                del self.cache[key]
-                return None
-            
-            return item['value']
+            return self._partition(namespace).get(key, self.clock())[1]
     
-    def delete(self, key: str) -> None:
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> None:
         """删除缓存项
         
         Args:
             key: 缓存键
+            namespace: 缓存分区
         """
         with self.lock:
-            if key in self.cache:
-                del self.cache[key]
+            partition = self.partitions.get(namespace)
+            if partition is not None:
+                partition.delete(key)
     
-    def clear(self) -> None:
-        """清空缓存"""
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """清空缓存
+
+        Args:
+            namespace: 只清空该分区，None表示清空所有分区
+        """
         with self.lock:
-            self.cache.clear()
+            for name, partition in self.partitions.items():
+                if namespace is None or name == namespace:
+                    partition.clear()
     
-    def size(self) -> int:
+    def size(self, namespace: Optional[str] = None) -> int:
         """获取缓存大小
         
+        Args:
+            namespace: 只统计该分区，None表示所有分区
+
         Returns:
             缓存项数量
         """
         with self.lock:
             # 先清理过期项
             self._clean_expired()
-            return len(self.cache)
+            return sum(
+                len(partition.entries) for name, partition in self.partitions.items()
+                if namespace is None or name == namespace
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+
+        Returns:
+            总计数以及每个分区的条目数、字节数、命中、未命中、淘汰和过期次数
+        """
+        with self.lock:
+            self._clean_expired()
+            namespaces = {name: p.stats() for name, p in self.partitions.items()}
+        totals = {
+            field: sum(stats[field] for stats in namespaces.values())
+            for field in ("size", "bytes", "hits", "misses", "evictions", "expirations", "rejected")
+        }
+        lookups = totals["hits"] + totals["misses"]
+        totals["hit_rate"] = totals["hits"] / lookups if lookups else 0.0
+        totals["namespaces"] = namespaces
+        return totals
     
     def _clean_expired(self) -> None:
         """清理过期的缓存项"""
-        current_time = time.time()
-        expired_keys = [
-            key for key, item in self.cache.items()
-            if current_time - item['added_at'] > item['ttl']
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
+        now = self.clock()
+        for partition in self.partitions.values():
+            partition.purge(now)
+
+    def _partition(self, namespace: str) -> _CachePartition:
+        partition = self.partitions.get(namespace)
+        if partition is None:
+            partition = _CachePartition(self.ttl, self.max_size, self.max_bytes)
+            self.partitions[namespace] = partition
+        return partition
 
 # 创建全局上下文缓存实例
 context_cache = ContextCache()
 
 class PerformanceMonitor:
-    """性能监控工具类"""
+    """性能监控工具类
+
+    每个操作只保存固定大小的延迟直方图（按成功/失败分开）和滑动窗口计数，
+    内存占用与调用次数无关，统计中包含p50/p90/p99/p99.9分位数和窗口内调用速率。
+    """
     
-    def __init__(self):
-        self.performance_records = {}
+    def __init__(self, window_seconds: int = DEFAULT_RATE_WINDOW):
+        self.window_seconds = window_seconds
+        self.performance_records: Dict[str, OperationStats] = {}
         self.lock = threading.RLock()
     
     def start(self, operation_name: str) -> float:
@@ -127,8 +310,7 @@ class PerformanceMonitor:
         start_time = time.time()
         
         with self.lock:
-            if operation_name not in self.performance_records:
-                self.performance_records[operation_name] = []
+            self._operation(operation_name)
         
         return start_time
     
@@ -141,25 +323,20 @@ class PerformanceMonitor:
             success: 操作是否成功
             
         Returns:
-            性能记录
+            本次调用的性能记录（只计入直方图，不单独保存）
         """
         end_time = time.time()
         duration = end_time - start_time
         
         with self.lock:
-            record = {
-                'start_time': start_time,
-                'end_time': end_time,
-                'duration': duration,
-                'success': success
-            }
-            
-            if operation_name in self.performance_records:
-                self.performance_records[operation_name].append(record)
-            else:
-                self.performance_records[operation_name] = [record]
+            self._operation(operation_name).record(duration, success)
         
-        return record
+        return {
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration': duration,
+            'success': success
+        }
     
     def get_stats(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """获取性能统计信息
@@ -173,38 +350,38 @@ class PerformanceMonitor:
         with self.lock:
             if operation_name:
                 # 获取特定操作的统计
-                if operation_name not in self.performance_records:
-                    return {
-                        'operation_name': operation_name,
-                        'count': 0,
-                        'success_count': 0,
-                        'failure_count': 0,
-                        'avg_duration': 0,
-                        'min_duration': float('inf'),
-                        'max_duration': 0
-                    }
-                
-                records = self.performance_records[operation_name]
-                return self._calculate_stats(operation_name, records)
+                return self._calculate_stats(operation_name, self.performance_records.get(operation_name))
             else:
                 # 获取所有操作的统计
-                all_stats = {}
-                for op_name, records in self.performance_records.items():
-                    all_stats[op_name] = self._calculate_stats(op_name, records)
-                
-                return all_stats
+                return {
+                    op_name: self._calculate_stats(op_name, stats)
+                    for op_name, stats in self.performance_records.items()
+                }
+
+    def export_prometheus(self, path: str) -> str:
+        """将所有操作的统计以Prometheus文本格式写入本地文件
+        
+        Args:
+            path: 输出文件路径（供node exporter的textfile collector读取）
+            
+        Returns:
+            写入的绝对路径
+        """
+        with self.lock:
+            snapshots = {name: stats.snapshot() for name, stats in self.performance_records.items()}
+        return write_prometheus_textfile(path, render_prometheus(snapshots))
     
-    def _calculate_stats(self, operation_name: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_stats(self, operation_name: str, stats: Optional[OperationStats]) -> Dict[str, Any]:
         """计算指定操作的性能统计
         
         Args:
             operation_name: 操作名称
-            records: 性能记录列表
+            stats: 操作的直方图统计
             
         Returns:
             性能统计信息
         """
-        if not records:
+        if stats is None or not (stats.success.count or stats.failure.count):
             return {
                 'operation_name': operation_name,
                 'count': 0,
@@ -215,31 +392,35 @@ class PerformanceMonitor:
                 'max_duration': 0
             }
         
-        # 计算统计数据
-        count = len(records)
-        success_count = sum(1 for r in records if r['success'])
-        failure_count = count - success_count
-        
-        durations = [r['duration'] for r in records]
-        avg_duration = sum(durations) / count if count > 0 else 0
-        min_duration = min(durations) if count > 0 else 0
-        max_duration = max(durations) if count > 0 else 0
-        
-        return {
+        snapshot = stats.snapshot()
+        result = {
             'operation_name': operation_name,
-            'count': count,
-            'success_count': success_count,
-            'failure_count': failure_count,
-            'avg_duration': avg_duration,
-            'min_duration': min_duration,
-            'max_duration': max_duration
+            'count': snapshot['count'],
+            'success_count': snapshot['success']['count'],
+            'failure_count': snapshot['failure']['count'],
+            'avg_duration': snapshot['avg'],
+            'min_duration': snapshot['min'],
+            'max_duration': snapshot['max']
         }
+        for key, _ in PERCENTILES:
+            result[f'{key}_duration'] = snapshot[key]
+        result['success'] = snapshot['success']
+        result['failure'] = snapshot['failure']
+        result['rates'] = snapshot['rates']
+        return result
     
     def clear(self) -> None:
         """清除所有性能记录"""
         with self.lock:
             self.performance_records.clear()
 
+    def _operation(self, operation_name: str) -> OperationStats:
+        stats = self.performance_records.get(operation_name)
+        if stats is None:
+            stats = OperationStats(self.window_seconds)
+            self.performance_records[operation_name] = stats
+        return stats
+
 # 创建全局性能监控实例
 performance_monitor = PerformanceMonitor()
 
@@ -247,7 +428,8 @@ performance_monitor = PerformanceMonitor()
 def cache_context_data(
     cache_key: str,
     data: Any,
-    ttl: Optional[int] = None
+    ttl: Optional[int] = None,
+    namespace: str = DEFAULT_NAMESPACE
 ) -> Dict[str, Any]:
     """缓存上下文数据
 
@@ -255,6 +437,7 @@ def cache_context_data(
         cache_key: 缓存键
         data: 要缓存的数据
         ttl: 缓存过期时间(秒)
+        namespace: 缓存分区（如上下文树、定位结果、文本快照），分区之间互不淘汰
 
     Returns:
         包含缓存结果的字典
@@ -280,7 +463,7 @@ def cache_context_data(
             serialized_data = data
         
         # 设置缓存
-        context_cache.set(cache_key, serialized_data, ttl)
+        context_cache.set(cache_key, serialized_data, ttl, namespace=namespace)
         
         log_debug(f"Successfully cached context data with key: {cache_key}")
         
@@ -294,18 +477,19 @@ def cache_context_data(
         raise
 
 @handle_com_error(ErrorCode.SERVER_ERROR, "get cached context data")
-def get_cached_context_data(cache_key: str) -> Dict[str, Any]:
+def get_cached_context_data(cache_key: str, namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Any]:
     """获取缓存的上下文数据
 
     Args:
         cache_key: 缓存键
+        namespace: 缓存分区
 
     Returns:
         包含缓存数据的字典
     """
     try:
         # 获取缓存
-        cached_data = context_cache.get(cache_key)
+        cached_data = context_cache.get(cache_key, namespace=namespace)
         
         if cached_data is None:
             return {
@@ -328,18 +512,19 @@ def get_cached_context_data(cache_key: str) -> Dict[str, Any]:
         raise
 
 @handle_com_error(ErrorCode.SERVER_ERROR, "invalidate cached context data")
-def invalidate_cached_context_data(cache_key: str) -> Dict[str, Any]:
+def invalidate_cached_context_data(cache_key: str, namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Any]:
     """使缓存的上下文数据失效
 
     Args:
         cache_key: 缓存键
+        namespace: 缓存分区
 
     Returns:
         包含操作结果的字典
     """
     try:
         # 删除缓存
-        context_cache.delete(cache_key)
+        context_cache.delete(cache_key, namespace=namespace)
         
         log_debug(f"Successfully invalidated cached context data with key: {cache_key}")
         
@@ -353,15 +538,18 @@ def invalidate_cached_context_data(cache_key: str) -> Dict[str, Any]:
         raise
 
 @handle_com_error(ErrorCode.SERVER_ERROR, "clear context cache")
-def clear_context_cache() -> Dict[str, Any]:
+def clear_context_cache(namespace: Optional[str] = None) -> Dict[str, Any]:
     """清空上下文缓存
 
+    Args:
+        namespace: 只清空该分区，None表示清空所有分区
+
     Returns:
         包含操作结果的字典
     """
     try:
         # 清空缓存
-        context_cache.clear()
+        context_cache.clear(namespace)
         
         log_info("Successfully cleared context cache")
         
@@ -378,18 +566,19 @@ def get_context_cache_stats() -> Dict[str, Any]:
     """获取上下文缓存统计信息
 
     Returns:
-        包含缓存统计的字典
+        包含缓存统计的字典：条目数、字节数、命中/未命中/淘汰/过期次数及各分区明细
     """
     try:
-        # 获取缓存大小
-        cache_size = context_cache.size()
+        stats = context_cache.get_stats()
+        cache_size = stats["size"]
         
-        log_debug(f"Context cache statistics: size={cache_size}")
+        log_debug(f"Context cache statistics: size={cache_size}, hits={stats['hits']}, misses={stats['misses']}")
         
         return {
             "success": True,
             "message": "Context cache statistics retrieved successfully",
-            "cache_size": cache_size
+            "cache_size": cache_size,
+            "stats": stats
         }
     except Exception as e:
         log_error(f"Failed to get context cache statistics: {str(e)}")
@@ -403,7 +592,8 @@ def get_performance_stats(operation_name: Optional[str] = None) -> Dict[str, Any
         operation_name: 可选的操作名称
 
     Returns:
-        包含性能统计的字典
+        包含性能统计的字典（次数、平均/最小/最大耗时、p50/p90/p99/p99.9分位数、
+        成功/失败拆分和滑动窗口内的调用速率）
     """
     try:
         # 获取性能统计
@@ -442,6 +632,30 @@ def clear_performance_stats() -> Dict[str, Any]:
         log_error(f"Failed to clear performance statistics: {str(e)}")
         raise
 
+@handle_com_error(ErrorCode.SERVER_ERROR, "export performance stats")
+def export_performance_stats(path: str) -> Dict[str, Any]:
+    """将性能统计导出为Prometheus文本文件
+
+    Args:
+        path: 本地输出文件路径
+
+    Returns:
+        包含导出结果的字典
+    """
+    try:
+        written = performance_monitor.export_prometheus(path)
+        
+        log_info(f"Performance statistics exported to {written}")
+        
+        return {
+            "success": True,
+            "message": "Performance statistics exported successfully",
+            "path": written
+        }
+    except Exception as e:
+        log_error(f"Failed to export performance statistics: {str(e)}")
+        raise
+
 @handle_com_error(ErrorCode.SERVER_ERROR, "generate context ID")
 def generate_context_id(prefix: str = "ctx", seed: Optional[str] = None) -> str:
     """生成唯一的上下文ID
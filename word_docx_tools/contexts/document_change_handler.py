@@ -172,12 +172,7 @@ class DocumentChangeHandler:
                 return context_manager.update_context(paragraph_id, {'metadata': metadata})
             else:
                 # 创建新的上下文
-                section = self._find_section_for_range(paragraph.Range)
-                if not section:
-                    return False
-                
-                section_id = f"section_{section.Range.Start}"
-                section_context = context_manager.find_context_by_id(section_id)
+                section_context = self._find_section_context(paragraph.Range)
                 
                 if not section_context:
                     return False
@@ -246,12 +241,7 @@ class DocumentChangeHandler:
                 return context_manager.update_context(table_id, {'metadata': metadata})
             else:
                 # 创建新的上下文
-                section = self._find_section_for_range(table.Range)
-                if not section:
-                    return False
-                
-                section_id = f"section_{section.Range.Start}"
-                section_context = context_manager.find_context_by_id(section_id)
+                section_context = self._find_section_context(table.Range)
                 
                 if not section_context:
                     return False
@@ -320,12 +310,7 @@ class DocumentChangeHandler:
                 return context_manager.update_context(image_id, {'metadata': metadata})
             else:
                 # 创建新的上下文
-                section = self._find_section_for_range(image.Range)
-                if not section:
-                    return False
-                
-                section_id = f"section_{section.Range.Start}"
-                section_context = context_manager.find_context_by_id(section_id)
+                section_context = self._find_section_context(image.Range)
                 
                 if not section_context:
                     return False
@@ -465,34 +450,28 @@ class DocumentChangeHandler:
         except Exception as e:
             logger.error(f"Error batch processing document objects: {e}")
 
-    def _find_section_for_range(self, range_obj: CDispatch) -> Optional[CDispatch]:
+    def _find_section_context(self, range_obj: CDispatch) -> Optional[DocumentContext]:
         """
-        查找Range所属的节
+        查找包含Range的节上下文
         
         Args:
             range_obj: Range对象
         
         Returns:
-            节对象，如果未找到则返回None
+            节上下文，如果未找到则返回None
         """
         try:
-            if not range_obj or not hasattr(range_obj, 'Document'):
+            if not range_obj:
                 return None
             
-            document = range_obj.Document
-            for section in document.Sections:
-                if section.Range.Start <= range_obj.Start and section.Range.End >= range_obj.End:
-                    return section
-            
-            # 如果没有完全包含的节，返回第一个节
-            if document.Sections.Count > 0:
-                return document.Sections(1)
-            
-            return None
+            # 通过上下文管理器的区间索引查找，不逐个读取节的Range
+            sections = get_context_manager().find_contexts_containing(
+                range_obj.Start, range_obj.End, "section"
+            )
+            return sections[0] if sections else None
         except Exception:
             return None
 
-
 # 创建全局文档变更处理器实例
 global_change_handler = DocumentChangeHandler()
 
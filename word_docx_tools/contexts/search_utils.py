@@ -7,6 +7,8 @@ from ..com_backend.com_utils import handle_com_error
 from .context_control import DocumentContext
 from .context_manager import get_context_manager
 
+logger = logging.getLogger(__name__)
+
 
 def search_contexts_by_type(context_type: str, include_children: bool = False) -> List[Dict[str, Any]]:
     """
@@ -24,14 +26,12 @@ def search_contexts_by_type(context_type: str, include_children: bool = False) -
 
     try:
         context_manager = get_context_manager()
-        all_contexts = context_manager.get_all_contexts()
         
-        # 过滤出指定类型的上下文
-        for context in all_contexts:
-            if context.metadata.get('type') == context_type:
-                # 转换为字典格式
-                context_dict = _context_to_dict(context, include_children)
-                results.append(context_dict)
+        # 通过类型索引查找指定类型的上下文
+        for context in context_manager.find_contexts_by_type(context_type):
+            # 转换为字典格式
+            context_dict = _context_to_dict(context, include_children)
+            results.append(context_dict)
         
         logger.info(f"Search for context type '{context_type}' found {len(results)} results")
     except Exception as e:
@@ -122,13 +122,10 @@ def _context_to_dict(context: DocumentContext, include_children: bool = False) -
             'has_children': len(context.child_contexts) > 0
         }
         
-        # 添加位置信息（如果可用）
-        if hasattr(context, 'range_obj') and context.range_obj:
-            try:
-                context_dict['start'] = context.range_obj.Start
-                context_dict['end'] = context.range_obj.End
-            except Exception:
-                pass
+        # 添加位置信息（如果可用），使用上下文记录的偏移量而不读取Range
+        offsets = context.get_offsets() if hasattr(context, 'get_offsets') else None
+        if offsets is not None:
+            context_dict['start'], context_dict['end'] = offsets
         
         # 如果需要，添加子上下文信息
         if include_children and hasattr(context, 'child_contexts'):
@@ -194,19 +191,10 @@ def find_contexts_by_metadata(metadata_filters: Dict[str, Any]) -> List[Dict[str
 
     try:
         context_manager = get_context_manager()
-        all_contexts = context_manager.get_all_contexts()
         
-        # 根据元数据筛选上下文
-        for context in all_contexts:
-            # 检查是否满足所有筛选条件
-            match = True
-            for key, value in metadata_filters.items():
-                if key not in context.metadata or context.metadata[key] != value:
-                    match = False
-                    break
-            
-            if match:
-                results.append(_context_to_dict(context))
+        # 根据元数据筛选上下文（有索引的键直接命中对应的索引桶）
+        for context in context_manager.find_contexts_by_metadata(metadata_filters):
+            results.append(_context_to_dict(context))
         
         logger.info(f"Metadata search found {len(results)} matching contexts")
     except Exception as e:
@@ -244,24 +232,10 @@ def find_contexts_by_range(start_pos: int, end_pos: int) -> List[Dict[str, Any]]
 
     try:
         context_manager = get_context_manager()
-        all_contexts = context_manager.get_all_contexts()
         
-        # 查找与指定范围有交集的上下文
-        for context in all_contexts:
-            # 检查上下文是否有位置信息
-            if not hasattr(context, 'range_obj') or not context.range_obj:
-                continue
-            
-            try:
-                context_start = context.range_obj.Start
-                context_end = context.range_obj.End
-                
-                # 检查是否有交集
-                if not (context_end < start_pos or context_start > end_pos):
-                    results.append(_context_to_dict(context))
-            except Exception:
-                # 如果获取位置信息失败，跳过此上下文
-                continue
+        # 通过区间索引查找与指定范围有交集的上下文（端点相接也算交集），不逐个读取Range
+        for context in context_manager.find_contexts_by_range(start_pos - 1, end_pos + 1):
+            results.append(_context_to_dict(context))
         
         logger.info(f"Range search found {len(results)} matching contexts")
     except Exception as e:
@@ -283,16 +257,19 @@ def find_contexts_by_range(start_pos: int, end_pos: int) -> List[Dict[str, Any]]
     return results
 
 
-def search_contexts(keyword: str, search_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+def search_contexts(keyword: str, search_fields: Optional[List[str]] = None,
+                    operator: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     全文搜索上下文
     
     Args:
         keyword: 搜索关键词
         search_fields: 要搜索的字段列表，默认为['title', 'metadata']
+        operator: None表示整体匹配关键词，'and'/'or'表示按空白拆分后全部/任一匹配
+        limit: 最多返回的结果数量
     
     Returns:
-        包含关键词的上下文对象列表（字典形式）
+        包含关键词的上下文对象列表（字典形式），按得分从高到低排列
     """
     start_time = time.time()
     results = []
@@ -302,29 +279,15 @@ def search_contexts(keyword: str, search_fields: Optional[List[str]] = None) ->
         search_fields = ['title', 'metadata']
 
     try:
+        if operator is not None and operator.lower() not in ('and', 'or'):
+            raise ValueError(f"Unsupported operator: {operator}")
+
+        # 倒排索引只返回包含所有关键词三元组的候选上下文
         context_manager = get_context_manager()
-        all_contexts = context_manager.get_all_contexts()
-        
-        # 转换关键词为小写以进行不区分大小写的搜索
-        keyword_lower = keyword.lower()
-        
-        # 搜索上下文
-        for context in all_contexts:
-            # 检查是否在任何指定字段中包含关键词
-            match = False
-            
-            if 'title' in search_fields and keyword_lower in context.title.lower():
-                match = True
-            
-            if 'metadata' in search_fields:
-                # 检查元数据中的字符串值
-                for key, value in context.metadata.items():
-                    if isinstance(value, str) and keyword_lower in value.lower():
-                        match = True
-                        break
-            
-            if match:
-                results.append(_context_to_dict(context))
+        for context, score in context_manager.search_contexts(keyword, search_fields, operator, limit):
+            result = _context_to_dict(context)
+            result['score'] = score
+            results.append(result)
         
         logger.info(f"Keyword search for '{keyword}' found {len(results)} matching contexts")
     except Exception as e:
@@ -4,7 +4,6 @@ AppContext for managing the Word application instance and the active document st
 
 import logging
 import os
-import shutil
 import sys
 import traceback
 import time
@@ -16,7 +15,21 @@ from win32com.client.dynamic import CDispatch
 from win32com.client import constants as wd_constants
 
 from .errors import ErrorCode, WordDocumentError
+from ..com_backend.com_dispatch import (binding_mode, create_word_application,
+                                        rebuild_word_typelib)
+from ..com_backend.com_utils import document_key
+from ..com_backend.context_intervals import ContextIntervalIndex
+from ..com_backend.edit_journal import (anchored_offsets_current,
+                                        get_edit_journal,
+                                        get_edit_journal_stats)
+from ..com_backend.metadata_index import IndexedContextMap, parse_indexed_keys
+from ..com_backend.metric_store import MetricStore
+from ..com_backend.render_suspension import suspend_rendering
+from ..com_backend.section_sweep import read_section_content
+from ..com_backend.word_pool import WordInstance, WordInstancePool
 from ..common.exceptions import DocumentContextError
+from .document_workspace import (DEFAULT_MAX_DOCUMENTS, DocumentWorkspace,
+                                 WorkspaceDocument, forget_document_caches)
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -62,15 +75,34 @@ class AppContext:
             return
 
         # Initialize attributes first
+        self._logger = logger
         self._temp_word_app: Optional[CDispatch] = None
         self._active_document: Optional[CDispatch] = None
         self._word_app: Optional[CDispatch] = None
+
+        # Word实例池（WORD_POOL_SIZE > 1 时启用），文档固定在打开它的实例上
+        self._word_pool: Optional[WordInstancePool] = None
+        self._pool_configured = False
+        self._pending_instance: Optional[WordInstance] = None
+        self._active_instance: Optional[WordInstance] = None
+
+        # 多文档工作区：按句柄管理打开的文档，每个文档保留自己的上下文树
+        self._workspace = DocumentWorkspace(
+            _env_int("WORD_WORKSPACE_MAX_DOCUMENTS") or DEFAULT_MAX_DOCUMENTS
+        )
+        self._active_handle: Optional[str] = None
         
         # Document context tree management
         self._document_context_tree: Optional[DocumentContext] = None  # Root of the context tree
-        self._context_map: Dict[str, DocumentContext] = {}  # Map of context IDs to context objects
+        # 上下文映射按这些元数据键维护哈希索引（WORD_CONTEXT_INDEX_KEYS）
+        self._indexed_metadata_keys = parse_indexed_keys(os.environ.get("WORD_CONTEXT_INDEX_KEYS"))
+        self._context_map: Dict[str, DocumentContext] = self._new_context_map()  # Map of context IDs to context objects
         self._active_context: Optional[DocumentContext] = None  # Currently active context
         self._update_handlers: List[Callable] = []  # List of update handlers for real-time mapping
+        # 上下文偏移量的区间索引，范围查询不再逐个读取Range
+        self._context_intervals = ContextIntervalIndex(
+            lambda: self._context_map, version_source=self._active_edit_version
+        )
         
         # 文档操作相关
         self._document_operations_count = 0
@@ -83,7 +115,8 @@ class AppContext:
         self._cache_misses = 0
         
         # 性能监控
-        self._operation_times = {}
+        # 操作耗时和附加指标：运行聚合值加蓄水池采样，受全局内存上限约束
+        self._operation_times = MetricStore()
         
         # 事务状态
         self._in_transaction = False
@@ -101,45 +134,116 @@ class AppContext:
         """
         self._word_app = word_app
 
-    def _clear_com_cache(self):
-        """Clear win32com cache to resolve CLSIDToPackageMap errors"""
+    def configure_word_pool(
+        self,
+        size: Optional[int] = None,
+        max_operations: Optional[int] = None,
+        max_memory_bytes: Optional[int] = None,
+        app_factory: Optional[Callable[[], Any]] = None,
+    ) -> Optional[WordInstancePool]:
+        """
+        Configure the pool of Word instances new documents are routed to.
+
+        Values not given are read from the environment: ``WORD_POOL_SIZE``
+        (default 1), ``WORD_POOL_MAX_OPERATIONS`` and
+        ``WORD_POOL_MAX_MEMORY_MB``. With a size of 1 no pool is used and all
+        documents share the single application from ``get_word_app``.
+
+        Args:
+            size: Maximum number of Word instances.
+            max_operations: Recycle an idle instance after this many operations.
+            max_memory_bytes: Recycle an idle instance using this much memory.
+            app_factory: Callable creating one Word application; defaults to
+                DispatchEx, which starts a separate process.
+
+        Returns:
+            The pool, or None when pooling is disabled.
+        """
+        if self._word_pool is not None:
+            self._word_pool.shutdown()
+        if size is None:
+            size = _env_int("WORD_POOL_SIZE") or 1
+        if max_operations is None:
+            max_operations = _env_int("WORD_POOL_MAX_OPERATIONS")
+        if max_memory_bytes is None:
+            max_memory_mb = _env_int("WORD_POOL_MAX_MEMORY_MB")
+            max_memory_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb else None
+
+        self._pool_configured = True
+        self._pending_instance = None
+        self._active_instance = None
+        if size <= 1:
+            self._word_pool = None
+            return None
+
+        if app_factory is None:
+            app_factory = lambda: self._create_word_app_with_dispatchex(make_current=False)
+        self._word_pool = WordInstancePool(
+            size, app_factory,
+            max_operations=max_operations, max_memory_bytes=max_memory_bytes,
+        )
+        logger.info(f"Word instance pool enabled with {size} instances")
+        return self._word_pool
+
+    def get_word_pool(self) -> Optional[WordInstancePool]:
+        """Return the Word instance pool, or None when pooling is disabled."""
+        if not self._pool_configured:
+            self.configure_word_pool()
+        return self._word_pool
+
+    def get_word_app_for_new_document(self) -> Optional[CDispatch]:
+        """
+        Get the Word application a new or opened document should live in.
+
+        With a pool this is the least-loaded instance; the next
+        ``set_active_document`` call pins the document to it. Without a pool
+        it is the shared application.
+        """
+        pool = self.get_word_pool()
+        if pool is None:
+            return self.get_word_app(create_if_needed=True)
         try:
-            # 获取gen_py目录路径，使用win32com的内置路径
-            import win32com
-
-            gen_path = os.path.join(win32com.__gen_path__, "win32com", "gen_py")
-            logger.info(f"Checking win32com cache at: {gen_path}")
-
-            # 检查目录是否存在
-            if os.path.exists(gen_path):
-                logger.info(f"Clearing win32com cache at: {gen_path}")
-                # 尝试删除目录
-                shutil.rmtree(gen_path)
-                logger.info("Cleared win32com cache successfully")
-                return True
-            else:
-                logger.warning(f"win32com cache directory not found: {gen_path}")
-                # 尝试查找其他可能的缓存位置
-                temp_gen_path = os.path.join(
-                    os.environ.get("TEMP", "C:\\temp"), "gen_py"
-                )
-                if os.path.exists(temp_gen_path):
-                    logger.info(
-                        f"Clearing win32com cache at temp location: {temp_gen_path}"
-                    )
-                    shutil.rmtree(temp_gen_path)
-                    logger.info(
-                        "Cleared win32com cache from temp location successfully"
-                    )
-                    return True
-                return False
-        except PermissionError as e:
-            logger.error(f"Permission denied when clearing win32com cache: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to clear win32com cache: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return False
+            self._pending_instance = pool.acquire_for_new_document()
+        except RuntimeError as e:
+            logger.error(f"Failed to acquire Word instance from pool: {e}")
+            return None
+        return self._pending_instance.app
+
+    def release_document(self, doc: Optional[CDispatch]) -> None:
+        """
+        Forget a document that is about to be closed.
+
+        Removes it from the workspace, drops its caches, unpins it from its
+        pool instance and recycles idle instances. Must be called before the
+        document is closed.
+        """
+        if doc is None:
+            return
+        entry = self._workspace.find(doc)
+        if entry is not None:
+            self._workspace.remove(entry.handle)
+            if entry.handle == self._active_handle:
+                self._active_handle = None
+        forget_document_caches(doc)
+        if self._word_pool is None:
+            return
+        instance = self._word_pool.unpin(document_key(doc))
+        if instance is not None and instance is self._active_instance:
+            self._active_instance = None
+        self._word_pool.recycle_idle()
+
+    def _clear_com_cache(self):
+        """Regenerate the Word gen_py wrapper to resolve CLSIDToPackageMap errors.
+
+        Only the Word type library wrapper is rebuilt; wrappers of other type
+        libraries in gen_py are kept, so they need not be regenerated.
+        """
+        logger.info("Regenerating Word type library wrapper in win32com cache")
+        if rebuild_word_typelib():
+            logger.info("Regenerated Word type library wrapper successfully")
+            return True
+        logger.warning("Failed to regenerate Word type library wrapper")
+        return False
 
     def get_word_app(self, create_if_needed: bool = False) -> Optional[CDispatch]:
         """
@@ -151,6 +255,10 @@ class AppContext:
         Returns:
             The Word application instance or None if not available and not created.
         """
+        # 启用实例池时返回活动文档所在的实例
+        if self._active_instance is not None:
+            return self._active_instance.app
+
         # Return existing Word app if available and validate it's still functional
         if self._word_app is not None:
             if self._validate_word_app(self._word_app):
@@ -169,12 +277,13 @@ class AppContext:
             try:
                 logger.info(f"Attempt {attempt+1}/3 to create Word Application instance...")
                 
-                # 1. Try the standard Dispatch method first
+                # 1. Prefer early binding from the prebuilt gen_py cache,
+                #    falling back to late-bound Dispatch
                 result = self._create_word_app_with_dispatch()
                 if result:
                     return result
                 
-                # 2. If standard method fails, clear cache and try again
+                # 2. If that fails, regenerate the Word wrapper and try again
                 if attempt == 0:
                     if self._clear_com_cache():
                         logger.info("Retrying after COM cache clear...")
@@ -190,12 +299,6 @@ class AppContext:
                 if result:
                     return result
                 
-                # 4. Try with early binding
-                logger.info("Trying with early binding (gencache)...")
-                result = self._create_word_app_with_early_binding()
-                if result:
-                    return result
-                
                 # If all methods failed for this attempt, wait before retrying
                 if attempt < 2:  # Don't wait after the last attempt
                     import time
@@ -212,49 +315,43 @@ class AppContext:
         return None
         
     def _create_word_app_with_dispatch(self, reload_module: bool = False) -> Optional[CDispatch]:
-        """Create Word app using standard Dispatch method."""
+        """Create Word app, early bound when the gen_py wrapper is available."""
         try:
-            # 确保每次都使用新的win32com.client导入
-            import win32com.client
-            
             if reload_module:
+                # 确保使用重新生成的gen_py包装
                 import importlib
+
+                import win32com.client
                 importlib.reload(win32com.client)
                 logger.info("Reloaded win32com.client module.")
             
-            self._word_app = win32com.client.Dispatch("Word.Application")
-            logger.info("Successfully created Word application instance with Dispatch.")
+            self._word_app = create_word_application(prefer_early_binding=True)
+            logger.info(
+                f"Successfully created Word application instance "
+                f"({binding_mode(self._word_app)} binding)."
+            )
             return self._word_app
         except Exception as e:
             logger.warning(f"Dispatch method failed: {e}")
             return None
             
-    def _create_word_app_with_dispatchex(self) -> Optional[CDispatch]:
-        """Create Word app using DispatchEx method (creates a separate process)."""
+    def _create_word_app_with_dispatchex(self, make_current: bool = True) -> Optional[CDispatch]:
+        """Create Word app using DispatchEx method (creates a separate process).
+
+        Args:
+            make_current: Whether the new app becomes the shared application;
+                pool instances pass False.
+        """
         try:
-            import win32com.client
-            
-            self._word_app = win32com.client.DispatchEx("Word.Application")
+            word_app = create_word_application(separate_process=True)
+            if make_current:
+                self._word_app = word_app
             logger.info("Successfully created Word application instance with DispatchEx.")
-            return self._word_app
+            return word_app
         except Exception as e:
             logger.warning(f"DispatchEx method failed: {e}")
             return None
             
-    def _create_word_app_with_early_binding(self) -> Optional[CDispatch]:
-        """Create Word app using early binding (gencache)."""
-        try:
-            import win32com.client.gencache
-            
-            # Ensure we have the gen_py files for Word
-            win32com.client.gencache.EnsureModule('{00020905-0000-0000-C000-000000000046}', 0, 8, 7)
-            self._word_app = win32com.client.gencache.Dispatch("Word.Application")
-            logger.info("Successfully created Word application instance with early binding.")
-            return self._word_app
-        except Exception as e:
-            logger.warning(f"Early binding method failed: {e}")
-            return None
-            
     def _validate_word_app(self, word_app: CDispatch) -> bool:
         """Validate that the Word application instance is still functional."""
         if not word_app:
@@ -271,24 +368,163 @@ class AppContext:
 
     def get_active_document(self) -> Optional[CDispatch]:
         """Get the current active document."""
+        if self._word_pool is not None and self._active_document is not None:
+            self._word_pool.record_operation(self._active_instance)
         return self._active_document
 
     def set_active_document(self, doc: Optional[CDispatch]) -> None:
         """
         Set the current active document.
+
+        The document is added to the workspace if it is not open there yet.
+        Switching back to a workspace document restores its context tree
+        instead of rebuilding it. Least recently used documents above the
+        workspace limit are saved and closed.
         """
+        self._stash_active_document_state()
         self._active_document = doc
+        self._pin_active_document(doc)
         
         # 当设置活动文档后，自动创建文档上下文树
         if doc is not None:
-            self.on_document_opened()
+            entry = self._workspace.add(doc)
+            self._active_handle = entry.handle
+            if entry.context_tree is not None:
+                self._restore_document_state(entry)
+            else:
+                self.on_document_opened()
+                self._stash_active_document_state()
+            self._evict_documents()
         else:
+            self._active_handle = None
             # 如果清除活动文档，也要清除上下文树
             self._document_context_tree = None
-            self._context_map = {}  
+            self._context_map = self._new_context_map()
             self._active_context = None
             self._update_handlers = []
 
+    def activate_document(self, handle: str) -> CDispatch:
+        """
+        Make a workspace document the active document.
+
+        Args:
+            handle: The document handle returned when it was opened.
+
+        Returns:
+            The document COM object.
+
+        Raises:
+            WordDocumentError: If no open document has the handle.
+        """
+        entry = self._workspace.get(handle)
+        if entry is None:
+            raise WordDocumentError(
+                ErrorCode.NOT_FOUND,
+                f"No open document with handle '{handle}'. "
+                f"Open documents: {[e.handle for e in self._workspace.entries()]}",
+            )
+        if handle != self._active_handle:
+            self.set_active_document(entry.document)
+        else:
+            self._workspace.touch(handle)
+        return entry.document
+
+    def get_active_document_handle(self) -> Optional[str]:
+        """Return the handle of the active document, or None."""
+        return self._active_handle
+
+    def find_open_document(self, file_path: str) -> Optional[WorkspaceDocument]:
+        """Return the workspace entry of a document already opened from a path."""
+        return self._workspace.find_by_path(file_path)
+
+    def refresh_active_document_key(self) -> None:
+        """Re-register the active document after it was saved under a new name."""
+        if self._active_handle is not None:
+            self._workspace.rekey(self._active_handle)
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """Return the open documents, most recently used first."""
+        documents = []
+        for entry in self._workspace.entries():
+            info = entry.to_dict()
+            info["active"] = entry.handle == self._active_handle
+            documents.append(info)
+        return documents
+
+    def _stash_active_document_state(self) -> None:
+        """Keep the active document's context tree state in its workspace entry."""
+        entry = self._workspace.get(self._active_handle) if self._active_handle else None
+        if entry is None:
+            return
+        entry.context_tree = self._document_context_tree
+        entry.context_map = self._context_map
+        entry.active_context = self._active_context
+        entry.update_handlers = self._update_handlers
+
+    def _new_context_map(self) -> IndexedContextMap:
+        """创建按配置的元数据键维护索引的上下文映射"""
+        return IndexedContextMap(keys=self._indexed_metadata_keys)
+
+    def _restore_document_state(self, entry: WorkspaceDocument) -> None:
+        self._document_context_tree = entry.context_tree
+        self._context_map = entry.context_map
+        self._active_context = entry.active_context
+        self._update_handlers = entry.update_handlers
+
+    def _evict_documents(self) -> None:
+        """Save and close the least recently used documents above the limit."""
+        for entry in self._workspace.eviction_candidates(keep=self._active_handle):
+            document = entry.document
+            try:
+                if not document.Path:
+                    # 从未保存过的文档没有路径，保存会弹出对话框，保留不关闭
+                    logger.warning(f"Not evicting unsaved document {entry.handle}")
+                    continue
+                document.Save()
+            except Exception as e:
+                # 保存失败（只读或被其他进程锁定）时文档仍然打开，保留在工作区中
+                logger.error(f"Failed to save document {entry.handle}, not evicting it: {e}")
+                continue
+            try:
+                self.release_document(document)
+                document.Close(SaveChanges=0)
+                logger.info(f"Evicted least recently used document {entry.handle} ({entry.key})")
+            except Exception as e:
+                logger.error(f"Failed to close evicted document {entry.handle}: {e}")
+
+    def close_all_documents(self) -> int:
+        """
+        Close every workspace document without saving.
+
+        Returns:
+            The number of documents closed.
+        """
+        closed = 0
+        for entry in self._workspace.entries():
+            try:
+                self.release_document(entry.document)
+                entry.document.Close(SaveChanges=0)  # 不保存更改
+                closed += 1
+            except Exception as e:
+                logger.error(f"Error closing document {entry.handle}: {e}")
+                self._workspace.remove(entry.handle)
+        self.set_active_document(None)
+        return closed
+
+    def _pin_active_document(self, doc: Optional[CDispatch]) -> None:
+        """Pin a new document to its pool instance and track the active instance."""
+        if self._word_pool is None:
+            return
+        if doc is None:
+            self._active_instance = None
+            return
+        key = document_key(doc)
+        instance = self._word_pool.instance_for(key) or self._pending_instance
+        if instance is not None:
+            self._word_pool.pin(key, instance)
+        self._pending_instance = None
+        self._active_instance = instance
+
     def clear_active_document(self) -> None:
         """Clear the current active document."""
         self._active_document = None
@@ -297,11 +533,13 @@ class AppContext:
         """关闭当前活动文档"""
         try:
             if self._active_document is not None:
+                self.release_document(self._active_document)
                 self._active_document.Close(SaveChanges=0)  # 不保存更改
                 self._active_document = None
+                self._active_instance = None
                 # 清除上下文树相关信息
                 self._document_context_tree = None
-                self._context_map = {}
+                self._context_map = self._new_context_map()
                 self._active_context = None
                 return True
             return False
@@ -312,13 +550,22 @@ class AppContext:
     def quit_word_app(self):
         """退出Word应用程序"""
         try:
-            if self._word_app is not None:
-                self._word_app.Quit()
+            pooled = self._word_pool is not None and len(self._word_pool) > 0
+            if self._word_pool is not None:
+                self._word_pool.shutdown()
+                self._active_instance = None
+                self._pending_instance = None
+            if self._word_app is not None or pooled:
+                if self._word_app is not None:
+                    self._word_app.Quit()
                 self._word_app = None
                 self._active_document = None
+                self._active_handle = None
+                for entry in self._workspace.entries():
+                    self._workspace.remove(entry.handle)
                 # 清除上下文树相关信息
                 self._document_context_tree = None
-                self._context_map = {}
+                self._context_map = self._new_context_map()
                 self._active_context = None
                 return True
             return False
@@ -361,7 +608,7 @@ class AppContext:
             }
             
             # 创建根上下文节点
-            self._document_context_tree = DocumentContext.create_root_context(
+            self._document_context_tree = DocumentContext(
                 title=f"Document: {document_name}",
                 range_obj=self._active_document.Content if hasattr(self._active_document, 'Content') else None,
                 metadata=document_metadata
@@ -370,13 +617,15 @@ class AppContext:
             # 添加根上下文到映射中
             self._context_map[self._document_context_tree.context_id] = self._document_context_tree
             
-            # 批量构建文档结构的上下文树
+            # 只构建节这一层，节的内容在首次访问时才构建
             self._build_document_structure_optimized(self._document_context_tree)
             
+            build_time = time.time() - start_time
+            self._document_context_tree.update_multiple_metadata({'build_time': build_time})
             self._logger.info(f"Successfully created document context tree with {len(self._context_map)} contexts for {document_name}")
             
             # 记录性能指标
-            self._record_operation_time('create_document_context_tree', time.time() - start_time)
+            self._record_operation_time('create_document_context_tree', build_time)
             return self._document_context_tree
         except Exception as e:
             self._logger.error(f"Failed to create document context tree: {e}")
@@ -388,8 +637,9 @@ class AppContext:
     
     def _build_document_structure_optimized(self, root_context: 'DocumentContext') -> None:
         """
-        构建文档结构的上下文树（优化版）
-        使用批量添加和异步处理提高性能
+        构建文档结构的上下文树（延迟加载版）
+        只读取节信息并创建节上下文；每个节的表格、图片和段落在该节的
+        child_contexts首次被查询或导航访问时才构建，构建开销记录在节的元数据中
         
         Args:
             root_context: 根上下文节点
@@ -403,171 +653,169 @@ class AppContext:
             # 收集所有节信息用于批量处理
             sections = self._active_document.Sections
             section_contexts = []
+            # 延迟加载时读取构建时的文档并写入其上下文映射，即使活动文档已切换
+            document = self._active_document
+            context_map = self._context_map
             
             # 预处理所有节
             for i, section in enumerate(sections):
+                section_range = section.Range
+                page_setup = section.PageSetup
+                range_start = section_range.Start
+                range_end = section_range.End
                 section_metadata = {
                     "type": "section",
-                    "id": str(section.Range.Start),
+                    "id": str(range_start),
                     "index": i,
-                    "range_start": section.Range.Start,
-                    "range_end": section.Range.End,
+                    "range_start": range_start,
+                    "range_end": range_end,
                     "page_setup": {
-                        "orientation": str(section.PageSetup.Orientation),
-                        "paper_size": str(section.PageSetup.PaperSize),
-                        "top_margin": section.PageSetup.TopMargin,
-                        "bottom_margin": section.PageSetup.BottomMargin,
-                        "left_margin": section.PageSetup.LeftMargin,
-                        "right_margin": section.PageSetup.RightMargin
+                        "orientation": str(page_setup.Orientation),
+                        "paper_size": str(page_setup.PaperSize),
+                        "top_margin": page_setup.TopMargin,
+                        "bottom_margin": page_setup.BottomMargin,
+                        "left_margin": page_setup.LeftMargin,
+                        "right_margin": page_setup.RightMargin
                     }
                 }
                 
                 # 创建节上下文
                 section_context = DocumentContext(
                     title=f"Section {i+1}",
-                    range_obj=section.Range,
+                    range_obj=section_range,
                     metadata=section_metadata
                 )
-                section_contexts.append((section_context, section))
+                section_context.set_lazy_loader(
+                    lambda context, index=i, section_range=section_range:
+                        self._build_section_content_optimized(
+                            context, document, index, section_range, context_map
+                        )
+                )
+                section_contexts.append(section_context)
                 
                 # 添加节上下文到映射中
-                self._context_map[section_context.context_id] = section_context
+                context_map[section_context.context_id] = section_context
+            
+            # 节的偏移量锚定到编辑日志，之后的编辑在读取时平移，无需重建；
+            # 同时记录Content.End，用于发现日志之外的编辑
+            offsets = get_edit_journal(self._active_document).anchor(
+                (
+                    offset
+                    for context in section_contexts
+                    for offset in (context.metadata["range_start"], context.metadata["range_end"])
+                ),
+                content_end=self._active_document.Content.End,
+            )
+            for context in section_contexts:
+                context.anchor_offsets(offsets, context.metadata["range_start"], context.metadata["range_end"])
             
             # 使用批量添加方法添加所有节上下文
-            root_context.batch_add_child_contexts([ctx for ctx, _ in section_contexts])
-            
-            # 为每个节构建内容
-            for section_context, section in section_contexts:
-                self._build_section_content_optimized(section_context, section)
+            root_context.batch_add_child_contexts(section_contexts)
                 
         except Exception as e:
             self._logger.error(f"Failed to build document structure: {e}")
     
-    def _build_section_content_optimized(self, parent_context: 'DocumentContext', section: CDispatch) -> None:
+    def _build_section_content_optimized(self, parent_context: 'DocumentContext',
+                                         document: CDispatch, index: int, section_range: CDispatch,
+                                         context_map: Optional[Dict[str, 'DocumentContext']] = None) -> List['DocumentContext']:
         """
-        构建节内容的上下文树（优化版）
-        批量处理段落、表格和图片，减少重复操作
+        构建节内容的上下文（延迟加载函数）
+        只读取该节的表格、图片和段落的起止偏移量，按偏移量合并分配到节和表格后，
+        只为保留的对象读取文本、样式和尺寸（read_section_content），构建开销只计入该节；
+        节自身的起止偏移量取自其锚定的偏移量树，不再访问Word
         
         Args:
-            parent_context: 父上下文节点
-            section: Word节对象
+            parent_context: 节上下文节点
+            document: 节所在的文档
+            index: 节的序号（从0开始）
+            section_range: 节的Range对象
+            context_map: 要登记新上下文的映射，默认为当前文档的映射
+        
+        Returns:
+            节的子上下文列表
         """
         from ..models.context import DocumentContext
         
         start_time = time.time()
+        if context_map is None:
+            context_map = self._context_map
+        child_contexts = []
         
         try:
-            # 获取节内的所有对象范围
-            range_start = section.Range.Start
-            range_end = section.Range.End
-            
-            # 预收集所有需要处理的对象
-            child_contexts = []
-            objects_to_add = []
+            content = read_section_content(
+                document, index, section_range,
+                parent_context.offset_tree, parent_context.get_offsets()
+            )
             
             # 1. 处理表格
-            for table in self._active_document.Tables:
-                if range_start <= table.Range.Start and table.Range.End <= range_end:
-                    table_metadata = {
-                        "type": "table",
-                        "id": str(table.Range.Start),
-                        "rows": table.Rows.Count,
-                        "columns": table.Columns.Count,
-                        "cell_count": table.Rows.Count * table.Columns.Count
-                    }
-                    
-                    table_context = DocumentContext(
-                        title=f"Table at {table.Range.Start}",
-                        range_obj=table.Range,
-                        metadata=table_metadata
-                    )
-                    
-                    # 添加到批量处理列表
-                    child_contexts.append(table_context)
-                    self._context_map[table_context.context_id] = table_context
-                    objects_to_add.append((table_context, table_metadata))
-            
-            # 2. 处理图片
-            for i in range(1, self._active_document.InlineShapes.Count + 1):
-                try:
-                    shape = self._active_document.InlineShapes(i)
-                    if range_start <= shape.Range.Start and shape.Range.End <= range_end:
-                        # 检查是否已作为表格的一部分处理
-                        is_processed = False
-                        for ctx in child_contexts:
-                            if ctx.range and shape.Range.Start >= ctx.range.Start and shape.Range.End <= ctx.range.End:
-                                is_processed = True
-                                break
-                        
-                        if not is_processed:
-                            image_metadata = {
-                                "type": "image",
-                                "id": str(shape.Range.Start),
-                                "width": shape.Width,
-                                "height": shape.Height,
-                                "type": str(getattr(shape, 'Type', 'Unknown'))
-                            }
-                            
-                            image_context = DocumentContext(
-                                title=f"Image at {shape.Range.Start}",
-                                range_obj=shape.Range,
-                                metadata=image_metadata
-                            )
-                            
-                            # 添加到批量处理列表
-                            child_contexts.append(image_context)
-                            self._context_map[image_context.context_id] = image_context
-                            objects_to_add.append((image_context, image_metadata))
-                except Exception:
-                    # 忽略无法访问的图片
-                    continue
+            for table in content.tables:
+                row_count = table["Rows.Count"] or 0
+                column_count = table["Columns.Count"] or 0
+                table_metadata = {
+                    "type": "table",
+                    "id": str(table["Range.Start"]),
+                    "range_start": table["Range.Start"],
+                    "range_end": table["Range.End"],
+                    "rows": row_count,
+                    "columns": column_count,
+                    "cell_count": row_count * column_count
+                }
+                table_context = DocumentContext(
+                    title=f"Table at {table['Range.Start']}",
+                    range_obj=table["Range"],
+                    metadata=table_metadata
+                )
+                table_context.batch_add_objects([dict(table_metadata)])
+                child_contexts.append(table_context)
             
-            # 3. 处理段落（排除已处理的表格和图片中的段落）
-            processed_ranges = [(ctx.range.Start, ctx.range.End) for ctx in child_contexts if ctx.range]
+            # 2. 处理图片（表格内的图片已在扫描时排除）
+            for shape in content.images:
+                image_metadata = {
+                    "type": "image",
+                    "id": str(shape["Range.Start"]),
+                    "range_start": shape["Range.Start"],
+                    "range_end": shape["Range.End"],
+                    "width": shape["Width"],
+                    "height": shape["Height"],
+                    "shape_type": str(shape["Type"] if shape["Type"] is not None else 'Unknown')
+                }
+                image_context = DocumentContext(
+                    title=f"Image at {shape['Range.Start']}",
+                    range_obj=shape["Range"],
+                    metadata=image_metadata
+                )
+                image_context.batch_add_objects([dict(image_metadata)])
+                child_contexts.append(image_context)
             
-            for i in range(1, self._active_document.Paragraphs.Count + 1):
-                try:
-                    paragraph = self._active_document.Paragraphs(i)
-                    if range_start <= paragraph.Range.Start and paragraph.Range.End <= range_end:
-                        # 检查是否已被处理
-                        is_processed = False
-                        for start, end in processed_ranges:
-                            if paragraph.Range.Start >= start and paragraph.Range.End <= end:
-                                is_processed = True
-                                break
-                        
-                        if not is_processed:
-                            # 只处理非空段落或包含重要内容的段落
-                            if paragraph.Range.Text.strip():
-                                text_preview = paragraph.Range.Text[:30] + ("..." if len(paragraph.Range.Text) > 30 else "")
-                                para_metadata = {
-                                    "type": "paragraph",
-                                    "id": str(paragraph.Range.Start),
-                                    "text_preview": text_preview,
-                                    "style_name": getattr(paragraph, 'Style', '').Name if hasattr(getattr(paragraph, 'Style', ''), 'Name') else 'Normal',
-                                    "is_heading": getattr(paragraph, 'Style', '').Name.startswith('Heading') if hasattr(getattr(paragraph, 'Style', ''), 'Name') else False
-                                }
-                                
-                                para_context = DocumentContext(
-                                    title=f"Paragraph at {paragraph.Range.Start}",
-                                    range_obj=paragraph.Range,
-                                    metadata=para_metadata
-                                )
-                                
-                                # 添加到批量处理列表
-                                child_contexts.append(para_context)
-                                self._context_map[para_context.context_id] = para_context
-                                objects_to_add.append((para_context, para_metadata))
-                except Exception:
-                    # 忽略无法访问的段落
+            # 3. 处理段落（表格内的段落已在扫描时排除），只处理非空段落
+            for paragraph in content.paragraphs:
+                text = paragraph["Range.Text"] or ""
+                if not text.strip():
                     continue
+                style_name = paragraph["Style.NameLocal"] or 'Normal'
+                para_metadata = {
+                    "type": "paragraph",
+                    "id": str(paragraph["Range.Start"]),
+                    "range_start": paragraph["Range.Start"],
+                    "range_end": paragraph["Range.End"],
+                    "text_preview": text[:30] + ("..." if len(text) > 30 else ""),
+                    "style_name": style_name,
+                    "is_heading": str(style_name).startswith('Heading')
+                }
+                para_context = DocumentContext(
+                    title=f"Paragraph at {paragraph['Range.Start']}",
+                    range_obj=paragraph["Range"],
+                    metadata=para_metadata
+                )
+                para_context.batch_add_objects([dict(para_metadata)])
+                child_contexts.append(para_context)
             
-            # 批量添加子上下文
-            parent_context.batch_add_child_contexts(child_contexts)
-            
-            # 批量添加对象
-            for context, obj_metadata in objects_to_add:
-                context.batch_add_objects([obj_metadata])
+            for context in child_contexts:
+                # 扫描读取的偏移量已锚定在编辑日志中，扫描之后的编辑同样会被平移
+                if content.offsets is not None:
+                    context.anchor_offsets(content.offsets, context.metadata["range_start"],
+                                           context.metadata["range_end"])
+                context_map[context.context_id] = context
             
             # 记录性能指标
             self._record_operation_time('build_section_content', time.time() - start_time)
@@ -575,6 +823,54 @@ class AppContext:
         except Exception as e:
             self._logger.error(f"Failed to build section content: {e}")
             self._logger.error(f"Traceback: {traceback.format_exc()}")
+        return child_contexts
+    
+    def expand_document_context_tree(self) -> Optional['DocumentContext']:
+        """
+        构建上下文树中所有尚未展开的节，用于需要遍历整棵树的查询
+        
+        Returns:
+            文档上下文树的根节点
+        """
+        if self._document_context_tree is None:
+            return None
+        for section_context in self._document_context_tree.child_contexts:
+            section_context.expand()
+        return self._document_context_tree
+    
+    def get_context_build_stats(self) -> Dict[str, Any]:
+        """
+        获取上下文树的构建开销
+        
+        Returns:
+            包含根节点（节这一层）构建耗时和每个子树展开状态、构建耗时、
+            COM调用次数和子上下文数量的字典，以及活动文档编辑日志的版本和最近的编辑
+        """
+        root = self._document_context_tree
+        if root is None:
+            return {"success": False, "message": "No context tree available"}
+        
+        subtrees = []
+        for context in root.loaded_child_contexts:
+            subtrees.append({
+                "context_id": context.context_id,
+                "title": context.title,
+                "is_expanded": context.is_expanded,
+                "build_time": context.metadata.get("build_time"),
+                "build_com_calls": context.metadata.get("build_com_calls"),
+                "built_child_count": context.metadata.get("built_child_count"),
+            })
+        expanded = [s for s in subtrees if s["is_expanded"]]
+        return {
+            "success": True,
+            "root_build_time": root.metadata.get("build_time"),
+            "subtree_count": len(subtrees),
+            "expanded_subtrees": len(expanded),
+            "total_expand_time": sum(s["build_time"] or 0.0 for s in expanded),
+            "context_count": len(self._context_map),
+            "edit_journal": get_edit_journal_stats(self._active_document) if self._active_document else {},
+            "subtrees": subtrees,
+        }
     
     def get_document_context_tree(self) -> Optional['DocumentContext']:
         """
@@ -678,6 +974,7 @@ class AppContext:
             
             # 添加到映射中
             self._context_map[context.context_id] = context
+            self._context_intervals.invalidate()
             
             # 更新上下文的metadata
             context._update_metadata({
@@ -751,6 +1048,7 @@ class AppContext:
             
             # 从映射中移除
             del self._context_map[context_id]
+            self._context_intervals.invalidate()
             
             # 如果当前活动上下文是被移除的上下文，则清除活动上下文
             if self._active_context == context:
@@ -789,7 +1087,7 @@ class AppContext:
             
             # 清除旧的上下文树信息
             self._document_context_tree = None
-            self._context_map = {}  
+            self._context_map = self._new_context_map()
             self._active_context = None
             self._update_handlers = []
             
@@ -801,10 +1099,13 @@ class AppContext:
             logger.error(f"Failed to initialize document context tree: {e}")
             logger.error(f"Traceback: {traceback.format_exc()}")
 
-    def get_context_tree_as_dict(self) -> Dict[str, Any]:
+    def get_context_tree_as_dict(self, expand: bool = False) -> Dict[str, Any]:
         """
         将上下文树转换为字典格式，便于序列化
         
+        参数:
+            expand: 是否先构建尚未展开的子树；默认只输出已构建的部分
+        
         返回:
             上下文树的字典表示
         """
@@ -815,9 +1116,12 @@ class AppContext:
             }
         
         try:
+            if expand:
+                self.expand_document_context_tree()
+            
             def context_to_dict(context):
                 result = context.to_dict()
-                result["children"] = [context_to_dict(child) for child in context.child_contexts]
+                result["children"] = [context_to_dict(child) for child in context.loaded_child_contexts]
                 return result
             
             return {
@@ -835,7 +1139,7 @@ class AppContext:
     
     def refresh_document_context_tree(self) -> Optional['DocumentContext']:
         """
-        刷新文档上下文树，重新构建整个树结构
+        刷新文档上下文树，重新构建节这一层，节的内容在首次访问时再构建
         
         返回:
             刷新后的文档上下文树的根节点，如果没有活动文档则返回None
@@ -902,7 +1206,7 @@ class AppContext:
         try:
             # 查找与该段落相关的上下文
             para_id = f"paragraph_{paragraph_range.Start}"
-            paragraph_context = self._context_map.get(para_id)
+            paragraph_context = self._context_map.get(para_id) or self._find_object_context(paragraph_range, "paragraph")
             
             # 提取段落样式和格式化信息
             text_preview = paragraph_range.Text[:30] + ("..." if len(paragraph_range.Text) > 30 else "")
@@ -946,6 +1250,7 @@ class AppContext:
                 # 更新上下文信息
                 paragraph_context.title = f"Paragraph {paragraph_range.Start}"
                 paragraph_context.range = paragraph_range
+                self._context_intervals.invalidate()
                 
                 # 更新对象信息和元数据
                 paragraph_context.batch_add_objects([para_metadata])
@@ -954,24 +1259,20 @@ class AppContext:
                 logger.debug(f"Updated paragraph context: {para_id}")
             else:
                 # 如果找不到对应的上下文，尝试为其创建新的上下文
-                section = self._find_section_for_range(paragraph_range)
-                if section:
-                    section_id = f"section_{section.Range.Start}"
-                    section_context = self._context_map.get(section_id)
+                section_context = self._find_section_context(paragraph_range)
+                if section_context:
+                    # 创建新的段落上下文
+                    new_para_context = DocumentContext(
+                        title=f"Paragraph {paragraph_range.Start}",
+                        range_obj=paragraph_range,
+                        metadata=para_metadata
+                    )
+                    new_para_context.batch_add_objects([para_metadata])
                     
-                    if section_context:
-                        # 创建新的段落上下文
-                        new_para_context = DocumentContext(
-                            title=f"Paragraph {paragraph_range.Start}",
-                            range_obj=paragraph_range,
-                            metadata=para_metadata
-                        )
-                        new_para_context.batch_add_objects([para_metadata])
-                        
-                        # 添加到父上下文和映射中
-                        self.add_context_to_tree(new_para_context, section_context)
-                        
-                        logger.debug(f"Created new paragraph context: {para_id}")
+                    # 添加到父上下文和映射中
+                    self.add_context_to_tree(new_para_context, section_context)
+                    
+                    logger.debug(f"Created new paragraph context: {para_id}")
             
             # 通知更新
             self.notify_update("paragraph_updated", paragraph_id=para_id, metadata=para_metadata)
@@ -1018,7 +1319,7 @@ class AppContext:
         try:
             # 查找与该表格相关的上下文
             table_id = f"table_{table.Range.Start}"
-            table_context = self._context_map.get(table_id)
+            table_context = self._context_map.get(table_id) or self._find_object_context(table.Range, "table")
             
             # 收集表格信息
             try:
@@ -1061,6 +1362,7 @@ class AppContext:
                 
                 # 更新上下文信息
                 table_context.range = table.Range
+                self._context_intervals.invalidate()
                 
                 # 更新对象信息和元数据
                 table_context.batch_add_objects([table_metadata])
@@ -1069,24 +1371,20 @@ class AppContext:
                 logger.debug(f"Updated table context: {table_id}")
             else:
                 # 如果找不到对应的上下文，尝试为其创建新的上下文
-                section = self._find_section_for_range(table.Range)
-                if section:
-                    section_id = f"section_{section.Range.Start}"
-                    section_context = self._context_map.get(section_id)
+                section_context = self._find_section_context(table.Range)
+                if section_context:
+                    # 创建新的表格上下文
+                    new_table_context = DocumentContext(
+                        title=f"Table {table.Range.Start}",
+                        range_obj=table.Range,
+                        metadata=table_metadata
+                    )
+                    new_table_context.batch_add_objects([table_metadata])
                     
-                    if section_context:
-                        # 创建新的表格上下文
-                        new_table_context = DocumentContext(
-                            title=f"Table {table.Range.Start}",
-                            range_obj=table.Range,
-                            metadata=table_metadata
-                        )
-                        new_table_context.batch_add_objects([table_metadata])
-                        
-                        # 添加到父上下文和映射中
-                        self.add_context_to_tree(new_table_context, section_context)
-                        
-                        logger.debug(f"Created new table context: {table_id}")
+                    # 添加到父上下文和映射中
+                    self.add_context_to_tree(new_table_context, section_context)
+                    
+                    logger.debug(f"Created new table context: {table_id}")
             
             # 通知更新
             self.notify_update("table_updated", table_id=table_id, metadata=table_metadata)
@@ -1133,7 +1431,7 @@ class AppContext:
         try:
             # 查找与该图片相关的上下文
             image_id = f"image_{image.Range.Start}"
-            image_context = self._context_map.get(image_id)
+            image_context = self._context_map.get(image_id) or self._find_object_context(image.Range, "image")
             
             # 收集图片信息
             try:
@@ -1177,6 +1475,7 @@ class AppContext:
                 
                 # 更新上下文信息
                 image_context.range = image.Range
+                self._context_intervals.invalidate()
                 
                 # 更新对象信息和元数据
                 image_context.batch_add_objects([image_metadata])
@@ -1185,24 +1484,20 @@ class AppContext:
                 logger.debug(f"Updated image context: {image_id}")
             else:
                 # 如果找不到对应的上下文，尝试为其创建新的上下文
-                section = self._find_section_for_range(image.Range)
-                if section:
-                    section_id = f"section_{section.Range.Start}"
-                    section_context = self._context_map.get(section_id)
+                section_context = self._find_section_context(image.Range)
+                if section_context:
+                    # 创建新的图片上下文
+                    new_image_context = DocumentContext(
+                        title=f"Image {image.Range.Start}",
+                        range_obj=image.Range,
+                        metadata=image_metadata
+                    )
+                    new_image_context.batch_add_objects([image_metadata])
                     
-                    if section_context:
-                        # 创建新的图片上下文
-                        new_image_context = DocumentContext(
-                            title=f"Image {image.Range.Start}",
-                            range_obj=image.Range,
-                            metadata=image_metadata
-                        )
-                        new_image_context.batch_add_objects([image_metadata])
-                        
-                        # 添加到父上下文和映射中
-                        self.add_context_to_tree(new_image_context, section_context)
-                        
-                        logger.debug(f"Created new image context: {image_id}")
+                    # 添加到父上下文和映射中
+                    self.add_context_to_tree(new_image_context, section_context)
+                    
+                    logger.debug(f"Created new image context: {image_id}")
             
             # 通知更新
             self.notify_update("image_updated", image_id=image_id, metadata=image_metadata)
@@ -1245,8 +1540,9 @@ class AppContext:
             # 构建对象ID
             object_id = f"{object_type}_{object_range.Start}"
             
-            # 从上下文树中移除
-            result = self.remove_context_from_tree(object_id)
+            # 按对象的范围在区间索引中查找上下文，并从上下文树中移除
+            context = self._find_object_context(object_range, object_type)
+            result = self.remove_context_from_tree(context.context_id) if context else False
             
             if result:
                 # 通知更新
@@ -1258,24 +1554,138 @@ class AppContext:
             logger.error(f"Failed to remove {object_type} context: {e}")
             return False
     
-    def _find_section_for_range(self, range_obj: CDispatch) -> Optional[CDispatch]:
+    def _active_edit_version(self) -> int:
+        """返回活动文档编辑日志的版本，用于判断区间索引中固定偏移量是否过期"""
+        if self._active_document is None:
+            return 0
+        return get_edit_journal(self._active_document).version
+    
+    def get_context_interval_index(self) -> ContextIntervalIndex:
+        """
+        获取上下文偏移量的区间索引
+        
+        返回:
+            覆盖当前上下文映射的ContextIntervalIndex，上下文增删后自动重建
         """
-        查找给定Range所在的节
+        return self._context_intervals
+    
+    def ensure_context_offsets_current(self) -> bool:
+        """
+        检查上下文树锚定的偏移量是否仍与活动文档一致，不一致时重建上下文树
+        
+        编辑日志之外的编辑（全部替换、批量写入单元格、在Word中的手动编辑）
+        会使锚定的偏移量失效；检查只读取一次Content.End
+        
+        返回:
+            偏移量仍然有效时为True，上下文树被重建时为False
+        """
+        root = self._document_context_tree
+        if root is None or self._active_document is None:
+            return True
+        sections = root.loaded_child_contexts
+        offset_tree = sections[0].offset_tree if sections else None
+        if offset_tree is None:
+            return True
+        try:
+            if anchored_offsets_current(self._active_document, offset_tree):
+                return True
+        except Exception as e:
+            logger.warning(f"Failed to check context offsets: {e}")
+        
+        self._logger.info("Context offsets no longer match the document, rebuilding the context tree")
+        self._document_context_tree = None
+        self._context_map = self._new_context_map()
+        self._active_context = None
+        self.create_document_context_tree()
+        return False
+    
+    def _expand_sections_overlapping(self, start: int, end: int) -> None:
+        """展开与给定范围重叠的节，使其中的表格、图片和段落进入区间索引"""
+        for section_context in self._context_intervals.overlapping(start, end, "section"):
+            if not section_context.is_expanded:
+                section_context.expand()
+    
+    def find_contexts_by_range(self, start: int, end: int, context_type: Optional[str] = None,
+                               mode: str = "overlap") -> List['DocumentContext']:
+        """
+        按偏移量范围查找上下文，不访问Word
         
         参数:
-            range_obj: Range对象
+            start: 起始偏移量
+            end: 结束偏移量
+            context_type: 只返回该类型的上下文，None表示所有类型
+            mode: "overlap"（与范围重叠）、"contains"（包含该范围，由内到外）
+                或 "within"（位于范围内）
         
         返回:
-            节对象，如果未找到则返回None
+            符合条件的上下文列表
+        """
+        self.ensure_context_offsets_current()
+        if context_type != "section":
+            self._expand_sections_overlapping(start, end)
+        if mode == "contains":
+            return self._context_intervals.containing(start, end, context_type)
+        if mode == "within":
+            return self._context_intervals.contained_in(start, end, context_type)
+        return self._context_intervals.overlapping(start, end, context_type)
+    
+    def find_context_by_range(self, document: Optional[CDispatch], start: int, end: int,
+                              object_type: Optional[str] = None) -> Optional['DocumentContext']:
         """
-        if not self._active_document:
-            return None
+        查找范围恰好为[start, end)的上下文
+        
+        参数:
+            document: 对象所在的文档，不是活动文档时返回None
+            start: 起始偏移量
+            end: 结束偏移量
+            object_type: 上下文类型（paragraph、table、image等）
         
+        返回:
+            找到的上下文，未找到时返回None
+        """
+        if document is not None and self._active_document is not None:
+            if document_key(document) != document_key(self._active_document):
+                return None
+        self.ensure_context_offsets_current()
+        if object_type != "section":
+            self._expand_sections_overlapping(start, end)
+        return self._context_intervals.find_exact(start, end, object_type)
+    
+    def find_nearest_context(self, offset: int, context_type: Optional[str] = None) -> Optional['DocumentContext']:
+        """
+        查找包含偏移量的最内层上下文，没有时返回距离最近的上下文
+        
+        参数:
+            offset: 文档偏移量
+            context_type: 只考虑该类型的上下文，None表示所有类型
+        """
+        self.ensure_context_offsets_current()
+        if context_type != "section":
+            self._expand_sections_overlapping(offset, offset + 1)
+        return self._context_intervals.nearest(offset, context_type)
+    
+    def _find_object_context(self, range_obj: CDispatch, object_type: str) -> Optional['DocumentContext']:
+        """按对象Range的起止偏移量查找对应的上下文"""
         try:
-            for section in self._active_document.Sections:
-                if section.Range.Start <= range_obj.Start and range_obj.End <= section.Range.End:
-                    return section
+            return self.find_context_by_range(None, range_obj.Start, range_obj.End, object_type)
+        except Exception as e:
+            logger.error(f"Failed to find {object_type} context for range: {e}")
             return None
+    
+    def _find_section_context(self, range_obj: CDispatch) -> Optional['DocumentContext']:
+        """
+        查找包含给定Range的节上下文
+        
+        参数:
+            range_obj: Range对象
+        
+        返回:
+            节上下文，如果未找到则返回None
+        """
+        try:
+            self.ensure_context_offsets_current()
+            sections = self._context_intervals.containing(range_obj.Start, range_obj.End, "section")
+            return sections[0] if sections else None
         except Exception as e:
             logger.error(f"Failed to find section for range: {e}")
             return None
@@ -1313,62 +1723,70 @@ class AppContext:
             results["transaction_id"] = self._current_transaction_id
         
         try:
-            for op_index, op in enumerate(update_operations):
-                op_type = op.get("type")
-                op_details = {
-                    "index": op_index,
-                    "type": op_type,
-                    "success": False,
-                    "error": None
-                }
+            # 批量更新期间暂停屏幕刷新和后台排版
+            with suspend_rendering(self._word_app, "batch_update_contexts") as suspension:
+                for op_index, op in enumerate(update_operations):
+                    op_type = op.get("type")
+                    op_details = {
+                        "index": op_index,
+                        "type": op_type,
+                        "success": False,
+                        "error": None
+                    }
                 
-                try:
-                    if op_type == "update_paragraph":
-                        success = self.update_paragraph_context(op.get("range"))
-                    elif op_type == "update_table":
-                        success = self.update_table_context(op.get("table"))
-                    elif op_type == "update_image":
-                        success = self.update_image_context(op.get("image"))
-                    elif op_type == "remove_object":
-                        success = self.remove_object_context(op.get("object_type"), op.get("range"))
-                    elif op_type == "add_paragraph":
-                        # 支持批量添加段落
-                        success = self._add_paragraph_context_in_batch(op.get("range"), op.get("section"))
-                    elif op_type == "add_table":
-                        # 支持批量添加表格
-                        success = self._add_table_context_in_batch(op.get("table"), op.get("section"))
-                    elif op_type == "add_image":
-                        # 支持批量添加图片
-                        success = self._add_image_context_in_batch(op.get("image"), op.get("section"))
-                    else:
-                        raise ValueError(f"Unknown update operation type: {op_type}")
+                    try:
+                        if op_type == "update_paragraph":
+                            success = self.update_paragraph_context(op.get("range"))
+                        elif op_type == "update_table":
+                            success = self.update_table_context(op.get("table"))
+                        elif op_type == "update_image":
+                            success = self.update_image_context(op.get("image"))
+                        elif op_type == "remove_object":
+                            success = self.remove_object_context(op.get("object_type"), op.get("range"))
+                        elif op_type == "add_paragraph":
+                            # 支持批量添加段落
+                            success = self._add_paragraph_context_in_batch(op.get("range"), op.get("section"))
+                        elif op_type == "add_table":
+                            # 支持批量添加表格
+                            success = self._add_table_context_in_batch(op.get("table"), op.get("section"))
+                        elif op_type == "add_image":
+                            # 支持批量添加图片
+                            success = self._add_image_context_in_batch(op.get("image"), op.get("section"))
+                        else:
+                            raise ValueError(f"Unknown update operation type: {op_type}")
                     
-                    if success:
-                        results["updated"] += 1
-                        op_details["success"] = True
-                    else:
+                        if success:
+                            results["updated"] += 1
+                            op_details["success"] = True
+                        else:
+                            results["failed"] += 1
+                            error_msg = f"Failed to perform {op_type}"
+                            results["errors"].append(error_msg)
+                            op_details["error"] = error_msg
+                            results["success"] = False
+                    except Exception as e:
                         results["failed"] += 1
-                        error_msg = f"Failed to perform {op_type}"
+                        error_msg = str(e)
                         results["errors"].append(error_msg)
                         op_details["error"] = error_msg
                         results["success"] = False
-                except Exception as e:
-                    results["failed"] += 1
-                    error_msg = str(e)
-                    results["errors"].append(error_msg)
-                    op_details["error"] = error_msg
-                    results["success"] = False
-                    logger.error(f"Error in batch update operation {op_type} at index {op_index}: {e}")
-                    logger.error(f"Traceback: {traceback.format_exc()}")
+                        logger.error(f"Error in batch update operation {op_type} at index {op_index}: {e}")
+                        logger.error(f"Traceback: {traceback.format_exc()}")
                 
-                results["operation_details"].append(op_details)
+                    results["operation_details"].append(op_details)
             
+
             # 如果是新创建的事务，则提交
             if not was_in_transaction:
                 self.commit_transaction()
             
             # 记录性能指标
-            self._record_operation_time('batch_update', time.time() - start_time, operations_count=len(update_operations))
+            self._record_operation_time(
+                'batch_update',
+                time.time() - start_time,
+                operations_count=len(update_operations),
+                render_suspended_time=suspension.elapsed,
+            )
             
             logger.info(f"Batch update completed: {results['updated']} succeeded, {results['failed']} failed")
             
@@ -1411,20 +1829,14 @@ class AppContext:
             return False
         
         try:
-            # 如果没有提供节，则查找
-            if not section:
-                section = self._find_section_for_range(paragraph_range)
-                if not section:
-                    return False
-            
-            section_id = f"section_{section.Range.Start}"
-            section_context = self._context_map.get(section_id)
+            # 通过区间索引查找所属节的上下文，提供了节时按节的范围查找
+            section_context = self._find_section_context(section.Range if section else paragraph_range)
             
             if section_context:
                 para_id = f"paragraph_{paragraph_range.Start}"
                 
                 # 如果已存在则直接更新
-                if para_id in self._context_map:
+                if para_id in self._context_map or self._find_object_context(paragraph_range, "paragraph"):
                     return self.update_paragraph_context(paragraph_range)
                 
                 # 创建新的段落上下文
@@ -1477,14 +1889,17 @@ class AppContext:
         results = []
         
         try:
-            # 遍历上下文映射，查找匹配类型的上下文
-            for context_id, context in self._context_map.items():
-                if len(results) >= max_results:
-                    break
-                
-                if context.metadata.get('type') == context_type:
-                    # 转换为字典格式并添加到结果列表
-                    results.append(self._context_to_dict(context))
+            # 节以外的类型需要先构建尚未展开的节
+            if context_type != 'section':
+                self.expand_document_context_tree()
+            
+            # 通过类型索引查找匹配的上下文，未建索引时遍历上下文映射
+            matches = self._context_map.index.lookup('type', context_type)
+            if matches is None:
+                matches = [c for c in self._context_map.values() if c.metadata.get('type') == context_type]
+            for context in matches[:max_results]:
+                # 转换为字典格式并添加到结果列表
+                results.append(self._context_to_dict(context))
             
             # 记录性能指标
             self._record_operation_time('search_contexts', time.time() - start_time, results_count=len(results))
@@ -1500,6 +1915,30 @@ class AppContext:
             
             return []
     
+    def find_contexts_by_metadata(self, metadata_filters: Dict[str, Any],
+                                  max_results: int = 100) -> List['DocumentContext']:
+        """
+        按元数据等值条件查找上下文
+        
+        条件中包含已建索引的键（默认type、style_name、is_heading、parent_id）时
+        从最小的索引桶开始匹配，开销与结果数量成正比；否则遍历上下文映射。
+        只查找已构建的上下文，不展开延迟加载的节。
+        
+        Args:
+            metadata_filters: 元数据键值条件，全部满足才匹配
+            max_results: 最大返回结果数
+        
+        Returns:
+            匹配的上下文列表
+        """
+        matches = self._context_map.index.find(metadata_filters)
+        if matches is None:
+            matches = [
+                c for c in self._context_map.values()
+                if all(k in c.metadata and c.metadata[k] == v for k, v in metadata_filters.items())
+            ]
+        return matches[:max_results]
+    
     def get_context_hierarchy(self, context_id: str) -> Optional[Dict[str, Any]]:
         """
         获取指定上下文的层次结构
@@ -1681,37 +2120,7 @@ class AppContext:
             **kwargs: 其他要记录的指标（如结果数量、操作计数等）
         """
         try:
-            if operation_type not in self._operation_times:
-                self._operation_times[operation_type] = {
-                    'count': 0,
-                    'total_time': 0,
-                    'success_count': 0,
-                    'fail_count': 0,
-                    'metrics': {}
-                }
-            
-            # 更新基本统计信息
-            self._operation_times[operation_type]['count'] += 1
-            self._operation_times[operation_type]['total_time'] += duration
-            
-            if success:
-                self._operation_times[operation_type]['success_count'] += 1
-            else:
-                self._operation_times[operation_type]['fail_count'] += 1
-            
-            # 更新额外指标
-            for key, value in kwargs.items():
-                if key not in self._operation_times[operation_type]['metrics']:
-                    self._operation_times[operation_type]['metrics'][key] = []
-                
-                # 对于数值类型，记录具体值；对于其他类型，记录计数或状态
-                if isinstance(value, (int, float)):
-                    self._operation_times[operation_type]['metrics'][key].append(value)
-                else:
-                    # 对于非数值类型，记录存在性
-                    if key not in self._operation_times[operation_type]['metrics']:
-                        self._operation_times[operation_type]['metrics'][key] = 0
-                    self._operation_times[operation_type]['metrics'][key] += 1
+            self._operation_times.record(operation_type, duration, success, **kwargs)
             
             # 记录操作频率
             current_time = time.time()
@@ -1726,6 +2135,19 @@ class AppContext:
             # 记录性能指标本身的错误不应影响主流程
             logger.error(f"Error recording operation metrics: {e}")
     
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """
+        获取性能指标报告
+        
+        Returns:
+            每种操作的次数、耗时聚合值与分位数和附加指标
+        """
+        return self._operation_times.snapshot()
+    
+    def reset_performance_metrics(self) -> None:
+        """清空性能指标，释放其占用的内存预算"""
+        self._operation_times.reset()
+    
     def _add_table_context_in_batch(self, table: CDispatch, section: Optional[CDispatch] = None) -> bool:
         """
         在批量操作中添加表格上下文
@@ -1741,20 +2163,14 @@ class AppContext:
             return False
         
         try:
-            # 如果没有提供节，则查找
-            if not section:
-                section = self._find_section_for_range(table.Range)
-                if not section:
-                    return False
-            
-            section_id = f"section_{section.Range.Start}"
-            section_context = self._context_map.get(section_id)
+            # 通过区间索引查找所属节的上下文，提供了节时按节的范围查找
+            section_context = self._find_section_context(section.Range if section else table.Range)
             
             if section_context:
                 table_id = f"table_{table.Range.Start}"
                 
                 # 如果已存在则直接更新
-                if table_id in self._context_map:
+                if table_id in self._context_map or self._find_object_context(table.Range, "table"):
                     return self.update_table_context(table)
                 
                 # 创建新的表格上下文
@@ -1805,20 +2221,14 @@ class AppContext:
             return False
         
         try:
-            # 如果没有提供节，则查找
-            if not section:
-                section = self._find_section_for_range(image.Range)
-                if not section:
-                    return False
-            
-            section_id = f"section_{section.Range.Start}"
-            section_context = self._context_map.get(section_id)
+            # 通过区间索引查找所属节的上下文，提供了节时按节的范围查找
+            section_context = self._find_section_context(section.Range if section else image.Range)
             
             if section_context:
                 image_id = f"image_{image.Range.Start}"
                 
                 # 如果已存在则直接更新
-                if image_id in self._context_map:
+                if image_id in self._context_map or self._find_object_context(image.Range, "image"):
                     return self.update_image_context(image)
                 
                 # 创建新的图片上下文
@@ -1852,3 +2262,16 @@ class AppContext:
             return False
         except Exception:
             return False
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read a positive integer setting from the environment, None if unset or invalid."""
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+        return None
+    return number if number > 0 else None
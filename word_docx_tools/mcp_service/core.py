@@ -10,6 +10,8 @@ from contextlib import asynccontextmanager
 
 from mcp.server.fastmcp import FastMCP
 
+from ..com_backend.com_dispatch import ensure_word_typelib
+from ..com_backend.com_executor import get_com_executor
 from ..mcp_service.app_context import AppContext
 
 
@@ -19,11 +21,16 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     # Initialize AppContext
     # Word application will be started on-demand when needed
     app_context = AppContext()
+    # All COM work runs on the executor's STA worker thread
+    com_executor = get_com_executor()
+    # Build the Word gen_py wrapper now so the first request can bind early
+    await com_executor.run_async(ensure_word_typelib)
     try:
         yield app_context
     finally:
-        # Cleanup on shutdown - close any open document but don't quit Word app
-        app_context.close_document()
+        # Cleanup on shutdown - close all open documents but don't quit Word app
+        await com_executor.run_async(app_context.close_all_documents)
+        com_executor.shutdown()
 
 
 # --- MCP Server Initialization ---
@@ -2,7 +2,9 @@
 Utility functions shared across multiple Word document server modules.
 """
 
+import asyncio
 import functools
+import inspect
 import logging
 import os
 import shutil
@@ -11,6 +13,8 @@ from typing import Any, Dict, List, Optional, Tuple
 from mcp.server.fastmcp import Context
 from mcp.server.session import ServerSession
 
+from ..com_backend.com_executor import get_com_executor
+from ..com_backend.com_utils import count_com_calls
 from .app_context import AppContext
 
 # Configure logging
@@ -224,6 +228,15 @@ def log_warning(message: str) -> None:
     logger.warning(message)
 
 
+def log_debug(message: str) -> None:
+    """记录调试日志
+
+    Args:
+        message: 调试信息
+    """
+    logger.debug(message)
+
+
 
 
 
@@ -475,7 +488,9 @@ def handle_tool_errors(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
-            return func(*args, **kwargs)
+            # 按工具名统计COM调用次数，可通过get_com_call_stats查看
+            with count_com_calls(func.__name__):
+                return func(*args, **kwargs)
         except Exception as e:
             # Log the error with context
             logger.error("Error in tool %s: %s", func.__name__, str(e), exc_info=True)
@@ -487,6 +502,43 @@ def handle_tool_errors(func):
     return wrapper
 
 
+def run_on_com_thread(func):
+    """Run an MCP tool on the COM worker thread and make it awaitable.
+
+    Must be the decorator directly below ``@mcp_server.tool()``. The event
+    loop awaits the queued job instead of blocking on COM calls, so other
+    requests (pings included) are served while Word works. Coroutine tools
+    are driven to completion on the worker thread as well.
+
+    A ``document_handle`` argument makes that workspace document the active
+    document before the tool runs, so tool bodies keep working on the active
+    document.
+    """
+
+    if inspect.iscoroutinefunction(func):
+        def run(*args, **kwargs):
+            return asyncio.run(func(*args, **kwargs))
+    else:
+        run = func
+
+    def call(*args, **kwargs):
+        handle = kwargs.get("document_handle")
+        if isinstance(handle, str) and handle:
+            try:
+                AppContext.get_instance().activate_document(handle)
+            except WordDocumentError as e:
+                return format_error_response(e)
+        return run(*args, **kwargs)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await get_com_executor().run_async(
+            call, *args, label=func.__name__, **kwargs
+        )
+
+    return wrapper
+
+
 def is_file_writeable(filepath: str) -> Tuple[bool, str]:
     """
     Check if a file can be written to.
@@ -0,0 +1,203 @@
+"""
+Document workspace for Word Document MCP Server.
+
+AppContext used to track a single active document, so working on several
+files meant closing and reopening them and rebuilding the context tree on
+every switch. The workspace keeps many documents open at once, each
+addressed by a short handle (``doc1``, ``doc2``, ...) and carrying its own
+context tree state. Switching documents restores that state instead of
+rebuilding it; per-document COM caches (outline, page map, comments, styles,
+paragraph index, edit journal) are keyed by document already and stay warm.
+
+Entries are kept in least-recently-used order. When more than
+``max_documents`` are open, AppContext saves and closes the least recently
+used ones.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from ..com_backend.com_utils import document_key
+from ..com_backend.comment_inventory import invalidate_comment_inventory
+from ..com_backend.document_outline import invalidate_document_outline
+from ..com_backend.edit_journal import invalidate_edit_journal
+from ..com_backend.page_map import invalidate_page_map
+from ..com_backend.paragraph_index import invalidate_paragraph_index
+from ..com_backend.style_catalog import invalidate_style_catalog
+
+# Default number of documents kept open (WORD_WORKSPACE_MAX_DOCUMENTS)
+DEFAULT_MAX_DOCUMENTS = 10
+
+
+class WorkspaceDocument:
+    """
+    One open document and its per-document state.
+
+    Attributes:
+        handle: The handle tools use to address the document.
+        document: The Word document COM object.
+        key: The document's full name when it was added.
+        context_tree: Root of the document's context tree, None until built.
+        context_map: Context IDs to context objects of the tree.
+        active_context: The document's active context.
+        update_handlers: Update handlers registered for the document.
+    """
+
+    def __init__(self, handle: str, document: Any, key: str):
+        self.handle = handle
+        self.document = document
+        self.key = key
+        self.context_tree: Any = None
+        self.context_map: Dict[str, Any] = {}
+        self.active_context: Any = None
+        self.update_handlers: List[Callable] = []
+        self.opened_at = time.time()
+        self.last_used = self.opened_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        try:
+            name = str(self.document.Name)
+        except Exception:
+            name = os.path.basename(self.key)
+        return {
+            "handle": self.handle,
+            "name": name,
+            "full_name": self.key,
+            "opened_at": self.opened_at,
+            "last_used": self.last_used,
+            "context_tree_built": self.context_tree is not None,
+        }
+
+
+class DocumentWorkspace:
+    """
+    Open documents addressed by handle, in least-recently-used order.
+
+    Example:
+        workspace = DocumentWorkspace(max_documents=5)
+        entry = workspace.add(doc)
+        workspace.get(entry.handle)
+    """
+
+    def __init__(self, max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        if max_documents < 1:
+            raise ValueError("Workspace must allow at least one document")
+        self.max_documents = max_documents
+        self._lock = threading.RLock()
+        # handle -> entry, least recently used first
+        self._entries: "OrderedDict[str, WorkspaceDocument]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+        self._next_handle = 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._entries
+
+    def add(self, document: Any) -> WorkspaceDocument:
+        """
+        Add a document, or return its entry if it is already open.
+
+        The entry becomes the most recently used one.
+        """
+        key = document_key(document)
+        with self._lock:
+            handle = self._by_key.get(key)
+            if handle is not None:
+                entry = self._entries[handle]
+                entry.document = document
+                self.touch(handle)
+                return entry
+            handle = f"doc{self._next_handle}"
+            self._next_handle += 1
+            entry = WorkspaceDocument(handle, document, key)
+            self._entries[handle] = entry
+            self._by_key[key] = handle
+            return entry
+
+    def get(self, handle: str) -> Optional[WorkspaceDocument]:
+        """Return the entry of a handle, or None."""
+        with self._lock:
+            return self._entries.get(handle)
+
+    def find(self, document: Any) -> Optional[WorkspaceDocument]:
+        """Return the entry of an open document, or None."""
+        return self.find_by_path(document_key(document))
+
+    def find_by_path(self, path: str) -> Optional[WorkspaceDocument]:
+        """Return the entry of the document opened from a path, or None."""
+        with self._lock:
+            handle = self._by_key.get(path)
+            if handle is None:
+                wanted = _normalize_path(path)
+                handle = next(
+                    (h for key, h in self._by_key.items() if _normalize_path(key) == wanted),
+                    None,
+                )
+            return self._entries.get(handle) if handle is not None else None
+
+    def touch(self, handle: str) -> None:
+        """Mark a document as the most recently used one."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is not None:
+                entry.last_used = time.time()
+                self._entries.move_to_end(handle)
+
+    def remove(self, handle: str) -> Optional[WorkspaceDocument]:
+        """Remove a document from the workspace and return its entry."""
+        with self._lock:
+            entry = self._entries.pop(handle, None)
+            if entry is not None and self._by_key.get(entry.key) == handle:
+                del self._by_key[entry.key]
+            return entry
+
+    def rekey(self, handle: str) -> None:
+        """Update the path of a document after it was saved under a new name."""
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return
+            if self._by_key.get(entry.key) == handle:
+                del self._by_key[entry.key]
+            entry.key = document_key(entry.document)
+            self._by_key[entry.key] = handle
+
+    def eviction_candidates(self, keep: Optional[str] = None) -> List[WorkspaceDocument]:
+        """
+        Return the least recently used entries above the document limit.
+
+        Args:
+            keep: Handle that must not be evicted, usually the active document.
+        """
+        with self._lock:
+            excess = len(self._entries) - self.max_documents
+            if excess <= 0:
+                return []
+            return [e for h, e in self._entries.items() if h != keep][:excess]
+
+    def entries(self) -> List[WorkspaceDocument]:
+        """Return all entries, most recently used first."""
+        with self._lock:
+            return list(reversed(self._entries.values()))
+
+
+def forget_document_caches(document: Any) -> None:
+    """Drop every per-document COM cache of a document that is being closed."""
+    for invalidate in (
+        invalidate_document_outline,
+        invalidate_page_map,
+        invalidate_comment_inventory,
+        invalidate_style_catalog,
+        invalidate_paragraph_index,
+        invalidate_edit_journal,
+    ):
+        invalidate(document)
+
+
+def _normalize_path(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path)) if path else path
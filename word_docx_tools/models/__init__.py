@@ -4,7 +4,9 @@ This package contains the core models used by the Word Document MCP Server.
 """
 
 from .context import DocumentContext
+from .range_snapshot import RangeSnapshot
 
 __all__ = [
-    'DocumentContext'
+    'DocumentContext',
+    'RangeSnapshot'
 ]
\ No newline at end of file
@@ -7,12 +7,14 @@ and manages context information within Word documents.
 import logging
 import uuid
 import time
-from typing import Dict, Any, Optional, List, Set, Tuple
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple
 
 import win32com.client
 
+from ..com_backend.com_utils import count_com_calls
 from ..mcp_service.errors import ErrorCode, WordDocumentError
 from ..mcp_service.core_utils import log_error, log_info
+from .range_snapshot import RangeSnapshot
 
 
 class DocumentContext:
@@ -24,44 +26,157 @@ class DocumentContext:
         range: 上下文对应的文档范围对象
         object_list: 上下文包含的对象列表
         parent_context: 父上下文对象
-        child_contexts: 子上下文对象列表
+        child_contexts: 子上下文对象列表（延迟加载的节点在首次访问时展开）
         metadata: 上下文元数据字典
         last_updated: 最后更新时间戳
+        _offsets: 锚定在编辑日志中的偏移量树及构建时的起止偏移量
+        _index_listeners: 包含本上下文的元数据索引，元数据变化时重建索引
         _cached_dict: 缓存的字典表示，用于性能优化
         _cache_valid: 缓存有效性标志
     """
     
-    def __init__(self, title: str = "", range_obj: Optional[Any] = None):
+    def __init__(self, title: str = "", range_obj: Optional[Any] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
         """初始化文档上下文对象
         
         参数:
             title: 上下文标题
             range_obj: Word文档Range对象
+            metadata: 初始元数据
         """
         self.context_id = str(uuid.uuid4())  # 生成唯一上下文ID
         self.title = title
         self.range = range_obj  # Word文档Range对象
         self.object_list: List[Dict[str, Any]] = []  # 对象列表，存储对象信息字典
         self.parent_context: Optional['DocumentContext'] = None  # 父上下文
-        self.child_contexts: List['DocumentContext'] = []  # 子上下文列表
-        self.metadata: Dict[str, Any] = {}  # 上下文元数据
+        self._child_contexts: List['DocumentContext'] = []  # 子上下文列表
+        self._loader: Optional[Callable[['DocumentContext'], List['DocumentContext']]] = None  # 延迟加载函数
+        self.metadata: Dict[str, Any] = dict(metadata) if metadata else {}  # 上下文元数据
+        self._offsets: Optional[Tuple[Any, int, int]] = None  # (OffsetTree, 构建时起点, 构建时终点)
+        self._index_listeners: List[Callable[['DocumentContext'], None]] = []  # 元数据索引的重建回调
         self.last_updated = time.time()  # 最后更新时间戳
         self._cached_dict: Optional[Dict[str, Any]] = None  # 缓存的字典表示
         self._cache_valid = False  # 缓存有效性标志
     
     def _invalidate_cache(self) -> None:
-        """使缓存失效，并更新最后更新时间"""
+        """使缓存失效，更新最后更新时间，并通知所在的元数据索引重建本上下文的索引"""
         self._cache_valid = False
         self.last_updated = time.time()
+        for listener in self._index_listeners:
+            listener(self)
     
-    def _update_metadata(self, key: str, value: Any) -> None:
+    @property
+    def child_contexts(self) -> List['DocumentContext']:
+        """子上下文列表；延迟加载的节点在首次访问时展开"""
+        if self._loader is not None:
+            self.expand()
+        return self._child_contexts
+
+    @child_contexts.setter
+    def child_contexts(self, value: List['DocumentContext']) -> None:
+        self._child_contexts = value
+
+    @property
+    def loaded_child_contexts(self) -> List['DocumentContext']:
+        """已构建的子上下文，不触发延迟加载"""
+        return self._child_contexts
+
+    @property
+    def is_expanded(self) -> bool:
+        """子上下文是否已构建"""
+        return self._loader is None
+
+    def set_lazy_loader(self, loader: Callable[['DocumentContext'], List['DocumentContext']]) -> None:
+        """设置延迟加载函数，子上下文在首次访问时才构建
+        
+        参数:
+            loader: 接收本上下文、返回子上下文列表的函数
+        """
+        self._loader = loader
+        self._update_metadata('is_expanded', False)
+
+    def expand(self) -> List['DocumentContext']:
+        """构建延迟加载的子上下文，并在元数据中记录该子树的构建开销
+        
+        元数据中记录 build_time（秒）、build_com_calls（记录到的COM调用次数）
+        和 built_child_count。加载失败时记录 build_error，子上下文为空。
+        
+        返回:
+            子上下文列表
+        """
+        loader = self._loader
+        if loader is None:
+            return self._child_contexts
+        # 先清除加载函数，避免加载过程中访问child_contexts时重入
+        self._loader = None
+        start_time = time.perf_counter()
+        with count_com_calls("expand_context") as counter:
+            try:
+                children = loader(self)
+                error = None
+            except Exception as e:
+                log_error(f"Failed to expand context '{self.title}': {e}")
+                children = []
+                error = str(e)
+        self.batch_add_child_contexts(children)
+        build_cost = {
+            'is_expanded': True,
+            'build_time': time.perf_counter() - start_time,
+            'build_com_calls': counter.total,
+            'built_child_count': len(children),
+        }
+        if error is not None:
+            build_cost['build_error'] = error
+        self.update_multiple_metadata(build_cost)
+        return self._child_contexts
+
+    def anchor_offsets(self, offset_tree: Any, start: int, end: int) -> None:
+        """把构建时读取的起止偏移量锚定到编辑日志的偏移量树上
+        
+        之后通过操作层完成的编辑会在读取时平移这些偏移量，无需重建上下文树
+        
+        参数:
+            offset_tree: 编辑日志返回的OffsetTree，包含start和end
+            start: 构建时的起始偏移量
+            end: 构建时的结束偏移量
+        """
+        self._offsets = (offset_tree, start, end)
+
+    @property
+    def offset_tree(self) -> Optional[Any]:
+        """锚定偏移量的OffsetTree，未锚定时为None"""
+        return self._offsets[0] if self._offsets is not None else None
+
+    def get_offsets(self) -> Optional[Tuple[int, int]]:
+        """获取上下文当前的起止偏移量，不访问Word
+        
+        返回:
+            (start, end)元组；未锚定时使用元数据中的range_start/range_end，
+            都没有时返回None
+        """
+        if self._offsets is not None:
+            offset_tree, start, end = self._offsets
+            current_start = offset_tree.current(start)
+            current_end = offset_tree.current(end)
+            if current_start is not None and current_end is not None:
+                return current_start, current_end
+        start = self.metadata.get('range_start')
+        end = self.metadata.get('range_end')
+        if start is None or end is None:
+            return None
+        return start, end
+
+    def _update_metadata(self, key: Any, value: Any = None) -> None:
         """更新元数据
         
         参数:
-            key: 元数据键
+            key: 元数据键，或包含多个键值的字典
             value: 元数据值
         """
-        self.metadata[key] = value
+        if isinstance(key, dict):
+            self.metadata.update(key)
+        else:
+            self.metadata[key] = value
         self._invalidate_cache()
     
     def update_multiple_metadata(self, metadata_dict: Dict[str, Any]) -> None:
@@ -95,12 +210,25 @@ class DocumentContext:
             child_context: 子上下文对象
         """
         if child_context not in self.child_contexts:
-            self.child_contexts.append(child_context)
+            self._child_contexts.append(child_context)
             child_context.parent_context = self
             # 更新子上下文的元数据，标记其在树中的位置
             child_context._update_metadata('parent_id', self.context_id)
             self._invalidate_cache()
     
+    def batch_add_child_contexts(self, child_contexts: List['DocumentContext']) -> None:
+        """批量添加子上下文，不触发延迟加载
+        
+        参数:
+            child_contexts: 子上下文对象列表
+        """
+        for child_context in child_contexts:
+            self._child_contexts.append(child_context)
+            child_context.parent_context = self
+            child_context.metadata['parent_id'] = self.context_id
+            child_context._invalidate_cache()
+        self._invalidate_cache()
+
     def remove_child_context(self, child_context: 'DocumentContext') -> None:
         """移除子上下文
         
@@ -108,7 +236,7 @@ class DocumentContext:
             child_context: 要移除的子上下文对象
         """
         if child_context in self.child_contexts:
-            self.child_contexts.remove(child_context)
+            self._child_contexts.remove(child_context)
             child_context.parent_context = None
             # 更新子上下文的元数据
             child_context.metadata.pop('parent_id', None)
@@ -206,7 +334,8 @@ class DocumentContext:
             "title": self.title,
             "has_range": self.range is not None,
             "object_count": len(self.object_list),
-            "child_count": len(self.child_contexts),
+            "child_count": len(self._child_contexts),
+            "is_expanded": self.is_expanded,
             "has_parent": self.parent_context is not None,
             "metadata": self.metadata.copy(),
             "last_updated": self.last_updated
@@ -215,10 +344,13 @@ class DocumentContext:
         # 如果有Range对象，可以添加一些基本信息
         if self.range:
             try:
+                snapshot = RangeSnapshot.capture(
+                    self.range, preview_length=50, include_style=False
+                )
                 result["range_info"] = {
-                    "start": self.range.Start,
-                    "end": self.range.End,
-                    "text_preview": self.range.Text[:50] + ("..." if len(self.range.Text) > 50 else "")
+                    "start": snapshot.start,
+                    "end": snapshot.end,
+                    "text_preview": snapshot.text_preview(50)
                 }
             except Exception:
                 result["range_info"] = {"error": "Failed to get range details"}
@@ -344,12 +476,15 @@ class DocumentContext:
             # 收集注释信息
             if selection.Comments.Count > 0:
                 for i, comment in enumerate(selection.Comments):
+                    snapshot = RangeSnapshot.capture(
+                        comment.Range, preview_length=100, include_style=False
+                    )
                     objects_to_add.append({
                         "type": "comment",
                         "id": str(comment.Index),
                         "index": i,
                         "author": comment.Author,
-                        "text": comment.Range.Text[:100] + ("..." if len(comment.Range.Text) > 100 else "")
+                        "text": snapshot.text_preview(100)
                     })
             
             # 批量添加对象，提高性能
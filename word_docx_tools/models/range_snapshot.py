@@ -0,0 +1,126 @@
+"""
+Range snapshot model for Word Document MCP Server.
+
+A RangeSnapshot holds the handful of Range properties that response
+dictionaries need, read once from COM. Building a response from a snapshot
+instead of from the live Range avoids reading ``Range.Text`` once for the
+length check and again for the preview, and probing ``Style`` with
+``hasattr`` before reading it.
+"""
+
+from typing import Any, Dict, Optional
+
+from ..com_backend.com_dispatch import get_com_property
+from ..com_backend.com_utils import record_com_call
+
+# Longest preview any response currently asks for
+DEFAULT_PREVIEW_LENGTH = 200
+
+
+class RangeSnapshot:
+    """
+    Compact, read-once view of a Word Range.
+
+    Attributes:
+        start: Start position of the range.
+        end: End position of the range.
+        text_length: Length of the full range text, or None if the text
+            could not be read.
+        preview: The first ``preview_length`` characters of the text, or None
+            if the text could not be read.
+        style_name: Local name of the range style, or None if unavailable.
+    """
+
+    __slots__ = ("start", "end", "text_length", "preview", "style_name")
+
+    def __init__(
+        self,
+        start: int,
+        end: int,
+        text_length: Optional[int] = None,
+        preview: Optional[str] = None,
+        style_name: Optional[str] = None,
+    ):
+        self.start = start
+        self.end = end
+        self.text_length = text_length
+        self.preview = preview
+        self.style_name = style_name
+
+    @classmethod
+    def capture(
+        cls,
+        range_obj: Any,
+        preview_length: int = DEFAULT_PREVIEW_LENGTH,
+        include_style: bool = True,
+    ) -> "RangeSnapshot":
+        """
+        Read a Range once and keep only what responses need.
+
+        Start and End must be readable; errors reading them are raised. Text
+        and style are optional and become None when they cannot be read.
+
+        Args:
+            range_obj: The Range COM object.
+            preview_length: Number of leading characters to keep.
+            include_style: Whether to read the style name.
+
+        Returns:
+            A RangeSnapshot of the range.
+        """
+        start = get_com_property(range_obj, "Start")
+        end = get_com_property(range_obj, "End")
+        record_com_call("Range.Start")
+        record_com_call("Range.End")
+
+        text_length = None
+        preview = None
+        try:
+            text = get_com_property(range_obj, "Text")
+            record_com_call("Range.Text")
+            if text is not None:
+                text_length = len(text)
+                preview = text[:preview_length]
+        except Exception:
+            pass
+
+        style_name = None
+        if include_style:
+            try:
+                style_name = range_obj.Style.NameLocal
+                record_com_call("Range.Style")
+                record_com_call("Style.NameLocal")
+            except Exception:
+                # Ranges spanning several styles return no Style object
+                pass
+
+        return cls(start, end, text_length, preview, style_name)
+
+    def text_preview(self, limit: int) -> Optional[str]:
+        """
+        Return the text cut to ``limit`` characters, with "..." if it was cut.
+
+        ``limit`` should not exceed the preview length the snapshot was
+        captured with.
+        """
+        if self.preview is None:
+            return None
+        if self.text_length > limit:
+            return self.preview[:limit] + "..."
+        return self.preview
+
+    def to_dict(self, preview_limit: int = DEFAULT_PREVIEW_LENGTH) -> Dict[str, Any]:
+        """Return the snapshot as a JSON-serializable dictionary."""
+        return {
+            "start": self.start,
+            "end": self.end,
+            "text_length": self.text_length,
+            "text_preview": self.text_preview(preview_limit),
+            "style": self.style_name,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"RangeSnapshot(start={self.start}, end={self.end}, "
+            f"text_length={self.text_length}, style_name={self.style_name!r})"
+        )
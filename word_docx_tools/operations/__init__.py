@@ -4,7 +4,7 @@
 # 评论操作
 from .comment_ops import (add_comment, delete_all_comments, delete_comment,
                           edit_comment, get_comment_thread, get_comments,
-                          reply_to_comment)
+                          get_comments_page, reply_to_comment)
 from .document_ops import (close_document, create_document,
                            get_document_outline, open_document,
                            save_document)
@@ -35,7 +35,8 @@ from .navigate_tools import (
 )
 # 表格操作
 from .table_ops import (create_table, get_cell_text, get_table_info,
-                        insert_column, insert_row, set_cell_text)
+                        insert_column, insert_row, set_cell_text,
+                        set_cells)
 # 文本格式操作
 from .text_format_ops import (set_alignment_for_range, set_bold_for_range,
                               set_font_color_for_range,
@@ -74,6 +75,7 @@ __all__ = [
     # comment_ops
     "add_comment",
     "get_comments",
+    "get_comments_page",
     "get_comment_thread",
     "delete_comment",
     "delete_all_comments",
@@ -89,6 +91,7 @@ __all__ = [
     "create_table",
     "get_cell_text",
     "set_cell_text",
+    "set_cells",
     "get_table_info",
     "insert_row",
     "insert_column",
@@ -9,7 +9,9 @@ from typing import Any, Dict, List, Optional
 
 import win32com.client
 
-from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.com_utils import handle_com_error
+from ..com_backend.comment_inventory import read_comment_inventory
+from ..com_backend.document_revision import bump_document_revision
 from ..mcp_service.core_utils import (ErrorCode, WordDocumentError, log_error,
                                       log_info)
 
@@ -44,111 +46,95 @@ def add_comment(
     if author:
         comment.Author = author
 
+    bump_document_revision(document)
     return comment
 
 
 # === Comment Retrieval Operations ===
 
 
-@handle_com_error(ErrorCode.COMMENT_ERROR, "get comments")
-def get_comments(document: win32com.client.CDispatch) -> List[Dict[str, Any]]:
+def get_comments(
+    document: win32com.client.CDispatch,
+    author: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    scope_start: Optional[int] = None,
+    scope_end: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
     """
-    Retrieves all comments from the document.
+    Retrieves comments from the document, optionally filtered and paged.
 
     Args:
         document: The Word document COM object.
+        author: Optional author name to filter by (case-insensitive).
+        date_from: Optional earliest comment date, ISO format.
+        date_to: Optional latest comment date, ISO format.
+        scope_start: Optional start offset; keeps comments whose scope ends after it.
+        scope_end: Optional end offset; keeps comments whose scope starts before it.
+        offset: Number of matching comments to skip.
+        limit: Maximum number of comments to return.
 
     Returns:
         A list of dictionaries with comment details.
     """
-    if not document:
-        raise RuntimeError("No document open.")
+    return get_comments_page(
+        document, author, date_from, date_to, scope_start, scope_end, offset, limit
+    )["comments"]
 
-    comments: List[Dict[str, Any]] = []
-    for i, comment in enumerate(iter_com_collection(document.Comments), 1):
-        try:
-            # 创建一个基本的评论信息字典，只包含必要的属性
-            comment_info = {"index": i - 1, "replies_count": 0}  # 0-based index
-
-            # 尝试获取每个属性，使用try-except包装每个属性访问
-            # 尝试多种方法获取Text属性
-            try:
-                # 方法1: 直接访问Text属性
-                comment_info["text"] = str(comment.Text)
-            except Exception as e1:
-                try:
-                    # 方法2: 通过Range属性获取Text
-                    if hasattr(comment, "Range"):
-                        comment_info["text"] = str(comment.Range.Text)
-                    else:
-                        raise AttributeError("Range attribute not found")
-                except Exception as e2:
-                    try:
-                        # 方法3: 使用Get_Text()方法（如果存在）
-                        if hasattr(comment, "Get_Text") and callable(comment.Get_Text):
-                            comment_info["text"] = str(comment.Get_Text())
-                        else:
-                            raise AttributeError("Get_Text method not found")
-                    except Exception as e3:
-                        logging.warning(
-                            f"Failed to get Text for comment {i} using multiple methods: {e1}, {e2}, {e3}"
-                        )
-                        comment_info["text"] = "[Unable to retrieve text]"
-
-            try:
-                comment_info["author"] = str(comment.Author)
-            except Exception as e:
-                logging.warning(f"Failed to get Author for comment {i}: {e}")
-                comment_info["author"] = "[Unknown]"
-
-            try:
-                comment_info["initials"] = str(comment.Initial)
-            except Exception as e:
-                logging.warning(f"Failed to get Initial for comment {i}: {e}")
-                comment_info["author_initial"] = ""
-
-            try:
-                comment_info["date"] = str(comment.Date)
-            except Exception as e:
-                logging.warning(f"Failed to get Date for comment {i}: {e}")
-                comment_info["date"] = "[Unknown date]"
-
-            # 尝试获取Scope属性
-            try:
-                if hasattr(comment, "Scope") and comment.Scope:
-                    scope_info = {
-                        "start": comment.Scope.Start,
-                        "end": comment.Scope.End,
-                        "text": comment.Scope.Text.strip(),
-                    }
-                    comment_info["scope"] = scope_info
-            except Exception as e:
-                logging.warning(f"Failed to get Scope for comment {i}: {e}")
-
-            # 尝试获取Replies.Count
-            try:
-                if hasattr(comment, "Replies"):
-                    comment_info["replies_count"] = comment.Replies.Count
-            except Exception as e:
-                logging.warning(f"Failed to get Replies for comment {i}: {e}")
-
-            # 无论如何都添加评论信息，即使某些属性无法访问
-            comments.append(comment_info)
 
-        except Exception as e:
-            logging.warning(f"Failed to retrieve comment at index {i}: {e}")
-            # 仍然添加一个基本的评论信息，以便至少知道有这个评论存在
-            comments.append(
-                {
-                    "index": i - 1,
-                    "text": "[Error retrieving comment]",
-                    "author": "[Unknown]",
-                    "replies_count": 0,
-                }
-            )
-            continue
+@handle_com_error(ErrorCode.COMMENT_ERROR, "get comments")
+def get_comments_page(
+    document: win32com.client.CDispatch,
+    author: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    scope_start: Optional[int] = None,
+    scope_end: Optional[int] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Retrieves one page of comments together with the paging information.
 
-    return comments
+    All comment fields are read in a single pass over Document.Comments and
+    cached per document revision; filtering and paging happen in memory.
+
+    Args:
+        document: The Word document COM object.
+        author: Optional author name to filter by (case-insensitive).
+        date_from: Optional earliest comment date, ISO format.
+        date_to: Optional latest comment date, ISO format.
+        scope_start: Optional start offset; keeps comments whose scope ends after it.
+        scope_end: Optional end offset; keeps comments whose scope starts before it.
+        offset: Number of matching comments to skip.
+        limit: Maximum number of comments to return.
+
+    Returns:
+        A dictionary with the comments, the total number of matching
+        comments, the paging values and whether more comments follow.
+    """
+    if not document:
+        raise RuntimeError("No document open.")
+
+    inventory = read_comment_inventory(document)
+    comments, total = inventory.query(
+        author=author,
+        date_from=date_from,
+        date_to=date_to,
+        scope_start=scope_start,
+        scope_end=scope_end,
+        offset=offset,
+        limit=limit,
+    )
+    return {
+        "comments": comments,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "has_more": offset + len(comments) < total,
+    }
 
 
 @handle_com_error(ErrorCode.COMMENT_ERROR, "get comment thread")
@@ -168,37 +154,8 @@ def get_comment_thread(
     if not document:
         raise RuntimeError("No document open.")
 
-    thread: List[Dict[str, Any]] = []
-    # Get the comment at the specified index
-    comment = document.Comments(index + 1)  # COM is 1-based
-    # Add the main comment
-    thread.append(
-        {
-            "index": index,
-            "text": comment.Range.Text,
-            "author": comment.Author,
-            "initials": comment.Initial,
-            "date": str(comment.Date),
-            "scope_start": comment.Scope.Start,
-            "scope_end": comment.Scope.End,
-            "scope_text": comment.Scope.Text.strip(),
-        }
-    )
-    # Add any replies
-    replies_count = comment.Replies.Count if hasattr(comment, "Replies") else 0
-    for i in range(1, replies_count + 1):
-        reply = comment.Replies(i)
-        thread.append(
-            {
-                "index": f"{index}-reply-{i-1}",
-                "text": reply.Range.Text,
-                "author": reply.Author,
-                "initials": reply.Initial,
-                "date": str(reply.Date),
-            }
-        )
-
-    return thread
+    # 从评论清单中按索引查找，回复通过Ancestor关系预先建立索引
+    return read_comment_inventory(document).thread(document, index)
 
 
 # === Comment Modification Operations ===
@@ -220,6 +177,7 @@ def delete_comment(document: win32com.client.CDispatch, index: int) -> bool:
     comment = document.Comments(index + 1)  # COM is 1-based
     # Delete the comment
     comment.Delete()
+    bump_document_revision(document)
     return True
 
 
@@ -243,6 +201,7 @@ def delete_all_comments(document: win32com.client.CDispatch) -> Any:
         except Exception as e:
             logger.warning(f"Failed to delete comment at index {i}: {e}")
             continue
+    bump_document_revision(document)
     return count
 
 
@@ -265,6 +224,7 @@ def edit_comment(
     comment = document.Comments(index + 1)  # COM is 1-based
     # Edit the comment
     comment.Range.Text = new_text
+    bump_document_revision(document)
     return True
 
 
@@ -313,6 +273,8 @@ def reply_to_comment(
                 comment.Replies.Count if hasattr(comment, "Replies") else 0
             )
             reply_added = new_replies_count > original_replies_count
+            if reply_added:
+                bump_document_revision(document)
 
             # 如果回复成功添加且提供了作者，尝试设置作者
             if reply_added and author:
@@ -342,6 +304,8 @@ def reply_to_comment(
                 comment.Replies.Count if hasattr(comment, "Replies") else 0
             )
             reply_added = new_replies_count > original_replies_count
+            if reply_added:
+                bump_document_revision(document)
 
             # 如果回复成功添加且提供了作者，尝试设置作者
             if reply_added and author:
@@ -6,14 +6,21 @@ This module contains functions for document-level operations.
 
 import logging
 import os
+import re
 import traceback
 import json  # 添加json导入
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import win32com.client
 from win32com.client import CDispatch
 
-from ..com_backend.com_utils import handle_com_error, safe_com_call
+from ..com_backend.com_utils import (count_com_calls, handle_com_error,
+                                     record_com_call, safe_com_call)
+from ..com_backend.document_outline import read_document_outline
+from ..com_backend.page_map import read_page_map
+from ..com_backend.edit_journal import invalidate_edit_journal
+from ..com_backend.paragraph_index import invalidate_paragraph_index
+from ..com_backend.render_suspension import suspend_rendering
 from ..mcp_service.core_utils import ErrorCode, WordDocumentError, AppContext
 
 logger = logging.getLogger(__name__)
@@ -275,10 +282,8 @@ def count_objects_by_type(document: CDispatch, object_type: str) -> int:
         elif object_type == "sections":
             count = document.Sections.Count
         elif object_type == "pages":
-            # 近似页数计算
-            count = document.Range().Information(
-                4
-            )  # 4 corresponds to wdNumberOfPagesInDocument
+            # 页数取自按文档版本缓存的页面索引
+            count = read_page_map(document).page_count
         else:
             raise ValueError(f"Unsupported object type: {object_type}")
 
@@ -293,11 +298,16 @@ def count_objects_by_type(document: CDispatch, object_type: str) -> int:
 
 
 @handle_com_error(ErrorCode.SERVER_ERROR, "get document outline")
-def get_document_outline(document: CDispatch) -> str:
-    """获取文档大纲信息，通过段落级别来判断是否是大纲
+def get_document_outline(document: CDispatch, include_page_numbers: bool = False) -> str:
+    """获取文档大纲信息，通过段落大纲级别来判断是否是标题
+
+    标题通过按大纲级别的批量查找获得，不逐个读取段落；结果按文档版本缓存，
+    文档未变化时重复调用不再访问COM。
 
     Args:
         document: Word文档COM对象
+        include_page_numbers: 是否计算每个标题所在页码和文档总页数。
+            页码来自页面索引，每个文档版本只分页一次，默认不计算
 
     Returns:
         包含文档大纲层级结构的JSON字符串
@@ -306,43 +316,25 @@ def get_document_outline(document: CDispatch) -> str:
         if not document:
             raise RuntimeError("No document open.")
 
-        outline_structure = []
-        
-        # 遍历所有段落，提取大纲信息
-        for i in range(1, document.Paragraphs.Count + 1):
-            paragraph = document.Paragraphs(i)
-            
-            # 获取段落样式信息
-            style_name = paragraph.Style.NameLocal if hasattr(paragraph.Style, 'NameLocal') else ""
-            
-            # 获取段落级别（大纲级别）
-            outline_level = 0
-            if hasattr(paragraph, 'OutlineLevel'):
-                outline_level = paragraph.OutlineLevel
-            
-            # 根据用户需求，1~9为标题样式，10为正文
-            if 1 <= outline_level <= 9:
-                outline_item = {
-                    "index": i,
-                    "text": paragraph.Range.Text.strip(),
-                    "outline_level": outline_level,
-                    "style_name": style_name,
-                    "page_number": paragraph.Range.Information(3) if hasattr(paragraph.Range, 'Information') else 0  # wdActiveEndPageNumber
-                }
-                outline_structure.append(outline_item)
+        outline = read_document_outline(document)
+        # 1~9为标题级别，10为正文
+        outline_structure = outline.heading_list(document, include_page_numbers)
 
         # 构建层次化的大纲结构
         hierarchical_outline = build_hierarchical_outline_by_level(outline_structure)
 
+        document_statistics = {
+            "paragraphs": outline.paragraph_count,
+            "tables": document.Tables.Count if hasattr(document, 'Tables') and document.Tables is not None else 0,
+            "sections": document.Sections.Count if hasattr(document, 'Sections') and document.Sections is not None else 0,
+        }
+        if include_page_numbers:
+            document_statistics["pages"] = read_page_map(document).page_count
+
         return json.dumps({
             "outline_items": hierarchical_outline,
             "total_headings": len(outline_structure),
-            "document_statistics": {
-                "paragraphs": document.Paragraphs.Count,
-                "tables": document.Tables.Count if hasattr(document, 'Tables') and document.Tables is not None else 0,
-                "sections": document.Sections.Count if hasattr(document, 'Sections') and document.Sections is not None else 0,
-                "pages": document.Range().Information(4) if hasattr(document.Range(), 'Information') else 0  # wdNumberOfPagesInDocument
-            }
+            "document_statistics": document_statistics
         }, ensure_ascii=False, indent=2)
 
     except Exception as e:
@@ -394,6 +386,158 @@ def build_hierarchical_outline_by_level(heading_list: list) -> list:
     return hierarchical_outline
 
 
+# Word查找替换常量
+_WD_FIND_STOP = 0
+_WD_REPLACE_ONE = 1
+_WD_REPLACE_ALL = 2
+
+# 可以在本地文本中模拟的Word特殊字符
+_WORD_SPECIAL_CHARS = {"^p": "\r", "^t": "\t", "^^": "^"}
+
+# find_and_replace_rules中每条规则支持的选项
+_REPLACE_RULE_OPTIONS = {"match_case", "match_whole_word"}
+
+
+def _translate_word_specials(text: str) -> Optional[str]:
+    """将Word查找文本中的特殊字符转换为普通文本
+
+    Args:
+        text: 查找文本
+
+    Returns:
+        转换后的文本；包含无法在本地模拟的特殊字符（如^#、^w、^c）时返回None
+    """
+    result = []
+    index = 0
+    while index < len(text):
+        if text[index] != "^":
+            result.append(text[index])
+            index += 1
+            continue
+        special = text[index:index + 2]
+        if special in _WORD_SPECIAL_CHARS:
+            result.append(_WORD_SPECIAL_CHARS[special])
+        else:
+            return None
+        index += 2
+    return "".join(result)
+
+
+def _scan_replacements(
+    text: str,
+    find_text: str,
+    match_case: bool,
+    match_whole_word: bool,
+) -> Optional[int]:
+    """在本地文本中统计一次全部替换会替换的次数
+
+    Args:
+        text: 文档文本
+        find_text: 查找文本（Word语法）
+        match_case: 是否匹配大小写
+        match_whole_word: 是否匹配整个单词
+
+    Returns:
+        匹配次数；查找文本无法在本地模拟时返回None
+    """
+    pattern_text = _translate_word_specials(find_text)
+    if pattern_text is None:
+        return None
+
+    pattern = re.escape(pattern_text)
+    if match_whole_word:
+        pattern = rf"(?<!\w){pattern}(?!\w)"
+    regex = re.compile(pattern, 0 if match_case else re.IGNORECASE)
+    return sum(1 for _ in regex.finditer(text))
+
+
+def _prepare_find(
+    document: CDispatch,
+    find_text: str,
+    replace_text: str,
+    match_case: bool,
+    match_whole_word: bool,
+) -> Any:
+    """创建并配置一个覆盖整个文档正文的Find对象"""
+    find = document.Content.Find
+    find.ClearFormatting()
+    find.Text = find_text
+    find.Replacement.ClearFormatting()
+    find.Replacement.Text = replace_text
+    find.Forward = True
+    find.Wrap = _WD_FIND_STOP
+    find.Format = False
+    find.MatchCase = match_case
+    find.MatchWholeWord = match_whole_word
+    find.MatchWildcards = False
+    find.MatchSoundsLike = False
+    find.MatchAllWordForms = False
+    return find
+
+
+def _replace_one_by_one(
+    document: CDispatch,
+    find_text: str,
+    replace_text: str,
+    match_case: bool,
+    match_whole_word: bool,
+) -> int:
+    """逐个替换并计数，仅用于无法在本地统计的查找文本"""
+    find = _prepare_find(document, find_text, replace_text, match_case, match_whole_word)
+    count = 0
+    while find.Execute(Replace=_WD_REPLACE_ONE):
+        count += 1
+    return count
+
+
+def _apply_replace_rule(
+    document: CDispatch,
+    find_text: str,
+    replace_text: str,
+    match_case: bool,
+    match_whole_word: bool,
+) -> Tuple[int, bool]:
+    """执行一条替换规则
+
+    总是发出一次wdReplaceAll，由Word决定实际替换哪些内容。替换次数通过在本地
+    扫描文档文本估算：Word的匹配与本地扫描并不完全一致（智能引号、不区分大小写
+    时按原文大小写调整的替换文本等），因此本地扫描只用于计数，不用于决定是否替换。
+
+    Args:
+        document: Word文档COM对象
+        find_text: 查找文本
+        replace_text: 替换文本
+        match_case: 是否匹配大小写
+        match_whole_word: 是否匹配整个单词
+
+    Returns:
+        (替换次数, Word是否进行了替换)
+    """
+    if not find_text:
+        raise ValueError("Find text cannot be empty.")
+
+    text = document.Content.Text or ""
+    record_com_call("Document.Content")
+    record_com_call("Range.Text")
+
+    count = _scan_replacements(text, find_text, match_case, match_whole_word)
+    if count is None:
+        # 查找文本包含无法在本地模拟的特殊字符
+        count = _replace_one_by_one(
+            document, find_text, replace_text, match_case, match_whole_word
+        )
+        return count, count > 0
+
+    find = _prepare_find(document, find_text, replace_text, match_case, match_whole_word)
+    replaced = bool(find.Execute(Replace=_WD_REPLACE_ALL))
+    record_com_call("Find.Setup", 15)
+    record_com_call("Find.Execute")
+    if replaced and not count:
+        # Word找到了本地扫描没有匹配到的内容，至少替换了一处
+        count = 1
+    return count, replaced or count > 0
+
+
 def find_and_replace_text(
     document: CDispatch,
     find_text: str,
@@ -403,6 +547,8 @@ def find_and_replace_text(
 ) -> int:
     """在文档中查找并替换文本
 
+    使用一次wdReplaceAll完成替换，替换次数通过在本地扫描文档文本估算。
+
     Args:
         document: Word文档COM对象
         find_text: 要查找的文本
@@ -417,29 +563,13 @@ def find_and_replace_text(
         if not document:
             raise RuntimeError("No document open.")
 
-        if not find_text:
-            raise ValueError("Find text cannot be empty.")
-
-        # 使用Word的查找和替换功能
-        find = document.Content.Find
-        find.ClearFormatting()
-        find.Text = find_text
-        find.Replacement.ClearFormatting()
-        find.Replacement.Text = replace_text
-        find.Forward = True
-        find.Wrap = 1  # wdFindContinue
-        find.Format = False
-        find.MatchCase = match_case
-        find.MatchWholeWord = match_whole_word
-        find.MatchWildcards = False
-        find.MatchSoundsLike = False
-        find.MatchAllWordForms = False
-
-        # 执行替换所有
-        count = 0
-        while find.Execute(Replace=2):  # 2 = wdReplaceOne
-            count += 1
-
+        count, replaced = _apply_replace_rule(
+            document, find_text, replace_text, match_case, match_whole_word
+        )
+        if replaced:
+            # wdReplaceAll不是一次替换，锚定的上下文偏移量只能标记为过期
+            invalidate_paragraph_index(document)
+            invalidate_edit_journal(document)
         return count
 
     except Exception as e:
@@ -447,3 +577,104 @@ def find_and_replace_text(
         raise WordDocumentError(
             ErrorCode.SERVER_ERROR, f"Failed to find and replace text: {str(e)}"
         )
+
+
+def _normalize_replace_rule(rule: Any, index: int) -> Tuple[str, str, Dict[str, Any]]:
+    """将(find, replace, options)元组或字典形式的规则统一为元组"""
+    if isinstance(rule, dict):
+        options = {
+            key: value for key, value in rule.items() if key not in ("find", "replace")
+        }
+        find_text, replace_text = rule.get("find"), rule.get("replace")
+    elif isinstance(rule, (list, tuple)) and len(rule) in (2, 3):
+        find_text, replace_text = rule[0], rule[1]
+        options = dict(rule[2]) if len(rule) == 3 and rule[2] else {}
+    else:
+        raise ValueError(
+            f"Rule {index} must be a (find, replace, options) tuple or a dict"
+        )
+
+    if not find_text:
+        raise ValueError(f"Rule {index} has an empty find text")
+    if replace_text is None:
+        raise ValueError(f"Rule {index} has no replace text")
+    unknown = set(options) - _REPLACE_RULE_OPTIONS
+    if unknown:
+        raise ValueError(
+            f"Rule {index} has unsupported options: {', '.join(sorted(unknown))}"
+        )
+    return find_text, replace_text, options
+
+
+@handle_com_error(ErrorCode.SERVER_ERROR, "find and replace rules")
+def find_and_replace_rules(
+    document: CDispatch,
+    rules: List[Any],
+    undo_name: str = "Find and replace rules",
+) -> Dict[str, Any]:
+    """按顺序应用多条查找替换规则
+
+    每条规则读取一次文档文本用于估算替换次数，并只有一次wdReplaceAll调用；
+    后面的规则扫描的是Word替换后的文本。整批替换在同一个撤销记录中完成，
+    用户可以一次撤销。
+
+    Args:
+        document: Word文档COM对象
+        rules: 规则列表，每条规则是(find, replace, options)元组，或包含find、
+            replace以及可选match_case、match_whole_word的字典
+        undo_name: 撤销记录的名称
+
+    Returns:
+        包含每条规则替换次数和总替换次数的字典
+    """
+    if not document:
+        raise WordDocumentError(ErrorCode.DOCUMENT_ERROR, "No active document found")
+    if not rules:
+        raise ValueError("At least one rule must be provided.")
+
+    normalized = [_normalize_replace_rule(rule, i) for i, rule in enumerate(rules)]
+
+    undo_record = None
+    try:
+        undo_record = document.Application.UndoRecord
+        undo_record.StartCustomRecord(undo_name)
+    except Exception as e:
+        # Word 2007及更早版本没有UndoRecord
+        undo_record = None
+        logger.warning(f"Custom undo record not available: {e}")
+
+    results = []
+    changed = False
+    try:
+        with count_com_calls("find_and_replace_rules") as counter:
+            with suspend_rendering(document, "find_and_replace_rules"):
+                for find_text, replace_text, options in normalized:
+                    count, replaced = _apply_replace_rule(
+                        document,
+                        find_text,
+                        replace_text,
+                        bool(options.get("match_case", False)),
+                        bool(options.get("match_whole_word", False)),
+                    )
+                    changed = changed or replaced
+                    results.append(
+                        {"find": find_text, "replace": replace_text, "count": count}
+                    )
+    finally:
+        if undo_record is not None:
+            try:
+                undo_record.EndCustomRecord()
+            except Exception as e:
+                logger.warning(f"Failed to close custom undo record: {e}")
+
+    total = sum(result["count"] for result in results)
+    if changed:
+        invalidate_paragraph_index(document)
+        invalidate_edit_journal(document)
+
+    return {
+        "success": True,
+        "rules": results,
+        "total_replacements": total,
+        "com_calls": counter.to_dict(),
+    }
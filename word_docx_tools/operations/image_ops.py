@@ -11,6 +11,10 @@ from typing import Any, Dict, List, Optional
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.edit_journal import invalidate_edit_journal
+from ..com_backend.paragraph_index import (invalidate_paragraph_index,
+                                           record_range_edit,
+                                           record_range_insertion)
 from ..com_backend.selector_utils import get_selection_range
 from ..mcp_service.core_utils import (
     ErrorCode,
@@ -304,9 +308,11 @@ def insert_image(
                 # 无论当前范围位置如何，都确保图片有独立的段落
                 # 1. 保存当前范围位置
                 current_start = range_obj.Start
+                current_end = range_obj.End
                 
                 # 2. 在当前范围位置后插入两个段落标记，创建一个空段落
                 range_obj.InsertAfter("\n\n")
+                record_range_edit(range_obj, current_end, current_end, "\n\n")
                 
                 # 3. 更新范围到新创建的空段落
                 range_obj.Start = current_start + 1
@@ -317,7 +323,9 @@ def insert_image(
             except Exception as e:
                 log_error(f"Failed to prepare independent paragraph: {str(e)}")
 
-        # 插入图片
+        # 插入图片，图片替换range_obj（未折叠时）或插入在其位置
+        picture_start, picture_end = range_obj.Start, range_obj.End
+        content_end = document.Content.End
         # 如果直接使用Range参数失败，尝试先选择范围再插入
         try:
             picture = document.InlineShapes.AddPicture(
@@ -344,6 +352,7 @@ def insert_image(
                     ErrorCode.SERVER_ERROR,
                     f"Failed to insert image: {str(second_exception)}",
                 )
+        record_range_insertion(range_obj, picture_start, picture_end, content_end)
 
         # 添加成功日志
         # 更新DocumentContext
@@ -441,7 +450,9 @@ def add_caption(
                         # 如果范围不在段落末尾，创建新段落
                         if range_obj.Start != current_paragraph.Range.End - 1:
                             # 在当前范围前插入段落标记创建新段落
+                            insert_position = range_obj.Start
                             range_obj.InsertBefore("\n")
+                            record_range_edit(range_obj, insert_position, insert_position, "\n")
                             # 更新范围到新段落
                             range_obj.Start = range_obj.Start
                             range_obj.End = range_obj.Start
@@ -474,6 +485,9 @@ def add_caption(
                                 Position=wd_caption_position,
                                 ExcludeLabel=exclude_label
                             )
+                            # 题注段落的位置由Word决定，无法记录为一次替换
+                            invalidate_paragraph_index(document)
+                            invalidate_edit_journal(document)
                             # 验证题注是否成功添加
                             if document.Paragraphs.Count > 0:
                                 return json.dumps({
@@ -495,16 +509,18 @@ def add_caption(
                         Position=wd_caption_position,
                         ExcludeLabel=exclude_label
                     )
+                    invalidate_paragraph_index(document)
+                    invalidate_edit_journal(document)
             except Exception as e:
                 log_error(f"InsertCaption method failed: {str(e)}")
                 # 备用方法：使用直接文本插入
                 if hasattr(document.Application, "Selection"):
                     range_obj = document.Application.Selection.Range
                 range_obj.Collapse(False)  # wdCollapseEnd
-                if not exclude_label:
-                    range_obj.InsertAfter(f"{label}: {caption_text}")
-                else:
-                    range_obj.InsertAfter(caption_text)
+                text = caption_text if exclude_label else f"{label}: {caption_text}"
+                insert_position = range_obj.End
+                range_obj.InsertAfter(text)
+                record_range_edit(range_obj, insert_position, insert_position, text)
         except Exception as e:
             log_error(f"Failed to insert caption: {str(e)}")
             raise WordDocumentError(
@@ -862,11 +878,14 @@ def add_image_caption(
                 )
             range_obj.Collapse(False)  # wdCollapseEnd
 
-        # 添加题注
+        # 添加题注（自动图文集中含有域，插入长度取自Content.End的变化）
         try:
+            caption_start, caption_end = range_obj.Start, range_obj.End
+            content_end = document.Content.End
             document.Application.ActiveDocument.AttachedTemplate.AutoTextEntries(
                 "Caption Figure"
             ).Insert(Where=range_obj)
+            record_range_insertion(range_obj, caption_start, caption_end, content_end)
         except Exception as e:
             log_error(f"Failed to insert caption: {str(e)}")
             raise WordDocumentError(
@@ -876,7 +895,9 @@ def add_image_caption(
         # 设置题注文本
         caption_range = document.Application.Selection.Range
         caption_range.Collapse(False)  # wdCollapseEnd
+        insert_position = caption_range.Start
         caption_range.Text = f" {caption_text}"
+        record_range_edit(caption_range, insert_position, insert_position, f" {caption_text}")
     except Exception as e:
         raise WordDocumentError(
             ErrorCode.SERVER_ERROR, f"Failed to add caption: {str(e)}"
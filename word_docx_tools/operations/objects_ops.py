@@ -9,11 +9,13 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error, safe_com_call
+from ..com_backend.paragraph_index import record_range_insertion
 from ..mcp_service.core_utils import (
     ErrorCode, WordDocumentError, log_error,
     log_info, AppContext
 )
 from ..models.context import DocumentContext
+from ..models.range_snapshot import RangeSnapshot
 
 if TYPE_CHECKING:
     from win32com.client import CDispatch
@@ -188,14 +190,13 @@ def get_bookmark(
 
         bookmark = document.Bookmarks(bookmark_name)
 
+        snapshot = RangeSnapshot.capture(
+            bookmark.Range, preview_length=100, include_style=False
+        )
         range_info = {
-            "start": bookmark.Range.Start,
-            "end": bookmark.Range.End,
-            "text": (
-                bookmark.Range.Text[:100] + "..."
-                if len(bookmark.Range.Text) > 100
-                else bookmark.Range.Text
-            ),
+            "start": snapshot.start,
+            "end": snapshot.end,
+            "text": snapshot.text_preview(100),
         }
 
         log_info(f"Successfully retrieved bookmark '{bookmark_name}'")
@@ -306,7 +307,11 @@ def create_citation(
 
     try:
         source = document.Bibliography.Sources.Add(source_data)
+        # 引用是一个域，插入长度取自Content.End的变化
+        citation_start, citation_end = range_obj.Start, range_obj.End
+        content_end = document.Content.End
         citation = document.Bibliography.Citations.Add(source, range_obj)
+        record_range_insertion(range_obj, citation_start, citation_end, content_end)
 
         log_info("Successfully created citation")
         
@@ -371,7 +376,9 @@ def create_hyperlink(
         if not address.startswith(("http://", "https://", "file://", "mailto:")):
             address = f"http://{address}"
 
-        # 创建超链接
+        # 创建超链接（替换选区的HYPERLINK域，插入长度取自Content.End的变化）
+        link_start, link_end = range_obj.Start, range_obj.End
+        content_end = document.Content.End
         hyperlink = document.Hyperlinks.Add(
             Anchor=range_obj,
             Address=address,
@@ -379,6 +386,7 @@ def create_hyperlink(
             ScreenTip=screen_tip or "",
             TextToDisplay=text_to_display or address,
         )
+        record_range_insertion(range_obj, link_start, link_end, content_end)
 
         log_info(f"Successfully created hyperlink to {address}")
 
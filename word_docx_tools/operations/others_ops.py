@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error
+from ..com_backend.page_map import read_page_map
 from ..mcp_service.core_utils import (ErrorCode, WordDocumentError, log_error,
                                       log_info)
 
@@ -332,7 +333,7 @@ def get_document_statistics(document: win32com.client.CDispatch) -> Dict[str, An
             if hasattr(document, "Characters") and document.Characters is not None
             else 0
         ),
-        "pages": document.Range().Information(4),  # wdNumberOfPagesInDocument
+        "pages": read_page_map(document).page_count,
         "bookmarks": document.Bookmarks.Count if hasattr(document, "Bookmarks") else 0,
     }
 
@@ -9,7 +9,13 @@ from typing import Any, Dict, List, Optional
 
 import win32com.client
 
-from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.com_utils import (count_com_calls, handle_com_error,
+                                     iter_com_collection, record_com_call)
+from ..com_backend.document_snapshot import read_paragraph_snapshot
+from ..com_backend.page_map import read_page_map
+from ..com_backend.paragraph_index import (get_paragraph_index,
+                                           record_range_replaced)
+from ..com_backend.render_suspension import suspend_rendering
 from ..mcp_service.core_utils import (ErrorCode, WordDocumentError, log_error,
                                       log_info, AppContext)
 from ..models.context import DocumentContext 
@@ -22,7 +28,8 @@ logger = logging.getLogger(__name__)
 @handle_com_error(ErrorCode.PARAGRAPH_SELECTION_FAILED, "get paragraphs")
 def get_paragraphs(
     document: win32com.client.CDispatch,
-    locator: Optional[Dict[str, Any]] = None
+    locator: Optional[Dict[str, Any]] = None,
+    snapshot: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Retrieves paragraphs from the document.
@@ -30,9 +37,15 @@ def get_paragraphs(
     If a locator is provided, retrieves paragraphs within the specified range.
     If no locator is provided, retrieves all paragraphs from the document.
 
+    When listing all paragraphs in snapshot mode, the document text is read
+    once and split locally (see com_backend.document_snapshot for the COM
+    cost). If the snapshot does not line up with Word's paragraph collection
+    the per-paragraph path is used instead.
+
     Args:
         document: The Word document COM object.
         locator: Optional. A locator dictionary defining the range to retrieve paragraphs from.
+        snapshot: Whether to read all paragraphs from a single text snapshot.
 
     Returns:
         A list of dictionaries with paragraph summary details.
@@ -51,26 +64,12 @@ def get_paragraphs(
             if locator['type'] == 'paragraph':
                 # 获取指定段落
                 if 'index' in locator:
-                    index = locator['index']
-                    if index < 0:
-                        # 负索引表示从末尾开始计数
-                        paragraph_count = document.Paragraphs.Count
-                        if paragraph_count + index >= 0:
-                            index = paragraph_count + index + 1
-                        else:
-                            raise WordDocumentError(
-                                ErrorCode.OBJECT_NOT_FOUND,
-                                f"Paragraph index out of range: {index}"
-                            )
-                    if 1 <= index <= document.Paragraphs.Count:
-                        paragraph = document.Paragraphs(index)
-                        _add_paragraph_info(paragraphs, paragraph, 0)
-                        return paragraphs
-                    else:
-                        raise WordDocumentError(
-                            ErrorCode.OBJECT_NOT_FOUND,
-                            f"Paragraph index out of range: {index}"
-                        )
+                    # 负索引表示从末尾开始计数
+                    range_obj = _get_paragraph_range(document, locator['index'])
+                    paragraph = range_obj.Paragraphs(1)
+                    record_com_call("Range.Paragraphs", 2)
+                    _add_paragraph_info(paragraphs, paragraph, 0)
+                    return paragraphs
             else:
                 # 处理其他类型的locator
                 raise WordDocumentError(
@@ -83,19 +82,51 @@ def get_paragraphs(
                 "Locator must specify an object type"
             )
     else:
+        if snapshot:
+            paragraph_snapshot = read_paragraph_snapshot(document)
+            if paragraph_snapshot is not None:
+                for i, (start, end, text) in enumerate(paragraph_snapshot.spans):
+                    paragraphs.append(_build_paragraph_info(
+                        i, paragraph_snapshot.styles[i], text, start, end
+                    ))
+                return paragraphs
+            log_info("Paragraph snapshot does not match the document, reading paragraphs one by one")
+
         # Process all paragraphs in the document
-        paragraphs_count = document.Paragraphs.Count
-        for i in range(1, paragraphs_count + 1):
+        for i, paragraph in enumerate(iter_com_collection(document.Paragraphs)):
             try:
-                paragraph = document.Paragraphs(i)
-                _add_paragraph_info(paragraphs, paragraph, i - 1)  # 0-based index
+                _add_paragraph_info(paragraphs, paragraph, i)  # 0-based index
             except Exception as e:
-                log_error(f"Failed to retrieve paragraph at index {i}: {e}", exc_info=True)
+                log_error(f"Failed to retrieve paragraph at index {i + 1}: {e}", exc_info=True)
                 continue
 
     return paragraphs
 
 
+def _get_paragraph_range(document: Any, index: int) -> Any:
+    """
+    Resolves a paragraph locator index to the paragraph's Range.
+
+    Uses the per-document paragraph offset index instead of
+    ``document.Paragraphs(index)``, which walks the collection from the start.
+
+    Args:
+        document: The Word document COM object.
+        index: 1-based paragraph index; negative values count from the end.
+
+    Returns:
+        The Range object of the paragraph.
+    """
+    paragraph_index = get_paragraph_index(document)
+    try:
+        return paragraph_index.to_range(document, index)
+    except IndexError:
+        raise WordDocumentError(
+            ErrorCode.OBJECT_NOT_FOUND,
+            f"Paragraph index out of range: {index}"
+        )
+
+
 def _update_document_context_for_paragraph(paragraph: Any, operation: str = "modify") -> None:
     """
     更新段落对应的DocumentContext
@@ -118,13 +149,11 @@ def _update_document_context_for_paragraph(paragraph: Any, operation: str = "mod
         )
         
         if context:
-            # 更新上下文信息
+            # 更新上下文信息（update_paragraph_context会通知上下文更新处理器）
             if operation == "delete":
-                app_context.remove_context_from_tree(context)
+                app_context.remove_context_from_tree(context.context_id)
             else:
-                app_context.update_paragraph_context(context, paragraph)
-                # 通知上下文更新处理器
-                app_context.notify_context_update(context, operation)
+                app_context.update_paragraph_context(paragraph.Range)
     except Exception as e:
         log_error(f"Failed to update DocumentContext for paragraph operation {operation}: {str(e)}")
 
@@ -142,15 +171,51 @@ def _add_paragraph_info(
         paragraph: The paragraph COM object.
         index: The index to assign to the paragraph.
     """
+    paragraph_range = paragraph.Range
+    record_com_call("Paragraph.Range")
+    record_com_call("Range.Text")
+    record_com_call("Range.Start")
+    record_com_call("Range.End")
+    record_com_call("Paragraph.Style")
+    record_com_call("Style.NameLocal")
+    paragraphs.append(_build_paragraph_info(
+        index,
+        paragraph.Style.NameLocal,
+        paragraph_range.Text,
+        paragraph_range.Start,
+        paragraph_range.End
+    ))
+
+
+def _build_paragraph_info(
+    index: int,
+    style_name: Optional[str],
+    text: str,
+    range_start: int,
+    range_end: int
+) -> Dict[str, Any]:
+    """
+    Builds the paragraph summary dictionary from already fetched values.
+
+    Args:
+        index: The index to assign to the paragraph.
+        style_name: The local name of the paragraph style.
+        text: The paragraph text including its paragraph mark.
+        range_start: Start position of the paragraph range.
+        range_end: End position of the paragraph range.
+
+    Returns:
+        The paragraph summary dictionary.
+    """
     # 获取段落文本并去除首尾空白
-    paragraph_text = paragraph.Range.Text.strip()
+    paragraph_text = text.strip()
     
     # 构建段落概略信息
     paragraph_info = {
         "index": index,
-        "style_name": paragraph.Style.NameLocal,
-        "range_start": paragraph.Range.Start,
-        "range_end": paragraph.Range.End,
+        "style_name": style_name,
+        "range_start": range_start,
+        "range_end": range_end,
         "has_text": len(paragraph_text) > 0
     }
     
@@ -167,7 +232,7 @@ def _add_paragraph_info(
         paragraph_info["empty_type"] = "paragraph_break"
         paragraph_info["description"] = "Empty paragraph containing only paragraph break"
         
-    paragraphs.append(paragraph_info)
+    return paragraph_info
 
 
 @handle_com_error(ErrorCode.PARAGRAPH_SELECTION_FAILED, "get paragraphs in range")
@@ -220,7 +285,16 @@ def get_paragraphs_info(document: win32com.client.CDispatch) -> Dict[str, Any]:
     # Get statistics
     stats = {"total_paragraphs": document.Paragraphs.Count, "styles_used": {}}
 
-    # Count style usage
+    # Count style usage from a snapshot when it matches the document
+    paragraph_snapshot = read_paragraph_snapshot(document)
+    if paragraph_snapshot is not None:
+        for style_name in paragraph_snapshot.styles:
+            stats["styles_used"][style_name] = stats["styles_used"].get(style_name, 0) + 1
+        stats["styles_used"] = dict(
+            sorted(stats["styles_used"].items(), key=lambda item: item[1], reverse=True)
+        )
+        return stats
+
     for i, paragraph in enumerate(iter_com_collection(document.Paragraphs)):
         try:
             style_name = paragraph.Style.NameLocal
@@ -246,7 +320,8 @@ def get_paragraphs_info(document: win32com.client.CDispatch) -> Dict[str, Any]:
 def get_paragraphs_details(
     document: win32com.client.CDispatch,
     locator: Optional[Dict[str, Any]] = None,
-    include_stats: bool = False
+    include_stats: bool = False,
+    include_page_numbers: bool = False
 ) -> Dict[str, Any]:
     """
     合并版段落信息获取函数，可同时获取段落列表和统计信息。
@@ -255,9 +330,12 @@ def get_paragraphs_details(
         document: The Word document COM object.
         locator: Optional. A locator dictionary defining the range to retrieve paragraphs from.
         include_stats: Whether to include paragraph statistics in the result.
+        include_page_numbers: Whether to add the page each paragraph starts on,
+            looked up in the document's page map.
 
     Returns:
-        A dictionary containing paragraphs list and optionally statistics.
+        A dictionary containing paragraphs list, the COM calls spent and
+        optionally statistics.
     """
     if not document:
         raise WordDocumentError(ErrorCode.DOCUMENT_ERROR, "No active document found")
@@ -265,8 +343,14 @@ def get_paragraphs_details(
     result = {}
     
     # 获取段落列表
-    paragraphs = get_paragraphs(document, locator)
+    with count_com_calls("get_paragraphs_details") as com_counter:
+        paragraphs = get_paragraphs(document, locator)
+        if include_page_numbers:
+            page_map = read_page_map(document)
+            for paragraph in paragraphs:
+                paragraph["page_number"] = page_map.page_at(paragraph["range_start"])
     result["paragraphs"] = paragraphs
+    result["com_calls"] = com_counter.to_dict()
     
     # 如果需要统计信息
     if include_stats:
@@ -333,24 +417,8 @@ def insert_paragraph_impl(
         if locator['type'] == 'paragraph':
             # 获取指定段落
             if 'index' in locator:
-                index = locator['index']
-                if index < 0:
-                    # 负索引表示从末尾开始计数
-                    paragraph_count = document.Paragraphs.Count
-                    if paragraph_count + index >= 0:
-                        index = paragraph_count + index + 1
-                    else:
-                        raise WordDocumentError(
-                            ErrorCode.OBJECT_NOT_FOUND,
-                            f"Paragraph index out of range: {index}"
-                        )
-                if 1 <= index <= document.Paragraphs.Count:
-                    range_obj = document.Paragraphs(index).Range
-                else:
-                    raise WordDocumentError(
-                        ErrorCode.OBJECT_NOT_FOUND,
-                        f"Paragraph index out of range: {index}"
-                    )
+                # 负索引表示从末尾开始计数
+                range_obj = _get_paragraph_range(document, locator['index'])
         elif locator['type'] == 'document_start':
             # 获取文档开头
             range_obj = document.Content
@@ -376,39 +444,45 @@ def insert_paragraph_impl(
             "Failed to locate range for paragraph insertion"
         )
 
-    # If needed as independent paragraph
-    if is_independent_paragraph:
-        try:
-            # Check if current range is already at the end of a paragraph
-            if (
-                hasattr(range_obj, "Paragraphs")
-                and range_obj.Paragraphs.Count > 0
-            ):
-                current_paragraph = range_obj.Paragraphs(1)
-                # Create new paragraph if range is not at the end of a paragraph
-                if range_obj.Start != current_paragraph.Range.End - 1:
-                    # Insert paragraph mark before current range to create new paragraph
-                    range_obj.InsertBefore("\n")
-                    # Update range to the new paragraph
-                    range_obj.Start = range_obj.Start
-                    range_obj.End = range_obj.Start
-        except Exception as e:
-            log_error(f"Failed to prepare independent paragraph: {str(e)}")
+    # 插入和套用样式期间暂停屏幕刷新和后台排版
+    with suspend_rendering(document, "insert_paragraph"):
+        # If needed as independent paragraph
+        if is_independent_paragraph:
+            try:
+                # Check if current range is already at the end of a paragraph
+                if (
+                    hasattr(range_obj, "Paragraphs")
+                    and range_obj.Paragraphs.Count > 0
+                ):
+                    current_paragraph = range_obj.Paragraphs(1)
+                    # Create new paragraph if range is not at the end of a paragraph
+                    if range_obj.Start != current_paragraph.Range.End - 1:
+                        # Insert paragraph mark before current range to create new paragraph
+                        insert_position = range_obj.Start
+                        range_obj.InsertBefore("\n")
+                        record_range_replaced(
+                            document, insert_position, insert_position, "\n"
+                        )
+                        # Update range to the new paragraph
+                        range_obj.Start = range_obj.Start
+                        range_obj.End = range_obj.Start
+            except Exception as e:
+                log_error(f"Failed to prepare independent paragraph: {str(e)}")
 
-    # Insert paragraph
-    result = insert_text_after_range(com_range=range_obj, text=f"\n{text}")
+        # Insert paragraph
+        result = insert_text_after_range(com_range=range_obj, text=f"\n{text}")
 
-    if style:
-        # Apply paragraph style to the newly inserted paragraph
-        try:
-            # 获取最后一个段落（新插入的段落）
-            last_paragraph_index = document.Paragraphs.Count
-            if last_paragraph_index > 0:
-                new_paragraph = document.Paragraphs(last_paragraph_index)
-                set_paragraph_style(new_paragraph.Range, style)
-        except Exception as e:
-            log_error(f"Failed to apply paragraph style: {str(e)}")
-            # 继续执行，因为这不是致命错误
+        if style:
+            # Apply paragraph style to the newly inserted paragraph
+            try:
+                # 获取最后一个段落（新插入的段落）
+                last_paragraph_index = document.Paragraphs.Count
+                if last_paragraph_index > 0:
+                    new_paragraph = document.Paragraphs(last_paragraph_index)
+                    set_paragraph_style(new_paragraph.Range, style)
+            except Exception as e:
+                log_error(f"Failed to apply paragraph style: {str(e)}")
+                # 继续执行，因为这不是致命错误
 
     # 获取新插入的段落并更新DocumentContext
     try:
@@ -457,24 +531,8 @@ def delete_paragraph_impl(
         if locator['type'] == 'paragraph':
             # 获取指定段落
             if 'index' in locator:
-                index = locator['index']
-                if index < 0:
-                    # 负索引表示从末尾开始计数
-                    paragraph_count = document.Paragraphs.Count
-                    if paragraph_count + index >= 0:
-                        index = paragraph_count + index + 1
-                    else:
-                        raise WordDocumentError(
-                            ErrorCode.OBJECT_NOT_FOUND,
-                            f"Paragraph index out of range: {index}"
-                        )
-                if 1 <= index <= document.Paragraphs.Count:
-                    range_obj = document.Paragraphs(index).Range
-                else:
-                    raise WordDocumentError(
-                        ErrorCode.OBJECT_NOT_FOUND,
-                        f"Paragraph index out of range: {index}"
-                    )
+                # 负索引表示从末尾开始计数
+                range_obj = _get_paragraph_range(document, locator['index'])
         else:
             raise WordDocumentError(
                 ErrorCode.OBJECT_TYPE_ERROR,
@@ -501,7 +559,9 @@ def delete_paragraph_impl(
 
     # Delete the paragraph
     try:
+        delete_start, delete_end = range_obj.Start, range_obj.End
         range_obj.Delete()
+        record_range_replaced(document, delete_start, delete_end, "")
         log_info("Paragraph deleted successfully")
         
         # 通知段落删除，更新DocumentContext
@@ -566,24 +626,8 @@ def format_paragraph_impl(
         if locator['type'] == 'paragraph':
             # 获取指定段落
             if 'index' in locator:
-                index = locator['index']
-                if index < 0:
-                    # 负索引表示从末尾开始计数
-                    paragraph_count = document.Paragraphs.Count
-                    if paragraph_count + index >= 0:
-                        index = paragraph_count + index + 1
-                    else:
-                        raise WordDocumentError(
-                            ErrorCode.OBJECT_NOT_FOUND,
-                            f"Paragraph index out of range: {index}"
-                        )
-                if 1 <= index <= document.Paragraphs.Count:
-                    range_obj = document.Paragraphs(index).Range
-                else:
-                    raise WordDocumentError(
-                        ErrorCode.OBJECT_NOT_FOUND,
-                        f"Paragraph index out of range: {index}"
-                    )
+                # 负索引表示从末尾开始计数
+                range_obj = _get_paragraph_range(document, locator['index'])
         else:
             raise WordDocumentError(
                 ErrorCode.OBJECT_TYPE_ERROR,
@@ -10,7 +10,10 @@ from typing import Any, Dict, List, Optional
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.paragraph_index import get_paragraph_index, record_range_edit
+from ..com_backend.render_suspension import suspend_rendering
 from ..com_backend.selector_utils import get_selection_range
+from ..models.range_snapshot import RangeSnapshot
 from ..mcp_service.core_utils import (
     ErrorCode, WordDocumentError, log_error,
     log_info
@@ -49,26 +52,22 @@ def select_objects(document: win32com.client.CDispatch, locator: Dict[str, Any])
                 "type": "Range",
             }
 
+            # 一次读取Range的位置、文本和样式
+            snapshot = RangeSnapshot.capture(range_obj, preview_length=200)
+
             # 添加文本内容（如果可用）
-            try:
-                info["text"] = (
-                    range_obj.Text[:200] + "..."
-                    if len(range_obj.Text) > 200
-                    else range_obj.Text
-                )
-            except Exception as text_e:
-                logger.warning(f"Failed to get text for object: {text_e}")
+            if snapshot.preview is not None:
+                info["text"] = snapshot.text_preview(200)
+            else:
+                logger.warning("Failed to get text for object")
 
             # 添加样式信息（如果可用）
-            if hasattr(range_obj, "Style") and hasattr(
-                range_obj.Style, "NameLocal"
-            ):
-                info["style"] = range_obj.Style.NameLocal
+            if snapshot.style_name is not None:
+                info["style"] = snapshot.style_name
 
-            # 添加位置信息（如果可用）
-            if hasattr(range_obj, "Start") and hasattr(range_obj, "End"):
-                info["start_position"] = range_obj.Start
-                info["end_position"] = range_obj.End
+            # 添加位置信息
+            info["start_position"] = snapshot.start
+            info["end_position"] = snapshot.end
 
             objects_info.append(info)
         except Exception as e:
@@ -108,7 +107,8 @@ def get_object_by_id(document: win32com.client.CDispatch, object_id: str) -> str
             )
 
         # 获取段落总数
-        paragraph_count = document.Paragraphs.Count
+        paragraph_index = get_paragraph_index(document)
+        paragraph_count = len(paragraph_index)
 
         if index < 0 or index >= paragraph_count:
             raise WordDocumentError(
@@ -117,22 +117,15 @@ def get_object_by_id(document: win32com.client.CDispatch, object_id: str) -> str
             )
 
         # 获取指定索引的段落并转换为Range对象
-        range_obj = document.Paragraphs(index + 1).Range
+        range_obj = paragraph_index.to_range(document, index + 1)
 
         # 构建元素信息
+        snapshot = RangeSnapshot.capture(range_obj, preview_length=200)
         object_info = {
             "index": index,
             "type": "Range",
-            "text": (
-                range_obj.Text[:200] + "..."
-                if len(range_obj.Text) > 200
-                else range_obj.Text
-            ),
-            "style": (
-                range_obj.Style.NameLocal
-                if hasattr(range_obj.Style, "NameLocal")
-                else "Unknown"
-            ),
+            "text": snapshot.text_preview(200),
+            "style": snapshot.style_name or "Unknown",
         }
 
         return json.dumps(object_info, ensure_ascii=False, indent=2)
@@ -180,23 +173,17 @@ def batch_select_objects(
                         "type": "Range",
                     }
 
+                    snapshot = RangeSnapshot.capture(range_obj, preview_length=100)
+
                     # 添加文本内容（如果可用）
-                    try:
-                        info["text"] = (
-                            range_obj.Text[:100] + "..."
-                            if len(range_obj.Text) > 100
-                            else range_obj.Text
-                        )
-                    except Exception as text_e:
-                        logger.warning(
-                            f"Failed to get text for object: {text_e}"
-                        )
+                    if snapshot.preview is not None:
+                        info["text"] = snapshot.text_preview(100)
+                    else:
+                        logger.warning("Failed to get text for object")
 
                     # 添加其他属性（如果可用）
-                    if hasattr(range_obj, "Style") and hasattr(
-                        range_obj.Style, "NameLocal"
-                    ):
-                        info["style"] = range_obj.Style.NameLocal
+                    if snapshot.style_name is not None:
+                        info["style"] = snapshot.style_name
 
                     objects_info.append(info)
                 except Exception as e:
@@ -237,60 +224,66 @@ def batch_apply_formatting(
 
         results = []
 
-        # 执行每个格式化操作
-        for i, operation in enumerate(operations):
-            try:
-                if "locator" not in operation or "formatting" not in operation:
-                    raise ValueError(
-                        f"Operation {i} must contain 'locator' and 'formatting' keys"
-                    )
+        # 批量修改期间暂停屏幕刷新和后台排版，避免每次修改都重新布局
+        with suspend_rendering(document, "batch_apply_formatting") as suspension:
+            # 执行每个格式化操作
+            for i, operation in enumerate(operations):
+                try:
+                    if "locator" not in operation or "formatting" not in operation:
+                        raise ValueError(
+                            f"Operation {i} must contain 'locator' and 'formatting' keys"
+                        )
 
-                locator = operation["locator"]
-                formatting = operation["formatting"]
+                    locator = operation["locator"]
+                    formatting = operation["formatting"]
 
-                # 获取选择范围
-                range_obj = get_selection_range(document, locator, "move selection")
+                    # 获取选择范围
+                    range_obj = get_selection_range(document, locator, "move selection")
                 
-                # 初始化成功标志
-                all_success = True
+                    # 初始化成功标志
+                    all_success = True
                 
-                # 应用格式
-                try:
-                    result = apply_formatting_to_object(range_obj, formatting)
-                    # 解析结果以检查是否成功
+                    # 应用格式
                     try:
-                        result_dict = json.loads(result)
-                        if not result_dict.get("success", False):
-                            all_success = False
-                            logger.warning(
-                                f"Formatting failed for range object: {result_dict.get('message', 'Unknown error')}"
-                            )
-                    except json.JSONDecodeError:
-                        # 如果结果不是有效的JSON，尝试检查字符串内容
-                        if (
-                            "error" in result.lower()
-                            or "failed" in result.lower()
-                        ):
-                            all_success = False
-                            logger.warning(
-                                f"Formatting may have failed (invalid JSON response): {result}"
-                            )
-                except Exception as inner_e:
-                    all_success = False
-                    logger.warning(
-                        f"Error applying formatting to range object: {inner_e}"
-                    )
+                        result = apply_formatting_to_object(range_obj, formatting)
+                        # 解析结果以检查是否成功
+                        try:
+                            result_dict = json.loads(result)
+                            if not result_dict.get("success", False):
+                                all_success = False
+                                logger.warning(
+                                    f"Formatting failed for range object: {result_dict.get('message', 'Unknown error')}"
+                                )
+                        except json.JSONDecodeError:
+                            # 如果结果不是有效的JSON，尝试检查字符串内容
+                            if (
+                                "error" in result.lower()
+                                or "failed" in result.lower()
+                            ):
+                                all_success = False
+                                logger.warning(
+                                    f"Formatting may have failed (invalid JSON response): {result}"
+                                )
+                    except Exception as inner_e:
+                        all_success = False
+                        logger.warning(
+                            f"Error applying formatting to range object: {inner_e}"
+                        )
 
-                if not all_success:
-                    raise Exception("Some formatting operations failed")
+                    if not all_success:
+                        raise Exception("Some formatting operations failed")
 
-                results.append({"operation_index": i, "status": "success"})
+                    results.append({"operation_index": i, "status": "success"})
 
-            except Exception as e:
-                logger.warning(f"Failed to apply formatting in operation {i}: {e}")
-                results.append(
-                    {"operation_index": i, "status": "failed", "error": str(e)}
-                )
+                except Exception as e:
+                    logger.warning(f"Failed to apply formatting in operation {i}: {e}")
+                    results.append(
+                        {"operation_index": i, "status": "failed", "error": str(e)}
+                    )
+
+        logger.info(
+            f"Applied {len(operations)} formatting operations with rendering suspended for {suspension.elapsed:.3f}s"
+        )
 
         return json.dumps(results, ensure_ascii=False, indent=2)
 
@@ -322,7 +315,9 @@ def delete_object_by_locator(
         range_obj = get_selection_range(document, locator, "select and navigate")
 
         # 删除元素
+        delete_start, delete_end = range_obj.Start, range_obj.End
         range_obj.Delete()
+        record_range_edit(range_obj, delete_start, delete_end, "")
 
         return True
 
@@ -10,7 +10,9 @@ from typing import Any, Dict, List, Optional, Union
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.document_revision import bump_document_revision
 from ..com_backend.selector_utils import get_selection_range
+from ..com_backend.style_catalog import STYLE_TYPES, get_style_catalog
 from ..mcp_service.core_utils import (
     ErrorCode, 
     WordDocumentError, 
@@ -32,6 +34,12 @@ def _update_document_context_for_style(range_obj, operation_type):
         range_obj: 应用样式的范围对象
         operation_type: 操作类型（"create", "modify", "delete"）
     """
+    # 段落样式变化会改变大纲级别，按文档版本缓存的大纲和页码映射需要重建
+    try:
+        bump_document_revision(range_obj.Document)
+    except Exception as e:
+        log_error(f"Failed to record document revision: {e}")
+
     try:
         # 获取AppContext实例
         app_context = AppContext.get_instance()
@@ -222,22 +230,18 @@ def apply_formatting(
                 try:
                     range_obj.Paragraphs(1).Style = formatting["paragraph_style"]
                 except Exception:
-                    # 如果直接设置失败，尝试在文档样式中查找
-                    style_found = False
-                    for i in range(1, document.Styles.Count + 1):
-                        if (
-                            document.Styles(i).NameLocal.lower()
-                            == formatting["paragraph_style"].lower()
-                        ):
-                            range_obj.Paragraphs(1).Style = document.Styles(i)
-                            style_found = True
-                            break
-
-                    if not style_found:
+                    # 如果直接设置失败，在样式目录中忽略大小写查找
+                    style_entry = get_style_catalog(document).find(
+                        formatting["paragraph_style"], ignore_case=True
+                    )
+                    if style_entry is not None:
+                        range_obj.Paragraphs(1).Style = document.Styles(style_entry["name"])
+                    else:
                         raise WordDocumentError(
                             ErrorCode.FORMATTING_ERROR,
                             f"Style '{formatting['paragraph_style']}' not found in document",
                         )
+                bump_document_revision(document)
             formatted_count += 1
 
         # 添加成功日志
@@ -429,28 +433,14 @@ def set_paragraph_style(
     if not style_name:
         raise ValueError("Style name parameter must be provided")
 
-    # 检查样式是否存在（使用NameLocal属性并添加异常处理以提高兼容性）
-    style_exists = False
-    paragraph_styles = []
+    # 检查样式是否存在（在样式目录中按NameLocal查找，这在不同语言环境下更可靠）
+    catalog = get_style_catalog(document)
     target_style = None
-    for style in iter_com_collection(document.Styles):
-        try:
-            if style.Type == 1:  # wdStyleTypeParagraph = 1
-                # 优先使用NameLocal属性，这在不同语言环境下更可靠
-                style_name_local = style.NameLocal
-                paragraph_styles.append(style_name_local)
-                # 同时检查Name和NameLocal，以增加兼容性
-                if style_name_local == style_name or (
-                    hasattr(style, "Name") and style.Name == style_name
-                ):
-                    style_exists = True
-                    target_style = style
-                    break
-        except Exception as e:
-            log_error(f"Error accessing style property: {str(e)}")
-            continue
+    if catalog.find(style_name, STYLE_TYPES["paragraph"]) is not None:
+        target_style = document.Styles(style_name)
 
-    if not style_exists:
+    if target_style is None:
+        paragraph_styles = catalog.names(STYLE_TYPES["paragraph"])
         # 准备可用段落样式列表
         if len(paragraph_styles) <= 10:
             styles_list = ", ".join(paragraph_styles)
@@ -5,11 +5,18 @@ This module contains functions for table-related operations.
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import win32com.client
 
-from ..com_backend.com_utils import handle_com_error, iter_com_collection
+from ..com_backend.com_utils import (count_com_calls, handle_com_error,
+                                     iter_com_collection, record_com_call)
+from ..com_backend.edit_journal import invalidate_edit_journal
+from ..com_backend.paragraph_index import (invalidate_paragraph_index,
+                                           record_range_edit,
+                                           record_range_insertion)
+from ..com_backend.render_suspension import suspend_rendering
+from ..com_backend.table_snapshot import read_table_cells
 from ..com_backend.selector_utils import get_selection_range
 from ..mcp_service.core_utils import (ErrorCode, WordDocumentError, log_error,
                                       log_info, AppContext)
@@ -40,17 +47,60 @@ def _update_document_context_for_table(table: Any, operation: str = "modify") ->
         )
         
         if context:
-            # 更新上下文信息
+            # 更新上下文信息（update_table_context会通知上下文更新处理器）
             if operation == "delete":
-                app_context.remove_context_from_tree(context)
+                app_context.remove_context_from_tree(context.context_id)
             else:
-                app_context.update_table_context(context, table)
-                # 通知上下文更新处理器
-                app_context.notify_context_update(context, operation)
+                app_context.update_table_context(table)
     except Exception as e:
         log_error(f"Failed to update DocumentContext for table operation {operation}: {str(e)}")
 
 
+def _apply_cell_formatting(cell: Any, formatting: Dict[str, Any]) -> None:
+    """
+    对单元格应用格式化
+
+    Args:
+        cell: 单元格COM对象
+        formatting: 格式化参数字典，支持"font"和"paragraph"两部分
+    """
+    # 应用字体格式化
+    if "font" in formatting:
+        font_format = formatting["font"]
+        font = cell.Range.Font
+
+        if "name" in font_format:
+            font.Name = font_format["name"]
+        if "size" in font_format:
+            font.Size = font_format["size"]
+        if "bold" in font_format:
+            font.Bold = font_format["bold"]
+        if "italic" in font_format:
+            font.Italic = font_format["italic"]
+        if "color" in font_format:
+            color = font_format["color"]
+            if isinstance(color, str) and color.startswith("#"):
+                cell.Range.Font.Color = color
+            elif isinstance(color, dict) and "rgb" in color:
+                rgb = color["rgb"]
+                cell.Range.Font.Color = f"RGB({rgb[0]},{rgb[1]},{rgb[2]})"
+
+    # 应用段落格式化
+    if "paragraph" in formatting:
+        para_format = formatting["paragraph"]
+        paragraph = cell.Range.Paragraphs(1)
+
+        if "alignment" in para_format:
+            alignment_map = {
+                "left": 0,  # wdAlignParagraphLeft
+                "center": 1,  # wdAlignParagraphCenter
+                "right": 2,  # wdAlignParagraphRight
+                "justify": 3,  # wdAlignParagraphJustify
+            }
+            if para_format["alignment"] in alignment_map:
+                paragraph.Alignment = alignment_map[para_format["alignment"]]
+
+
 @handle_com_error(ErrorCode.TABLE_ERROR, "create table")
 def create_table(
     document: win32com.client.CDispatch,
@@ -117,8 +167,11 @@ def create_table(
             range_obj.Collapse(Direction=0)  # wdCollapseEnd
 
     try:
-        # 创建表格
+        # 创建表格；单元格结束标记不以文本形式报告，插入长度取自Content.End的变化
+        table_start, table_end = range_obj.Start, range_obj.End
+        content_end = document.Content.End
         table = document.Tables.Add(Range=range_obj, NumRows=rows, NumColumns=cols)
+        record_range_insertion(range_obj, table_start, table_end, content_end)
 
         # 应用表格样式
         try:
@@ -191,7 +244,9 @@ def add_object_caption(
             caption_range.Collapse(0)  # wdCollapseEnd
 
         # 插入标题文本
+        insert_position = caption_range.Start
         caption_range.InsertAfter(caption_text + "\n")
+        record_range_edit(caption_range, insert_position, insert_position, caption_text + "\n")
 
         # 应用样式
         try:
@@ -354,7 +409,11 @@ def set_cell_text(
     # 设置单元格文本
     try:
         cell = table.Cell(Row=row, Column=col)
-        cell.Range.Text = text
+        cell_range = cell.Range
+        # 赋值会保留单元格结束标记，被替换的只是标记之前的内容
+        cell_start, cell_end = cell_range.Start, cell_range.End - 1
+        cell_range.Text = text
+        record_range_edit(cell_range, cell_start, cell_end, text)
     except Exception as e:
         raise WordDocumentError(
             ErrorCode.TABLE_ERROR, f"Failed to set cell text: {str(e)}"
@@ -363,41 +422,7 @@ def set_cell_text(
     # 应用格式化（如果指定）
     if formatting:
         try:
-            # 应用字体格式化
-            if "font" in formatting:
-                font_format = formatting["font"]
-                font = cell.Range.Font
-
-                if "name" in font_format:
-                    font.Name = font_format["name"]
-                if "size" in font_format:
-                    font.Size = font_format["size"]
-                if "bold" in font_format:
-                    font.Bold = font_format["bold"]
-                if "italic" in font_format:
-                    font.Italic = font_format["italic"]
-                if "color" in font_format:
-                    color = font_format["color"]
-                    if isinstance(color, str) and color.startswith("#"):
-                        cell.Range.Font.Color = color
-                    elif isinstance(color, dict) and "rgb" in color:
-                        rgb = color["rgb"]
-                        cell.Range.Font.Color = f"RGB({rgb[0]},{rgb[1]},{rgb[2]})"
-
-            # 应用段落格式化
-            if "paragraph" in formatting:
-                para_format = formatting["paragraph"]
-                paragraph = cell.Range.Paragraphs(1)
-
-                if "alignment" in para_format:
-                    alignment_map = {
-                        "left": 0,  # wdAlignParagraphLeft
-                        "center": 1,  # wdAlignParagraphCenter
-                        "right": 2,  # wdAlignParagraphRight
-                        "justify": 3,  # wdAlignParagraphJustify
-                    }
-                    if para_format["alignment"] in alignment_map:
-                        paragraph.Alignment = alignment_map[para_format["alignment"]]
+            _apply_cell_formatting(cell, formatting)
         except Exception as e:
             log_error(f"Failed to apply formatting to cell: {str(e)}")
             # 格式化应用失败不影响文本设置的成功状态
@@ -420,15 +445,201 @@ def set_cell_text(
     )
 
 
+def _normalize_cell_updates(
+    cells: Union[List[List[Optional[str]]], Dict[Any, str]],
+    start_row: int = 1,
+    start_col: int = 1,
+) -> List[Tuple[int, int, str]]:
+    """
+    将批量单元格参数统一转换为(row, col, text)列表
+
+    Args:
+        cells: 二维数组（None表示跳过该单元格），或稀疏映射。映射的键可以是
+            (row, col)元组，也可以是"row,col"字符串（JSON只支持字符串键）
+        start_row: 二维数组第一行对应的表格行号（从1开始）
+        start_col: 二维数组第一列对应的表格列号（从1开始）
+
+    Returns:
+        按行、列排序的(row, col, text)列表
+    """
+    updates: List[Tuple[int, int, str]] = []
+    if isinstance(cells, dict):
+        for key, text in cells.items():
+            try:
+                if isinstance(key, str):
+                    row, col = (int(part) for part in key.split(","))
+                else:
+                    row, col = (int(part) for part in key)
+            except (TypeError, ValueError):
+                raise ValueError(
+                    f"Invalid cell key {key!r}, expected (row, col) or 'row,col'"
+                )
+            if text is not None:
+                updates.append((row, col, str(text)))
+    elif isinstance(cells, list):
+        for r_offset, row_values in enumerate(cells):
+            if row_values is None:
+                continue
+            if not isinstance(row_values, list):
+                raise ValueError("cells must be a 2-D array of strings")
+            for c_offset, text in enumerate(row_values):
+                if text is not None:
+                    updates.append(
+                        (start_row + r_offset, start_col + c_offset, str(text))
+                    )
+    else:
+        raise ValueError("cells must be a 2-D array or a {(row, col): text} map")
+
+    for row, col, _ in updates:
+        if row <= 0 or col <= 0:
+            raise ValueError(f"Cell ({row},{col}) must use positive row and column numbers")
+    updates.sort(key=lambda update: (update[0], update[1]))
+    return updates
+
+
+@handle_com_error(ErrorCode.TABLE_ERROR, "set cells")
+def set_cells(
+    document: win32com.client.CDispatch,
+    table_index: int,
+    cells: Union[List[List[Optional[str]]], Dict[Any, str]],
+    column_formatting: Optional[Dict[Any, Dict[str, Any]]] = None,
+    start_row: int = 1,
+    start_col: int = 1,
+) -> str:
+    """批量设置表格单元格文本
+
+    与逐个调用set_cell_text不同，表格和行列范围只校验一次，所有单元格写入
+    完成后只更新一次DocumentContext。
+
+    Args:
+        document: Word文档COM对象
+        table_index: 表格索引（从1开始）
+        cells: 二维数组或稀疏映射{(row, col): text}，参见_normalize_cell_updates
+        column_formatting: 可选的按列格式化参数，键为列号（从1开始），值的格式
+            与set_cell_text的formatting参数相同
+        start_row: 二维数组第一行对应的表格行号（从1开始）
+        start_col: 二维数组第一列对应的表格列号（从1开始）
+
+    Returns:
+        包含写入数量、失败单元格和COM调用统计的JSON字符串
+
+    Raises:
+        ValueError: 当参数无效时抛出
+        WordDocumentError: 当表格或单元格超出范围时抛出
+    """
+    if not document:
+        raise WordDocumentError(ErrorCode.DOCUMENT_ERROR, "No active document found")
+
+    if table_index <= 0:
+        raise ValueError("Table index must be a positive integer")
+    if start_row <= 0 or start_col <= 0:
+        raise ValueError("start_row and start_col must be positive integers")
+
+    updates = _normalize_cell_updates(cells, start_row, start_col)
+    formatting_by_column: Dict[int, Dict[str, Any]] = {}
+    for key, formatting in (column_formatting or {}).items():
+        try:
+            formatting_by_column[int(key)] = formatting
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid column_formatting key {key!r}, expected a column number")
+
+    with count_com_calls("set_cells") as counter:
+        # 只做一次校验
+        table_count = document.Tables.Count
+        record_com_call("Tables.Count", 2)
+        if table_index > table_count:
+            raise WordDocumentError(
+                ErrorCode.TABLE_ERROR,
+                f"Table index {table_index} out of range. There are {table_count} tables in the document",
+            )
+
+        table = document.Tables(table_index)
+        row_count = table.Rows.Count
+        column_count = table.Columns.Count
+        record_com_call("Tables.Item", 2)
+        record_com_call("Rows.Count", 2)
+        record_com_call("Columns.Count", 2)
+
+        if updates:
+            max_row = max(row for row, _, _ in updates)
+            max_col = max(col for _, col, _ in updates)
+            if max_row > row_count:
+                raise WordDocumentError(
+                    ErrorCode.TABLE_ERROR,
+                    f"Row {max_row} out of range. The table has {row_count} rows",
+                )
+            if max_col > column_count:
+                raise WordDocumentError(
+                    ErrorCode.TABLE_ERROR,
+                    f"Column {max_col} out of range. The table has {column_count} columns",
+                )
+
+        written = 0
+        failed: List[Dict[str, Any]] = []
+        with suspend_rendering(document, "set_cells"):
+            for row, col, text in updates:
+                try:
+                    cell = table.Cell(Row=row, Column=col)
+                    cell.Range.Text = text
+                    record_com_call("Table.Cell")
+                    record_com_call("Cell.Range")
+                    record_com_call("Range.Text")
+                    written += 1
+                except Exception as e:
+                    # 合并单元格等情况下个别单元格可能无法访问，不影响其他单元格
+                    failed.append({"cell": f"({row},{col})", "error": str(e)})
+                    continue
+
+                formatting = formatting_by_column.get(col)
+                if formatting:
+                    try:
+                        _apply_cell_formatting(cell, formatting)
+                    except Exception as e:
+                        log_error(f"Failed to apply formatting to cell ({row},{col}): {str(e)}")
+
+    # 单元格文本可能包含段落标记，直接让段落索引在下次使用时重建；
+    # 批量写入无法表示为一次替换，上下文树锚定的偏移量也标记为过期
+    invalidate_paragraph_index(document)
+    invalidate_edit_journal(document)
+
+    # 更新DocumentContext
+    try:
+        _update_document_context_for_table(table, "modify")
+    except Exception as e:
+        log_error(f"Failed to update context after setting cells: {str(e)}")
+
+    log_info(f"Successfully set {written} cells in table {table_index}")
+    return json.dumps(
+        {
+            "success": not failed,
+            "message": f"Successfully set {written} cells",
+            "table_index": table_index,
+            "cells_written": written,
+            "failed_cells": failed,
+            "com_calls": counter.to_dict(),
+        },
+        ensure_ascii=False,
+    )
+
+
 @handle_com_error(ErrorCode.TABLE_ERROR, "get table info")
 def get_table_info(
-    document: win32com.client.CDispatch, table_index: Optional[int] = None
+    document: win32com.client.CDispatch,
+    table_index: Optional[int] = None,
+    row_start: int = 1,
+    row_end: Optional[int] = None,
+    col_start: int = 1,
+    col_end: Optional[int] = None,
 ) -> str:
     """获取表格信息
 
     Args:
         document: Word文档COM对象
         table_index: 表格索引（从1开始），不提供则返回所有表格信息
+        row_start: 返回单元格的起始行（从1开始）
+        row_end: 返回单元格的结束行（包含），不提供则到最后一行
+        col_start: 返回单元格的起始列（从1开始）
+        col_end: 返回单元格的结束列（包含），不提供则到最后一列
 
     Returns:
         包含表格信息的JSON字符串
@@ -440,14 +651,21 @@ def get_table_info(
     if not document:
         raise WordDocumentError(ErrorCode.DOCUMENT_ERROR, "No active document found")
 
+    if row_start < 1 or col_start < 1:
+        raise ValueError("row_start and col_start must be positive integers")
+    windowed = (
+        row_start != 1 or col_start != 1 or row_end is not None or col_end is not None
+    )
+
     # 检查表格数量
     table_count = document.Tables.Count
     if table_count == 0:
         return json.dumps({"tables": [], "total_tables": 0}, ensure_ascii=False)
 
     # 定义一个内部函数来获取单个表格的信息
-    def get_single_table_info(table_idx: int) -> Dict[str, Any]:
-        table = document.Tables(table_idx)
+    def get_single_table_info(table_idx: int, table: Any = None) -> Dict[str, Any]:
+        if table is None:
+            table = document.Tables(table_idx)
 
         # 获取表格基本信息
         info = {
@@ -472,20 +690,21 @@ def get_table_info(
             # 获取标题失败不影响主要功能
             pass
 
-        # 获取表格内容（可选择性地获取，根据需要）
-        # 注意：对于大表格，获取所有单元格内容可能会影响性能
-        cells_data = []
-        for r_idx, row in enumerate(iter_com_collection(table.Rows), 1):
-            row_data = []
-            for c_idx, cell in enumerate(iter_com_collection(row.Cells), 1):
-                cell_text = cell.Range.Text
-                # 移除Word单元格末尾的特殊字符
-                if cell_text.endswith("\r\x07"):
-                    cell_text = cell_text[:-2]
-                row_data.append(cell_text)
-            cells_data.append(row_data)
-
-        info["cells"] = cells_data
+        # 获取表格内容：一次读取表格文本后在本地拆分单元格
+        info["cells"] = read_table_cells(
+            table,
+            row_start=row_start,
+            row_end=row_end,
+            col_start=col_start,
+            col_end=col_end,
+        )
+        if windowed:
+            info["cell_window"] = {
+                "row_start": row_start,
+                "row_end": row_end,
+                "col_start": col_start,
+                "col_end": col_end,
+            }
         return info
 
     try:
@@ -508,7 +727,7 @@ def get_table_info(
             all_tables_info = []
             for idx, table in enumerate(iter_com_collection(document.Tables), 1):
                 try:
-                    table_info = get_single_table_info(idx)
+                    table_info = get_single_table_info(idx, table)
                     all_tables_info.append(table_info)
                 except Exception as e:
                     # 单个表格获取失败不影响其他表格
@@ -600,6 +819,10 @@ def insert_row(
         raise WordDocumentError(
             ErrorCode.TABLE_ERROR, f"Failed to insert row(s): {str(e)}"
         )
+    finally:
+        # 新行的单元格是新段落；多次插入无法表示为一次替换
+        invalidate_paragraph_index(document)
+        invalidate_edit_journal(document)
 
     # 更新DocumentContext
     try:
@@ -709,6 +932,10 @@ def insert_column(
         raise WordDocumentError(
             ErrorCode.TABLE_ERROR, f"Failed to insert column(s): {str(e)}"
         )
+    finally:
+        # 新列在每一行都插入单元格，无法表示为一次替换
+        invalidate_paragraph_index(document)
+        invalidate_edit_journal(document)
 
     # 更新DocumentContext
     try:
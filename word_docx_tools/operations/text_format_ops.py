@@ -9,7 +9,10 @@ from typing import Any, Dict, List, Optional, Union
 import win32com.client
 
 from ..com_backend.com_utils import handle_com_error
+from ..com_backend.document_revision import bump_document_revision
+from ..com_backend.paragraph_index import record_range_edit
 from ..com_backend.selector_utils import get_selection_range
+from ..com_backend.style_catalog import get_style_catalog
 from ..mcp_service.core_utils import (
     ErrorCode, 
     ObjectNotFoundError,
@@ -35,6 +38,12 @@ def _update_document_context_for_style(range_obj: Any, operation_type: str) -> b
     Returns:
         操作是否成功
     """
+    # 样式和格式变化会影响大纲等按文档版本缓存的结果
+    try:
+        bump_document_revision(range_obj.Document)
+    except Exception as e:
+        log_error(f"Failed to record document revision: {e}")
+
     try:
         # 获取应用上下文
         app_context = AppContext.get_instance()
@@ -284,23 +293,20 @@ def set_paragraph_style(object: Any, style_name: str) -> bool:
                     
                 return True
             except Exception:
-                # 如果失败，尝试在文档中查找样式
+                # 如果失败，在文档样式目录中忽略大小写查找
                 if hasattr(object, "Document") and hasattr(object.Document, "Styles"):
-                    styles = object.Document.Styles
-                    for i in range(1, styles.Count + 1):
+                    document = object.Document
+                    style_entry = get_style_catalog(document).find(style_name, ignore_case=True)
+                    if style_entry is not None:
+                        object.Style = document.Styles(style_entry["name"])
+                        
+                        # 更新DocumentContext
                         try:
-                            if styles(i).NameLocal.lower() == style_name.lower():
-                                object.Style = styles(i)
-                                
-                                # 更新DocumentContext
-                                try:
-                                    _update_document_context_for_style(object, "modify")
-                                except Exception as ctx_err:
-                                    log_error(f"Failed to update DocumentContext after setting paragraph style: {ctx_err}")
-                                    
-                                return True
-                        except Exception:
-                            continue
+                            _update_document_context_for_style(object, "modify")
+                        except Exception as ctx_err:
+                            log_error(f"Failed to update DocumentContext after setting paragraph style: {ctx_err}")
+                            
+                        return True
         return False
     except Exception as e:
         log_error(f"Failed to set paragraph style: {e}")
@@ -342,10 +348,15 @@ def create_bulleted_list_relative_to(
             # 在锚点后插入
             insertion_range.Collapse(0)  # wdCollapseEnd = 0
 
+        # 列表文本连续插入在折叠后的位置，整体记录为一次插入
+        insert_position = insertion_range.Start
+        inserted_text = "\r".join(items)
+
         # 如果不是在文档开头插入，先添加一个段落标记
-        if position == "after" and insertion_range.Start > 0:
+        if position == "after" and insert_position > 0:
             insertion_range.InsertAfter("\r")
             insertion_range.Collapse(0)
+            inserted_text = "\r" + inserted_text
 
         # 插入列表项
         for i, item in enumerate(items):
@@ -357,6 +368,7 @@ def create_bulleted_list_relative_to(
                 insertion_range.Collapse(False)  # wdCollapseEnd
                 insertion_range.InsertAfter("\r")
                 insertion_range.Collapse(False)  # wdCollapseEnd
+        record_range_edit(insertion_range, insert_position, insert_position, inserted_text)
 
         # 为新插入的文本应用项目符号列表格式
         # 获取刚刚插入的文本范围
@@ -415,7 +427,9 @@ def create_bulleted_list(
             
             if position == "replace":
                 # 删除元素首先
+                delete_start, delete_end = range_obj.Start, range_obj.End
                 range_obj.Delete()
+                record_range_edit(range_obj, delete_start, delete_end, "")
                 # 使用元素的范围作为插入点
                 insertion_range = document.Range(range_obj.Start, range_obj.Start)
             elif position == "before":
@@ -18,39 +18,29 @@ from ..mcp_service.core_utils import (
 from ..models.context import DocumentContext
 
 # Import text_format_ops for formatting functions
+from ..com_backend.paragraph_index import record_range_edit
 from ..com_backend.selector_utils import get_selection_range
 from . import text_format_ops
 
 def _update_document_context_for_text(range_obj: Any, operation_type: str) -> None:
     """更新文本操作后的DocumentContext
     
+    上下文节点的偏移量锚定在编辑日志中，record_range_edit记录的编辑会在
+    读取节点时平移后续节点，因此这里不再修改节点或刷新整棵树，只通知
+    上下文更新处理器
+    
     Args:
         range_obj: Range对象
         operation_type: 操作类型（create, modify, delete）
     """
     try:
-        # 获取活动文档的上下文
         context = AppContext.get_instance()
-        doc_context = context.get_document_context(range_obj.Document)
-        
-        if not doc_context:
-            log_error("Document context not found")
+        if context.get_document_context_tree() is None:
             return
         
-        # 获取文本位置信息
-        start_pos = range_obj.Start
-        end_pos = range_obj.End
-        
-        # 查找对应的节点并更新
-        if operation_type == "create":
-            doc_context.add_or_update_node(start_pos, end_pos, "text", "insert")
-        elif operation_type == "modify":
-            doc_context.add_or_update_node(start_pos, end_pos, "text", "update")
-        elif operation_type == "delete":
-            doc_context.remove_node(start_pos, end_pos, "text")
-        
-        # 通知处理器
-        doc_context.notify_update()
+        context.notify_update(
+            f"text_{operation_type}", start=range_obj.Start, end=range_obj.End
+        )
         
     except Exception as e:
         log_error(f"Failed to update document context for text operation: {str(e)}")
@@ -128,7 +118,9 @@ def insert_text(document: Any, locator: Dict[str, Any], text: str) -> str:
         # 使用get_selection_range获取选择范围
         try:
             range_obj = get_selection_range(document, locator)
+            insert_position = range_obj.End
             range_obj.InsertAfter(text)
+            record_range_edit(range_obj, insert_position, insert_position, text)
             
             # 更新DocumentContext
             try:
@@ -157,7 +149,9 @@ def insert_text_before_range(com_range: Any, text: str) -> str:
         操作结果的JSON字符串
     """
     try:
+        insert_position = com_range.Start
         com_range.InsertBefore(text)
+        record_range_edit(com_range, insert_position, insert_position, text)
         
         # 更新DocumentContext
         try:
@@ -182,7 +176,9 @@ def insert_text_after_range(com_range: Any, text: str) -> str:
         操作结果的JSON字符串
     """
     try:
+        insert_position = com_range.End
         com_range.InsertAfter(text)
+        record_range_edit(com_range, insert_position, insert_position, text)
         
         # 更新DocumentContext
         try:
@@ -298,7 +294,9 @@ def replace_object_text(range_obj: Any, new_text: str) -> str:
     """
     try:
         # 由于我们已经确保所有对象都是Range对象，直接访问Text属性
+        replace_start, replace_end = range_obj.Start, range_obj.End
         range_obj.Text = new_text
+        record_range_edit(range_obj, replace_start, replace_end, new_text)
         
         # 更新DocumentContext
         try:
@@ -359,7 +357,9 @@ def insert_text_into_document(document: Any, locator: Dict[str, Any], text: str,
             if position.lower() == "before":
                 result = insert_text_before_range(range_obj, text)
             elif position.lower() == "replace":
+                replace_start, replace_end = range_obj.Start, range_obj.End
                 range_obj.Text = text
+                record_range_edit(range_obj, replace_start, replace_end, text)
                 result = json.dumps({"success": True, "message": "Text replaced successfully"})
             else:  # 默认"after"
                 result = insert_text_after_range(range_obj, text)
@@ -7,6 +7,7 @@ with the MCP server.
 
 # Import all tools to register them with the MCP server
 from .comment_tools import comment_tools
+from .diagnostics_tools import diagnostics_tools
 from .document_tools import document_tools
 from .image_tools import image_tools
 from .navigate_tools import navigate_tools
@@ -20,6 +21,7 @@ from .view_control_tools import view_control_tools
 
 __all__ = [
     "comment_tools",
+    "diagnostics_tools",
     "document_tools",
     "image_tools",
     "navigate_tools",
@@ -17,7 +17,7 @@ from pydantic import Field
 # Local imports
 from ..mcp_service.core import mcp_server
 from ..mcp_service.core_utils import (ErrorCode, WordDocumentError,
-                                      get_active_document)
+                                      get_active_document, run_on_com_thread)
 
 from ..mcp_service.app_context import AppContext
 from ..com_backend.selector_utils import get_selection_range
@@ -32,7 +32,7 @@ def _import_comment_operations():
     from ..operations.comment_ops import (add_comment, delete_all_comments,
                                           delete_comment, edit_comment,
                                           get_comment_thread, get_comments,
-                                          reply_to_comment)
+                                          get_comments_page, reply_to_comment)
 
     return (
         add_comment,
@@ -41,6 +41,7 @@ def _import_comment_operations():
         edit_comment,
         get_comment_thread,
         get_comments,
+        get_comments_page,
         reply_to_comment,
     )
 
@@ -50,6 +51,7 @@ load_dotenv()
 
 
 @mcp_server.tool()
+@run_on_com_thread
 async def comment_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
     operation_type: str = Field(
@@ -70,13 +72,41 @@ async def comment_tools(
     ),
     author: Optional[str] = Field(
         default=None,
-        description="Comment author for add operation\n\n    Optional for: add\n    ",
+        description="Comment author for add operation, or author filter for get_all\n\n    Optional for: add, get_all\n    ",
+    ),
+    date_from: Optional[str] = Field(
+        default=None,
+        description="Only return comments dated on or after this ISO date/time\n\n    Optional for: get_all\n    ",
+    ),
+    date_to: Optional[str] = Field(
+        default=None,
+        description="Only return comments dated on or before this ISO date/time\n\n    Optional for: get_all\n    ",
+    ),
+    scope_start: Optional[int] = Field(
+        default=None,
+        description="Only return comments whose scope ends after this document offset\n\n    Optional for: get_all\n    ",
+    ),
+    scope_end: Optional[int] = Field(
+        default=None,
+        description="Only return comments whose scope starts before this document offset\n\n    Optional for: get_all\n    ",
+    ),
+    offset: int = Field(
+        default=0,
+        description="Number of matching comments to skip\n\n    Optional for: get_all\n    ",
+    ),
+    limit: Optional[int] = Field(
+        default=None,
+        description="Maximum number of comments to return\n\n    Optional for: get_all\n    ",
     ),
     # 支持测试用例的参数格式
     params: Optional[Dict[str, Any]] = Field(
         default=None,
         description="Parameters for test compatibility"
-    )
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> Any:
     """评论操作工具
 
@@ -87,9 +117,9 @@ async def comment_tools(
     - delete: 通过ID删除评论
       * 必需参数：comment_id
       * 可选参数：无
-    - get_all: 获取文档中的所有评论
+    - get_all: 获取文档中的评论，支持按作者、日期和范围过滤及分页
       * 必需参数：无
-      * 可选参数：无
+      * 可选参数：author, date_from, date_to, scope_start, scope_end, offset, limit
     - reply: 回复现有评论
       * 必需参数：comment_text, comment_id
       * 可选参数：无
@@ -248,6 +278,7 @@ async def comment_tools(
         edit_comment,
         get_comment_thread,
         get_comments,
+        get_comments_page,
         reply_to_comment,
     ) = _import_comment_operations()
 
@@ -348,10 +379,23 @@ async def comment_tools(
             try:
                 # 检查Comments集合是否存在
                 if hasattr(document, "Comments"):
-                    result = get_comments(document)
+                    page = get_comments_page(
+                        document,
+                        author=author,
+                        date_from=date_from,
+                        date_to=date_to,
+                        scope_start=scope_start,
+                        scope_end=scope_end,
+                        offset=offset,
+                        limit=limit,
+                    )
                     return {
                         "success": True,
-                        "comments": result,
+                        "comments": page["comments"],
+                        "total": page["total"],
+                        "offset": page["offset"],
+                        "limit": page["limit"],
+                        "has_more": page["has_more"],
                         "message": "Comments retrieved successfully",
                     }
                 else:
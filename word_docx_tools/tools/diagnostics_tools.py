@@ -0,0 +1,82 @@
+"""
+Diagnostics Tool for Word Document MCP Server.
+
+This module provides a tool to inspect and reset the server's in-process
+performance counters: operation metrics, COM call counts, COM dispatch and
+executor statistics and render suspension timings.
+"""
+
+import json
+from typing import Optional
+
+# Third-party imports
+from mcp.server.fastmcp import Context
+from mcp.server.session import ServerSession
+from pydantic import Field
+
+# Local imports
+from ..com_backend.com_dispatch import get_dispatch_stats, reset_dispatch_stats
+from ..com_backend.com_executor import (get_com_executor_stats,
+                                        reset_com_executor_stats)
+from ..com_backend.com_utils import get_com_call_stats, reset_com_call_stats
+from ..com_backend.metric_store import get_metric_budget
+from ..com_backend.render_suspension import (get_render_suspension_stats,
+                                             reset_render_suspension_stats)
+from ..contexts.context_manager import get_context_manager
+from ..mcp_service.app_context import AppContext
+from ..mcp_service.core import mcp_server
+from ..mcp_service.core_utils import handle_tool_errors, log_info
+
+
+@mcp_server.tool()
+@handle_tool_errors
+def diagnostics_tools(
+    ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
+    operation_type: Optional[str] = Field(
+        default="snapshot",
+        description="Type of diagnostics operation: snapshot, reset",
+    ),
+) -> str:
+    """诊断工具，查看或重置服务器进程内的性能统计。
+
+    支持的操作类型：
+    - snapshot: 返回操作指标（次数、耗时聚合值和分位数、附加指标）、指标内存预算、
+      按工具统计的COM调用次数、COM派发和执行线程统计以及渲染暂停耗时
+      * 必需参数：无
+    - reset: 清空上述所有计数器，释放操作指标占用的内存预算
+      * 必需参数：无
+
+    不访问Word，也不在COM线程上排队，因此COM线程繁忙时仍可使用。
+
+    返回：
+        操作结果的JSON字符串
+    """
+    app_context = ctx.request_context.lifespan_context
+    context_manager = get_context_manager()
+    operation = (operation_type or "snapshot").lower()
+
+    if operation == "snapshot":
+        result = {
+            "operation_metrics": {
+                "app_context": app_context.get_performance_metrics(),
+                "context_manager": context_manager.get_performance_metrics(),
+            },
+            "metric_budget": get_metric_budget().get_stats(),
+            "com_calls": get_com_call_stats(),
+            "com_dispatch": get_dispatch_stats(),
+            "com_executor": get_com_executor_stats(),
+            "render_suspension": get_render_suspension_stats(),
+        }
+        return json.dumps(result, ensure_ascii=False, default=str)
+
+    if operation == "reset":
+        app_context.reset_performance_metrics()
+        context_manager.reset_performance_metrics()
+        reset_com_call_stats()
+        reset_dispatch_stats()
+        reset_com_executor_stats()
+        reset_render_suspension_stats()
+        log_info("Diagnostics counters reset")
+        return json.dumps({"success": True, "message": "Diagnostics counters reset"}, ensure_ascii=False)
+
+    raise ValueError(f"不支持的操作类型: {operation_type}")
@@ -22,7 +22,7 @@ from ..mcp_service.core_utils import (
     format_error_response,
     get_active_document, handle_tool_errors,
     log_error, log_info, log_warning,
-    require_active_document_validation
+    require_active_document_validation, run_on_com_thread
 )
 from ..operations.document_ops import (
     close_document, create_document,
@@ -39,12 +39,13 @@ except Exception as e:
 
 
 @mcp_server.tool()
+@run_on_com_thread
 @handle_tool_errors
 def document_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
     operation_type: Optional[str] = Field(
         default="open",
-        description="Type of document operation: create, open, save, save_as, close, get_outline, set_property, get_property",
+        description="Type of document operation: create, open, save, save_as, close, get_outline, set_property, get_property, list_documents, activate",
     ),
     file_path: Optional[str] = Field(
         default=None,
@@ -70,6 +71,14 @@ def document_tools(
         default=None,
         description="Password for opening protected documents. Required for: open (when document is password protected). Optional for: None",
     ),
+    include_page_numbers: bool = Field(
+        default=False,
+        description="Whether to compute the page number of each heading and the page count. Slower because Word has to paginate. Optional for: get_outline",
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> Any:
     """Unified document operation tool.
 
@@ -86,18 +95,29 @@ def document_tools(
     - save_as: Save the current document to a new path
       * Required parameters: file_path
       * Optional parameters: None
-    - close: Close the current document
+    - close: Close the current document (or the one given by document_handle)
       * Required parameters: None
-      * Optional parameters: None
+      * Optional parameters: document_handle
     - get_outline: Get document outline
       * Required parameters: None
-      * Optional parameters: None
+      * Optional parameters: include_page_numbers
     - set_property: Set document property
       * Required parameters: property_name, property_value
       * Optional parameters: document_properties
     - get_property: Get document property
       * Required parameters: property_name
-      * Optional parameters: Nonecreate
+      * Optional parameters: None
+    - list_documents: List the open documents with their handles
+      * Required parameters: None
+      * Optional parameters: None
+    - activate: Make an open document the active document
+      * Required parameters: document_handle
+      * Optional parameters: None
+
+    Several documents can be open at once. open and create return a
+    document_handle; pass it to any tool to work on that document without
+    reopening it. Least recently used documents are saved and closed when
+    more than WORD_WORKSPACE_MAX_DOCUMENTS are open.
 
     Returns:
         Operation result based on the operation type
@@ -137,9 +157,7 @@ def document_tools(
             if operation_type_str == "create":
                 log_info("Creating new document")
                 # 创建新文档的逻辑
-                word_app = ctx.request_context.lifespan_context.get_word_app(
-                    create_if_needed=True
-                )
+                word_app = ctx.request_context.lifespan_context.get_word_app_for_new_document()
                 if word_app is None:
                     log_error("Failed to get or create Word application instance")
                     raise RuntimeError("Failed to get or create Word application instance")
@@ -164,6 +182,7 @@ def document_tools(
                 # 确保file_path是字符串类型或None
                 save_path = str(file_path) if file_path and not isinstance(file_path, (str, bytes, os.PathLike)) else file_path
                 save_document(doc, save_path)
+                ctx.request_context.lifespan_context.refresh_active_document_key()
 
                 # 返回agent_guide.md文件内容
                 agent_guide_path = os.path.join(
@@ -186,6 +205,7 @@ def document_tools(
                         "success": True,
                         "message": "New document created successfully",
                         "document_name": doc.Name,
+                        "document_handle": ctx.request_context.lifespan_context.get_active_document_handle(),
                         "document_created": True,
                         "agent_guide_content": agent_guide_content,
                     },
@@ -198,11 +218,31 @@ def document_tools(
                         "file_path parameter must be provided for open operation"
                     )
 
+                # 文档已在工作区中打开时直接切换，无需重新打开
+                open_entry = ctx.request_context.lifespan_context.find_open_document(file_path)
+                if open_entry is not None:
+                    log_info(f"Document already open, activating: {file_path}")
+                    doc = ctx.request_context.lifespan_context.activate_document(open_entry.handle)
+                    return json.dumps(
+                        {
+                            "success": True,
+                            "message": f"Document already open: {file_path}",
+                            "document_opened": True,
+                            "already_open": True,
+                            "document_handle": open_entry.handle,
+                            "document": {
+                                "name": doc.Name,
+                                "path": file_path,
+                                "full_name": doc.FullName,
+                                "saved": doc.Saved,
+                            },
+                        },
+                        ensure_ascii=False,
+                    )
+
                 log_info(f"Opening document: {file_path}")
                 # 获取Word应用实例
-                word_app = ctx.request_context.lifespan_context.get_word_app(
-                    create_if_needed=True
-                )
+                word_app = ctx.request_context.lifespan_context.get_word_app_for_new_document()
                 if word_app is None:
                     raise RuntimeError("Failed to get or create Word application instance")
 
@@ -218,6 +258,7 @@ def document_tools(
                         "success": True,
                         "message": f"Document opened successfully: {file_path}",
                         "document_opened": True,
+                        "document_handle": ctx.request_context.lifespan_context.get_active_document_handle(),
                         "document": {
                             "name": doc.Name,
                             "path": file_path,
@@ -254,6 +295,8 @@ def document_tools(
 
                 log_info(f"Saving document as: {file_path}")
                 result = save_document(active_doc, file_path)
+                # 另存为后文档路径改变，更新工作区中的记录
+                ctx.request_context.lifespan_context.refresh_active_document_key()
 
                 return json.dumps(
                     {"success": result, "message": f"Document saved as: {file_path}", "document_saved": True},
@@ -267,6 +310,8 @@ def document_tools(
                     )
 
                 log_info("Closing document")
+                # 关闭前解除文档与Word实例的绑定
+                ctx.request_context.lifespan_context.release_document(active_doc)
                 result = close_document(active_doc)
 
                 # 清除上下文中的活动文档
@@ -276,6 +321,27 @@ def document_tools(
                     {"success": result, "message": "Document closed successfully"},
                     ensure_ascii=False,
                 )
+            elif operation_type_str == "list_documents":
+                documents = ctx.request_context.lifespan_context.list_documents()
+                return json.dumps(
+                    {"success": True, "documents": documents, "count": len(documents)},
+                    ensure_ascii=False,
+                )
+
+            elif operation_type_str == "activate":
+                if not active_doc:
+                    raise WordDocumentError(
+                        ErrorCode.DOCUMENT_ERROR, "No active document found"
+                    )
+                return json.dumps(
+                    {
+                        "success": True,
+                        "message": f"Active document: {active_doc.Name}",
+                        "document_handle": ctx.request_context.lifespan_context.get_active_document_handle(),
+                    },
+                    ensure_ascii=False,
+                )
+
             elif operation_type_str == "get_outline":
                 if not active_doc:
                     raise WordDocumentError(
@@ -283,7 +349,9 @@ def document_tools(
                     )
 
                 log_info("Getting document outline")
-                outline = get_document_outline(active_doc)
+                outline = get_document_outline(
+                    active_doc, include_page_numbers=include_page_numbers
+                )
 
                 return outline
 
@@ -21,7 +21,8 @@ from ..mcp_service.core_utils import (ErrorCode, WordDocumentError,
                                       format_error_response,
                                       get_active_document, handle_tool_errors,
                                       log_error, log_info,
-                                      require_active_document_validation)
+                                      require_active_document_validation,
+                                      run_on_com_thread)
 
 from ..mcp_service.app_context import AppContext
 
@@ -55,6 +56,7 @@ except Exception as e:
 
 
 @mcp_server.tool()
+@run_on_com_thread
 async def image_tools(
     ctx: Context[ServerSession, AppContext],
     operation_type: str = Field(
@@ -100,6 +102,10 @@ async def image_tools(
         default=False,
         description="Whether to exclude the caption label when adding a caption. Optional for: add_caption",
     ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> str:
     """图像操作工具
 
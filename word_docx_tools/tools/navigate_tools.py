@@ -25,7 +25,8 @@ from ..mcp_service.core_utils import (
     handle_tool_errors,
     log_error,
     log_info,
-    require_active_document_validation
+    require_active_document_validation,
+    run_on_com_thread
 )
 from ..operations.navigate_tools import set_active_context, set_active_object
 
@@ -36,6 +37,7 @@ logger = logging.getLogger(__name__)
 
 
 @mcp_server.tool()
+@run_on_com_thread
 async def navigate_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="上下文对象"),
     operation_type: str = Field(
@@ -61,7 +63,11 @@ async def navigate_tools(
     params: Optional[Dict[str, Any]] = Field(
         default=None,
         description="用于测试兼容性的参数"
-    )
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="要操作的已打开文档的句柄（由document_tools的open/create/list_documents返回），默认使用活动文档",
+    ),
 ) -> Dict[str, Any]:
     """导航工具
 
@@ -22,7 +22,8 @@ from ..mcp_service.core_utils import (ErrorCode, WordDocumentError,
                                       format_error_response,
                                       get_active_document, handle_tool_errors,
                                       log_error, log_info,
-                                      require_active_document_validation)
+                                      require_active_document_validation,
+                                      run_on_com_thread)
 from ..operations.objects_ops import (create_bookmark, create_citation,
                                       create_hyperlink)
 from ..mcp_service.app_context import AppContext
@@ -36,6 +37,7 @@ except Exception as e:
 
 
 @mcp_server.tool()
+@run_on_com_thread
 def objects_tools(
     ctx: Context[ServerSession, AppContext] = Field(
         description="MCP context object containing session and application context information"
@@ -87,6 +89,10 @@ def objects_tools(
         default=None,
         description="Name of the hyperlink. Optional for hyperlink_operations",
     ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> Dict[str, Any]:
     """文档对象操作工具
 
@@ -21,7 +21,8 @@ from ..mcp_service.core_utils import (
     handle_tool_errors,
     log_error,
     log_info,
-    require_active_document_validation
+    require_active_document_validation,
+    run_on_com_thread
 )
 from ..operations.paragraphs_ops import (
     get_paragraphs_info,
@@ -33,6 +34,7 @@ from ..operations.paragraphs_ops import (
 from ..operations.navigate_tools import set_active_context, set_active_object
 
 @mcp_server.tool()
+@run_on_com_thread
 @require_active_document_validation
 @handle_tool_errors
 def paragraph_tools(
@@ -58,6 +60,10 @@ def paragraph_tools(
         None,
         description="包含要应用的段落样式的字典\n\n         Required for: format_paragraph"
     ),
+    include_page_numbers: bool = Field(
+        False,
+        description="是否返回每个段落所在页码\n\n         Optional for: get_paragraphs_details"
+    ),
     context_type: Optional[str] = Field(
         None,
         description="上下文类型，例如：document, section, paragraph, table"
@@ -73,7 +79,11 @@ def paragraph_tools(
     object_id: Optional[int] = Field(
         None,
         description="对象ID，对应于特定类型的对象ID"
-    )
+    ),
+    document_handle: Optional[str] = Field(
+        None,
+        description="要操作的已打开文档的句柄（由document_tools的open/create/list_documents返回），默认使用活动文档"
+    ),
 ) -> str:
     """段落操作工具，支持获取段落信息、插入段落、删除段落和格式化段落等操作。
 
@@ -89,7 +99,7 @@ def paragraph_tools(
       * 可选参数：无
     - get_paragraphs_details: 获取段落详情（合并版，可同时获取段落列表和统计信息）
       * 必需参数：无
-      * 可选参数：context_type, context_id, object_type, object_id
+      * 可选参数：include_page_numbers, context_type, context_id, object_type, object_id
 
     返回：
         操作结果的JSON字符串
@@ -118,7 +128,9 @@ def paragraph_tools(
         # 执行相应的操作
         if operation_type == "get_paragraphs_details":
             # 获取段落详情
-            result = get_paragraphs_details(active_doc, locator)
+            result = get_paragraphs_details(
+                active_doc, locator, include_page_numbers=include_page_numbers
+            )
         elif operation_type == "insert_paragraph":
             # 插入段落
             if not text:
@@ -20,12 +20,14 @@ from ..mcp_service.core_utils import (
     WordDocumentError,
     get_active_document,
     log_error,
-    log_info
+    log_info,
+    run_on_com_thread
 )
 from ..operations.text_operations import apply_formatting_to_object
 
 
 @mcp_server.tool()
+@run_on_com_thread
 async def range_tools(
     ctx: Context[ServerSession, AppContext],
     operation_type: str = Field(
@@ -40,6 +42,10 @@ async def range_tools(
         default=None,
         description="Formatting options for modify_selection_style operation",
     ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> str:
     """范围选择操作工具，专注于用户选择内容的操作。
 
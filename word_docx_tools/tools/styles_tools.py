@@ -15,17 +15,20 @@ from mcp.server.session import ServerSession
 from pydantic import Field
 
 # Local imports
+from ..com_backend.style_catalog import get_font_catalog, get_style_catalog
 from ..mcp_service.core import mcp_server
 from ..mcp_service.core_utils import (
     ErrorCode, WordDocumentError,
     format_error_response,
     handle_tool_errors,
     log_error, log_info,
-    require_active_document_validation)
+    require_active_document_validation,
+    run_on_com_thread)
 from ..mcp_service.app_context import AppContext
 
 
 @mcp_server.tool()
+@run_on_com_thread
 @handle_tool_errors
 @require_active_document_validation
 def styles_tools(
@@ -40,7 +43,19 @@ def styles_tools(
     ),
     limit: Optional[int] = Field(
         default=None,
-        description="Limit the number of results returned (only used with get_font_names)",
+        description="Limit the number of results returned",
+    ),
+    offset: int = Field(
+        default=0,
+        description="Number of results to skip, for paging",
+    ),
+    name_prefix: Optional[str] = Field(
+        default=None,
+        description="Only return styles or fonts whose name starts with this prefix (case-insensitive)",
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
     ),
 ) -> str:
     """样式操作工具，支持查询文档中的可用样式、编号样式和字体名称。
@@ -48,13 +63,15 @@ def styles_tools(
     支持的操作类型：
     - get_available_styles: 获取文档中所有可用的样式
       * 必需参数：无
-      * 可选参数：style_type - 过滤样式类型
+      * 可选参数：style_type - 过滤样式类型, name_prefix, offset, limit
     - get_numbering_styles: 获取文档中所有可用的编号样式
       * 必需参数：无
-      * 可选参数：无
+      * 可选参数：name_prefix, offset, limit
     - get_font_names: 获取系统中所有可用的字体名称
       * 必需参数：无
-      * 可选参数：limit - 限制返回的字体数量
+      * 可选参数：name_prefix, offset, limit - 限制返回的字体数量
+
+    字体列表在进程内只读取一次，样式目录按文档缓存，过滤和分页都在内存中完成。
 
     返回：
         操作结果的JSON字符串
@@ -71,43 +88,19 @@ def styles_tools(
                 ErrorCode.DOCUMENT_ERROR, "未找到活动文档"
             )
 
+        # limit不是正整数时返回全部结果
+        page_limit = limit if isinstance(limit, int) and limit > 0 else None
+
         # 处理get_available_styles操作
         if operation_type and operation_type.lower() == "get_available_styles":
             log_info("获取可用样式")
-            result = []
             try:
-                # Word中样式类型常量
-                STYLE_TYPES = {
-                    'paragraph': 1,    # wdStyleTypeParagraph
-                    'character': 2,    # wdStyleTypeCharacter
-                    'table': 3,        # wdStyleTypeTable
-                    'list': 4          # wdStyleTypeList
-                }
-                
-                for style in active_doc.Styles:
-                    # 如果指定了style_type，则过滤样式类型
-                    if style_type and style_type.lower() in STYLE_TYPES:
-                        if style.Type == STYLE_TYPES[style_type.lower()]:
-                            result.append({
-                                "name": style.NameLocal,
-                                "type": style.Type,
-                                "built_in": style.BuiltIn,
-                                "type_name": style_type.lower()
-                            })
-                    else:
-                        # 获取样式类型的名称
-                        type_name = "unknown"
-                        for key, value in STYLE_TYPES.items():
-                            if value == style.Type:
-                                type_name = key
-                                break
-                        
-                        result.append({
-                            "name": style.NameLocal,
-                            "type": style.Type,
-                            "built_in": style.BuiltIn,
-                            "type_name": type_name
-                        })
+                result, _ = get_style_catalog(active_doc).query(
+                    style_type=style_type,
+                    prefix=name_prefix,
+                    offset=offset,
+                    limit=page_limit,
+                )
             except Exception as e:
                 raise WordDocumentError(
                     ErrorCode.SERVER_ERROR, f"获取样式失败: {str(e)}"
@@ -120,30 +113,33 @@ def styles_tools(
             log_info("获取编号样式")
             result = []
             try:
+                catalog = get_style_catalog(active_doc)
                 # Word中列表样式类型常量为4 (wdStyleTypeList)
-                for style in active_doc.Styles:
-                    if style.Type == 4:  # wdStyleTypeList
-                        result.append({
-                            "name": style.NameLocal,
-                            "built_in": style.BuiltIn,
-                            "is_numbering_style": True
-                        })
+                list_styles, _ = catalog.query(style_type="list", prefix=name_prefix)
+                for style in list_styles:
+                    result.append({
+                        "name": style["name"],
+                        "built_in": style["built_in"],
+                        "is_numbering_style": True
+                    })
                 
                 # 如果没有找到列表样式，尝试另一种方式识别编号样式
                 if not result:
-                    numbering_styles = []
-                    for style in active_doc.Styles:
+                    candidates, _ = catalog.query(prefix=name_prefix)
+                    for style in candidates:
                         # 检查样式名称是否包含编号相关关键词
-                        name_lower = style.NameLocal.lower()
+                        name_lower = style["name"].lower()
                         if any(keyword in name_lower for keyword in 
                               ['number', '编号', 'list', '列表', 'bullet', '项目符号']):
-                            numbering_styles.append({
-                                "name": style.NameLocal,
-                                "built_in": style.BuiltIn,
+                            result.append({
+                                "name": style["name"],
+                                "built_in": style["built_in"],
                                 "is_numbering_style": True,
-                                "original_type": style.Type
+                                "original_type": style["type"]
                             })
-                    result = numbering_styles
+
+                stop = None if page_limit is None else offset + page_limit
+                result = result[offset:stop]
             except Exception as e:
                 raise WordDocumentError(
                     ErrorCode.SERVER_ERROR, f"获取编号样式失败: {str(e)}"
@@ -154,25 +150,16 @@ def styles_tools(
         # 处理get_font_names操作
         elif operation_type and operation_type.lower() == "get_font_names":
             log_info("获取字体名称")
-            result = []
             try:
                 if not hasattr(active_doc, "Application") or active_doc.Application is None:
                     raise WordDocumentError(
                         ErrorCode.SERVER_ERROR, "无法访问Application对象获取字体列表"
                     )
                 
-                # 获取所有可用字体名称
-                font_names = list(active_doc.Application.FontNames)
-                
-                # 如果设置了限制，只返回指定数量的字体
-                if limit and isinstance(limit, int) and limit > 0:
-                    font_names = font_names[:limit]
-                
-                # 构建返回结果
-                for font_name in font_names:
-                    result.append({
-                        "font_name": font_name
-                    })
+                # 字体列表在进程生命周期内只读取一次
+                result, _ = get_font_catalog(active_doc.Application).query(
+                    prefix=name_prefix, offset=offset, limit=page_limit
+                )
             except Exception as e:
                 raise WordDocumentError(
                     ErrorCode.SERVER_ERROR, f"获取字体名称失败: {str(e)}"
@@ -21,10 +21,11 @@ from ..mcp_service.core_utils import (ErrorCode, WordDocumentError,
                                       format_error_response,
                                       get_active_document, handle_tool_errors,
                                       log_error, log_info,
-                                      require_active_document_validation)
+                                      require_active_document_validation,
+                                      run_on_com_thread)
 from ..operations.table_ops import (create_table, get_cell_text,
                                     get_table_info, insert_column, insert_row,
-                                    set_cell_text)
+                                    set_cell_text, set_cells)
 
 # 自定义定位器异常类
 class LocatorSyntaxError(Exception):
@@ -32,17 +33,18 @@ class LocatorSyntaxError(Exception):
 
 
 @mcp_server.tool()
+@run_on_com_thread
 @handle_tool_errors
 @require_active_document_validation
 def table_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
     operation_type: Optional[str] = Field(
         default=None,
-        description="Type of table operation: create, get_cell, set_cell, get_info, insert_row, insert_column",
+        description="Type of table operation: create, get_cell, set_cell, set_cells, get_info, insert_row, insert_column",
     ),
     table_index: Optional[int] = Field(
         default=None,
-        description="Table index (larger than 0) for operations that require specifying a table. Required for: get_cell, set_cell, get_info, insert_row, insert_column",
+        description="Table index (larger than 0) for operations that require specifying a table. Required for: get_cell, set_cell, set_cells, get_info, insert_row, insert_column",
     ),
     rows: Optional[int] = Field(
         default=None,
@@ -54,11 +56,11 @@ def table_tools(
     ),
     row: Optional[int] = Field(
         default=None,
-        description="Cell row number (1-based). Required for: get_cell, set_cell",
+        description="Cell row number (1-based). Required for: get_cell, set_cell. Optional for: set_cells (row of the first array row, default 1)",
     ),
     col: Optional[int] = Field(
         default=None,
-        description="Cell column number (1-based). Required for: get_cell, set_cell",
+        description="Cell column number (1-based). Required for: get_cell, set_cell. Optional for: set_cells (column of the first array column, default 1)",
     ),
     text: Optional[str] = Field(
         default=None,
@@ -80,6 +82,22 @@ def table_tools(
         default=None,
         description="Number of rows/columns to insert. Optional for: insert_row, insert_column",
     ),
+    cells: Optional[Union[List[List[Optional[str]]], Dict[str, str]]] = Field(
+        default=None,
+        description="Cell texts to write: a 2-D array (null entries are skipped) or a sparse map {'row,col': text}. Required for: set_cells",
+    ),
+    column_formatting: Optional[Dict[str, Dict[str, Any]]] = Field(
+        default=None,
+        description="Optional formatting per column number, same format as formatting. Optional for: set_cells",
+    ),
+    cell_window: Optional[Dict[str, int]] = Field(
+        default=None,
+        description="Optional 1-based, inclusive window of cells to return, with keys row_start, row_end, col_start, col_end. Optional for: get_info",
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> str:
     """表格操作工具
 
@@ -93,9 +111,12 @@ def table_tools(
     - set_cell: 设置单元格文本
       * 必需参数：table_index, row, col, text
       * 可选参数：formatting
+    - set_cells: 批量设置单元格文本（一次校验、一次上下文更新）
+      * 必需参数：table_index, cells
+      * 可选参数：row, col（二维数组的起始单元格）, column_formatting
     - get_info: 获取表格信息
       * 必需参数：无（不提供table_index则返回所有表格信息）
-      * 可选参数：table_index
+      * 可选参数：table_index, cell_window（按行/列窗口分页读取大表格）
     - insert_row: 插入行
       * 必需参数：table_index
       * 可选参数：position, count
@@ -263,6 +284,24 @@ def table_tools(
             log_info("Cell text set successfully")
             return str(result)
 
+        elif operation_type and operation_type.lower() == "set_cells":
+            if table_index is None or cells is None:
+                raise ValueError(
+                    "table_index and cells parameters must be provided for set_cells operation"
+                )
+
+            log_info(f"Setting cells in table {table_index}")
+            result = set_cells(
+                document=active_doc,
+                table_index=table_index,
+                cells=cells,
+                column_formatting=column_formatting,
+                start_row=row or 1,
+                start_col=col or 1,
+            )
+            log_info("Cells set successfully")
+            return str(result)
+
         elif operation_type and operation_type.lower() == "get_info":
             # 添加对table_index的验证
             if table_index is not None and table_index <= 0:
@@ -273,7 +312,21 @@ def table_tools(
             log_info(
                 f"Getting info for table {table_index if table_index is not None else 'all tables'}"
             )
-            result = get_table_info(document=active_doc, table_index=table_index)
+            window = cell_window or {}
+            unknown_keys = set(window) - {"row_start", "row_end", "col_start", "col_end"}
+            if unknown_keys:
+                raise WordDocumentError(
+                    ErrorCode.INVALID_INPUT,
+                    f"Unsupported cell_window keys: {', '.join(sorted(unknown_keys))}"
+                )
+            result = get_table_info(
+                document=active_doc,
+                table_index=table_index,
+                row_start=window.get("row_start", 1),
+                row_end=window.get("row_end"),
+                col_start=window.get("col_start", 1),
+                col_end=window.get("col_end"),
+            )
             log_info("Table info retrieved successfully")
             return str(result)
 
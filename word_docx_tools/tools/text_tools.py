@@ -21,7 +21,8 @@ from ..mcp_service.core_utils import (
     handle_tool_errors,
     log_error,
     log_info,
-    require_active_document_validation
+    require_active_document_validation,
+    run_on_com_thread
 )
 from ..operations.text_operations import (
     get_text_from_document,
@@ -31,6 +32,7 @@ from ..operations.text_operations import (
     apply_formatting_to_document_text,
     validate_required_params
 )
+from ..operations.document_ops import find_and_replace_rules, find_and_replace_text
 from ..operations.navigate_tools import set_active_context, set_active_object
 from ..mcp_service.app_context import AppContext
 
@@ -39,13 +41,14 @@ from ..mcp_service.app_context import AppContext
 
 
 @mcp_server.tool()
+@run_on_com_thread
 @require_active_document_validation
 @handle_tool_errors
 def text_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
     operation_type: Optional[str] = Field(
         default=None,
-        description="Type of text operation: get_text, insert_text, replace_text, get_char_count, apply_formatting",
+        description="Type of text operation: get_text, insert_text, replace_text, get_char_count, apply_formatting, find_replace",
     ),
     context_type: Optional[str] = Field(
         default=None,
@@ -75,6 +78,26 @@ def text_tools(
         default=None,
         description="Formatting options: bold, italic, font_size, font_name, font_color, alignment, Used for: apply_formatting",
     ),
+    find_text: Optional[str] = Field(
+        default=None,
+        description="Text to find in the whole document; text is used as the replacement\n\n    Used by: find_replace\n",
+    ),
+    rules: Optional[List[Dict[str, Any]]] = Field(
+        default=None,
+        description="List of find/replace rules applied in order as one undo step, each with find, replace and optional match_case, match_whole_word\n\n    Used by: find_replace\n",
+    ),
+    match_case: bool = Field(
+        default=False,
+        description="Whether find_text must match case\n\n    Used by: find_replace\n",
+    ),
+    match_whole_word: bool = Field(
+        default=False,
+        description="Whether find_text must match whole words only\n\n    Used by: find_replace\n",
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 
 ) -> Any:
     """文本操作工具，支持获取文本内容、插入文本、替换文本、获取字符计数和应用文本格式等操作。
@@ -95,6 +118,9 @@ def text_tools(
     - apply_formatting: 对特定上下文中的文本应用格式设置
       * 必需参数：formatting
       * 可选参数：context_type, context_id, object_type, object_id
+    - find_replace: 在整个文档中查找并全部替换
+      * 必需参数：find_text和text，或rules（多条规则作为一次撤销操作批量执行）
+      * 可选参数：match_case, match_whole_word
 
     返回：
         操作结果的JSON字符串
@@ -139,6 +165,19 @@ def text_tools(
             # 只使用formatting参数
             return apply_formatting_to_document_text(active_doc, formatting)
 
+        elif operation_type == "find_replace":
+            if rules:
+                return json.dumps(
+                    find_and_replace_rules(active_doc, rules), ensure_ascii=False
+                )
+            validate_required_params({"find_text": find_text, "text": text}, "find_replace")
+            count = find_and_replace_text(
+                active_doc, find_text, text, match_case, match_whole_word
+            )
+            return json.dumps(
+                {"success": True, "replacements": count}, ensure_ascii=False
+            )
+
         else:
             raise ValueError(f"Unsupported operation type: {operation_type}")
     except Exception as e:
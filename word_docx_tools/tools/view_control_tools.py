@@ -18,7 +18,7 @@ from pydantic import Field
 # Local imports
 from ..mcp_service.core import mcp_server
 from ..mcp_service.app_context import AppContext
-from ..mcp_service.core_utils import ErrorCode, WordDocumentError
+from ..mcp_service.core_utils import ErrorCode, WordDocumentError, run_on_com_thread
 # 导入操作相关模块
 from ..contexts.context_control import set_active_context, get_active_object, navigate_to_next_object, navigate_to_previous_object, get_context_information, set_zoom_level
 
@@ -299,6 +299,7 @@ def set_zoom(percentage: int = None) -> Dict[str, Any]:
         }
 
 @mcp_server.tool()
+@run_on_com_thread
 async def view_control_tools(
     ctx: Context[ServerSession, AppContext] = Field(description="Context object"),
     operation_type: str = Field(
@@ -312,7 +313,11 @@ async def view_control_tools(
     params: Optional[Dict[str, Any]] = Field(
         default=None,
         description="Parameters for test compatibility"
-    )
+    ),
+    document_handle: Optional[str] = Field(
+        default=None,
+        description="Handle of the open document to work on, as returned by document_tools open/create/list_documents. Defaults to the active document",
+    ),
 ) -> Dict[str, Any]:
     """上下文控制工具
 